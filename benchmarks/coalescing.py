@@ -0,0 +1,112 @@
+# coding=utf-8
+"""
+Measures the effect of :py:class:`iota.adapter.wrappers.CoalescingWrapper`
+when many threads request overlapping transactions at the same time.
+
+Usage::
+
+   python benchmarks/coalescing.py [--threads 32] [--latency 0.05]
+"""
+from __future__ import absolute_import, division, print_function, \
+  unicode_literals
+
+from argparse import ArgumentParser
+from random import Random
+from threading import Thread
+from time import time
+
+from iota import StrictIota, TransactionHash
+from iota.adapter import HttpAdapter
+from iota.adapter.wrappers import CoalescingWrapper
+
+from stand_in_node import StandInNode
+
+
+def run(api, hash_sets, rounds):
+  """
+  Sends ``getTrytes`` requests from one thread per hash set.
+  """
+  def worker(hashes):
+    for _ in range(rounds):
+      api.get_trytes(hashes)
+
+  threads = [Thread(target=worker, args=(hashes,)) for hashes in hash_sets]
+
+  start = time()
+
+  for t in threads:
+    t.start()
+
+  for t in threads:
+    t.join()
+
+  return time() - start
+
+
+def main(threads, latency, rounds, pool_size, hashes_per_request, window):
+  rng = Random(42)
+
+  pool = [
+    TransactionHash(
+      ''.join(rng.choice('9ABCDEFGHIJKLMNOPQRSTUVWXYZ') for _ in range(81))
+        .encode('ascii')
+    )
+      for _ in range(pool_size)
+  ]
+
+  # Each worker asks for a random subset of a shared pool of hashes,
+  # so the requests overlap.
+  hash_sets = [rng.sample(pool, hashes_per_request) for _ in range(threads)]
+
+  with StandInNode(latency=latency) as node:
+    scenarios = [
+      ('HttpAdapter', HttpAdapter(node.uri)),
+      ('CoalescingWrapper', CoalescingWrapper(node.uri, window=window)),
+    ]
+
+    print(
+      '{threads} threads x {rounds} rounds, {latency:.0f} ms node latency, '
+      '{hashes} hashes per request from a pool of {pool}'.format(
+        threads = threads,
+        rounds  = rounds,
+        latency = latency * 1000,
+        hashes  = hashes_per_request,
+        pool    = pool_size,
+      ),
+    )
+
+    for name, adapter in scenarios:
+      node.reset_counters()
+
+      elapsed = run(StrictIota(adapter), hash_sets, rounds)
+
+      print(
+        '{name:>20}: {elapsed:7.3f} s, {requests:5d} requests, '
+        '{items:6d} hashes sent to node'.format(
+          name      = name,
+          elapsed   = elapsed,
+          requests  = node.request_count,
+          items     = node.item_count,
+        ),
+      )
+
+
+if __name__ == '__main__':
+  parser = ArgumentParser(description=__doc__.split('\n\n')[0])
+  parser.add_argument('--threads', type=int, default=32)
+  parser.add_argument('--latency', type=float, default=0.05)
+  parser.add_argument('--rounds', type=int, default=5)
+  parser.add_argument('--pool-size', type=int, default=200)
+  parser.add_argument('--hashes-per-request', type=int, default=20)
+  parser.add_argument('--window', type=float, default=CoalescingWrapper.DEFAULT_WINDOW)
+
+  args = parser.parse_args()
+
+  main(
+    threads             = args.threads,
+    latency             = args.latency,
+    rounds              = args.rounds,
+    pool_size           = args.pool_size,
+    hashes_per_request  = args.hashes_per_request,
+    window              = args.window,
+  )
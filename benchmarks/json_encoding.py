@@ -0,0 +1,95 @@
+# coding=utf-8
+"""
+Measures how long it takes to encode a ``storeTransactions`` payload
+containing many transactions.
+
+Usage::
+
+   python benchmarks/json_encoding.py [--transactions 1000] [--rounds 50]
+"""
+from __future__ import absolute_import, division, print_function, \
+  unicode_literals
+
+from argparse import ArgumentParser
+from json.encoder import JSONEncoder
+from random import Random
+from timeit import timeit
+
+from six import text_type
+
+from iota import TransactionTrytes
+from iota.json import JsonEncoder, OrjsonEncoder, orjson
+
+
+class DefaultHookEncoder(JSONEncoder):
+  """
+  Converts each tryte sequence individually via :py:meth:`default`
+  (this is how :py:class:`JsonEncoder` used to encode every payload).
+  """
+  def default(self, o):
+    return JsonEncoder().default(o)
+
+
+def main(transactions, rounds):
+  rng = Random(42)
+
+  trytes = [
+    TransactionTrytes(
+      ''.join(
+        rng.choice('9ABCDEFGHIJKLMNOPQRSTUVWXYZ')
+          for _ in range(TransactionTrytes.LEN)
+      ).encode('ascii')
+    )
+      for _ in range(transactions)
+  ]
+
+  # Payload as sent by ``Iota.store_transactions`` (the request filter
+  # converts trytes to unicode strings).
+  text_payload = {
+    'command':  'storeTransactions',
+    'trytes':   [text_type(t) for t in trytes],
+  }
+
+  # Payload as sent directly to an adapter.
+  trytes_payload = {
+    'command':  'storeTransactions',
+    'trytes':   trytes,
+  }
+
+  encoders = [
+    ('default hook', DefaultHookEncoder()),
+    ('JsonEncoder', JsonEncoder()),
+  ]
+
+  if orjson is not None:
+    encoders.append(('OrjsonEncoder', OrjsonEncoder()))
+  else:
+    print('orjson is not installed; skipping OrjsonEncoder.')
+
+  print('Encoding {count} transactions, {rounds} rounds:'.format(
+    count   = transactions,
+    rounds  = rounds,
+  ))
+
+  for label, payload in (
+      ('TryteString payload', trytes_payload),
+      ('unicode payload', text_payload),
+  ):
+    print('  {label}:'.format(label=label))
+
+    for name, encoder in encoders:
+      elapsed = timeit(lambda: encoder.encode(payload), number=rounds)
+
+      print('    {name:<15} {ms:8.2f} ms/payload'.format(
+        ms    = elapsed / rounds * 1000,
+        name  = name,
+      ))
+
+
+if __name__ == '__main__':
+  parser = ArgumentParser(description=__doc__.strip().splitlines()[0])
+  parser.add_argument('--transactions', type=int, default=1000)
+  parser.add_argument('--rounds', type=int, default=50)
+
+  args = parser.parse_args()
+  main(args.transactions, args.rounds)
@@ -0,0 +1,93 @@
+# coding=utf-8
+"""
+Measures how ``get_account_data`` scales with the size of the Tangle,
+using an in-memory Tangle (no node required).
+
+A few transfers are sent to the seed's addresses, then the Tangle is
+padded with unrelated transactions.
+
+Usage::
+
+   python benchmarks/local_tangle.py [--addresses 3] \
+     [--sizes 10000 100000 1000000] [--compress]
+"""
+from __future__ import absolute_import, division, print_function, \
+  unicode_literals
+
+from argparse import ArgumentParser
+from timeit import default_timer
+
+from iota import Iota, ProposedTransaction
+from iota.adapter.local import LocalTangleAdapter
+
+SEED = b'BENCHMARK9SEED'
+
+ALPHABET = 'ABCDEFGHIJKLMNOPQRSTUVWXYZ'
+
+
+def tryte_id(prefix, n):
+  """
+  Converts a number into a unique 81-tryte sequence.
+  """
+  digits = []
+  while n:
+    n, digit = divmod(n, len(ALPHABET))
+    digits.append(ALPHABET[digit])
+
+  return (prefix + ''.join(digits)).ljust(81, '9')
+
+
+def filler_transactions(start, stop):
+  """
+  Generates unrelated transactions to pad the Tangle with.
+  """
+  # Everything except the address is 9s; the hashes are made up.
+  head = '9' * 2187
+  tail = '9' * (2673 - 2187 - 81)
+
+  for i in range(start, stop):
+    yield tryte_id('H', i), head + tryte_id('A', i) + tail
+
+
+def main(addresses, sizes, compress):
+  adapter = LocalTangleAdapter(compress=compress, seed=42)
+  api = Iota(adapter, SEED)
+
+  print('Sending {count} transfers to the seed...'.format(count=addresses))
+  for address in api.get_new_addresses(index=0, count=addresses)['addresses']:
+    api.send_transfer(
+      depth     = 3,
+      transfers = [ProposedTransaction(address=address, value=0)],
+    )
+
+  print('get_account_data:')
+
+  for size in sorted(sizes):
+    start = default_timer()
+    adapter.add_transactions(filler_transactions(len(adapter), size))
+    fill_time = default_timer() - start
+
+    start = default_timer()
+    account_data = api.get_account_data()
+    elapsed = default_timer() - start
+
+    assert len(account_data['bundles']) == addresses
+
+    print(
+      '  {size:>9} transactions: {elapsed:7.2f} s '
+      '(filled in {fill_time:.1f} s)'.format(
+        elapsed   = elapsed,
+        fill_time = fill_time,
+        size      = len(adapter),
+      ),
+    )
+
+
+if __name__ == '__main__':
+  parser = ArgumentParser(description=__doc__.strip().splitlines()[0])
+  parser.add_argument('--addresses', type=int, default=3)
+  parser.add_argument('--sizes', type=int, nargs='+', default=[10000, 100000])
+  parser.add_argument('--compress', action='store_true')
+
+  args = parser.parse_args()
+  main(args.addresses, args.sizes, args.compress)
@@ -0,0 +1,91 @@
+# coding=utf-8
+"""
+Measures the per-request overhead of :py:class:`iota.adapter.HttpAdapter`
+logging, with the logger set to INFO (adapter messages are ignored) vs
+DEBUG (adapter messages are formatted and handled).
+
+The HTTP request itself is replaced with a canned response, so only
+the adapter's own work is measured.
+
+Usage::
+
+   python benchmarks/logging_overhead.py [--transactions 1000] [--rounds 50]
+"""
+from __future__ import absolute_import, division, print_function, \
+  unicode_literals
+
+from argparse import ArgumentParser
+from logging import DEBUG, INFO, NullHandler, getLogger
+from random import Random
+from timeit import timeit
+
+import requests
+from six import BytesIO, text_type
+
+import iota.adapter
+from iota import TransactionTrytes
+from iota.adapter import HttpAdapter
+
+
+def canned_request(**kwargs):
+  """
+  Replaces :py:func:`requests.request`; returns an empty success
+  response without touching the network.
+  """
+  response = requests.Response()
+  response.status_code  = 200
+  response.encoding     = 'utf-8'
+  response.raw          = BytesIO(b'{"duration": 1}')
+  return response
+
+
+def main(transactions, rounds):
+  rng = Random(42)
+
+  payload = {
+    'command': 'storeTransactions',
+
+    'trytes': [
+      text_type(TransactionTrytes(
+        ''.join(
+          rng.choice('9ABCDEFGHIJKLMNOPQRSTUVWXYZ')
+            for _ in range(TransactionTrytes.LEN)
+        ).encode('ascii')
+      ))
+        for _ in range(transactions)
+    ],
+  }
+
+  iota.adapter.request = canned_request
+
+  logger = getLogger('benchmarks.logging_overhead')
+  logger.addHandler(NullHandler())
+  logger.propagate = False
+
+  print('Sending {count}-transaction payload, {rounds} rounds:'.format(
+    count   = transactions,
+    rounds  = rounds,
+  ))
+
+  for label, level in (('no logger', None), ('INFO', INFO), ('DEBUG', DEBUG)):
+    adapter = HttpAdapter('http://localhost:14265')
+
+    if level is not None:
+      logger.setLevel(level)
+      adapter.set_logger(logger)
+
+    elapsed = timeit(lambda: adapter.send_request(payload), number=rounds)
+
+    print('  {label:<10} {ms:8.2f} ms/request'.format(
+      label = label,
+      ms    = elapsed / rounds * 1000,
+    ))
+
+
+if __name__ == '__main__':
+  parser = ArgumentParser(description=__doc__.strip().splitlines()[0])
+  parser.add_argument('--transactions', type=int, default=1000)
+  parser.add_argument('--rounds', type=int, default=50)
+
+  args = parser.parse_args()
+  main(args.transactions, args.rounds)
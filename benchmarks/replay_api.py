@@ -0,0 +1,103 @@
+# coding=utf-8
+"""
+Records the traffic generated by high-level API commands against a real
+node, then measures how long the commands take when the recording is
+played back (no network access required).
+
+Usage::
+
+   # Record once (requires a node).
+   python benchmarks/replay_api.py record traffic.jsonl.gz \
+     --uri http://localhost:14265 --seed SEED9... [--send-transfer]
+
+   # Replay as often as you like.
+   python benchmarks/replay_api.py replay traffic.jsonl.gz \
+     --seed SEED9... [--rounds 20] [--latency]
+"""
+from __future__ import absolute_import, division, print_function, \
+  unicode_literals
+
+from argparse import ArgumentParser
+from timeit import timeit
+
+from iota import Iota, ProposedTransaction, Tag
+from iota.adapter.replay import RecordingWrapper, ReplayAdapter
+
+
+def run_commands(api, send_transfer):
+  """
+  Runs the API commands being benchmarked.
+  """
+  commands = [
+    ('get_account_data', lambda: api.get_account_data()),
+    ('get_transfers', lambda: api.get_transfers()),
+  ]
+
+  if send_transfer:
+    def _send_transfer():
+      # Zero-value transfer to one of the seed's own addresses.
+      address = api.get_new_addresses(index=0)['addresses'][0]
+
+      return api.send_transfer(
+        depth     = 3,
+
+        transfers = [
+          ProposedTransaction(address=address, value=0, tag=Tag(b'BENCHMARK')),
+        ],
+      )
+
+    commands.append(('send_transfer', _send_transfer))
+
+  return commands
+
+
+def record(path, uri, seed, send_transfer):
+  recorder = RecordingWrapper(uri)
+  api = Iota(recorder, seed)
+
+  for name, command in run_commands(api, send_transfer):
+    print('Recording {name}...'.format(name=name))
+    command()
+
+  recorder.save(path)
+
+  print('Saved {count} requests to {path}.'.format(
+    count = len(recorder.entries),
+    path  = path,
+  ))
+
+
+def replay(path, seed, send_transfer, rounds, latency):
+  api = Iota(ReplayAdapter(path, reproduce_latency=latency), seed)
+
+  print('Replaying {path}, {rounds} rounds:'.format(path=path, rounds=rounds))
+
+  for name, command in run_commands(api, send_transfer):
+    elapsed = timeit(command, number=rounds)
+
+    print('  {name:<17} {ms:8.2f} ms/call'.format(
+      ms    = elapsed / rounds * 1000,
+      name  = name,
+    ))
+
+
+if __name__ == '__main__':
+  parser = ArgumentParser(description=__doc__.strip().splitlines()[0])
+  parser.add_argument('mode', choices=('record', 'replay'))
+  parser.add_argument('path')
+  parser.add_argument('--seed', required=True)
+  parser.add_argument('--uri', default='http://localhost:14265')
+  parser.add_argument('--send-transfer', action='store_true')
+  parser.add_argument('--rounds', type=int, default=20)
+  parser.add_argument(
+    '--latency',
+    action  = 'store_true',
+    help    = 'Reproduce the latency of the recorded requests.',
+  )
+
+  args = parser.parse_args()
+
+  if args.mode == 'record':
+    record(args.path, args.uri, args.seed, args.send_transfer)
+  else:
+    replay(args.path, args.seed, args.send_transfer, args.rounds, args.latency)
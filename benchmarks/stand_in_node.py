@@ -0,0 +1,167 @@
+# coding=utf-8
+"""
+A minimal stand-in for an IOTA node, used to run benchmarks without
+connecting to a real node.
+
+The stand-in node listens on localhost, adds a configurable delay to
+every request (to simulate network latency and node processing time),
+and generates deterministic responses for a handful of read-only
+commands.
+"""
+from __future__ import absolute_import, division, print_function, \
+  unicode_literals
+
+import json
+from threading import Lock, Thread
+from time import sleep
+
+from six.moves import BaseHTTPServer, socketserver
+
+__all__ = [
+  'StandInNode',
+]
+
+
+TRANSACTION_LEN = 2673
+
+
+class _ThreadedHttpServer(socketserver.ThreadingMixIn, BaseHTTPServer.HTTPServer):
+  daemon_threads = True
+
+  # Benchmarks open lots of connections at once; the default backlog
+  # (5) causes connections to be reset.
+  request_queue_size = 128
+
+
+class StandInNode(object):
+  """
+  Runs a stand-in node in a background thread.
+
+  Example::
+
+     with StandInNode(latency=0.02) as node:
+       api = Iota(node.uri)
+       ...
+       print(node.request_count)
+  """
+  def __init__(self, latency=0.0):
+    # type: (float) -> None
+    """
+    :param latency:
+      Number of seconds to wait before responding to each request.
+    """
+    super(StandInNode, self).__init__()
+
+    self.latency = latency
+
+    self.request_count  = 0
+    self.item_count     = 0
+
+    self._lock    = Lock()
+    self._server  = None
+    self._thread  = None
+
+  @property
+  def uri(self):
+    return 'http://127.0.0.1:{port}/'.format(port=self._server.server_port)
+
+  def __enter__(self):
+    node = self
+
+    class Handler(BaseHTTPServer.BaseHTTPRequestHandler):
+      protocol_version = 'HTTP/1.1'
+
+      # noinspection PyPep8Naming
+      def do_POST(self):
+        length  = int(self.headers.get('Content-Length') or 0)
+        payload = json.loads(self.rfile.read(length).decode('utf-8'))
+
+        status, response = node.handle(payload)
+        body = json.dumps(response).encode('utf-8')
+
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+      def log_message(self, *args):
+        pass
+
+    self._server = _ThreadedHttpServer(('127.0.0.1', 0), Handler)
+    self._thread = Thread(target=self._server.serve_forever)
+    self._thread.daemon = True
+    self._thread.start()
+
+    return self
+
+  def __exit__(self, exc_type, exc_val, exc_tb):
+    self._server.shutdown()
+    self._server.server_close()
+
+  def reset_counters(self):
+    with self._lock:
+      self.request_count  = 0
+      self.item_count     = 0
+
+  def handle(self, payload):
+    # type: (dict) -> tuple
+    """
+    Generates the response to a request.
+
+    Returns a tuple of (HTTP status, response body).
+    """
+    command = payload.get('command')
+
+    with self._lock:
+      self.request_count += 1
+
+    if self.latency:
+      sleep(self.latency)
+
+    if command == 'getTrytes':
+      hashes = payload['hashes']
+      self._count_items(hashes)
+
+      return 200, {
+        'trytes': [
+          (h + '9' * TRANSACTION_LEN)[:TRANSACTION_LEN]
+            for h in hashes
+        ],
+
+        'duration': 0,
+      }
+
+    if command == 'getBalances':
+      addresses = payload['addresses']
+      self._count_items(addresses)
+
+      return 200, {
+        'balances':       ['0'] * len(addresses),
+        'milestone':      '9' * 81,
+        'milestoneIndex': 1,
+        'duration':       0,
+      }
+
+    if command == 'findTransactions':
+      return 200, {'hashes': [], 'duration': 0}
+
+    if command == 'getNodeInfo':
+      return 200, {
+        'appName':                        'StandInNode',
+        'appVersion':                     '0.0.0',
+        'latestMilestone':                '9' * 81,
+        'latestMilestoneIndex':           1,
+        'latestSolidSubtangleMilestone':  '9' * 81,
+        'latestSolidSubtangleMilestoneIndex': 1,
+        'duration':                       0,
+      }
+
+    return 400, {
+      'error':    "Command '{command}' is unknown".format(command=command),
+      'duration': 0,
+    }
+
+  def _count_items(self, items):
+    with self._lock:
+      self.item_count += len(items)
@@ -0,0 +1,149 @@
+# coding=utf-8
+"""
+Measures how much memory parsed transactions take up, e.g., when
+holding them in an in-memory cache.
+
+Transactions are parsed from random trytes, with precomputed hashes
+(so that Curl doesn't dominate the run time).
+
+For comparison, the baseline stores the same values in dict-backed
+copies of each object, i.e., the layout from before ``Transaction``
+and the tryte sequence types declared ``__slots__``.  Figures vary
+between Python versions (newer versions store instance dicts more
+compactly).
+
+Usage::
+
+   python benchmarks/transaction_memory.py [--count 10000]
+"""
+from __future__ import absolute_import, division, print_function, \
+  unicode_literals
+
+import tracemalloc
+from argparse import ArgumentParser
+from random import Random
+
+from iota import LazyTransaction, Transaction, TransactionHash, \
+  TransactionTrytes
+
+ALPHABET = '9ABCDEFGHIJKLMNOPQRSTUVWXYZ'
+
+
+def random_trytes(rng, length):
+  return ''.join(rng.choice(ALPHABET) for _ in range(length)).encode('ascii')
+
+
+def measure(label, parse, hashes, trytes):
+  """
+  Parses the transactions and reports the memory that they occupy
+  once parsing is complete.
+  """
+  tracemalloc.start()
+  baseline = tracemalloc.get_traced_memory()[0]
+
+  transactions = [parse(t, h) for h, t in zip(hashes, trytes)]
+
+  used = tracemalloc.get_traced_memory()[0] - baseline
+  tracemalloc.stop()
+
+  print('  {label:<40} {per_txn:>7,.0f} bytes/transaction'.format(
+    label   = label,
+    per_txn = used / len(transactions),
+  ))
+
+
+class DictBacked(object):
+  """
+  Stand-in for an object that stores its attributes in a ``__dict__``,
+  like transactions and tryte sequences did before they declared
+  ``__slots__``.
+  """
+
+
+dict_backed_types = {}
+"""
+Dict-backed stand-in for each slotted type.
+
+Each type gets its own class, same as before, so that instances can
+share their dict keys with other instances of the same type.
+"""
+
+
+def without_slots(value):
+  """
+  Returns a dict-backed copy of an object that uses ``__slots__``
+  (including the objects stored in its slots).
+
+  Other values are returned as-is.
+  """
+  slots = [
+    name
+      for cls in type(value).__mro__
+      for name in getattr(cls, '__slots__', ())
+      if not name.startswith('__')
+  ]
+
+  if not slots:
+    return value
+
+  try:
+    copy_type = dict_backed_types[type(value)]
+  except KeyError:
+    copy_type = dict_backed_types[type(value)] =\
+      type(str(type(value).__name__), (DictBacked,), {})
+
+  copy = copy_type()
+
+  for name in slots:
+    try:
+      attr = getattr(value, name)
+    except AttributeError:
+      continue
+
+    setattr(copy, name, without_slots(attr))
+
+  return copy
+
+
+def parse_without_slots(trytes, hash_):
+  # The slotted originals are freed as soon as the copy is made, so
+  # only the dict-backed copy is counted.
+  return without_slots(Transaction.from_tryte_string(trytes, hash_))
+
+
+def parse_lazy_all_fields(trytes, hash_):
+  txn = LazyTransaction.from_tryte_string(trytes, hash_)
+  txn.as_json_compatible()
+  return txn
+
+
+def parse_lazy_scan_fields(trytes, hash_):
+  txn = LazyTransaction.from_tryte_string(trytes, hash_)
+  txn.address, txn.value, txn.bundle_hash, txn.current_index
+  return txn
+
+
+def main(count):
+  rng = Random(42)
+
+  print('Generating {count} transactions...'.format(count=count))
+
+  # Reuse the same sample data for every transaction; only the hashes
+  # need to be unique (and they don't affect the memory footprint).
+  sample = [TransactionTrytes(random_trytes(rng, 2673)) for _ in range(100)]
+  trytes = [sample[i % len(sample)] for i in range(count)]
+  hashes = [TransactionHash(random_trytes(rng, 81)) for _ in range(count)]
+
+  print('Memory used by parsed transactions:')
+  measure('Transaction (dict-backed baseline)', parse_without_slots, hashes, trytes)
+  measure('Transaction (with __slots__)', Transaction.from_tryte_string, hashes, trytes)
+  measure('LazyTransaction (all fields)', parse_lazy_all_fields, hashes, trytes)
+  measure('LazyTransaction (4 fields)', parse_lazy_scan_fields, hashes, trytes)
+
+
+if __name__ == '__main__':
+  parser = ArgumentParser(description=__doc__.strip().splitlines()[0])
+  parser.add_argument('--count', type=int, default=10000)
+
+  args = parser.parse_args()
+  main(args.count)
@@ -0,0 +1,332 @@
+# coding=utf-8
+from __future__ import absolute_import, division, print_function, \
+  unicode_literals
+
+from collections import OrderedDict
+from operator import attrgetter
+from typing import Dict, List, Set
+
+from six import text_type
+
+from iota.api import Iota
+from iota.commands.core.find_transactions import FindTransactionsCommand
+from iota.commands.core.get_balances import GetBalancesCommand
+from iota.commands.extended.get_latest_inclusion import \
+  GetLatestInclusionCommand
+from iota.commands.extended.utils import SCAN_WINDOW_SIZE, \
+  get_bundles_from_transaction_hashes, iter_used_addresses
+from iota.transaction import Bundle, Transaction, TransactionHash, \
+  TransactionTrytes
+from iota.types import Address
+
+__all__ = [
+  'AccountTracker',
+]
+
+
+class AccountTracker(object):
+  """
+  Keeps track of the addresses, transactions and balances of an
+  account, so that it can be refreshed without scanning every address
+  and fetching every bundle again.
+
+  Example::
+
+     tracker = AccountTracker(api)
+
+     # The first refresh scans the account, same as
+     # ``api.get_account_data()``.
+     account = tracker.get_account_data()
+
+     # Later refreshes only scan addresses after the last used one, and
+     # only fetch bundles for transactions that are new.
+     account = tracker.get_account_data()
+
+  To pick up where a tracker left off in a new process, save its state
+  with :py:meth:`to_dict` and restore it with :py:meth:`from_dict`::
+
+     state = json.dumps(tracker.to_dict())
+
+     # Later...
+     tracker = AccountTracker.from_dict(api, json.loads(state))
+  """
+  def __init__(
+      self,
+      api,
+      start             = 0,
+      inclusion_states  = False,
+      window_size       = SCAN_WINDOW_SIZE,
+  ):
+    # type: (Iota, int, bool, int) -> None
+    """
+    :param api:
+      API instance used to talk to the node.  Its seed identifies the
+      account.
+
+    :param start:
+      Starting key index.
+
+    :param inclusion_states:
+      Whether to also fetch the inclusion states of the transfers.
+      Inclusion states are refreshed until each bundle is confirmed.
+
+    :param window_size:
+      Max number of addresses to check per ``findTransactions`` request
+      when scanning for new addresses (see
+      :py:func:`iota.commands.extended.utils.scan_addresses`).
+    """
+    super(AccountTracker, self).__init__()
+
+    self.api              = api
+    self.start            = start
+    self.inclusion_states = inclusion_states
+    self.window_size      = window_size
+
+    self.addresses = [] # type: List[Address]
+    """
+    Used addresses, in key index order, with their balances as of the
+    last refresh.
+    """
+
+    self.hashes = set() # type: Set[TransactionHash]
+    """
+    Hashes of the transactions that reference :py:attr:`addresses`.
+    """
+
+    self.bundles = {} # type: Dict[TransactionHash, Bundle]
+    """
+    Bundles with transactions to/from this account, keyed by tail
+    transaction hash.
+    """
+
+  @classmethod
+  def from_dict(cls, api, state):
+    # type: (Iota, dict) -> AccountTracker
+    """
+    Creates a tracker from the state saved by :py:meth:`to_dict`.
+
+    :param api:
+      API instance used to talk to the node.  Must have the same seed
+      as the tracker that saved the state.
+
+    :param state:
+      Value returned by :py:meth:`to_dict`.
+    """
+    tracker = cls(
+      api               = api,
+      start             = state['start'],
+      inclusion_states  = state['inclusion_states'],
+      window_size       = state.get('window_size', SCAN_WINDOW_SIZE),
+    )
+
+    tracker.addresses = [
+      Address(
+        trytes          = addy['address'],
+        balance         = addy['balance'],
+        key_index       = addy['key_index'],
+        security_level  = addy['security_level'],
+      )
+        for addy in state['addresses']
+    ]
+
+    tracker.hashes = {
+      TransactionHash(txn_hash)
+        for txn_hash in state['hashes']
+    }
+
+    for saved_bundle in state['bundles']:
+      bundle = Bundle([
+        # Use the saved hashes, so that they don't have to be computed
+        # again.
+        Transaction.from_tryte_string(
+          trytes  = txn['trytes'],
+          hash_   = TransactionHash(txn['hash']),
+        )
+          for txn in saved_bundle['transactions']
+      ])
+
+      bundle.is_confirmed = saved_bundle['is_confirmed']
+      tracker.bundles[bundle.tail_transaction.hash] = bundle
+
+    return tracker
+
+  def to_dict(self):
+    # type: () -> dict
+    """
+    Returns the tracker's state as a JSON-compatible dict, so that it
+    can be restored using :py:meth:`from_dict` (e.g., in another
+    process).
+
+    The seed is not included.
+    """
+    return {
+      'start':            self.start,
+      'inclusion_states': self.inclusion_states,
+      'window_size':      self.window_size,
+
+      'addresses': [
+        {
+          'address':        text_type(addy.address),
+          'balance':        addy.balance,
+          'key_index':      addy.key_index,
+          'security_level': addy.security_level,
+        }
+          for addy in self.addresses
+      ],
+
+      'hashes': sorted(text_type(txn_hash) for txn_hash in self.hashes),
+
+      'bundles': [
+        {
+          'is_confirmed': bundle.is_confirmed,
+
+          'transactions': [
+            {
+              'hash':   text_type(txn.hash),
+              'trytes': text_type(txn.as_tryte_string()),
+            }
+              for txn in bundle
+          ],
+        }
+          for bundle in self.bundles.values()
+      ],
+    }
+
+  @property
+  def next_index(self):
+    # type: () -> int
+    """
+    Key index of the first address that was unused as of the last
+    refresh.
+    """
+    return self.start + len(self.addresses)
+
+  @property
+  def balance(self):
+    # type: () -> int
+    """
+    Total account balance, as of the last refresh.
+    """
+    return sum(addy.balance or 0 for addy in self.addresses)
+
+  def get_account_data(self):
+    # type: () -> dict
+    """
+    Refreshes the account, and returns the same result as
+    :py:meth:`iota.api.Iota.get_account_data`.
+
+    Compared to a full scan:
+
+    - Addresses that are already known to be used are checked for new
+      transactions with a single ``findTransactions`` request.
+    - Only addresses after the last used one are scanned.
+    - Bundles are only fetched for transactions that haven't been seen
+      before.
+    - Balances are always fetched, with a single ``getBalances``
+      request.
+
+    :return:
+      Dict containing the following values::
+
+         {
+           'addresses': List[Address],
+             List of used addresses.
+
+           'balance': int,
+             Total account balance.  Might be 0.
+
+           'bundles': List[Bundle],
+             List of bundles with transactions to/from this account.
+         }
+    """
+    new_hashes = [] # type: List[TransactionHash]
+
+    # Transactions fetched while scanning don't need to be fetched
+    # again.
+    trytes_cache = {} # type: Dict[TransactionHash, TransactionTrytes]
+
+    if self.addresses:
+      ft_response = FindTransactionsCommand(self.api.adapter)(
+        addresses = self.addresses,
+      )
+
+      new_hashes.extend(
+        txn_hash
+          for txn_hash in ft_response['hashes']
+          if txn_hash not in self.hashes
+      )
+
+    for addy, hashes in iter_used_addresses(
+        adapter       = self.api.adapter,
+        seed          = self.api.seed,
+        start         = self.next_index,
+        window_size   = self.window_size,
+        trytes_cache  = trytes_cache,
+    ):
+      self.addresses.append(addy)
+
+      new_hashes.extend(
+        txn_hash
+          for txn_hash in hashes
+          if txn_hash not in self.hashes
+      )
+
+    # Remove duplicates, but keep the order.
+    new_hashes = list(OrderedDict.fromkeys(new_hashes))
+
+    self._refresh_inclusion_states()
+
+    for bundle in get_bundles_from_transaction_hashes(
+        adapter             = self.api.adapter,
+        transaction_hashes  = new_hashes,
+        inclusion_states    = self.inclusion_states,
+        trytes_cache        = trytes_cache,
+    ):
+      self.bundles.setdefault(bundle.tail_transaction.hash, bundle)
+
+    self.hashes.update(new_hashes)
+
+    if self.hashes:
+      gb_response = GetBalancesCommand(self.api.adapter)(
+        addresses = self.addresses,
+      )
+
+      for addy, balance in zip(self.addresses, gb_response['balances']):
+        addy.balance = balance
+
+    return {
+      'addresses':  list(sorted(self.addresses, key=attrgetter('key_index'))),
+      'balance':    self.balance,
+
+      'bundles':
+        list(sorted(
+          self.bundles.values(),
+            key = lambda bundle_: bundle_.tail_transaction.timestamp,
+        )),
+    }
+
+  def _refresh_inclusion_states(self):
+    # type: () -> None
+    """
+    Fetches the inclusion states of known bundles that weren't
+    confirmed as of the last refresh.
+    """
+    if not self.inclusion_states:
+      return
+
+    pending = [
+      tail_hash
+        for tail_hash, bundle in self.bundles.items()
+        if not bundle.is_confirmed
+    ]
+
+    if not pending:
+      return
+
+    gli_response = GetLatestInclusionCommand(self.api.adapter)(
+      hashes = pending,
+    )
+
+    for tail_hash in pending:
+      self.bundles[tail_hash].is_confirmed = \
+        gli_response['states'].get(tail_hash)
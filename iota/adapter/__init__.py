@@ -5,17 +5,21 @@ from __future__ import absolute_import, division, print_function, \
 import json
 from abc import ABCMeta, abstractmethod as abstract_method
 from collections import deque
+from concurrent.futures import ThreadPoolExecutor
 from inspect import isabstract as is_abstract
 from logging import DEBUG, Logger
 from socket import getdefaulttimeout as get_default_timeout
-from typing import Container, Dict, List, Optional, Text, Tuple, Union
+from threading import Lock
+from typing import Container, Dict, Generator, Iterator, List, Optional, \
+  Text, Tuple, Union
 
-from requests import Response, codes, request, auth
+from requests import Response, Session, codes, request, auth
+from requests.adapters import HTTPAdapter as RequestsHttpAdapter
 from six import PY2, binary_type, iteritems, moves as compat, text_type, \
   with_metaclass
 
 from iota.exceptions import with_context
-from iota.json import JsonEncoder
+from iota.json import JsonEncoder, iter_json_array
 
 __all__ = [
   'API_VERSION',
@@ -66,6 +70,43 @@ class InvalidUri(ValueError):
   pass
 
 
+DEFAULT_NODE_LIMITS = {
+  'maxBodyLength':        1000000,
+  'maxFindTransactions':  100000,
+  'maxGetTrytes':         10000,
+  'maxRequestsList':      1000,
+}
+"""
+Request limits that IRI nodes use by default.  Used as node
+capabilities unless the node reports its own values.
+"""
+
+
+def get_node_capabilities(node_info):
+  # type: (dict) -> dict
+  """
+  Determines node capabilities from a ``getNodeInfo`` response.
+
+  :return:
+    Dict containing:
+
+    - ``appName`` and ``appVersion``: node software.
+    - ``features``: optional features that the node supports (e.g.,
+      ``RemotePOW``).
+    - Request limits (see :py:data:`DEFAULT_NODE_LIMITS`).
+  """
+  capabilities = {
+    'appName':    node_info.get('appName'),
+    'appVersion': node_info.get('appVersion'),
+    'features':   list(node_info.get('features') or []),
+  }
+
+  for key, default in iteritems(DEFAULT_NODE_LIMITS):
+    capabilities[key] = node_info.get(key) or default
+
+  return capabilities
+
+
 adapter_registry = {} # type: Dict[Text, AdapterMeta]
 """
 Keeps track of available adapters and their supported protocols.
@@ -153,6 +194,8 @@ class BaseAdapter(with_metaclass(AdapterMeta)):
 
     self._logger = None # type: Logger
 
+    self._capabilities = None # type: Optional[dict]
+
   @abstract_method
   def get_uri(self):
     # type: () -> Text
@@ -186,6 +229,69 @@ class BaseAdapter(with_metaclass(AdapterMeta)):
       'Not implemented in {cls}.'.format(cls=type(self).__name__),
     )
 
+  def iter_response_values(self, payload, key, **kwargs):
+    # type: (dict, Text, dict) -> Iterator
+    """
+    Sends an API request to the node, and iterates over the values in
+    one of the lists in the response.
+
+    Adapters that can decode responses incrementally (e.g.,
+    :py:class:`HttpAdapter`) yield each value as soon as it arrives,
+    so that very large responses never have to be held in memory all
+    at once.  By default, the response is decoded in full and then
+    iterated.
+
+    :param payload:
+      JSON payload.
+
+    :param key:
+      Key of the list in the response to iterate over (e.g.,
+      ``trytes`` for ``getTrytes``).
+
+    :param kwargs:
+      Additional keyword arguments for the adapter.
+
+    :raise:
+      - :py:class:`BadApiResponse` if a non-success response was
+        received.
+    """
+    return iter(self.send_request(payload, **kwargs).get(key) or [])
+
+  def warmup(self, connections=1):
+    # type: (int) -> dict
+    """
+    Prepares the adapter for use, so that the first "real" request
+    doesn't have to pay for setting up connections, etc.
+
+    Sends a ``getNodeInfo`` request, and caches the node's capabilities
+    (see :py:meth:`get_capabilities`).
+
+    :param connections:
+      Number of connections to open in advance, for adapters that
+      maintain a connection pool.
+
+    :return:
+      The node's capabilities.
+    """
+    return self._cache_capabilities(
+      self.send_request({'command': 'getNodeInfo'}),
+    )
+
+  def get_capabilities(self):
+    # type: () -> Optional[dict]
+    """
+    Returns the node capabilities that were cached by
+    :py:meth:`warmup`, or ``None`` if the adapter hasn't been warmed up.
+
+    See :py:func:`get_node_capabilities` for the contents.
+    """
+    return self._capabilities
+
+  def _cache_capabilities(self, node_info):
+    # type: (dict) -> dict
+    self._capabilities = get_node_capabilities(node_info)
+    return self._capabilities
+
   def set_logger(self, logger):
     # type: (Logger) -> BaseAdapter
     """
@@ -196,12 +302,23 @@ class BaseAdapter(with_metaclass(AdapterMeta)):
     self._logger = logger
     return self
 
+  def _is_logging_enabled(self, level):
+    # type: (int) -> bool
+    """
+    Returns whether the instance's logger is configured and would
+    process messages at the specified level.
+
+    Check this before preparing log messages that are expensive to
+    build (e.g., ones that include request/response payloads).
+    """
+    return bool(self._logger) and self._logger.isEnabledFor(level)
+
   def _log(self, level, message, context=None):
     # type: (int, Text, Optional[dict]) -> None
     """
     Sends a message to the instance's logger, if configured.
     """
-    if self._logger:
+    if self._is_logging_enabled(level):
       self._logger.log(level, message, extra={'context': context or {}})
 
 
@@ -223,6 +340,17 @@ class HttpAdapter(BaseAdapter):
   in the ``headers`` kwarg.
   """
 
+  STREAM_CHUNK_SIZE = 65536
+  """
+  Number of bytes to read at a time when decoding a streamed response.
+  """
+
+  DEFAULT_POOL_SIZE = 10
+  """
+  Minimum number of connections to keep open once the adapter has been
+  warmed up.
+  """
+
   def __init__(self, uri, timeout=None, authentication=None):
     # type: (Union[Text, SplitResult], Optional[int]) -> None
     super(HttpAdapter, self).__init__()
@@ -230,6 +358,20 @@ class HttpAdapter(BaseAdapter):
     self.timeout = timeout
     self.authentication = authentication
 
+    self.json_encoder = JsonEncoder()
+    """
+    Encodes request payloads.  Can be replaced with another encoder
+    (e.g., :py:class:`iota.json.OrjsonEncoder`) for faster encoding of
+    large payloads.
+    """
+
+    self.session = None # type: Optional[Session]
+    """
+    Session used to send requests, so that connections are kept open
+    and reused.  Created by :py:meth:`warmup`; if ``None``, each request
+    opens a new connection.
+    """
+
     if isinstance(uri, text_type):
       uri = compat.urllib_parse.urlsplit(uri) # type: SplitResult
 
@@ -287,6 +429,44 @@ class HttpAdapter(BaseAdapter):
     # type: () -> Text
     return self.uri.geturl()
 
+  def warmup(self, connections=1):
+    # type: (int) -> dict
+    """
+    Opens a pool of connections to the node, and caches the node's
+    capabilities.
+
+    Connections are opened by sending a ``getNodeInfo`` request over
+    each one, concurrently; they are then kept open and reused for
+    subsequent requests.
+
+    :param connections:
+      Number of connections to open.
+    """
+    if self.session is None:
+      pool = RequestsHttpAdapter(
+        pool_connections  = 1,
+        pool_maxsize      = max(connections, self.DEFAULT_POOL_SIZE),
+      )
+
+      session = Session()
+      session.mount('http://', pool)
+      session.mount('https://', pool)
+
+      self.session = session
+
+    if connections <= 1:
+      return super(HttpAdapter, self).warmup()
+
+    # Requests that are in flight at the same time can't share a
+    # connection, so each one opens its own.
+    with ThreadPoolExecutor(max_workers=connections) as executor:
+      responses = list(executor.map(
+        lambda _: self.send_request({'command': 'getNodeInfo'}),
+        range(connections),
+      ))
+
+    return self._cache_capabilities(responses[0])
+
   def send_request(self, payload, **kwargs):
     # type: (dict, dict) -> dict
     kwargs.setdefault('headers', {})
@@ -295,7 +475,7 @@ class HttpAdapter(BaseAdapter):
 
     response = self._send_http_request(
       # Use a custom JSON encoder that knows how to convert Tryte values.
-      payload = JsonEncoder().encode(payload),
+      payload = self.json_encoder.encode(payload),
 
       url = self.node_url,
       **kwargs
@@ -303,6 +483,58 @@ class HttpAdapter(BaseAdapter):
 
     return self._interpret_response(response, payload, {codes['ok']})
 
+  def iter_response_values(self, payload, key, **kwargs):
+    # type: (dict, Text, dict) -> Iterator
+    kwargs.setdefault('headers', {})
+    for key_, value in iteritems(self.DEFAULT_HEADERS):
+      kwargs['headers'].setdefault(key_, value)
+
+    kwargs['stream'] = True
+
+    response = self._send_http_request(
+      payload = self.json_encoder.encode(payload),
+      url     = self.node_url,
+      **kwargs
+    )
+
+    if response.status_code != codes['ok']:
+      # Error responses are small, and some subclasses need to inspect
+      # the entire response (e.g., :py:class:`SandboxAdapter` polling
+      # for job results), so decode those the usual way.
+      decoded = self._interpret_response(response, payload, {codes['ok']})
+      return iter(decoded.get(key) or [])
+
+    return self._iter_streamed_values(response, payload, key)
+
+  def _iter_streamed_values(self, response, payload, key):
+    # type: (Response, dict, Text) -> Generator
+    """
+    Decodes a streamed response from the node, yielding the values in
+    the ``key`` list as they arrive.
+    """
+    try:
+      chunks = response.iter_content(chunk_size=self.STREAM_CHUNK_SIZE)
+
+      for value in iter_json_array(chunks, key):
+        yield value
+    # :bc: py2k doesn't have JSONDecodeError
+    except ValueError as e:
+      raise with_context(
+        exc = BadApiResponse(
+          'Malformed {status} response from node: {error}'.format(
+            error   = e,
+            status  = response.status_code,
+          ),
+        ),
+
+        context = {
+          'request':  payload,
+          'status':   response.status_code,
+        },
+      )
+    finally:
+      response.close()
+
   def _send_http_request(self, url, payload, method='post', **kwargs):
     # type: (Text, Optional[Text], Text, dict) -> Response
     """
@@ -317,44 +549,56 @@ class HttpAdapter(BaseAdapter):
     if self.authentication:
         kwargs.setdefault('auth', auth.HTTPBasicAuth(*self.authentication))
 
-    self._log(
-      level = DEBUG,
+    # Payloads can be several megabytes, so don't format log messages
+    # unless somebody is going to read them.
+    if self._is_logging_enabled(DEBUG):
+      self._log(
+        level = DEBUG,
 
-      message = 'Sending {method} to {url}: {payload!r}'.format(
-        method  = method,
-        payload = payload,
-        url     = url,
-      ),
+        message = 'Sending {method} to {url}: {payload!r}'.format(
+          method  = method,
+          payload = payload,
+          url     = url,
+        ),
 
-      context = {
-        'request_method':   method,
-        'request_kwargs':   kwargs,
-        'request_payload':  payload,
-        'request_url':      url,
-      },
-    )
+        context = {
+          'request_method':   method,
+          'request_kwargs':   kwargs,
+          'request_payload':  payload,
+          'request_url':      url,
+        },
+      )
 
-    response = request(method=method, url=url, data=payload, **kwargs)
+    send = self.session.request if self.session else request
+    response = send(method=method, url=url, data=payload, **kwargs)
 
-    self._log(
-      level = DEBUG,
+    if self._is_logging_enabled(DEBUG):
+      # Reading the content of a streamed response here would load the
+      # entire thing into memory, defeating the purpose of streaming it.
+      if kwargs.get('stream'):
+        content = None
+      else:
+        content = response.content
 
-      message = 'Receiving {method} from {url}: {response!r}'.format(
-        method    = method,
-        response  = response.content,
-        url       = url,
-      ),
+      self._log(
+        level = DEBUG,
 
-      context = {
-        'request_method':   method,
-        'request_kwargs':   kwargs,
-        'request_payload':  payload,
-        'request_url':      url,
+        message = 'Receiving {method} from {url}: {response!r}'.format(
+          method    = method,
+          response  = content,
+          url       = url,
+        ),
 
-        'response_headers': response.headers,
-        'response_content': response.content,
-      },
-    )
+        context = {
+          'request_method':   method,
+          'request_kwargs':   kwargs,
+          'request_payload':  payload,
+          'request_url':      url,
+
+          'response_headers': response.headers,
+          'response_content': content,
+        },
+      )
 
     return response
 
@@ -383,7 +627,8 @@ class HttpAdapter(BaseAdapter):
         ),
 
         context = {
-          'request': payload,
+          'request':  payload,
+          'status':   response.status_code,
         },
       )
 
@@ -402,6 +647,7 @@ class HttpAdapter(BaseAdapter):
         context = {
           'request':      payload,
           'raw_response': raw_content,
+          'status':       response.status_code,
         },
       )
 
@@ -417,6 +663,7 @@ class HttpAdapter(BaseAdapter):
         context = {
           'request':  payload,
           'response': decoded,
+          'status':   response.status_code,
         },
       )
 
@@ -443,6 +690,7 @@ class HttpAdapter(BaseAdapter):
       context = {
         'request':  payload,
         'response': decoded,
+        'status':   response.status_code,
       },
     )
 
@@ -454,6 +702,8 @@ class MockAdapter(BaseAdapter):
   To use this adapter, you must first "seed" the responses that the
   adapter should return for each request.  The adapter will then return
   the appropriate seeded response each time it "sends" a request.
+
+  It is safe to seed responses and send requests from multiple threads.
   """
   supported_protocols = ('mock',)
 
@@ -468,6 +718,8 @@ class MockAdapter(BaseAdapter):
     self.responses  = {} # type: Dict[Text, deque]
     self.requests   = [] # type: List[dict]
 
+    self._lock = Lock()
+
   def get_uri(self):
     return 'mock://'
 
@@ -492,17 +744,35 @@ class MockAdapter(BaseAdapter):
        adapter.send_request({'command': 'sayHello'})
        # {'message': 'Hello!'}
     """
-    if command not in self.responses:
-      self.responses[command] = deque()
+    with self._lock:
+      if command not in self.responses:
+        self.responses[command] = deque()
+
+      self.responses[command].append(response)
 
-    self.responses[command].append(response)
     return self
 
   def send_request(self, payload, **kwargs):
     # type: (dict, dict) -> dict
-    # Store a snapshot so that we can inspect the request later.
-    self.requests.append(dict(payload))
+    with self._lock:
+      # Store a snapshot so that we can inspect the request later.
+      self.requests.append(dict(payload))
+
+      response = self._pop_response(payload)
+
+    error = response.get('exception') or response.get('error')
+    if error:
+      raise with_context(BadApiResponse(error), context={'request': payload})
+
+    return response
+
+  def _pop_response(self, payload):
+    # type: (dict) -> dict
+    """
+    Removes the next seeded response for a request from its queue.
 
+    Must be called while holding the adapter's lock.
+    """
     command = payload['command']
 
     try:
@@ -534,8 +804,4 @@ class MockAdapter(BaseAdapter):
         },
       )
 
-    error = response.get('exception') or response.get('error')
-    if error:
-      raise with_context(BadApiResponse(error), context={'request': payload})
-
     return response
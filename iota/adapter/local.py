@@ -0,0 +1,594 @@
+# coding=utf-8
+from __future__ import absolute_import, division, print_function, \
+  unicode_literals
+
+import zlib
+from collections import OrderedDict
+from copy import deepcopy
+from itertools import count
+from random import Random
+from threading import Lock
+from time import time
+from typing import Dict, Iterable, List, MutableSequence, Optional, Set, \
+  Text, Tuple, Union
+
+from six import binary_type, text_type
+
+from iota.adapter import BadApiResponse, BaseAdapter
+from iota.crypto import Curl, HASH_LENGTH
+from iota.exceptions import with_context
+from iota.trits import int_from_trytes, trits_from_int, trytes_from_int
+from iota.types import TryteString, TrytesCompatible
+
+__all__ = [
+  'LocalTangleAdapter',
+]
+
+NULL_HASH = '9' * 81
+"""
+Hash used to reference "no transaction" (e.g., when the Tangle is
+empty).
+"""
+
+TRANSACTION_LENGTH = 2673
+"""
+Number of trytes in a transaction.
+"""
+
+MAX_ATTACHMENT_TIMESTAMP = (3 ** 27 - 1) // 2
+"""
+Upper bound for attachment timestamps (largest value that fits in 27
+trits).
+"""
+
+
+def _as_text(value):
+  # type: (Union[Text, binary_type, TryteString]) -> Text
+  """
+  Converts a tryte sequence from a request into a unicode string.
+  """
+  if isinstance(value, TryteString):
+    return text_type(value)
+
+  if isinstance(value, binary_type):
+    return value.decode('ascii')
+
+  return value
+
+
+def _int_from_trytes(trytes):
+  # type: (Text) -> int
+  return int_from_trytes(trytes.encode('ascii'))
+
+
+def _trytes_from_int(value, length):
+  # type: (int, int) -> Text
+  return trytes_from_int(value, pad=length).decode('ascii')
+
+
+class LocalTangleAdapter(BaseAdapter):
+  """
+  Simulates a node, using a Tangle that is stored in memory.
+
+  Unlike :py:class:`iota.adapter.MockAdapter`, this adapter actually
+  processes requests: transactions that are stored can be found and
+  fetched again, attaching transactions builds on the current tips,
+  balances follow the value transactions that have been stored, etc.
+  This makes it possible to run high-level API commands (e.g.,
+  ``get_account_data`` or ``send_transfer``) end-to-end, offline.
+
+  Supported commands:
+
+  - ``attachToTangle``
+  - ``broadcastTransactions`` / ``storeTransactions``
+  - ``checkConsistency``
+  - ``findTransactions``
+  - ``getBalances``
+  - ``getInclusionStates``
+  - ``getNodeInfo``
+  - ``getTips``
+  - ``getTransactionsToApprove``
+  - ``getTrytes``
+  - ``interruptAttachingToTangle``
+  - ``wereAddressesSpentFrom``
+
+  Note that the local Tangle has no milestones; every transaction is
+  considered confirmed as soon as it is stored, and balances are
+  updated immediately.
+
+  Example::
+
+     api = Iota('local://', seed)
+     api = Iota(LocalTangleAdapter(proof_of_work=True), seed)
+  """
+  supported_protocols = ('local',)
+
+  RECENT_HASHES = 10000
+  """
+  Number of hashes computed by ``attachToTangle`` to remember, so that
+  they don't have to be computed again when the transactions are
+  stored.
+  """
+
+  commands = {
+    'attachToTangle':             '_attach_to_tangle',
+    'broadcastTransactions':      '_store_transactions',
+    'checkConsistency':           '_check_consistency',
+    'findTransactions':           '_find_transactions',
+    'getBalances':                '_get_balances',
+    'getInclusionStates':         '_get_inclusion_states',
+    'getNodeInfo':                '_get_node_info',
+    'getTips':                    '_get_tips',
+    'getTransactionsToApprove':   '_get_transactions_to_approve',
+    'getTrytes':                  '_get_trytes',
+    'interruptAttachingToTangle': '_interrupt_attaching_to_tangle',
+    'storeTransactions':          '_store_transactions',
+    'wereAddressesSpentFrom':     '_were_addresses_spent_from',
+  }
+  """
+  Maps supported commands to the methods that process them.
+  """
+
+  # noinspection PyUnusedLocal
+  @classmethod
+  def configure(cls, parsed):
+    return cls()
+
+  def __init__(self, proof_of_work=False, compress=False, seed=None):
+    # type: (bool, bool, Optional[int]) -> None
+    """
+    :param proof_of_work:
+      Whether ``attachToTangle`` should perform real proof of work.
+
+      Proof of work is very slow in pure Python, so by default the
+      nonce is left empty.  Only enable this with a low
+      ``minWeightMagnitude``.
+
+    :param compress:
+      Whether to compress transaction trytes in memory.  This makes
+      storing and fetching transactions slower, but it allows the
+      adapter to hold many more transactions (most transactions are
+      padded with 9s, so they compress very well).
+
+    :param seed:
+      Seed for the random number generator used to select tips, so
+      that the shape of the Tangle is reproducible.
+    """
+    super(LocalTangleAdapter, self).__init__()
+
+    self.proof_of_work  = proof_of_work
+    self.compress       = compress
+
+    self._lock    = Lock()
+    self._random  = Random(seed)
+
+    self._trytes    = {} # type: Dict[Text, binary_type]
+    self._addresses = {} # type: Dict[Text, List[Text]]
+    self._approvees = {} # type: Dict[Text, List[Text]]
+    self._bundles   = {} # type: Dict[Text, List[Text]]
+    self._tags      = {} # type: Dict[Text, List[Text]]
+
+    self._balances  = {} # type: Dict[Text, int]
+    self._spent     = set() # type: Set[Text]
+    self._applied   = set() # type: Set[Tuple[Text, Text]]
+
+    # Tips are stored in a list so that one can be picked at random in
+    # constant time, with an index so that they can be removed in
+    # constant time.
+    self._tips      = [] # type: List[Text]
+    self._tip_index = {} # type: Dict[Text, int]
+
+    self._recent_hashes = OrderedDict() # type: OrderedDict
+
+  def get_uri(self):
+    # type: () -> Text
+    return 'local://'
+
+  def __len__(self):
+    """
+    Returns the number of transactions in the local Tangle.
+    """
+    return len(self._trytes)
+
+  def add_transactions(self, transactions):
+    # type: (Iterable[Tuple[TrytesCompatible, TrytesCompatible]]) -> LocalTangleAdapter
+    """
+    Adds transactions to the local Tangle, without computing their
+    hashes.
+
+    This is much faster than ``storeTransactions`` (computing
+    transaction hashes is slow in pure Python), which makes it possible
+    to fill the Tangle with millions of transactions, e.g. for
+    benchmarks.
+
+    :param transactions:
+      ``(hash, trytes)`` tuples.  The hashes are trusted as-is.
+    """
+    with self._lock:
+      for hash_, trytes in transactions:
+        self._store(_as_text(hash_), _as_text(trytes))
+
+    return self
+
+  def set_balance(self, address, balance):
+    # type: (TrytesCompatible, int) -> LocalTangleAdapter
+    """
+    Sets the balance of an address (e.g., to fund a seed before calling
+    ``send_transfer``).
+    """
+    with self._lock:
+      self._balances[_as_text(address)[:81]] = balance
+
+    return self
+
+  def send_request(self, payload, **kwargs):
+    # type: (dict, dict) -> dict
+    command = payload.get('command')
+
+    try:
+      method = getattr(self, self.commands[command])
+    except KeyError:
+      raise with_context(
+        exc = BadApiResponse(
+          'Command {command!r} is unknown.'.format(command=command),
+        ),
+
+        context = {
+          'request':  payload,
+          'status':   400,
+        },
+      )
+
+    try:
+      response = method(payload)
+    except (KeyError, TypeError, ValueError) as e:
+      raise with_context(
+        exc = BadApiResponse(
+          'Invalid parameters for {command!r}: {error}'.format(
+            command = command,
+            error   = e,
+          ),
+        ),
+
+        context = {
+          'request':  payload,
+          'status':   400,
+        },
+      )
+
+    response['duration'] = 0
+    return response
+
+  def _attach_to_tangle(self, payload):
+    # type: (dict) -> dict
+    trunk   = _as_text(payload['trunkTransaction'])
+    branch  = _as_text(payload['branchTransaction'])
+    mwm     = int(payload['minWeightMagnitude'])
+
+    timestamp = _trytes_from_int(int(time() * 1000), 9)
+    bounds = (
+        _trytes_from_int(0, 9)
+      + _trytes_from_int(MAX_ATTACHMENT_TIMESTAMP, 9)
+    )
+
+    attached      = [] # type: List[Text]
+    previous_hash = None # type: Optional[Text]
+
+    # Like IRI, the first transaction references the trunk and branch
+    # transactions, and each subsequent one references the previous
+    # one.
+    for trytes in map(_as_text, payload['trytes']):
+      if previous_hash:
+        approvees = previous_hash + trunk
+      else:
+        approvees = trunk + branch
+
+      trytes = (
+          trytes[:2430]
+        + approvees
+        + trytes[2592:2619]
+        + timestamp
+        + bounds
+      )
+
+      trytes, previous_hash = self._find_nonce(trytes, mwm)
+      attached.append(trytes)
+
+      with self._lock:
+        self._recent_hashes[trytes] = previous_hash
+
+        while len(self._recent_hashes) > self.RECENT_HASHES:
+          self._recent_hashes.popitem(last=False)
+
+    # IRI returns the transactions in reverse order.
+    return {'trytes': attached[::-1]}
+
+  def _check_consistency(self, payload):
+    # type: (dict) -> dict
+    missing = [
+      tail
+        for tail in map(_as_text, payload['tails'])
+        if tail not in self._trytes
+    ]
+
+    if missing:
+      return {
+        'state':  False,
+        'info':   'Transactions not found: {missing}'.format(
+          missing = ', '.join(missing),
+        ),
+      }
+
+    return {'state': True, 'info': ''}
+
+  def _find_transactions(self, payload):
+    # type: (dict) -> dict
+    results = None # type: Optional[List[Text]]
+
+    with self._lock:
+      for key, index, length in (
+          ('addresses', self._addresses, 81),
+          ('approvees', self._approvees, 81),
+          ('bundles',   self._bundles,   81),
+          ('tags',      self._tags,      27),
+      ):
+        if payload.get(key) is None:
+          continue
+
+        matches = OrderedDict() # type: OrderedDict
+        for value in payload[key]:
+          for hash_ in index.get(_as_text(value)[:length], ()):
+            matches[hash_] = True
+
+        # Multiple search terms are combined using "AND".
+        if results is None:
+          results = list(matches)
+        else:
+          results = [hash_ for hash_ in results if hash_ in matches]
+
+    return {'hashes': results or []}
+
+  def _get_balances(self, payload):
+    # type: (dict) -> dict
+    with self._lock:
+      balances = [
+        text_type(self._balances.get(_as_text(address)[:81], 0))
+          for address in payload['addresses']
+      ]
+
+    return {
+      'balances':       balances,
+      'milestone':      NULL_HASH,
+      'milestoneIndex': 0,
+    }
+
+  def _get_inclusion_states(self, payload):
+    # type: (dict) -> dict
+    # All transactions are confirmed as soon as they are stored.
+    return {
+      'states': [
+        _as_text(hash_) in self._trytes
+          for hash_ in payload['transactions']
+      ],
+    }
+
+  # noinspection PyUnusedLocal
+  def _get_node_info(self, payload):
+    # type: (dict) -> dict
+    return {
+      'appName':                            'LocalTangleAdapter',
+      'appVersion':                         '1',
+      'latestMilestone':                    NULL_HASH,
+      'latestMilestoneIndex':               0,
+      'latestSolidSubtangleMilestone':      NULL_HASH,
+      'latestSolidSubtangleMilestoneIndex': 0,
+      'neighbors':                          0,
+      'packetsQueueSize':                   0,
+      'time':                               int(time() * 1000),
+      'tips':                               len(self._tips),
+      'transactionsToRequest':              0,
+    }
+
+  # noinspection PyUnusedLocal
+  def _get_tips(self, payload):
+    # type: (dict) -> dict
+    with self._lock:
+      return {'hashes': list(self._tips)}
+
+  # noinspection PyUnusedLocal
+  def _get_transactions_to_approve(self, payload):
+    # type: (dict) -> dict
+    with self._lock:
+      if self._tips:
+        trunk   = self._random.choice(self._tips)
+        branch  = self._random.choice(self._tips)
+      else:
+        trunk = branch = NULL_HASH
+
+    return {
+      'trunkTransaction':   trunk,
+      'branchTransaction':  branch,
+    }
+
+  def _get_trytes(self, payload):
+    # type: (dict) -> dict
+    hashes = list(map(_as_text, payload['hashes']))
+
+    with self._lock:
+      stored = [self._trytes.get(hash_) for hash_ in hashes]
+
+    # Like IRI, unknown transactions are returned as 9s.
+    return {
+      'trytes': [
+        self._decompress(trytes) if trytes else '9' * TRANSACTION_LENGTH
+          for trytes in stored
+      ],
+    }
+
+  # noinspection PyUnusedLocal
+  def _interrupt_attaching_to_tangle(self, payload):
+    # type: (dict) -> dict
+    return {}
+
+  def _store_transactions(self, payload):
+    # type: (dict) -> dict
+    for trytes in map(_as_text, payload['trytes']):
+      with self._lock:
+        hash_ = self._recent_hashes.get(trytes)
+
+      if hash_ is None:
+        hash_ = self._get_hash(TryteString(trytes.encode('ascii')).as_trits())
+
+      with self._lock:
+        self._store(hash_, trytes)
+
+    return {}
+
+  def _were_addresses_spent_from(self, payload):
+    # type: (dict) -> dict
+    with self._lock:
+      return {
+        'states': [
+          _as_text(address)[:81] in self._spent
+            for address in payload['addresses']
+        ],
+      }
+
+  def _store(self, hash_, trytes):
+    # type: (Text, Text) -> None
+    """
+    Adds a transaction to the local Tangle and updates the indexes.
+
+    Must be called while holding the adapter's lock.
+    """
+    if len(trytes) != TRANSACTION_LENGTH:
+      raise ValueError(
+        'Transactions must be {length} trytes long.'.format(
+          length = TRANSACTION_LENGTH,
+        ),
+      )
+
+    if hash_ in self._trytes:
+      return
+
+    encoded = trytes.encode('ascii')
+    self._trytes[hash_] = zlib.compress(encoded, 1) if self.compress else encoded
+
+    address = trytes[2187:2268]
+    bundle  = trytes[2349:2430]
+    trunk   = trytes[2430:2511]
+    branch  = trytes[2511:2592]
+
+    self._addresses.setdefault(address, []).append(hash_)
+    self._bundles.setdefault(bundle, []).append(hash_)
+
+    self._tags.setdefault(trytes[2592:2619], []).append(hash_)
+    legacy_tag = trytes[2295:2322]
+    if legacy_tag != trytes[2592:2619]:
+      self._tags.setdefault(legacy_tag, []).append(hash_)
+
+    self._approvees.setdefault(trunk, []).append(hash_)
+    if branch != trunk:
+      self._approvees.setdefault(branch, []).append(hash_)
+
+    # The transaction is a tip unless another transaction (stored
+    # earlier) already approves it.
+    if hash_ not in self._approvees:
+      self._tip_index[hash_] = len(self._tips)
+      self._tips.append(hash_)
+
+    self._remove_tip(trunk)
+    self._remove_tip(branch)
+
+    # Apply value transactions to the ledger, but only once per bundle
+    # (in case the bundle is reattached).
+    value_trytes = trytes[2268:2295]
+    if value_trytes != '9' * 27:
+      key = (bundle, trytes[2331:2340])
+
+      if key not in self._applied:
+        self._applied.add(key)
+
+        value = _int_from_trytes(value_trytes)
+        self._balances[address] = self._balances.get(address, 0) + value
+
+        if value < 0:
+          self._spent.add(address)
+
+  def _remove_tip(self, hash_):
+    # type: (Text) -> None
+    """
+    Removes a transaction from the list of tips, if it is a tip.
+
+    Must be called while holding the adapter's lock.
+    """
+    index = self._tip_index.pop(hash_, None)
+    if index is None:
+      return
+
+    # Move the last tip into the vacant slot.
+    last = self._tips.pop()
+    if last != hash_:
+      self._tips[index] = last
+      self._tip_index[last] = index
+
+  def _decompress(self, trytes):
+    # type: (binary_type) -> Text
+    if self.compress:
+      trytes = zlib.decompress(trytes)
+
+    return trytes.decode('ascii')
+
+  def _find_nonce(self, trytes, min_weight_magnitude):
+    # type: (Text, int) -> Tuple[Text, Text]
+    """
+    Sets the nonce for a transaction, performing proof of work if
+    enabled.
+
+    :return:
+      Tuple containing the transaction trytes (including nonce) and the
+      resulting transaction hash.
+    """
+    trits = TryteString(trytes.encode('ascii') + b'9' * 27).as_trits()
+
+    if not self.proof_of_work:
+      return trytes + '9' * 27, self._get_hash(trits)
+
+    # The nonce is in the last block of trits that is absorbed, so the
+    # rest of the transaction only has to be absorbed once.
+    prefix = Curl()
+    prefix.absorb(trits[:-HASH_LENGTH])
+
+    block = trits[-HASH_LENGTH:]
+
+    for nonce in count():
+      block[-81:] = trits_from_int(nonce, pad=81)
+
+      sponge = deepcopy(prefix)
+      sponge.absorb(block)
+
+      hash_trits = [0] * HASH_LENGTH # type: MutableSequence[int]
+      sponge.squeeze(hash_trits)
+
+      if (
+            min_weight_magnitude <= 0
+        or  not any(hash_trits[-min_weight_magnitude:])
+      ):
+        return (
+          trytes + text_type(TryteString.from_trits(block[-81:])),
+          text_type(TryteString.from_trits(hash_trits)),
+        )
+
+  @staticmethod
+  def _get_hash(trits):
+    # type: (MutableSequence[int]) -> Text
+    """
+    Computes a transaction hash.
+    """
+    hash_trits = [0] * HASH_LENGTH # type: MutableSequence[int]
+
+    sponge = Curl()
+    sponge.absorb(trits)
+    sponge.squeeze(hash_trits)
+
+    return text_type(TryteString.from_trits(hash_trits))
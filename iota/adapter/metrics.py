@@ -0,0 +1,564 @@
+# coding=utf-8
+from __future__ import absolute_import, division, print_function, \
+  unicode_literals
+
+import socket
+from abc import ABCMeta, abstractmethod as abstract_method
+from bisect import bisect_left
+from logging import WARNING
+from threading import Lock
+from timeit import default_timer
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Text, \
+  Tuple
+
+from six import binary_type, iteritems, string_types, text_type, \
+  with_metaclass
+
+from iota.adapter import AdapterSpec
+from iota.adapter.wrappers import BaseWrapper
+from iota.types import TryteString
+
+__all__ = [
+  'BaseMetricsSink',
+  'InMemorySink',
+  'MetricsWrapper',
+  'PrometheusSink',
+  'StatsdSink',
+  'estimate_json_size',
+]
+
+
+def estimate_json_size(value):
+  # type: (Any) -> int
+  """
+  Estimates the number of bytes that a value will occupy once it is
+  encoded as JSON, without actually encoding it.
+
+  The estimate is exact for the kinds of values that API requests and
+  responses usually contain (tryte sequences and ASCII strings), and
+  close enough for everything else.
+  """
+  if isinstance(value, (TryteString, string_types, binary_type)):
+    # Quotes plus contents; assume there's nothing to escape.
+    return len(value) + 2
+
+  if isinstance(value, dict):
+    # ``{}``, plus ``"key": `` for each item, plus ``, `` between items.
+    return (
+        2
+      + sum(
+          len(text_type(key)) + 4 + estimate_json_size(item)
+            for key, item in iteritems(value)
+        )
+      + max(len(value) - 1, 0) * 2
+    )
+
+  if isinstance(value, (list, tuple)):
+    return (
+        2
+      + sum(estimate_json_size(item) for item in value)
+      + max(len(value) - 1, 0) * 2
+    )
+
+  if value is None:
+    return 4
+
+  # Numbers and booleans.
+  return len(text_type(value))
+
+
+class BaseMetricsSink(with_metaclass(ABCMeta)):
+  """
+  Receives measurements from :py:class:`MetricsWrapper`.
+  """
+  @abstract_method
+  def record(self, command, duration, request_size, response_size, error):
+    # type: (Text, float, int, int, Optional[Text]) -> None
+    """
+    Records a single request.
+
+    This method is called from the thread that sent the request, so it
+    should return quickly.
+
+    :param command:
+      Name of the command (e.g., ``getTrytes``).
+
+    :param duration:
+      Number of seconds the request took.
+
+    :param request_size:
+      Estimated size of the request payload, in bytes.
+
+    :param response_size:
+      Estimated size of the response payload, in bytes (0 if the
+      request failed).
+
+    :param error:
+      Name of the exception type if the request failed; ``None`` if it
+      succeeded.
+    """
+    raise NotImplementedError(
+      'Not implemented in {cls}.'.format(cls=type(self).__name__),
+    )
+
+
+class InMemorySink(BaseMetricsSink):
+  """
+  Aggregates measurements in memory, so that they can be inspected via
+  :py:meth:`snapshot`.
+  """
+  DEFAULT_BUCKETS = (
+    0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0,
+  )
+  """
+  Default latency histogram buckets (upper bounds, in seconds).
+  """
+
+  def __init__(self, buckets=DEFAULT_BUCKETS):
+    # type: (Sequence[float]) -> None
+    """
+    :param buckets:
+      Upper bounds of the latency histogram buckets, in seconds.
+      Requests that take longer than the last bucket are only counted
+      in the total.
+    """
+    super(InMemorySink, self).__init__()
+
+    self.buckets = tuple(sorted(buckets))
+
+    self._lock    = Lock()
+    self._stats   = {} # type: Dict[Text, _CommandStats]
+
+  def record(self, command, duration, request_size, response_size, error):
+    # type: (Text, float, int, int, Optional[Text]) -> None
+    bucket = bisect_left(self.buckets, duration)
+
+    with self._lock:
+      try:
+        stats = self._stats[command]
+      except KeyError:
+        stats = self._stats[command] = _CommandStats(len(self.buckets))
+
+      stats.calls           += 1
+      stats.duration_sum    += duration
+      stats.duration_max     = max(stats.duration_max, duration)
+      stats.request_bytes   += request_size
+      stats.response_bytes  += response_size
+
+      if bucket < len(self.buckets):
+        stats.bucket_counts[bucket] += 1
+
+      if error is not None:
+        stats.errors[error] = stats.errors.get(error, 0) + 1
+
+  def snapshot(self):
+    # type: () -> Dict[Text, dict]
+    """
+    Returns the current values, keyed by command.
+
+    Histogram values are cumulative: each bucket includes the requests
+    in the buckets before it.
+    """
+    with self._lock:
+      return {
+        command: stats.as_dict(self.buckets)
+          for command, stats in iteritems(self._stats)
+      }
+
+  def reset(self):
+    # type: () -> None
+    """
+    Clears all recorded values.
+    """
+    with self._lock:
+      self._stats = {}
+
+
+class PrometheusSink(InMemorySink):
+  """
+  Aggregates measurements in memory, and renders them in the Prometheus
+  text exposition format (e.g., for an HTTP ``/metrics`` endpoint).
+
+  References:
+    - https://prometheus.io/docs/instrumenting/exposition_formats/
+  """
+  def __init__(
+      self,
+      namespace = 'iota_adapter',
+      buckets   = InMemorySink.DEFAULT_BUCKETS,
+  ):
+    # type: (Text, Sequence[float]) -> None
+    """
+    :param namespace:
+      Prefix for metric names.
+
+    :param buckets:
+      Upper bounds of the latency histogram buckets, in seconds.
+    """
+    super(PrometheusSink, self).__init__(buckets)
+
+    self.namespace = namespace
+
+  def render(self):
+    # type: () -> Text
+    """
+    Returns the current values in the Prometheus text format.
+    """
+    snapshot  = self.snapshot()
+    commands  = sorted(snapshot)
+    ns        = self.namespace
+
+    lines = [] # type: List[Text]
+
+    def metric(name, type_, help_, samples):
+      # type: (Text, Text, Text, Iterable[Tuple[Text, Text, Any]]) -> None
+      lines.append('# HELP {ns}_{name} {help}'.format(
+        help  = help_,
+        name  = name,
+        ns    = ns,
+      ))
+
+      lines.append('# TYPE {ns}_{name} {type}'.format(
+        name  = name,
+        ns    = ns,
+        type  = type_,
+      ))
+
+      for suffix, labels, value in samples:
+        lines.append('{ns}_{name}{suffix}{{{labels}}} {value}'.format(
+          labels  = labels,
+          name    = name,
+          ns      = ns,
+          suffix  = suffix,
+          value   = _format_number(value),
+        ))
+
+    def command_label(command):
+      # type: (Text) -> Text
+      return 'command="{command}"'.format(command=_escape_label(command))
+
+    metric(
+      'requests_total', 'counter', 'Number of requests sent to the node.',
+      [
+        ('', command_label(c), snapshot[c]['calls'])
+          for c in commands
+      ],
+    )
+
+    metric(
+      'errors_total', 'counter', 'Number of failed requests.',
+      [
+        (
+          '',
+
+          '{command},error="{error}"'.format(
+            command = command_label(c),
+            error   = _escape_label(error),
+          ),
+
+          count,
+        )
+          for c in commands
+          for error, count in sorted(iteritems(snapshot[c]['errors']))
+      ],
+    )
+
+    histogram = [] # type: List[Tuple[Text, Text, Any]]
+    for c in commands:
+      stats = snapshot[c]
+
+      for bound, count in stats['histogram']:
+        histogram.append((
+          '_bucket',
+
+          '{command},le="{le}"'.format(
+            command = command_label(c),
+            le      = _format_number(bound),
+          ),
+
+          count,
+        ))
+
+      histogram.append((
+        '_bucket',
+        '{command},le="+Inf"'.format(command=command_label(c)),
+        stats['calls'],
+      ))
+
+      histogram.append(('_sum', command_label(c), stats['duration_sum']))
+      histogram.append(('_count', command_label(c), stats['calls']))
+
+    metric(
+      'request_duration_seconds', 'histogram', 'Request latency.',
+      histogram,
+    )
+
+    metric(
+      'request_bytes_total', 'counter',
+      'Estimated size of request payloads.',
+      [
+        ('', command_label(c), snapshot[c]['request_bytes'])
+          for c in commands
+      ],
+    )
+
+    metric(
+      'response_bytes_total', 'counter',
+      'Estimated size of response payloads.',
+      [
+        ('', command_label(c), snapshot[c]['response_bytes'])
+          for c in commands
+      ],
+    )
+
+    return '\n'.join(lines) + '\n'
+
+
+class StatsdSink(BaseMetricsSink):
+  """
+  Sends measurements to a StatsD server using the line protocol over
+  UDP.
+
+  Each request generates a single packet; if the packet can't be sent,
+  the measurement is discarded (metrics should never cause a request to
+  fail).
+
+  References:
+    - https://github.com/statsd/statsd/blob/master/docs/metric_types.md
+  """
+  def __init__(self, host='127.0.0.1', port=8125, prefix='iota.adapter'):
+    # type: (Text, int, Text) -> None
+    """
+    :param host:
+      Hostname or IP address of the StatsD server.
+
+    :param port:
+      UDP port of the StatsD server.
+
+    :param prefix:
+      Prefix for metric names.
+    """
+    super(StatsdSink, self).__init__()
+
+    self.address  = (host, port)
+    self.prefix   = prefix
+
+    self._socket = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+    self._socket.setblocking(False)
+
+  def record(self, command, duration, request_size, response_size, error):
+    # type: (Text, float, int, int, Optional[Text]) -> None
+    prefix = '{prefix}.{command}'.format(
+      command = command,
+      prefix  = self.prefix,
+    )
+
+    lines = [
+      '{prefix}.calls:1|c'.format(prefix=prefix),
+
+      '{prefix}.latency:{ms}|ms'.format(
+        ms      = _format_number(round(duration * 1000, 3)),
+        prefix  = prefix,
+      ),
+
+      '{prefix}.request_bytes:{size}|h'.format(
+        prefix  = prefix,
+        size    = request_size,
+      ),
+
+      '{prefix}.response_bytes:{size}|h'.format(
+        prefix  = prefix,
+        size    = response_size,
+      ),
+    ]
+
+    if error is not None:
+      lines.append('{prefix}.errors.{error}:1|c'.format(
+        error   = error,
+        prefix  = prefix,
+      ))
+
+    try:
+      self._socket.sendto('\n'.join(lines).encode('utf-8'), self.address)
+    except (IOError, OSError):
+      pass
+
+  def close(self):
+    # type: () -> None
+    """
+    Closes the UDP socket.
+    """
+    self._socket.close()
+
+
+class MetricsWrapper(BaseWrapper):
+  """
+  Records call counts, latency, payload sizes and errors for each
+  command, and passes them to one or more sinks.
+
+  Measuring a request only involves a timer and a quick walk over the
+  request and response values (payloads are not encoded a second
+  time), so the wrapper is cheap enough to leave enabled in
+  production.
+
+  Example::
+
+     sink = PrometheusSink()
+     iota = Iota(MetricsWrapper('http://localhost:14265', [sink]))
+
+     # Later, e.g. in your ``/metrics`` endpoint:
+     sink.render()
+  """
+  def __init__(self, adapter, sinks=None):
+    # type: (AdapterSpec, Optional[Iterable[BaseMetricsSink]]) -> None
+    """
+    :param adapter:
+      Adapter that will send the requests to the node.
+
+    :param sinks:
+      Sinks that will receive the measurements.
+      If not provided, an :py:class:`InMemorySink` is used.
+    """
+    super(MetricsWrapper, self).__init__(adapter)
+
+    self.sinks = list(sinks or [InMemorySink()]) # type: List[BaseMetricsSink]
+
+  def add_sink(self, sink):
+    # type: (BaseMetricsSink) -> MetricsWrapper
+    """
+    Adds a sink that will receive measurements.
+    """
+    self.sinks.append(sink)
+    return self
+
+  def send_request(self, payload, **kwargs):
+    # type: (dict, dict) -> dict
+    command       = payload.get('command')
+    request_size  = estimate_json_size(payload)
+    error         = None
+    response      = None
+
+    start = default_timer()
+    try:
+      response = self.adapter.send_request(payload, **kwargs)
+      return response
+    except BaseException as e:
+      # Includes exceptions like ``KeyboardInterrupt``, so that
+      # interrupted requests aren't recorded as successful.
+      error = type(e).__name__
+      raise
+    finally:
+      duration = default_timer() - start
+
+      self._record(command, duration, request_size, response, error)
+
+  def _record(self, command, duration, request_size, response, error):
+    # type: (Text, float, int, Optional[dict], Optional[Text]) -> None
+    """
+    Passes the measurements for a request to each sink.
+
+    Called while the request's result (or exception) is on its way to
+    the caller, so problems with the sinks are logged instead of
+    raised.
+    """
+    try:
+      response_size = (
+        0
+          if response is None
+          else estimate_json_size(response)
+      )
+    except Exception as e:
+      self._log_sink_error(e)
+      response_size = 0
+
+    for sink in self.sinks:
+      try:
+        sink.record(command, duration, request_size, response_size, error)
+      except Exception as e:
+        self._log_sink_error(e, sink)
+
+  def _log_sink_error(self, exc, sink=None):
+    # type: (Exception, Optional[BaseMetricsSink]) -> None
+    self._log(
+      level = WARNING,
+
+      message = 'Failed to record metrics{sink}: {exc!r}'.format(
+        exc   = exc,
+        sink  = ' in {0}'.format(type(sink).__name__) if sink else '',
+      ),
+
+      context = {
+        'exception':  exc,
+        'sink':       sink,
+      },
+    )
+
+
+class _CommandStats(object):
+  """
+  Aggregated measurements for a single command.
+
+  Used by :py:class:`InMemorySink`.
+  """
+  __slots__ = (
+    'bucket_counts',
+    'calls',
+    'duration_max',
+    'duration_sum',
+    'errors',
+    'request_bytes',
+    'response_bytes',
+  )
+
+  def __init__(self, bucket_count):
+    # type: (int) -> None
+    self.bucket_counts  = [0] * bucket_count
+    self.calls          = 0
+    self.duration_max   = 0.0
+    self.duration_sum   = 0.0
+    self.errors         = {} # type: Dict[Text, int]
+    self.request_bytes  = 0
+    self.response_bytes = 0
+
+  def as_dict(self, buckets):
+    # type: (Sequence[float]) -> dict
+    histogram = []
+    total     = 0
+
+    for bound, count in zip(buckets, self.bucket_counts):
+      total += count
+      histogram.append((bound, total))
+
+    return {
+      'calls':          self.calls,
+      'duration_max':   self.duration_max,
+      'duration_sum':   self.duration_sum,
+      'errors':         dict(self.errors),
+      'histogram':      histogram,
+      'request_bytes':  self.request_bytes,
+      'response_bytes': self.response_bytes,
+    }
+
+
+def _escape_label(value):
+  # type: (Text) -> Text
+  """
+  Escapes a Prometheus label value.
+  """
+  return (
+    text_type(value)
+      .replace('\\', '\\\\')
+      .replace('"', '\\"')
+      .replace('\n', '\\n')
+  )
+
+
+def _format_number(value):
+  # type: (Any) -> Text
+  """
+  Formats a number for the Prometheus/StatsD text formats.
+  """
+  if isinstance(value, float):
+    return text_type(int(value)) if value.is_integer() else repr(value)
+
+  return text_type(value)
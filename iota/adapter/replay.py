@@ -0,0 +1,284 @@
+# coding=utf-8
+from __future__ import absolute_import, division, print_function, \
+  unicode_literals
+
+import gzip
+import io
+import json
+from collections import deque
+from threading import Lock
+from time import sleep
+from timeit import default_timer
+from typing import Container, Dict, Iterable, List, Optional, Text, Union
+
+from six import string_types, text_type
+
+from iota.adapter import AdapterSpec, BadApiResponse, BaseAdapter, \
+  SplitResult
+from iota.adapter.wrappers import BaseWrapper
+from iota.exceptions import with_context
+from iota.json import JsonEncoder
+
+__all__ = [
+  'RecordingWrapper',
+  'ReplayAdapter',
+]
+
+
+def _encode(value):
+  # type: (Union[dict, list]) -> Text
+  """
+  Encodes a request or response as compact JSON, with its keys sorted
+  so that identical requests always produce identical text.
+  """
+  return json.dumps(
+    value,
+    cls         = JsonEncoder,
+    separators  = (',', ':'),
+    sort_keys   = True,
+  )
+
+
+def _open(path, mode):
+  # type: (Text, Text) -> io.TextIOBase
+  """
+  Opens a recording file, compressing it if its name ends in ``.gz``.
+  """
+  if path.endswith('.gz'):
+    return io.TextIOWrapper(gzip.open(path, mode + 'b'), encoding='utf-8')
+
+  return io.open(path, mode, encoding='utf-8')
+
+
+class RecordingWrapper(BaseWrapper):
+  """
+  Records every request sent to the wrapped adapter, along with the
+  response (or error) and how long it took, so that the traffic can be
+  played back later using :py:class:`ReplayAdapter`.
+
+  Example::
+
+     recorder = RecordingWrapper('http://localhost:14265')
+     Iota(recorder, seed).get_account_data()
+
+     recorder.save('account_data.jsonl.gz')
+  """
+  recorded_error_context = ('status', 'response')
+  """
+  Context values that are recorded along with each error.
+
+  Other values (e.g., the request) are either recorded already, or
+  can't be encoded as JSON.
+  """
+
+  def __init__(self, adapter):
+    # type: (AdapterSpec) -> None
+    super(RecordingWrapper, self).__init__(adapter)
+
+    # Entries are stored already encoded, in case the caller modifies
+    # the response after we return it.
+    self.entries = [] # type: List[Text]
+
+    self._lock = Lock()
+
+  def send_request(self, payload, **kwargs):
+    # type: (dict, dict) -> dict
+    start = default_timer()
+
+    try:
+      response = self.adapter.send_request(payload, **kwargs)
+    except BadApiResponse as e:
+      context = getattr(e, 'context', {})
+
+      self._record({
+        'request':  payload,
+        'error':    text_type(e),
+        'duration': default_timer() - start,
+
+        # Keep the details that the adapter attached to the error, so
+        # that they are available when the error is replayed (e.g.,
+        # :py:class:`iota.adapter.wrappers.RetryWrapper` checks the
+        # status code).
+        'error_context': {
+          key: context[key]
+            for key in self.recorded_error_context
+            if key in context
+        },
+      })
+
+      raise
+
+    self._record({
+      'request':  payload,
+      'response': response,
+      'duration': default_timer() - start,
+    })
+
+    return response
+
+  def save(self, path):
+    # type: (Text) -> None
+    """
+    Writes the recorded traffic to a file, one JSON document per line.
+
+    If ``path`` ends in ``.gz``, the file is compressed.
+    """
+    with self._lock:
+      entries = list(self.entries)
+
+    with _open(path, 'w') as f:
+      for entry in entries:
+        f.write(entry)
+        f.write('\n')
+
+  def _record(self, entry):
+    # type: (dict) -> None
+    encoded = _encode(entry)
+
+    with self._lock:
+      self.entries.append(encoded)
+
+
+class ReplayAdapter(BaseAdapter):
+  """
+  Serves responses from traffic recorded by :py:class:`RecordingWrapper`,
+  without sending any requests to a node.
+
+  Responses are looked up by the contents of the request.  If the same
+  request was recorded more than once, the responses are returned in
+  the order they were recorded, and the last one is repeated once the
+  others have been used up.
+
+  Example::
+
+     api = Iota(ReplayAdapter('account_data.jsonl.gz'), seed)
+     api = Iota('replay://account_data.jsonl.gz', seed)
+  """
+  supported_protocols = ('replay',)
+
+  DEFAULT_LOOSE_COMMANDS = frozenset({
+    'attachToTangle',
+    'broadcastTransactions',
+    'storeTransactions',
+  })
+  """
+  Commands whose requests differ every time they are sent (e.g., because
+  the transactions include a timestamp), so they are matched by command
+  name only.
+  """
+
+  @classmethod
+  def configure(cls, parsed):
+    # type: (SplitResult) -> ReplayAdapter
+    return cls(parsed.netloc + parsed.path)
+
+  def __init__(
+      self,
+      recording,
+      reproduce_latency = False,
+      loose_commands    = DEFAULT_LOOSE_COMMANDS,
+  ):
+    # type: (Union[Text, Iterable[Text]], bool, Container[Text]) -> None
+    """
+    :param recording:
+      Path to a file created by :py:meth:`RecordingWrapper.save`, or
+      the recorded entries themselves (i.e.,
+      :py:attr:`RecordingWrapper.entries`).
+
+    :param reproduce_latency:
+      Whether to wait as long as the original request took before
+      returning each response.
+
+    :param loose_commands:
+      Commands that are matched by command name only, instead of the
+      full contents of the request.
+    """
+    super(ReplayAdapter, self).__init__()
+
+    if isinstance(recording, string_types):
+      self.path = recording # type: Optional[Text]
+
+      with _open(recording, 'r') as f:
+        entries = [line for line in f if line.strip()]
+    else:
+      self.path = None
+      entries   = list(recording)
+
+    self.reproduce_latency  = reproduce_latency
+    self.loose_commands     = loose_commands
+
+    self._lock      = Lock()
+    self._responses = {} # type: Dict[Text, deque]
+
+    for line in entries:
+      entry = json.loads(line)
+
+      # Keep responses encoded, so that each request gets a fresh copy
+      # (response filters modify the response in place).
+      if 'response' in entry:
+        entry['response'] = _encode(entry['response'])
+
+      key = self._get_key(entry['request'])
+      self._responses.setdefault(key, deque()).append(entry)
+
+  def get_uri(self):
+    # type: () -> Text
+    return 'replay://{path}'.format(path=self.path or '')
+
+  def send_request(self, payload, **kwargs):
+    # type: (dict, dict) -> dict
+    try:
+      queue = self._responses[self._get_key(payload)]
+    except KeyError:
+      raise with_context(
+        exc = BadApiResponse(
+          'No recorded response for {command!r} request.'.format(
+            command = payload.get('command'),
+          ),
+        ),
+
+        context = {
+          'request': payload,
+        },
+      )
+
+    with self._lock:
+      entry = queue.popleft() if len(queue) > 1 else queue[0]
+
+    if self.reproduce_latency:
+      self._wait(entry['duration'])
+
+    if 'error' in entry:
+      context = {'request': payload}
+      context.update(entry.get('error_context') or {})
+
+      raise with_context(
+        exc     = BadApiResponse(entry['error']),
+        context = context,
+      )
+
+    return json.loads(entry['response'])
+
+  def _get_key(self, payload):
+    # type: (dict) -> Text
+    """
+    Returns the key used to look up the recorded response for a
+    request.
+    """
+    command = payload.get('command')
+
+    if command in self.loose_commands:
+      return command
+
+    return _encode(payload)
+
+  def _wait(self, duration):
+    # type: (float) -> None
+    """
+    Waits before returning a response, to reproduce the recorded
+    latency.
+
+    Implemented as a separate method so that it can be mocked during
+    unit tests.
+    """
+    sleep(duration)
@@ -2,11 +2,13 @@
 from __future__ import absolute_import, division, print_function, \
   unicode_literals
 
-from time import sleep
-from typing import Container, Optional, Text, Union
+from concurrent.futures import Future
+from threading import Condition, Thread
+from time import sleep, time
+from typing import Container, Iterator, List, Optional, Text, Union
 
 from requests import Response, codes
-from six import moves as compat, text_type
+from six import iteritems, moves as compat, text_type
 
 from iota.adapter import BadApiResponse, HttpAdapter, SplitResult
 from iota.exceptions import with_context
@@ -32,7 +34,8 @@ class SandboxAdapter(HttpAdapter):
 
   Note: for compatibility with Iota APIs, SandboxAdapter still operates
   synchronously; it blocks until it determines that a job has completed
-  successfully.
+  successfully.  Use :py:meth:`send_request_async` to submit jobs
+  without blocking.
 
   References:
     - https://github.com/iotaledger/iota.lib.py/issues/19
@@ -48,14 +51,21 @@ class SandboxAdapter(HttpAdapter):
   Maximum number of times to poll for job status before giving up.
   """
 
+  DEFAULT_MIN_POLL_INTERVAL = 1.0
+  """
+  Number of seconds to wait before checking the status of a job
+  submitted via :py:meth:`send_request_async` for the first time.
+  """
+
   def __init__(
       self,
       uri,
       auth_token,
-      poll_interval = DEFAULT_POLL_INTERVAL,
-      max_polls     = DEFAULT_MAX_POLLS,
+      poll_interval     = DEFAULT_POLL_INTERVAL,
+      max_polls         = DEFAULT_MAX_POLLS,
+      min_poll_interval = DEFAULT_MIN_POLL_INTERVAL,
   ):
-    # type: (Union[Text, SplitResult], Optional[Text], int, int) -> None
+    # type: (Union[Text, SplitResult], Optional[Text], int, int, float) -> None
     """
     :param uri:
       URI of the node to connect to.
@@ -91,6 +101,14 @@ class SandboxAdapter(HttpAdapter):
 
       This is effectively a timeout setting for asynchronous jobs;
       multiply by ``poll_interval`` to get the timeout duration.
+
+    :param min_poll_interval:
+      Number of seconds to wait before polling a job submitted via
+      :py:meth:`send_request_async` for the first time.  The interval
+      doubles after each poll, up to ``poll_interval``.
+
+      Jobs submitted this way time out after the same duration as
+      blocking requests (``poll_interval * max_polls`` seconds).
     """
     super(SandboxAdapter, self).__init__(uri)
 
@@ -172,9 +190,26 @@ class SandboxAdapter(HttpAdapter):
         },
       )
 
-    self.auth_token     = auth_token # type: Optional[Text]
-    self.poll_interval  = poll_interval # type: int
-    self.max_polls      = max_polls # type: int
+    if not (0 < min_poll_interval <= poll_interval):
+      raise with_context(
+        exc =
+          ValueError(
+            '``min_poll_interval`` must be > 0 and <= ``poll_interval`` '
+            '(``exc.context`` has more info).',
+          ),
+
+        context = {
+          'min_poll_interval':  min_poll_interval,
+          'poll_interval':      poll_interval,
+        },
+      )
+
+    self.auth_token         = auth_token # type: Optional[Text]
+    self.poll_interval      = poll_interval # type: int
+    self.max_polls          = max_polls # type: int
+    self.min_poll_interval  = min_poll_interval # type: float
+
+    self._poller = _JobPoller(self)
 
   @property
   def node_url(self):
@@ -218,6 +253,83 @@ class SandboxAdapter(HttpAdapter):
 
     return super(SandboxAdapter, self).send_request(payload, **kwargs)
 
+  def send_request_async(self, payload, **kwargs):
+    # type: (dict, dict) -> Future
+    """
+    Sends an API request to the node, without waiting for asynchronous
+    jobs to finish.
+
+    The request itself is sent immediately.  If the node queues it as a
+    job (e.g., ``attachToTangle``), the job is added to a poller that
+    checks on all outstanding jobs from a single background thread,
+    with each job's polling interval starting at
+    :py:attr:`min_poll_interval` and doubling up to
+    :py:attr:`poll_interval`.
+
+    :return:
+      :py:class:`concurrent.futures.Future` that resolves to the
+      decoded response (same as :py:meth:`send_request` would return).
+      In asyncio code, use :py:func:`asyncio.wrap_future` to await it.
+
+    :raise:
+      - :py:class:`BadApiResponse` if the node rejects the request
+        (job failures and timeouts are reported via the future).
+    """
+    kwargs.setdefault('headers', {})
+    for key, value in iteritems(self.DEFAULT_HEADERS):
+      kwargs['headers'].setdefault(key, value)
+
+    if self.auth_token:
+      kwargs['headers']['Authorization'] = self.authorization_header
+
+    response = self._send_http_request(
+      payload = self.json_encoder.encode(payload),
+      url     = self.node_url,
+      **kwargs
+    )
+
+    decoded =\
+      super(SandboxAdapter, self)._interpret_response(
+        response        = response,
+        payload         = payload,
+        expected_status = {codes['ok'], codes['accepted']},
+      )
+
+    future = Future()
+
+    if response.status_code != codes['accepted']:
+      future.set_result(decoded)
+    elif decoded['status'] in (STATUS_QUEUED, STATUS_RUNNING):
+      now = self._now()
+
+      self._poller.add(_SandboxJob(
+        decoded   = decoded,
+        deadline  = now + self.poll_interval * self.max_polls,
+        future    = future,
+        interval  = self.min_poll_interval,
+        payload   = payload,
+        next_poll = now + self.min_poll_interval,
+      ))
+    else:
+      try:
+        future.set_result(self._get_job_result(decoded, payload))
+      except BadApiResponse as e:
+        future.set_exception(e)
+
+    return future
+
+  def iter_response_values(self, payload, key, **kwargs):
+    # type: (dict, Text, dict) -> Iterator
+    if self.auth_token:
+      kwargs.setdefault('headers', {})
+      kwargs['headers']['Authorization'] = self.authorization_header
+
+    return super(SandboxAdapter, self).iter_response_values(
+      payload,
+      key,
+      **kwargs
+    )
+
   def _interpret_response(self, response, payload, expected_status):
     # type: (Response, dict, Container[int], bool) -> dict
     decoded =\
@@ -266,25 +378,109 @@ class SandboxAdapter(HttpAdapter):
             expected_status = {codes['ok']},
           )
 
-      if decoded['status'] == STATUS_FINISHED:
-        return decoded['{command}Response'.format(command=decoded['command'])]
+      return self._get_job_result(decoded, payload)
 
-      raise with_context(
-        exc = BadApiResponse(
-              decoded.get('error', {}).get('message')
-          or  'Command {status}: {decoded}'.format(
-                decoded = decoded,
-                status  = decoded['status'].lower(),
-              ),
-        ),
+    return decoded
 
-        context = {
-          'request':  payload,
-          'response': decoded,
-        },
+  def _get_job_result(self, decoded, payload):
+    # type: (dict, dict) -> dict
+    """
+    Extracts the result from a completed job.
+
+    :raise:
+      - :py:class:`BadApiResponse` if the job did not finish
+        successfully.
+    """
+    if decoded['status'] == STATUS_FINISHED:
+      return decoded['{command}Response'.format(command=decoded['command'])]
+
+    raise with_context(
+      exc = BadApiResponse(
+            decoded.get('error', {}).get('message')
+        or  'Command {status}: {decoded}'.format(
+              decoded = decoded,
+              status  = decoded['status'].lower(),
+            ),
+      ),
+
+      context = {
+        'request':  payload,
+        'response': decoded,
+      },
+    )
+
+  def _poll_job(self, job):
+    # type: (_SandboxJob) -> bool
+    """
+    Checks the status of a job submitted via
+    :py:meth:`send_request_async`, and resolves its future if the job
+    is done.
+
+    :return:
+      Whether the job is done (i.e., it no longer needs to be polled).
+    """
+    if job.future.cancelled():
+      return True
+
+    try:
+      poll_response = self._send_http_request(
+        headers = {'Authorization': self.authorization_header},
+        method  = 'get',
+        payload = None,
+        url     = self.get_jobs_url(job.decoded['id']),
       )
 
-    return decoded
+      job.decoded =\
+        super(SandboxAdapter, self)._interpret_response(
+          response        = poll_response,
+          payload         = job.payload,
+          expected_status = {codes['ok']},
+        )
+
+      if job.decoded['status'] in (STATUS_QUEUED, STATUS_RUNNING):
+        now = self._now()
+
+        if now >= job.deadline:
+          raise with_context(
+            exc =
+              BadApiResponse(
+                '``{command}`` job timed out after {duration} seconds '
+                '(``exc.context`` has more info).'.format(
+                  command   = job.decoded['command'],
+                  duration  = self.poll_interval * self.max_polls,
+                ),
+              ),
+
+            context = {
+              'request':  job.payload,
+              'response': job.decoded,
+            },
+          )
+
+        # Back off, but make sure we check one last time right at the
+        # deadline.
+        job.interval  = min(job.interval * 2, self.poll_interval)
+        job.next_poll = min(now + job.interval, job.deadline)
+        return False
+
+      result = self._get_job_result(job.decoded, job.payload)
+    except Exception as e:
+      _resolve_future(job.future, exception=e)
+    else:
+      _resolve_future(job.future, result=result)
+
+    return True
+
+  @staticmethod
+  def _now():
+    # type: () -> float
+    """
+    Returns the current time, for scheduling job polls.
+
+    Implemented as a separate method so that it can be mocked during
+    unit tests.
+    """
+    return time()
 
   def _wait_to_poll(self):
     """
@@ -294,3 +490,119 @@ class SandboxAdapter(HttpAdapter):
     unit tests ("Do you bite your thumb at us, sir?").
     """
     sleep(self.poll_interval)
+
+
+class _SandboxJob(object):
+  """
+  An asynchronous job submitted via
+  :py:meth:`SandboxAdapter.send_request_async`.
+  """
+  def __init__(self, payload, decoded, future, interval, next_poll, deadline):
+    # type: (dict, dict, Future, float, float, float) -> None
+    super(_SandboxJob, self).__init__()
+
+    self.payload    = payload
+    self.decoded    = decoded
+    self.future     = future
+    self.interval   = interval
+    self.next_poll  = next_poll
+    self.deadline   = deadline
+
+
+class _JobPoller(object):
+  """
+  Polls all of a :py:class:`SandboxAdapter`'s outstanding jobs from a
+  single background thread.
+
+  The thread is started when a job is added, and exits once there are
+  no more outstanding jobs.
+  """
+  def __init__(self, adapter):
+    # type: (SandboxAdapter) -> None
+    super(_JobPoller, self).__init__()
+
+    self.adapter = adapter
+
+    self._condition = Condition()
+    self._jobs      = [] # type: List[_SandboxJob]
+    self._thread    = None # type: Optional[Thread]
+
+  def add(self, job):
+    # type: (_SandboxJob) -> None
+    """
+    Adds a job to the poller.
+    """
+    with self._condition:
+      self._jobs.append(job)
+
+      if self._thread is None:
+        self._thread = Thread(target=self._run, name='SandboxJobPoller')
+        self._thread.daemon = True
+        self._thread.start()
+      else:
+        # Wake the thread, in case the new job is due before the others.
+        self._condition.notify()
+
+  def _run(self):
+    # type: () -> None
+    """
+    Polls jobs as they become due, until none are left.
+    """
+    try:
+      self._poll_jobs()
+    except BaseException as e:
+      # Don't leave the remaining jobs hanging; the next job that gets
+      # added will start a new thread.
+      with self._condition:
+        jobs          = self._jobs
+        self._jobs    = []
+        self._thread  = None
+
+      for job in jobs:
+        _resolve_future(job.future, exception=e)
+
+      raise
+
+  def _poll_jobs(self):
+    # type: () -> None
+    """
+    Main loop for :py:meth:`_run`.
+    """
+    while True:
+      with self._condition:
+        if not self._jobs:
+          self._thread = None
+          return
+
+        now = self.adapter._now()
+        due = [job for job in self._jobs if job.next_poll <= now]
+
+        if not due:
+          self._condition.wait(
+            min(job.next_poll for job in self._jobs) - now,
+          )
+          continue
+
+      finished = [job for job in due if self.adapter._poll_job(job)]
+
+      with self._condition:
+        for job in finished:
+          self._jobs.remove(job)
+
+
+def _resolve_future(future, result=None, exception=None):
+  # type: (Future, Optional[dict], Optional[BaseException]) -> None
+  """
+  Sets the result (or exception) of a job's future, unless the caller
+  has cancelled it (or it has been resolved already).
+
+  Marking the future as running first ensures that it can't be
+  cancelled while its result is being set.
+  """
+  if future.done() or not future.set_running_or_notify_cancel():
+    return
+
+  if exception is None:
+    future.set_result(result)
+  else:
+    future.set_exception(exception)
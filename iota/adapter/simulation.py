@@ -0,0 +1,217 @@
+# coding=utf-8
+from __future__ import absolute_import, division, print_function, \
+  unicode_literals
+
+from copy import deepcopy
+from random import Random
+from threading import Lock
+from time import sleep
+from typing import Callable, Dict, Optional, Text, Tuple, Union
+
+from iota.adapter import BadApiResponse, MockAdapter
+from iota.adapter.metrics import estimate_json_size
+from iota.exceptions import with_context
+
+__all__ = [
+  'SimulatedNodeAdapter',
+]
+
+Latency = Union[float, Tuple[float, float], Callable[[Random], float]]
+"""
+Latency of a simulated request, in seconds.  Can be:
+
+- A number (the latency is always the same).
+- A ``(low, high)`` tuple (the latency is uniformly distributed).
+- A callable that accepts a :py:class:`random.Random` instance and
+  returns the latency (e.g., ``lambda rng: rng.lognormvariate(-3, 1)``).
+"""
+
+
+class SimulatedNodeAdapter(MockAdapter):
+  """
+  A :py:class:`MockAdapter` that behaves more like a real node: each
+  request takes time to process, large payloads take longer to transfer,
+  and some requests fail at random.
+
+  This makes it possible to load-test client-side features (caching,
+  batching, retries, concurrency, etc.) realistically, without a node.
+
+  In addition to responses seeded via :py:meth:`seed_response` (which
+  are used once each), you can set a default response for a command
+  that is returned every time the command's queue is empty.
+
+  Example::
+
+     adapter =\\
+       SimulatedNodeAdapter(latency=(0.05, 0.2), bandwidth=1000000, seed=42)\\
+         .set_latency('attachToTangle', 2.0)\\
+         .set_error_rate('getBalances', 0.1)\\
+         .set_default_response('getNodeInfo', {...})
+  """
+  supported_protocols = ()
+
+  ERROR_STATUS = 503
+  """
+  HTTP status code reported by simulated errors.  Server errors are
+  considered transient by :py:class:`iota.adapter.wrappers.RetryWrapper`.
+  """
+
+  def __init__(self, latency=0, bandwidth=None, error_rate=0, seed=None):
+    # type: (Latency, Optional[float], float, Optional[int]) -> None
+    """
+    :param latency:
+      Default latency for each request.
+
+    :param bandwidth:
+      Simulated connection speed, in bytes per second.  Each request
+      takes additional time proportional to the (estimated) size of the
+      request and response payloads.
+
+      If ``None``, payload size does not affect latency.
+
+    :param error_rate:
+      Default probability (0-1) that a request fails.
+
+    :param seed:
+      Seed for the random number generator, so that latencies and
+      errors are reproducible.
+    """
+    super(SimulatedNodeAdapter, self).__init__()
+
+    if bandwidth is not None and bandwidth <= 0:
+      raise with_context(
+        exc     = ValueError('``bandwidth`` must be > 0.'),
+        context = {'bandwidth': bandwidth},
+      )
+
+    self.latency    = latency
+    self.bandwidth  = bandwidth
+    self.error_rate = self._check_error_rate(error_rate)
+
+    self.default_responses  = {} # type: Dict[Text, dict]
+
+    self._latencies   = {} # type: Dict[Text, Latency]
+    self._error_rates = {} # type: Dict[Text, float]
+
+    self._random      = Random(seed)
+    self._random_lock = Lock()
+
+  def set_latency(self, command, latency):
+    # type: (Text, Latency) -> SimulatedNodeAdapter
+    """
+    Sets the latency for a particular command.
+    """
+    self._latencies[command] = latency
+    return self
+
+  def set_error_rate(self, command, error_rate):
+    # type: (Text, float) -> SimulatedNodeAdapter
+    """
+    Sets the probability (0-1) that requests for a particular command
+    fail.
+    """
+    self._error_rates[command] = self._check_error_rate(error_rate)
+    return self
+
+  def set_default_response(self, command, response):
+    # type: (Text, dict) -> SimulatedNodeAdapter
+    """
+    Sets the response that the adapter returns for a command when there
+    are no seeded responses left for it.
+
+    Each request gets its own copy of the response.
+    """
+    with self._lock:
+      self.default_responses[command] = response
+
+    return self
+
+  def send_request(self, payload, **kwargs):
+    # type: (dict, dict) -> dict
+    command = payload['command']
+
+    with self._random_lock:
+      latency = self._sample_latency(command)
+      failed  = (
+        self._random.random()
+          < self._error_rates.get(command, self.error_rate)
+      )
+
+    if failed:
+      self._wait(latency)
+
+      raise with_context(
+        exc = BadApiResponse(
+          'Simulated error for {command!r} request.'.format(
+            command = command,
+          ),
+        ),
+
+        context = {
+          'request':  payload,
+          'status':   self.ERROR_STATUS,
+        },
+      )
+
+    try:
+      response = super(SimulatedNodeAdapter, self).send_request(payload)
+    except BadApiResponse:
+      self._wait(latency)
+      raise
+
+    if self.bandwidth:
+      latency += (
+          (estimate_json_size(payload) + estimate_json_size(response))
+        / self.bandwidth
+      )
+
+    self._wait(latency)
+    return response
+
+  def _pop_response(self, payload):
+    # type: (dict) -> dict
+    command = payload['command']
+
+    if self.responses.get(command) or command not in self.default_responses:
+      return super(SimulatedNodeAdapter, self)._pop_response(payload)
+
+    return deepcopy(self.default_responses[command])
+
+  def _sample_latency(self, command):
+    # type: (Text) -> float
+    """
+    Picks the latency for a request.
+
+    Must be called while holding the random number generator's lock.
+    """
+    latency = self._latencies.get(command, self.latency)
+
+    if callable(latency):
+      return latency(self._random)
+
+    if isinstance(latency, tuple):
+      return self._random.uniform(*latency)
+
+    return latency
+
+  @staticmethod
+  def _check_error_rate(error_rate):
+    # type: (float) -> float
+    if not (0 <= error_rate <= 1):
+      raise with_context(
+        exc     = ValueError('Error rate must be between 0 and 1.'),
+        context = {'error_rate': error_rate},
+      )
+
+    return error_rate
+
+  def _wait(self, duration):
+    # type: (float) -> None
+    """
+    Simulates the time it takes the node to process a request.
+
+    Implemented as a separate method so that it can be mocked during
+    unit tests.
+    """
+    if duration > 0:
+      sleep(duration)
@@ -0,0 +1,385 @@
+# coding=utf-8
+from __future__ import absolute_import, division, print_function, \
+  unicode_literals
+
+import sqlite3
+from threading import Lock
+from typing import Dict, Iterable, List, Optional, Sequence, Text, Tuple
+
+from six import binary_type, text_type
+
+from iota.adapter import AdapterSpec
+from iota.adapter.wrappers import BaseWrapper
+from iota.transaction.base import Transaction
+from iota.transaction.types import TransactionHash
+from iota.trits import int_from_trytes
+from iota.types import TryteString, TrytesCompatible
+
+__all__ = [
+  'TransactionStore',
+  'TransactionStoreWrapper',
+]
+
+SCHEMA = (
+  '''
+  CREATE TABLE IF NOT EXISTS transactions (
+    hash                  TEXT PRIMARY KEY,
+    address               TEXT NOT NULL,
+    value                 INTEGER NOT NULL,
+    legacy_tag            TEXT NOT NULL,
+    timestamp             INTEGER NOT NULL,
+    current_index         INTEGER NOT NULL,
+    last_index            INTEGER NOT NULL,
+    bundle                TEXT NOT NULL,
+    trunk                 TEXT NOT NULL,
+    branch                TEXT NOT NULL,
+    tag                   TEXT NOT NULL,
+    attachment_timestamp  INTEGER NOT NULL,
+    trytes                TEXT NOT NULL
+  )
+  ''',
+
+  'CREATE INDEX IF NOT EXISTS idx_address ON transactions (address)',
+  'CREATE INDEX IF NOT EXISTS idx_bundle ON transactions (bundle)',
+  'CREATE INDEX IF NOT EXISTS idx_tag ON transactions (tag)',
+  'CREATE INDEX IF NOT EXISTS idx_legacy_tag ON transactions (legacy_tag)',
+  'CREATE INDEX IF NOT EXISTS idx_trunk ON transactions (trunk)',
+  'CREATE INDEX IF NOT EXISTS idx_branch ON transactions (branch)',
+)
+
+NULL_TRYTES = '9' * 2673
+"""
+Trytes that the node returns for transactions it doesn't have.
+"""
+
+QUERY_CHUNK_SIZE = 500
+"""
+Maximum number of values to include in a single ``IN (...)`` clause
+(SQLite limits the number of parameters per query).
+"""
+
+
+def _as_text(value):
+  # type: (TrytesCompatible) -> Text
+  if isinstance(value, TryteString):
+    return text_type(value)
+
+  if isinstance(value, binary_type):
+    return value.decode('ascii')
+
+  return value
+
+
+def _int_from_trytes(trytes):
+  # type: (Text) -> int
+  return int_from_trytes(trytes.encode('ascii'))
+
+
+class TransactionStore(object):
+  """
+  Stores transactions in a SQLite database, indexed so that they can be
+  looked up the same way as with ``findTransactions``.
+
+  The database uses write-ahead logging, so it can be read while
+  transactions are being added (e.g., from another process).
+
+  Example::
+
+     store = TransactionStore('transactions.db')
+     store.add_trytes(hashes, get_trytes_response['trytes'])
+
+     store.find_transactions(addresses=[address])
+     store.get_trytes(hashes)
+  """
+  def __init__(self, path=':memory:'):
+    # type: (Text) -> None
+    """
+    :param path:
+      Path to the database file.  The file is created if it doesn't
+      exist.
+    """
+    super(TransactionStore, self).__init__()
+
+    self.path = path
+
+    self._lock = Lock()
+
+    self._connection = sqlite3.connect(path, check_same_thread=False)
+    self._connection.execute('PRAGMA journal_mode=WAL')
+    self._connection.execute('PRAGMA synchronous=NORMAL')
+
+    with self._connection:
+      for statement in SCHEMA:
+        self._connection.execute(statement)
+
+  def __len__(self):
+    with self._lock:
+      return self._connection.execute(
+        'SELECT COUNT(*) FROM transactions',
+      ).fetchone()[0]
+
+  def close(self):
+    # type: () -> None
+    """
+    Closes the database connection.
+    """
+    with self._lock:
+      self._connection.close()
+
+  def add_trytes(self, hashes, trytes):
+    # type: (Sequence[TrytesCompatible], Sequence[TrytesCompatible]) -> int
+    """
+    Adds raw transaction trytes to the store (e.g., the result of a
+    ``getTrytes`` request), all in a single database transaction.
+
+    Transactions the node didn't have (all 9s) are skipped, as are
+    transactions that are already in the store.
+
+    :param hashes:
+      Transaction hashes (e.g., the ``hashes`` parameter of the
+      ``getTrytes`` request).  They are not verified.
+
+    :param trytes:
+      Transaction trytes, in the same order as ``hashes``.
+
+    :return:
+      Number of transactions that were added.
+    """
+    rows = [
+      self._parse(_as_text(hash_), _as_text(trytes_))
+        for hash_, trytes_ in zip(hashes, trytes)
+        if _as_text(trytes_) != NULL_TRYTES
+    ]
+
+    return self._insert(rows)
+
+  def add_transactions(self, transactions):
+    # type: (Iterable[Transaction]) -> int
+    """
+    Adds :py:class:`Transaction` objects to the store, all in a single
+    database transaction.
+
+    :return:
+      Number of transactions that were added.
+    """
+    return self._insert([
+      (
+        text_type(txn.hash),
+        text_type(txn.address.address),
+        txn.value,
+        text_type(txn.legacy_tag),
+        txn.timestamp,
+        txn.current_index,
+        txn.last_index,
+        text_type(txn.bundle_hash),
+        text_type(txn.trunk_transaction_hash),
+        text_type(txn.branch_transaction_hash),
+        text_type(txn.tag),
+        txn.attachment_timestamp,
+        text_type(txn.as_tryte_string()),
+      )
+        for txn in transactions
+    ])
+
+  def get_trytes(self, hashes):
+    # type: (Iterable[TrytesCompatible]) -> Dict[Text, Text]
+    """
+    Returns the trytes for the specified transactions.
+
+    :return:
+      Dict mapping hash to trytes.  Transactions that are not in the
+      store are omitted.
+    """
+    return dict(self._select('trytes', ('hash',), hashes))
+
+  def find_transactions(
+      self,
+      addresses = None,
+      approvees = None,
+      bundles   = None,
+      tags      = None,
+  ):
+    # type: (Optional[Iterable[TrytesCompatible]], Optional[Iterable[TrytesCompatible]], Optional[Iterable[TrytesCompatible]], Optional[Iterable[TrytesCompatible]]) -> List[TransactionHash]
+    """
+    Finds transactions in the store, the same way as
+    ``findTransactions``: multiple values for the same parameter are
+    combined using "OR", and multiple parameters are combined using
+    "AND".
+
+    :return:
+      Matching transaction hashes, in the order they were added.
+    """
+    results = None # type: Optional[Dict[Text, int]]
+
+    for columns, values in (
+        (('address',),            addresses),
+        (('trunk', 'branch'),     approvees),
+        (('bundle',),             bundles),
+        (('tag', 'legacy_tag'),   tags),
+    ):
+      if values is None:
+        continue
+
+      # Addresses may include a checksum.
+      length = 27 if columns[0] == 'tag' else 81
+
+      matches = dict(self._select(
+        '_rowid_',
+        columns,
+        (_as_text(value)[:length] for value in values),
+        key = 'hash',
+      ))
+
+      if results is None:
+        results = matches
+      else:
+        results = {
+          hash_: rowid
+            for hash_, rowid in results.items()
+            if hash_ in matches
+        }
+
+    if not results:
+      return []
+
+    return [
+      TransactionHash(hash_.encode('ascii'))
+        for hash_ in sorted(results, key=results.get)
+    ]
+
+  def _insert(self, rows):
+    # type: (List[tuple]) -> int
+    with self._lock:
+      with self._connection:
+        before = self._connection.total_changes
+
+        self._connection.executemany(
+          'INSERT OR IGNORE INTO transactions VALUES '
+          '(?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)',
+          rows,
+        )
+
+        return self._connection.total_changes - before
+
+  def _select(self, value_column, columns, values, key='hash'):
+    # type: (Text, Sequence[Text], Iterable[TrytesCompatible], Text) -> List[Tuple[Text, object]]
+    """
+    Selects ``(key, value_column)`` pairs for rows where any of the
+    specified columns matches any of the values.
+    """
+    values = list(set(map(_as_text, values)))
+    rows = [] # type: List[Tuple[Text, object]]
+
+    with self._lock:
+      for i in range(0, len(values), QUERY_CHUNK_SIZE):
+        chunk = values[i:i + QUERY_CHUNK_SIZE]
+        placeholders = ', '.join('?' * len(chunk))
+
+        query = 'SELECT {key}, {value} FROM transactions WHERE {where}'.format(
+          key   = key,
+          value = value_column,
+
+          where = ' OR '.join(
+            '{column} IN ({placeholders})'.format(
+              column        = column,
+              placeholders  = placeholders,
+            )
+              for column in columns
+          ),
+        )
+
+        rows.extend(
+          self._connection.execute(query, chunk * len(columns)).fetchall(),
+        )
+
+    return rows
+
+  @staticmethod
+  def _parse(hash_, trytes):
+    # type: (Text, Text) -> tuple
+    """
+    Extracts the indexed columns from transaction trytes.
+
+    Slicing the trytes directly is much faster than creating a
+    :py:class:`Transaction` (which also computes the hash).
+    """
+    return (
+      hash_,
+      trytes[2187:2268],
+      _int_from_trytes(trytes[2268:2295]),
+      trytes[2295:2322],
+      _int_from_trytes(trytes[2322:2331]),
+      _int_from_trytes(trytes[2331:2340]),
+      _int_from_trytes(trytes[2340:2349]),
+      trytes[2349:2430],
+      trytes[2430:2511],
+      trytes[2511:2592],
+      trytes[2592:2619],
+      _int_from_trytes(trytes[2619:2628]),
+      trytes,
+    )
+
+
+class TransactionStoreWrapper(BaseWrapper):
+  """
+  Keeps a local copy of transactions fetched from the node, so that
+  they don't have to be fetched again.
+
+  ``getTrytes`` requests are answered from the store where possible;
+  only transactions that aren't in the store are requested from the
+  node, and the results are added to the store.  All other commands are
+  passed through to the node (e.g., ``findTransactions`` results change
+  as new transactions arrive, but you can query the store directly
+  using :py:meth:`TransactionStore.find_transactions`).
+
+  Example::
+
+     store = TransactionStore('transactions.db')
+     api = Iota(TransactionStoreWrapper('http://localhost:14265', store))
+  """
+  def __init__(self, adapter, store):
+    # type: (AdapterSpec, TransactionStore) -> None
+    super(TransactionStoreWrapper, self).__init__(adapter)
+
+    self.store = store
+
+    self._lock    = Lock()
+    self._metrics = {'hits': 0, 'misses': 0}
+
+  def get_metrics(self):
+    # type: () -> Dict[Text, int]
+    """
+    Returns the number of transactions that were found in the store
+    (``hits``) vs. requested from the node (``misses``).
+    """
+    with self._lock:
+      return dict(self._metrics)
+
+  def send_request(self, payload, **kwargs):
+    # type: (dict, dict) -> dict
+    if payload.get('command') != 'getTrytes':
+      return self.adapter.send_request(payload, **kwargs)
+
+    hashes = list(map(_as_text, payload['hashes']))
+    stored = self.store.get_trytes(hashes)
+
+    missing = [hash_ for hash_ in hashes if hash_ not in stored]
+
+    with self._lock:
+      self._metrics['hits']   += len(hashes) - len(missing)
+      self._metrics['misses'] += len(missing)
+
+    response = {}
+
+    if missing:
+      response = self.adapter.send_request(
+        dict(payload, hashes=missing),
+        **kwargs
+      )
+
+      self.store.add_trytes(missing, response['trytes'])
+
+      stored.update(zip(missing, map(_as_text, response['trytes'])))
+
+    response['trytes'] = [stored[hash_] for hash_ in hashes]
+    return response
@@ -3,16 +3,41 @@ from __future__ import absolute_import, division, print_function, \
   unicode_literals
 
 from abc import ABCMeta, abstractmethod as abstract_method
-from typing import Dict, Text
+from concurrent.futures import ThreadPoolExecutor
+from itertools import product
+from math import ceil
+from random import Random
+from threading import BoundedSemaphore, Event, Lock
+from time import sleep, time
+from typing import Dict, Hashable, Iterator, List, Optional, Sequence, Text, \
+  Tuple
 
-from iota.adapter import AdapterSpec, BaseAdapter, resolve_adapter
-from six import with_metaclass
+from requests.exceptions import ConnectionError as RequestsConnectionError, \
+  Timeout as RequestsTimeout
+
+from iota.adapter import AdapterSpec, BadApiResponse, BaseAdapter, \
+  resolve_adapter
+from iota.exceptions import with_context
+from six import iteritems, text_type, with_metaclass
 
 __all__ = [
+  'ChunkingWrapper',
+  'CircuitBreakerOpen',
+  'CoalescingWrapper',
+  'RateLimitWrapper',
+  'RetryWrapper',
   'RoutingWrapper',
 ]
 
 
+class CircuitBreakerOpen(BadApiResponse):
+  """
+  Indicates that a request was not sent, because the node has been
+  failing and :py:class:`RetryWrapper` is giving it time to recover.
+  """
+  pass
+
+
 class BaseWrapper(with_metaclass(ABCMeta, BaseAdapter)):
   """
   Base functionality for "adapter wrappers", used to extend the
@@ -31,6 +56,14 @@ class BaseWrapper(with_metaclass(ABCMeta, BaseAdapter)):
     # type: () -> Text
     return self.adapter.get_uri()
 
+  def warmup(self, connections=1):
+    # type: (int) -> dict
+    return self.adapter.warmup(connections)
+
+  def get_capabilities(self):
+    # type: () -> Optional[dict]
+    return self.adapter.get_capabilities()
+
   @abstract_method
   def send_request(self, payload, **kwargs):
     # type: (dict, dict) -> dict
@@ -98,8 +131,1127 @@ class RoutingWrapper(BaseWrapper):
     """
     return self.routes.get(command, self.adapter)
 
+  def warmup(self, connections=1):
+    # type: (int) -> dict
+    """
+    Warms up the default adapter and every adapter that commands are
+    routed to.
+
+    :return:
+      The capabilities of the node that the default adapter connects
+      to.
+    """
+    for adapter in set(self.routes.values()) - {self.adapter}:
+      adapter.warmup(connections)
+
+    return self.adapter.warmup(connections)
+
   def send_request(self, payload, **kwargs):
     # type: (dict, dict) -> dict
     command = payload.get('command')
 
     return self.get_adapter(command).send_request(payload, **kwargs)
+
+  def iter_response_values(self, payload, key, **kwargs):
+    # type: (dict, Text, dict) -> Iterator
+    command = payload.get('command')
+
+    return (
+      self.get_adapter(command)
+        .iter_response_values(payload, key, **kwargs)
+    )
+
+
+class ChunkingWrapper(BaseWrapper):
+  """
+  Splits requests with very large array parameters into several
+  smaller requests, sends them concurrently, and then reassembles the
+  responses so that the caller can't tell the difference.
+
+  Nodes limit the number of items that they will accept in a single
+  request (e.g., IRI rejects ``getTrytes`` requests with more than
+  ``MAX_GET_TRYTES`` hashes).  This wrapper allows you to query
+  thousands of addresses/transactions without hitting those limits.
+
+  Example::
+
+     # Send at most 500 hashes per ``getTrytes`` request, and at most
+     # 1000 items per request for the other supported commands.
+     iota = Iota(
+       ChunkingWrapper('http://localhost:14265', chunk_size=1000)
+         .set_chunk_size('getTrytes', 500)
+     )
+
+  If no chunk size is specified and the adapter has been warmed up
+  (see :py:meth:`iota.adapter.BaseAdapter.warmup`), chunks are sized
+  according to the node's request limits.
+  """
+  DEFAULT_CHUNK_SIZE = 1000
+  """
+  Default max number of items to send per chunk, if the node's request
+  limits are not known.
+  """
+
+  capability_limits = {
+    'getTrytes': 'maxGetTrytes',
+  } # type: Dict[Text, Text]
+  """
+  Node capabilities that limit the number of items per request, for
+  commands that are not limited by ``maxRequestsList``.
+  """
+
+  DEFAULT_MAX_WORKERS = 4
+  """
+  Default max number of chunks to send at the same time.
+  """
+
+  MERGE_CONCAT  = 'concat'
+  MERGE_UNION   = 'union'
+
+  chunkable_commands = {
+    'findTransactions': (
+      ('addresses', 'approvees', 'bundles', 'tags'),
+      'hashes',
+      MERGE_UNION,
+    ),
+
+    'getBalances':            (('addresses',), 'balances', MERGE_CONCAT),
+    'getInclusionStates':     (('transactions',), 'states', MERGE_CONCAT),
+    'getTrytes':              (('hashes',), 'trytes', MERGE_CONCAT),
+    'wereAddressesSpentFrom': (('addresses',), 'states', MERGE_CONCAT),
+  } # type: Dict[Text, Tuple[Tuple[Text, ...], Text, Text]]
+  """
+  Commands that this wrapper knows how to split.
+
+  Each value is a tuple containing:
+
+  - The request parameters that may be split into chunks.
+  - The response key containing the values for each item.
+  - How to combine the response values from each chunk:
+
+    - ``concat``: responses are concatenated in the same order as the
+      request items (the node returns one value per request item).
+    - ``union``: responses are combined and de-duplicated (the node
+      returns a set of results for the entire request).
+  """
+
+  def __init__(
+      self,
+      adapter,
+      chunk_size  = None,
+      max_workers = DEFAULT_MAX_WORKERS,
+  ):
+    # type: (AdapterSpec, Optional[int], int) -> None
+    """
+    :param adapter:
+      Adapter that will send the (chunked) requests to the node.
+
+    :param chunk_size:
+      Max number of items to send per request, for any command that
+      doesn't have its own chunk size (see :py:meth:`set_chunk_size`).
+
+      If ``None``, the node's request limits are used if known (see
+      :py:meth:`iota.adapter.BaseAdapter.get_capabilities`), otherwise
+      :py:attr:`DEFAULT_CHUNK_SIZE`.
+
+    :param max_workers:
+      Max number of chunks to send at the same time.
+      Set to 1 to send chunks sequentially.
+
+      Note that the wrapped adapter must be thread-safe if this value
+      is greater than 1 (all of the adapters that ship with PyOTA are).
+    """
+    super(ChunkingWrapper, self).__init__(adapter)
+
+    self.chunk_size   = chunk_size
+    self.max_workers  = max_workers
+
+    self.chunk_sizes = {} # type: Dict[Text, int]
+
+    self._executor = None # type: Optional[ThreadPoolExecutor]
+
+  def set_chunk_size(self, command, chunk_size):
+    # type: (Text, int) -> ChunkingWrapper
+    """
+    Sets the max number of items to send per request for a particular
+    command.
+
+    :param command:
+      The name of the command (e.g., "getTrytes").
+
+    :param chunk_size:
+      Max number of items per request.
+    """
+    self.chunk_sizes[command] = chunk_size
+    return self
+
+  def get_chunk_size(self, command):
+    # type: (Text) -> int
+    """
+    Returns the max number of items per request for the specified
+    command.
+    """
+    if command in self.chunk_sizes:
+      return self.chunk_sizes[command]
+
+    if self.chunk_size is not None:
+      return self.chunk_size
+
+    capabilities = self.adapter.get_capabilities()
+    if capabilities:
+      return capabilities[
+        self.capability_limits.get(command, 'maxRequestsList')
+      ]
+
+    return self.DEFAULT_CHUNK_SIZE
+
+  def send_request(self, payload, **kwargs):
+    # type: (dict, dict) -> dict
+    command = payload.get('command')
+
+    try:
+      param_keys, response_key, merge = self.chunkable_commands[command]
+    except KeyError:
+      return self.adapter.send_request(payload, **kwargs)
+
+    chunks = self._split_payload(
+      payload     = payload,
+      param_keys  = param_keys,
+      chunk_size  = self.get_chunk_size(command),
+    )
+
+    if len(chunks) < 2:
+      return self.adapter.send_request(payload, **kwargs)
+
+    if self.max_workers > 1:
+      responses = list(self._get_executor().map(
+        lambda chunk: self.adapter.send_request(chunk, **kwargs),
+        chunks,
+      ))
+    else:
+      responses = [self.adapter.send_request(c, **kwargs) for c in chunks]
+
+    return self._merge_responses(responses, response_key, merge)
+
+  def _get_executor(self):
+    # type: () -> ThreadPoolExecutor
+    """
+    Returns the thread pool used to send chunks concurrently.
+
+    The pool is created on first use, so that wrappers which never
+    need to split a request don't spawn any threads.
+    """
+    if self._executor is None:
+      self._executor = ThreadPoolExecutor(max_workers=self.max_workers)
+
+    return self._executor
+
+  @staticmethod
+  def _split_payload(payload, param_keys, chunk_size):
+    # type: (dict, Sequence[Text], int) -> List[dict]
+    """
+    Splits a request payload into chunks.
+
+    If more than one parameter is too large (e.g., a
+    ``findTransactions`` request with lots of addresses *and* lots of
+    bundles), the result contains every combination of chunks.  This
+    is OK because ``findTransactions`` returns the intersection of its
+    search terms, and intersection distributes over union.
+    """
+    split_params = [] # type: List[List[Tuple[Text, list]]]
+
+    for key in param_keys:
+      values = payload.get(key)
+
+      if values and (len(values) > chunk_size):
+        values = list(values)
+
+        split_params.append([
+          (key, values[i:i + chunk_size])
+            for i in range(0, len(values), chunk_size)
+        ])
+
+    if not split_params:
+      return [payload]
+
+    chunks = []
+    for combination in product(*split_params):
+      chunk = dict(payload)
+      chunk.update(combination)
+      chunks.append(chunk)
+
+    return chunks
+
+  @staticmethod
+  def _merge_responses(responses, response_key, merge):
+    # type: (List[dict], Text, Text) -> dict
+    """
+    Combines the responses for each chunk into a single response.
+    """
+    merged = dict(responses[0])
+
+    values = []
+    if merge == ChunkingWrapper.MERGE_UNION:
+      seen = set()
+
+      for response in responses:
+        for value in response.get(response_key) or []:
+          if value not in seen:
+            seen.add(value)
+            values.append(value)
+    else:
+      for response in responses:
+        values.extend(response.get(response_key) or [])
+
+    merged[response_key] = values
+
+    if 'duration' in merged:
+      # Report the total amount of time the node spent processing the
+      # request.
+      merged['duration'] = sum(r.get('duration') or 0 for r in responses)
+
+    if 'milestoneIndex' in merged:
+      # If the node's latest milestone changed while we were sending
+      # the chunks, report the oldest milestone, since that's the one
+      # that all of the results are guaranteed to reflect.
+      oldest = min(
+        responses,
+        key = lambda r: r.get('milestoneIndex') or 0,
+      )
+
+      for key, value in iteritems(oldest):
+        if key.startswith('milestone'):
+          merged[key] = value
+
+    return merged
+
+
+class CoalescingWrapper(BaseWrapper):
+  """
+  Merges requests for the same command that are sent at (nearly) the
+  same time from different threads into a single request.
+
+  The first thread to send a request opens a "batch" and waits for a
+  short interval; any other thread that sends a compatible request
+  during that interval joins the batch instead of contacting the node.
+  Once the interval elapses, the first thread sends one request
+  containing every (de-duplicated) item in the batch, and each thread
+  receives only the values that it asked for.
+
+  Example::
+
+     # Worker threads share a single API instance.
+     iota = Iota(CoalescingWrapper('http://localhost:14265', window=0.003))
+  """
+  DEFAULT_WINDOW = 0.003
+  """
+  Default number of seconds to wait for other requests to join a
+  batch.
+  """
+
+  coalescable_commands = {
+    'getBalances':            ('addresses', 'balances'),
+    'getInclusionStates':     ('transactions', 'states'),
+    'getTrytes':              ('hashes', 'trytes'),
+    'wereAddressesSpentFrom': ('addresses', 'states'),
+  } # type: Dict[Text, Tuple[Text, Text]]
+  """
+  Commands that this wrapper knows how to merge.
+
+  Each value is a tuple containing the request parameter that is
+  merged, and the response key containing one value per request item.
+
+  Note that requests are only merged if all of their other parameters
+  are identical (e.g., ``getBalances`` requests with different
+  ``threshold`` values are sent separately).
+  """
+
+  def __init__(self, adapter, window=DEFAULT_WINDOW, max_batch_size=None):
+    # type: (AdapterSpec, float, Optional[int]) -> None
+    """
+    :param adapter:
+      Adapter that will send the merged requests to the node.
+
+    :param window:
+      Number of seconds to wait for other requests to join a batch.
+
+      Larger values merge more requests, but every request is delayed
+      by up to this amount.
+
+    :param max_batch_size:
+      Max number of distinct items to include in a single batch.
+      Once a batch is full, new requests will start a new batch.
+
+      If ``None``, batches may grow without limit; consider combining
+      this wrapper with :py:class:`ChunkingWrapper` in that case.
+    """
+    super(CoalescingWrapper, self).__init__(adapter)
+
+    self.window         = window
+    self.max_batch_size = max_batch_size
+
+    self._lock    = Lock()
+    self._pending = {} # type: Dict[Hashable, _CoalescedBatch]
+
+  def send_request(self, payload, **kwargs):
+    # type: (dict, dict) -> dict
+    command = payload.get('command')
+
+    try:
+      param_key, response_key = self.coalescable_commands[command]
+    except KeyError:
+      return self.adapter.send_request(payload, **kwargs)
+
+    keys = [text_type(item) for item in payload.get(param_key) or []]
+    batch_key = self._get_batch_key(payload, param_key)
+
+    with self._lock:
+      batch = self._pending.get(batch_key)
+      is_leader = batch is None
+
+      if is_leader:
+        batch = self._pending[batch_key] =\
+          _CoalescedBatch(payload, param_key, response_key)
+
+      batch.add(keys)
+
+      if (
+            (self.max_batch_size is not None)
+        and (len(batch.keys) >= self.max_batch_size)
+      ):
+        # Close the batch so that subsequent requests start a new one.
+        self._close(batch_key, batch)
+
+    if is_leader:
+      self._wait_for_batch(batch)
+
+      with self._lock:
+        self._close(batch_key, batch)
+
+      batch.send(self.adapter, **kwargs)
+    else:
+      batch.done.wait()
+
+    return batch.get_response(keys)
+
+  def _close(self, batch_key, batch):
+    # type: (Hashable, _CoalescedBatch) -> None
+    """
+    Prevents any more requests from joining a batch.
+
+    Must be called while holding :py:attr:`_lock`.
+    """
+    if self._pending.get(batch_key) is batch:
+      del self._pending[batch_key]
+
+  def _wait_for_batch(self, batch):
+    # type: (_CoalescedBatch) -> None
+    """
+    Waits for other requests to join the batch.
+
+    Implemented as a separate method so that it can be mocked during
+    unit tests.
+    """
+    sleep(self.window)
+
+  @staticmethod
+  def _get_batch_key(payload, param_key):
+    # type: (dict, Text) -> Hashable
+    """
+    Returns a value that identifies requests that can be merged.
+    """
+    key = []
+
+    for name, value in sorted(iteritems(payload)):
+      if name == param_key:
+        continue
+
+      if isinstance(value, (list, tuple)):
+        value = tuple(text_type(v) for v in value)
+      else:
+        value = text_type(value)
+
+      key.append((name, value))
+
+    return tuple(key)
+
+
+class _CoalescedBatch(object):
+  """
+  A group of requests that will be sent to the node together.
+
+  Used by :py:class:`CoalescingWrapper`.
+  """
+  def __init__(self, payload, param_key, response_key):
+    # type: (dict, Text, Text) -> None
+    super(_CoalescedBatch, self).__init__()
+
+    self.payload      = payload
+    self.param_key    = param_key
+    self.response_key = response_key
+
+    self.keys   = [] # type: List[Text]
+    self.done   = Event()
+    self.size   = 0
+
+    self._seen      = set()
+    self._error     = None # type: Optional[BaseException]
+    self._response  = None # type: Optional[dict]
+    self._values    = {} # type: Dict[Text, object]
+
+  def add(self, keys):
+    # type: (Sequence[Text]) -> None
+    """
+    Adds a request's items to the batch.
+    """
+    self.size += 1
+
+    for key in keys:
+      if key not in self._seen:
+        self._seen.add(key)
+        self.keys.append(key)
+
+  def send(self, adapter, **kwargs):
+    # type: (BaseAdapter, dict) -> None
+    """
+    Sends the merged request and notifies everyone in the batch.
+    """
+    payload = dict(self.payload)
+    payload[self.param_key] = self.keys
+
+    try:
+      self._response = adapter.send_request(payload, **kwargs)
+      self._values = dict(zip(
+        self.keys,
+        self._response.get(self.response_key) or [],
+      ))
+    except BaseException as e:
+      # Includes exceptions like ``KeyboardInterrupt``; otherwise the
+      # other requests in the batch would have no response to read.
+      self._error = e
+    finally:
+      self.done.set()
+
+  def get_response(self, keys):
+    # type: (Sequence[Text]) -> dict
+    """
+    Extracts the response for a single request in the batch.
+    """
+    if self._error is not None:
+      raise self._error
+
+    response = dict(self._response)
+    response[self.response_key] = [self._values.get(key) for key in keys]
+    return response
+
+
+class RetryWrapper(BaseWrapper):
+  """
+  Retries requests that fail due to transient problems (connection
+  errors, timeouts and 5xx responses), and stops sending requests to a
+  node that keeps failing.
+
+  Only idempotent commands are retried by default (see
+  :py:attr:`idempotent_commands`).  Between attempts, the wrapper waits
+  for an exponentially-increasing, randomized ("jittered") delay.
+
+  If too many consecutive requests fail, the wrapper's circuit breaker
+  "opens", and any further requests fail immediately with
+  :py:class:`CircuitBreakerOpen` until ``reset_timeout`` seconds have
+  passed.  After that, one request is let through as a trial; if it
+  succeeds, the breaker closes and requests are sent normally again.
+
+  Example::
+
+     iota = Iota(
+       RetryWrapper('http://localhost:14265', max_retries=5)
+         # Give up on ``getTransactionsToApprove`` more quickly.
+         .set_max_retries('getTransactionsToApprove', 1)
+     )
+  """
+  DEFAULT_MAX_RETRIES = 3
+  """
+  Default number of times to retry a failed request.
+  """
+
+  STATE_CLOSED    = 'closed'
+  STATE_HALF_OPEN = 'half_open'
+  STATE_OPEN      = 'open'
+
+  idempotent_commands = {
+    'broadcastTransactions',
+    'checkConsistency',
+    'findTransactions',
+    'getBalances',
+    'getInclusionStates',
+    'getNeighbors',
+    'getNodeInfo',
+    'getTips',
+    'getTransactionsToApprove',
+    'getTrytes',
+    'storeTransactions',
+    'wereAddressesSpentFrom',
+  }
+  """
+  Commands that are safe to send more than once, and are therefore
+  retried by default.
+
+  Note that ``attachToTangle`` is excluded, since repeating the PoW is
+  expensive, as are commands that modify the node's configuration.
+  """
+
+  def __init__(
+      self,
+      adapter,
+      max_retries       = DEFAULT_MAX_RETRIES,
+      base_delay        = 0.1,
+      max_delay         = 10.0,
+      failure_threshold = 5,
+      reset_timeout     = 30.0,
+  ):
+    # type: (AdapterSpec, int, float, float, Optional[int], float) -> None
+    """
+    :param adapter:
+      Adapter that will send the requests to the node.
+
+    :param max_retries:
+      Number of times to retry a failed request for an idempotent
+      command.  Use :py:meth:`set_max_retries` to override this for
+      individual commands.
+
+    :param base_delay:
+      Number of seconds to wait (on average) before the first retry.
+      The delay doubles with each retry.
+
+    :param max_delay:
+      Max number of seconds to wait between retries.
+
+    :param failure_threshold:
+      Number of consecutive failed attempts that will open the circuit
+      breaker.  If ``None``, the circuit breaker is disabled.
+
+    :param reset_timeout:
+      Number of seconds to wait after the circuit breaker opens before
+      sending a trial request to the node.
+    """
+    super(RetryWrapper, self).__init__(adapter)
+
+    self.max_retries        = max_retries
+    self.base_delay         = base_delay
+    self.max_delay          = max_delay
+    self.failure_threshold  = failure_threshold
+    self.reset_timeout      = reset_timeout
+
+    self.retry_policies = {} # type: Dict[Text, int]
+
+    self._lock    = Lock()
+    self._random  = Random()
+
+    self._state                 = self.STATE_CLOSED
+    self._consecutive_failures  = 0
+    self._opened_at             = None # type: Optional[float]
+    self._trial_in_progress     = False
+
+    self._metrics = {
+      'attempts':       0,
+      'breaker_opened': 0,
+      'failures':       0,
+      'rejected':       0,
+      'retries':        0,
+      'successes':      0,
+    } # type: Dict[Text, int]
+
+    self._retries_by_command = {} # type: Dict[Text, int]
+
+  def set_max_retries(self, command, max_retries):
+    # type: (Text, int) -> RetryWrapper
+    """
+    Sets the number of times to retry failed requests for a command.
+
+    This also applies to commands that are not in
+    :py:attr:`idempotent_commands`, so only use it for commands that
+    you know are safe to repeat.  Set to 0 to disable retries for a
+    command.
+    """
+    self.retry_policies[command] = max_retries
+    return self
+
+  def get_max_retries(self, command):
+    # type: (Text) -> int
+    """
+    Returns the number of times to retry failed requests for a command.
+    """
+    try:
+      return self.retry_policies[command]
+    except KeyError:
+      return (
+        self.max_retries
+          if command in self.idempotent_commands
+          else 0
+      )
+
+  @property
+  def state(self):
+    # type: () -> Text
+    """
+    Current state of the circuit breaker.
+    """
+    with self._lock:
+      return self._get_state()
+
+  def get_metrics(self):
+    # type: () -> dict
+    """
+    Returns a snapshot of the wrapper's counters:
+
+    - ``attempts``: requests sent to the node (including retries).
+    - ``successes``: requests that eventually succeeded.
+    - ``failures``: requests that failed, after all retries.
+    - ``retries``: number of retries.
+    - ``retries_by_command``: number of retries for each command.
+    - ``rejected``: requests that failed immediately because the
+      circuit breaker was open.
+    - ``breaker_opened``: number of times the circuit breaker opened.
+    - ``state``: current state of the circuit breaker.
+    """
+    with self._lock:
+      metrics = dict(self._metrics)
+      metrics['retries_by_command'] = dict(self._retries_by_command)
+      metrics['state'] = self._get_state()
+
+    return metrics
+
+  def send_request(self, payload, **kwargs):
+    # type: (dict, dict) -> dict
+    command     = payload.get('command')
+    max_retries = self.get_max_retries(command)
+    attempt     = 0
+
+    while True:
+      self._before_attempt(payload)
+
+      try:
+        response = self.adapter.send_request(payload, **kwargs)
+      except Exception as e:
+        is_transient = self._is_transient(e)
+        self._after_attempt(success=not is_transient)
+
+        if (not is_transient) or (attempt >= max_retries):
+          with self._lock:
+            self._metrics['failures'] += 1
+          raise
+
+        with self._lock:
+          self._metrics['retries'] += 1
+          self._retries_by_command[command] =\
+            self._retries_by_command.get(command, 0) + 1
+
+        self._wait_for_retry(self._get_delay(attempt))
+        attempt += 1
+      else:
+        self._after_attempt(success=True)
+
+        with self._lock:
+          self._metrics['successes'] += 1
+
+        return response
+
+  def _before_attempt(self, payload):
+    # type: (dict) -> None
+    """
+    Checks the circuit breaker before sending a request.
+
+    :raise:
+      - :py:class:`CircuitBreakerOpen` if the request should not be
+        sent.
+    """
+    with self._lock:
+      state = self._get_state()
+
+      if state == self.STATE_CLOSED:
+        self._metrics['attempts'] += 1
+        return
+
+      if (state == self.STATE_HALF_OPEN) and not self._trial_in_progress:
+        # Let this request through to see if the node has recovered.
+        self._trial_in_progress = True
+        self._metrics['attempts'] += 1
+        return
+
+      self._metrics['rejected'] += 1
+
+    raise with_context(
+      exc = CircuitBreakerOpen(
+        'Not sending {command} request; '
+        'node at {uri} has failed {failures} times in a row.'.format(
+          command   = payload.get('command'),
+          failures  = self._consecutive_failures,
+          uri       = self.get_uri(),
+        ),
+      ),
+
+      context = {
+        'request': payload,
+      },
+    )
+
+  def _after_attempt(self, success):
+    # type: (bool) -> None
+    """
+    Updates the circuit breaker after a request is sent.
+    """
+    with self._lock:
+      was_trial = self._trial_in_progress
+      self._trial_in_progress = False
+
+      if success:
+        self._consecutive_failures  = 0
+        self._opened_at             = None
+        self._state                 = self.STATE_CLOSED
+        return
+
+      self._consecutive_failures += 1
+
+      if self.failure_threshold is None:
+        return
+
+      if was_trial or (self._consecutive_failures >= self.failure_threshold):
+        if self._state != self.STATE_OPEN:
+          self._metrics['breaker_opened'] += 1
+
+        self._state     = self.STATE_OPEN
+        self._opened_at = self._now()
+
+  def _get_state(self):
+    # type: () -> Text
+    """
+    Returns the current state of the circuit breaker.
+
+    Must be called while holding :py:attr:`_lock`.
+    """
+    if (
+          (self._state == self.STATE_OPEN)
+      and (self._now() - self._opened_at >= self.reset_timeout)
+    ):
+      self._state = self.STATE_HALF_OPEN
+
+    return self._state
+
+  def _get_delay(self, attempt):
+    # type: (int) -> float
+    """
+    Returns the number of seconds to wait before the next retry.
+
+    Uses "full jitter": the delay is chosen at random from between 0
+    and the exponential backoff value, so that clients that failed at
+    the same time don't all retry at the same time.
+
+    References:
+      - https://aws.amazon.com/blogs/architecture/exponential-backoff-and-jitter/
+    """
+    return self._random.uniform(
+      0,
+      min(self.max_delay, self.base_delay * (2 ** attempt)),
+    )
+
+  @staticmethod
+  def _is_transient(error):
+    # type: (Exception) -> bool
+    """
+    Returns whether a request that failed with the specified error is
+    worth retrying.
+    """
+    if isinstance(error, (RequestsConnectionError, RequestsTimeout)):
+      return True
+
+    if isinstance(error, BadApiResponse):
+      context = getattr(error, 'context', None) or {}
+      status  = context.get('status')
+
+      return (status is not None) and (status >= 500)
+
+    return False
+
+  def _wait_for_retry(self, delay):
+    # type: (float) -> None
+    """
+    Waits before retrying a request.
+
+    Implemented as a separate method so that it can be mocked during
+    unit tests.
+    """
+    sleep(delay)
+
+  @staticmethod
+  def _now():
+    # type: () -> float
+    """
+    Returns the current time, for the circuit breaker.
+
+    Implemented as a separate method so that it can be mocked during
+    unit tests.
+    """
+    return time()
+
+
+class RateLimitWrapper(BaseWrapper):
+  """
+  Limits the rate at which requests are sent to the node, and the
+  number of requests that are in progress at the same time.
+
+  Rate limits use the "token bucket" algorithm: the bucket holds up to
+  ``burst`` tokens and refills at ``rate`` tokens per second; each
+  request takes one token.  When the bucket is empty, requests wait in
+  line for a token instead of failing.
+
+  The wrapper is thread-safe; a single instance can be shared by any
+  number of threads (including the executor threads that asyncio code
+  uses to call the API via ``loop.run_in_executor``).
+
+  Example::
+
+     iota = Iota(
+       RateLimitWrapper('http://localhost:14265', rate=10, max_in_flight=4)
+         # ``getTrytes`` responses are large; be gentle.
+         .set_rate_limit('getTrytes', rate=2)
+     )
+  """
+  def __init__(self, adapter, rate=None, burst=None, max_in_flight=None):
+    # type: (AdapterSpec, Optional[float], Optional[int], Optional[int]) -> None
+    """
+    :param adapter:
+      Adapter that will send the requests to the node.
+
+    :param rate:
+      Max number of requests per second, across all commands.
+      If ``None``, there is no global rate limit.
+
+    :param burst:
+      Max number of requests that can be sent at once, after a period
+      of inactivity.  Defaults to ``rate`` (rounded up).
+
+    :param max_in_flight:
+      Max number of requests that can be in progress at the same time.
+      If ``None``, there is no limit.
+    """
+    super(RateLimitWrapper, self).__init__(adapter)
+
+    self.max_in_flight = max_in_flight
+
+    self._lock = Lock()
+
+    self._global_bucket = (
+      None
+        if rate is None
+        else _TokenBucket(rate, burst)
+    ) # type: Optional[_TokenBucket]
+
+    self._command_buckets = {} # type: Dict[Text, _TokenBucket]
+
+    self._semaphore = (
+      None
+        if max_in_flight is None
+        else BoundedSemaphore(max_in_flight)
+    )
+
+    self._in_flight = 0
+
+    self._metrics = {
+      'max_wait':   0.0,
+      'queued':     0,
+      'requests':   0,
+      'total_wait': 0.0,
+    } # type: Dict[Text, float]
+
+    self._wait_by_command = {} # type: Dict[Text, float]
+
+  def set_rate_limit(self, command, rate, burst=None):
+    # type: (Text, float, Optional[int]) -> RateLimitWrapper
+    """
+    Sets the rate limit for a command.
+
+    Requests for this command must also stay within the global rate
+    limit (if any).
+
+    :param command:
+      The name of the command (e.g., "getTrytes").
+
+    :param rate:
+      Max number of requests per second for this command.
+
+    :param burst:
+      Max number of requests for this command that can be sent at once.
+      Defaults to ``rate`` (rounded up).
+    """
+    with self._lock:
+      self._command_buckets[command] = _TokenBucket(rate, burst)
+
+    return self
+
+  def get_metrics(self):
+    # type: () -> dict
+    """
+    Returns a snapshot of the wrapper's counters:
+
+    - ``requests``: number of requests sent.
+    - ``queued``: number of requests that had to wait.
+    - ``total_wait``: total number of seconds that requests waited.
+    - ``max_wait``: longest wait for a single request, in seconds.
+    - ``average_wait``: average wait per request, in seconds.
+    - ``wait_by_command``: total wait for each command, in seconds.
+    - ``in_flight``: number of requests currently in progress.
+
+    If requests regularly have to wait, you may need more nodes (or a
+    higher limit).
+    """
+    with self._lock:
+      metrics = dict(self._metrics)
+      metrics['wait_by_command'] = dict(self._wait_by_command)
+      metrics['in_flight'] = self._in_flight
+
+    metrics['average_wait'] = (
+      metrics['total_wait'] / metrics['requests']
+        if metrics['requests']
+        else 0.0
+    )
+
+    return metrics
+
+  def send_request(self, payload, **kwargs):
+    # type: (dict, dict) -> dict
+    command = payload.get('command')
+    start   = self._now()
+
+    with self._lock:
+      buckets = [self._global_bucket, self._command_buckets.get(command)]
+
+      # Reserve a token from each bucket now, so that requests are
+      # served in the order they arrive.
+      delay = max([
+        bucket.reserve(start)
+          for bucket in buckets
+          if bucket is not None
+      ] or [0])
+
+    queued = delay > 0
+
+    if queued:
+      self._wait(delay)
+
+    if self._semaphore is not None:
+      # Only count the request as queued if it actually has to wait for
+      # another request to finish.
+      if not self._semaphore.acquire(False):
+        queued = True
+        self._semaphore.acquire()
+
+    try:
+      waited = max(self._now() - start, 0.0)
+
+      with self._lock:
+        self._in_flight += 1
+        self._record_wait(command, waited, queued)
+
+      try:
+        return self.adapter.send_request(payload, **kwargs)
+      finally:
+        with self._lock:
+          self._in_flight -= 1
+    finally:
+      if self._semaphore is not None:
+        self._semaphore.release()
+
+  def _record_wait(self, command, waited, queued):
+    # type: (Text, float, bool) -> None
+    """
+    Updates queue wait statistics.
+
+    Must be called while holding :py:attr:`_lock`.
+
+    :param waited:
+      Number of seconds since the request arrived.
+
+    :param queued:
+      Whether the request had to wait for a rate limit token or for a
+      free slot (as opposed to just the overhead of checking).
+    """
+    self._metrics['requests']   += 1
+    self._metrics['total_wait'] += waited
+    self._metrics['max_wait']    = max(self._metrics['max_wait'], waited)
+
+    if queued:
+      self._metrics['queued'] += 1
+
+    self._wait_by_command[command] =\
+      self._wait_by_command.get(command, 0.0) + waited
+
+  def _wait(self, delay):
+    # type: (float) -> None
+    """
+    Waits for a rate limit token.
+
+    Implemented as a separate method so that it can be mocked during
+    unit tests.
+    """
+    sleep(delay)
+
+  @staticmethod
+  def _now():
+    # type: () -> float
+    """
+    Returns the current time, for the rate limiters.
+
+    Implemented as a separate method so that it can be mocked during
+    unit tests.
+    """
+    return time()
+
+
+class _TokenBucket(object):
+  """
+  Token bucket rate limiter.
+
+  Used by :py:class:`RateLimitWrapper`.  Not thread-safe on its own.
+  """
+  def __init__(self, rate, capacity):
+    # type: (float, Optional[int]) -> None
+    super(_TokenBucket, self).__init__()
+
+    if rate <= 0:
+      raise with_context(
+        exc = ValueError('Rate must be positive (got {rate}).'.format(
+          rate = rate,
+        )),
+
+        context = {
+          'rate': rate,
+        },
+      )
+
+    self.rate     = rate
+    self.capacity = capacity or max(1, int(ceil(rate)))
+
+    self._tokens  = float(self.capacity)
+    self._updated = None # type: Optional[float]
+
+  def reserve(self, now):
+    # type: (float) -> float
+    """
+    Takes a token from the bucket, and returns the number of seconds
+    to wait before the token may be used.
+
+    If the bucket is empty, the token is "borrowed" from the future,
+    so that subsequent callers have to wait their turn.
+    """
+    if self._updated is not None:
+      elapsed = max(now - self._updated, 0.0)
+      self._tokens = min(self.capacity, self._tokens + elapsed * self.rate)
+
+    self._updated = now
+
+    self._tokens -= 1
+
+    if self._tokens >= 0:
+      return 0.0
+
+    return -self._tokens / self.rate
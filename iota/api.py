@@ -2,7 +2,7 @@
 from __future__ import absolute_import, division, print_function, \
   unicode_literals
 
-from typing import Dict, Iterable, Optional, Text
+from typing import Dict, Iterable, Iterator, Optional, Text
 
 from iota import AdapterSpec, Address, ProposedTransaction, Tag, \
   TransactionHash, TransactionTrytes, TryteString, TrytesCompatible
@@ -10,6 +10,7 @@ from iota.adapter import BaseAdapter, resolve_adapter
 from iota.commands import BaseCommand, CustomCommand, core, \
   discover_commands, extended
 from iota.commands.extended.helpers import Helpers
+from iota.commands.extended.utils import SCAN_WINDOW_SIZE
 from iota.crypto.addresses import AddressGenerator
 from iota.crypto.types import Seed
 from six import with_metaclass
@@ -63,14 +64,18 @@ class StrictIota(with_metaclass(ApiMeta)):
   """
   commands = discover_commands('iota.commands.core')
 
-  def __init__(self, adapter, testnet=False):
-    # type: (AdapterSpec, bool) -> None
+  def __init__(self, adapter, testnet=False, warmup=False):
+    # type: (AdapterSpec, bool, bool) -> None
     """
     :param adapter:
       URI string or BaseAdapter instance.
 
     :param testnet:
       Whether to use testnet settings for this instance.
+
+    :param warmup:
+      Whether to warm up the adapter immediately (see
+      :py:meth:`warmup`).
     """
     super(StrictIota, self).__init__()
 
@@ -80,6 +85,9 @@ class StrictIota(with_metaclass(ApiMeta)):
     self.adapter  = adapter # type: BaseAdapter
     self.testnet = testnet
 
+    if warmup:
+      self.warmup()
+
   def __getattr__(self, command):
     # type: (Text) -> BaseCommand
     """
@@ -127,6 +135,27 @@ class StrictIota(with_metaclass(ApiMeta)):
     """
     return CustomCommand(self.adapter, command)
 
+  def warmup(self, connections=1):
+    # type: (int) -> dict
+    """
+    Prepares the adapter, so that the first command doesn't have to pay
+    for connection setup (DNS lookup, TCP and TLS handshakes, etc.).
+
+    Opens ``connections`` pooled connections to the node (for adapters
+    that support connection pooling), sends ``getNodeInfo``, and caches
+    the node's capabilities (e.g., request limits, which
+    :py:class:`iota.adapter.wrappers.ChunkingWrapper` uses to size
+    chunks).
+
+    :param connections:
+      Number of connections to open in advance.
+
+    :return:
+      The node's capabilities.  See
+      :py:func:`iota.adapter.get_node_capabilities`.
+    """
+    return self.adapter.warmup(connections)
+
   @property
   def default_min_weight_magnitude(self):
     # type: () -> int
@@ -389,6 +418,63 @@ class StrictIota(with_metaclass(ApiMeta)):
     """
     return core.InterruptAttachingToTangleCommand(self.adapter)()
 
+  def iter_find_transactions(
+      self,
+      bundles   = None,
+      addresses = None,
+      tags      = None,
+      approvees = None,
+  ):
+    # type: (Optional[Iterable[TransactionHash]], Optional[Iterable[Address]], Optional[Iterable[Tag]], Optional[Iterable[TransactionHash]]) -> Iterator[TransactionHash]
+    """
+    Like :py:meth:`find_transactions`, but yields each transaction hash
+    as it is received from the node, instead of decoding the entire
+    response into memory first.
+
+    Useful for queries that match a very large number of transactions.
+
+    :param bundles:
+      List of transaction IDs.
+
+    :param addresses:
+      List of addresses.
+
+    :param tags:
+      List of tags.
+
+    :param approvees:
+      List of approvee transaction IDs.
+
+    :return:
+      Iterator of :py:class:`TransactionHash` objects.
+
+    References:
+      - https://iota.readme.io/docs/findtransactions
+    """
+    return core.FindTransactionsCommand(self.adapter).iterate(
+      bundles   = bundles,
+      addresses = addresses,
+      tags      = tags,
+      approvees = approvees,
+    )
+
+  def iter_get_trytes(self, hashes):
+    # type: (Iterable[TransactionHash]) -> Iterator[TryteString]
+    """
+    Like :py:meth:`get_trytes`, but yields the raw transaction data
+    (trytes) for each transaction as it is received from the node,
+    instead of decoding the entire response into memory first.
+
+    Trytes are yielded in the same order as ``hashes``.
+
+    :return:
+      Iterator of :py:class:`TryteString` objects.
+
+    References:
+      - https://iota.readme.io/docs/gettrytes
+    """
+    return core.GetTrytesCommand(self.adapter).iterate(hashes=hashes)
+
   def remove_neighbors(self, uris):
     # type: (Iterable[Text]) -> dict
     """
@@ -445,8 +531,8 @@ class Iota(StrictIota):
   """
   commands = discover_commands('iota.commands.extended')
 
-  def __init__(self, adapter, seed=None, testnet=False):
-    # type: (AdapterSpec, Optional[TrytesCompatible], bool) -> None
+  def __init__(self, adapter, seed=None, testnet=False, warmup=False):
+    # type: (AdapterSpec, Optional[TrytesCompatible], bool, bool) -> None
     """
     :param seed:
       Seed used to generate new addresses.
@@ -454,7 +540,7 @@ class Iota(StrictIota):
 
       Note: This value is never transferred to the node/network.
     """
-    super(Iota, self).__init__(adapter, testnet)
+    super(Iota, self).__init__(adapter, testnet, warmup)
 
     self.seed = Seed(seed) if seed else Seed.random()
     self.helpers = Helpers(self)
@@ -478,8 +564,14 @@ class Iota(StrictIota):
     """
     return extended.BroadcastAndStoreCommand(self.adapter)(trytes=trytes)
 
-  def get_account_data(self, start=0, stop=None, inclusion_states=False):
-    # type: (int, Optional[int], bool) -> dict
+  def get_account_data(
+      self,
+      start             = 0,
+      stop              = None,
+      inclusion_states  = False,
+      window_size       = SCAN_WINDOW_SIZE,
+  ):
+    # type: (int, Optional[int], bool, int) -> dict
     """
     More comprehensive version of :py:meth:`get_transfers` that returns
     addresses and account balance in addition to bundles.
@@ -505,6 +597,12 @@ class Iota(StrictIota):
       This requires an additional API call to the node, so it is
       disabled by default.
 
+    :param window_size:
+      Only used if ``stop`` is ``None``.
+
+      Max number of addresses to check per ``findTransactions`` request
+      while scanning for used addresses.
+
     :return:
       Dict containing the following values::
 
@@ -525,24 +623,33 @@ class Iota(StrictIota):
       start           = start,
       stop            = stop,
       inclusionStates = inclusion_states,
+      windowSize      = window_size,
     )
 
-  def get_bundles(self, transaction):
-    # type: (TransactionHash) -> dict
+  def get_bundles(self, transaction=None, transactions=None):
+    # type: (Optional[TransactionHash], Optional[Iterable[TransactionHash]]) -> dict
     """
     Returns the bundle(s) associated with the specified transaction
-    hash.
+    hash(es).
 
     :param transaction:
       Transaction hash.  Must be a tail transaction.
 
+    :param transactions:
+      Use instead of ``transaction`` to fetch many bundles at once.
+      Each hash must be a tail transaction.
+
+      This is much faster than calling ``get_bundles`` for each
+      transaction, as the bundles are fetched together.
+
     :return:
       Dict with the following structure::
 
          {
            'bundles': List[Bundle],
-             List of matching bundles.  Note that this value is always
-             a list, even if only one bundle was found.
+             List of matching bundles, one per tail transaction, in
+             the same order.  Note that this value is always a list,
+             even if only one bundle was found.
          }
 
     :raise:
@@ -552,10 +659,19 @@ class Iota(StrictIota):
     References:
       - https://github.com/iotaledger/wiki/blob/master/api-proposal.md#getbundle
     """
-    return extended.GetBundlesCommand(self.adapter)(transaction=transaction)
+    return extended.GetBundlesCommand(self.adapter)(
+      transaction   = transaction,
+      transactions  = transactions,
+    )
 
-  def get_inputs(self, start=0, stop=None, threshold=None):
-    # type: (int, Optional[int], Optional[int]) -> dict
+  def get_inputs(
+      self,
+      start       = 0,
+      stop        = None,
+      threshold   = None,
+      window_size = SCAN_WINDOW_SIZE,
+  ):
+    # type: (int, Optional[int], Optional[int], int) -> dict
     """
     Gets all possible inputs of a seed and returns them with the total
     balance.
@@ -595,6 +711,12 @@ class Iota(StrictIota):
       If ``threshold`` is ``None`` (default), this method will return
       **all** inputs in the specified key range.
 
+    :param window_size:
+      Only used if ``stop`` is ``None``.
+
+      Max number of addresses to check per ``findTransactions`` request
+      while scanning for used addresses.
+
     :return:
       Dict with the following structure::
 
@@ -625,10 +747,11 @@ class Iota(StrictIota):
       - https://github.com/iotaledger/wiki/blob/master/api-proposal.md#getinputs
     """
     return extended.GetInputsCommand(self.adapter)(
-      seed      = self.seed,
-      start     = start,
-      stop      = stop,
-      threshold = threshold,
+      seed        = self.seed,
+      start       = start,
+      stop        = stop,
+      threshold   = threshold,
+      windowSize  = window_size,
     )
 
   def get_latest_inclusion(self, hashes):
@@ -658,14 +781,20 @@ class Iota(StrictIota):
       count = 1,
       security_level = AddressGenerator.DEFAULT_SECURITY_LEVEL,
       checksum = False,
+      gallop = False,
+      window_size = SCAN_WINDOW_SIZE,
   ):
-    # type: (int, Optional[int], int, bool) -> dict
+    # type: (int, Optional[int], int, bool, bool, int) -> dict
     """
     Generates one or more new addresses from the seed.
 
     :param index:
       Specify the index of the new address (must be >= 1).
 
+      If ``count`` is ``None``, the scan starts at this index, so if
+      you already know that the first ``n`` addresses are used, you
+      can set ``index = n`` to skip them.
+
     :param count:
       Number of addresses to generate (must be >= 1).
 
@@ -687,6 +816,24 @@ class Iota(StrictIota):
       Specify whether to return the address with the checksum.
       Defaults to False.
 
+    :param gallop:
+      Only used if ``count`` is ``None``.
+
+      If ``True``, assumes that the seed's addresses have been used in
+      order, with no gaps.  Instead of checking every address, this
+      method then checks addresses at exponentially-increasing
+      offsets, followed by a binary search, which needs far fewer
+      requests for seeds with many used addresses.
+
+      Do not use this option if some addresses may have been skipped;
+      it may return an address that comes before a used one.
+
+    :param window_size:
+      Only used if ``count`` is ``None`` and ``gallop`` is ``False``.
+
+      Max number of addresses to check per ``findTransactions`` request
+      while scanning for an unused address.
+
     :return:
       Dict with the following items::
 
@@ -700,14 +847,22 @@ class Iota(StrictIota):
     """
     return extended.GetNewAddressesCommand(self.adapter)(
       count         = count,
+      gallop        = gallop,
       index         = index,
       securityLevel = security_level,
       checksum      = checksum,
       seed          = self.seed,
+      windowSize    = window_size,
     )
 
-  def get_transfers(self, start=0, stop=None, inclusion_states=False):
-    # type: (int, Optional[int], bool) -> dict
+  def get_transfers(
+      self,
+      start             = 0,
+      stop              = None,
+      inclusion_states  = False,
+      window_size       = SCAN_WINDOW_SIZE,
+  ):
+    # type: (int, Optional[int], bool, int) -> dict
     """
     Returns all transfers associated with the seed.
 
@@ -729,6 +884,12 @@ class Iota(StrictIota):
       This requires an additional API call to the node, so it is
       disabled by default.
 
+    :param window_size:
+      Only used if ``stop`` is ``None``.
+
+      Max number of addresses to check per ``findTransactions`` request
+      while scanning for used addresses.
+
     :return:
       Dict containing the following values::
 
@@ -745,6 +906,7 @@ class Iota(StrictIota):
       start           = start,
       stop            = stop,
       inclusionStates = inclusion_states,
+      windowSize      = window_size,
     )
 
   def prepare_transfer(self, transfers, inputs=None, change_address=None):
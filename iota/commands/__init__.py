@@ -8,7 +8,7 @@ from inspect import getmembers as get_members, isabstract as is_abstract, \
   isclass as is_class
 from pkgutil import walk_packages
 from types import ModuleType
-from typing import Any, Dict, Mapping, Optional, Text, Union
+from typing import Any, Dict, Iterator, Mapping, Optional, Text, Union
 
 import filters as f
 from six import string_types, with_metaclass
@@ -306,6 +306,36 @@ class FilterCommand(with_metaclass(ABCMeta, BaseCommand)):
       failure_message = 'Response failed validation',
     )
 
+  def _iter_response_values(self, request, key, item_filter):
+    # type: (dict, Text, f.BaseFilter) -> Iterator
+    """
+    Sends the command to the node, and iterates over the values in the
+    ``key`` list of the response as they are received, instead of
+    waiting for the entire response to be decoded.
+
+    Each value is run through ``item_filter`` before it is yielded.
+
+    The request is validated and sent immediately; values are filtered
+    lazily as the caller iterates.
+    """
+    replacement = self._prepare_request(request)
+    if replacement is not None:
+      request = replacement
+
+    request['command'] = self.command
+
+    values = self.adapter.iter_response_values(request, key)
+
+    return (
+      self._apply_filter(
+        value           = value,
+        filter_         = item_filter,
+        failure_message = 'Response failed validation',
+      )
+
+      for value in values
+    )
+
   @staticmethod
   def _apply_filter(value, filter_, failure_message):
     # type: (dict, Optional[f.BaseFilter], Text) -> dict
@@ -2,6 +2,8 @@
 from __future__ import absolute_import, division, print_function, \
   unicode_literals
 
+from typing import Any, Iterator
+
 import filters as f
 from six import iteritems
 
@@ -28,6 +30,24 @@ class FindTransactionsCommand(FilterCommand):
   def get_response_filter(self):
     return FindTransactionsResponseFilter()
 
+  def iterate(self, **kwargs):
+    # type: (**Any) -> Iterator[TransactionHash]
+    """
+    Sends the command to the node, yielding each transaction hash as it
+    is received.
+
+    See :py:meth:`iota.api.StrictIota.iter_find_transactions`.
+    """
+    return self._iter_response_values(
+      request     = kwargs,
+      key         = 'hashes',
+
+      item_filter = (
+          f.ByteString(encoding='ascii')
+        | Trytes(result_type=TransactionHash)
+      ),
+    )
+
 
 class FindTransactionsRequestFilter(RequestFilter):
   CODE_NO_SEARCH_VALUES = 'no_search_values'
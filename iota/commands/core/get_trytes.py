@@ -2,9 +2,11 @@
 from __future__ import absolute_import, division, print_function, \
   unicode_literals
 
+from typing import Any, Iterator
+
 import filters as f
 
-from iota import TransactionHash
+from iota import TransactionHash, TryteString
 from iota.commands import FilterCommand, RequestFilter, ResponseFilter
 from iota.filters import Trytes
 
@@ -27,6 +29,20 @@ class GetTrytesCommand(FilterCommand):
   def get_response_filter(self):
     return GetTrytesResponseFilter()
 
+  def iterate(self, **kwargs):
+    # type: (**Any) -> Iterator[TryteString]
+    """
+    Sends the command to the node, yielding each transaction's trytes
+    as it is received.
+
+    See :py:meth:`iota.api.StrictIota.iter_get_trytes`.
+    """
+    return self._iter_response_values(
+      request     = kwargs,
+      key         = 'trytes',
+      item_filter = f.ByteString(encoding='ascii') | Trytes,
+    )
+
 
 class GetTrytesRequestFilter(RequestFilter):
   def __init__(self):
@@ -3,15 +3,15 @@ from __future__ import absolute_import, division, print_function, \
   unicode_literals
 
 from operator import attrgetter
-from typing import List, Optional
+from typing import Dict, List, Optional
 
 import filters as f
-from iota import Address, TransactionHash
+from iota import Address, TransactionHash, TransactionTrytes
 from iota.commands import FilterCommand, RequestFilter
 from iota.commands.core.find_transactions import FindTransactionsCommand
 from iota.commands.core.get_balances import GetBalancesCommand
-from iota.commands.extended.utils import get_bundles_from_transaction_hashes, \
-  iter_used_addresses
+from iota.commands.extended.utils import SCAN_WINDOW_SIZE, \
+  get_bundles_from_transaction_hashes, iter_used_addresses
 from iota.crypto.addresses import AddressGenerator
 from iota.crypto.types import Seed
 from iota.filters import Trytes
@@ -40,12 +40,23 @@ class GetAccountDataCommand(FilterCommand):
     seed              = request['seed'] # type: Seed
     start             = request['start'] # type: int
     stop              = request['stop'] # type: Optional[int]
+    window_size       = request['windowSize'] # type: int
+
+    # Transactions fetched while scanning don't need to be fetched
+    # again.
+    trytes_cache = {} # type: Dict[TransactionHash, TransactionTrytes]
 
     if stop is None:
       my_addresses  = [] # type: List[Address]
       my_hashes     = [] # type: List[TransactionHash]
 
-      for addy, hashes in iter_used_addresses(self.adapter, seed, start):
+      for addy, hashes in iter_used_addresses(
+          adapter       = self.adapter,
+          seed          = seed,
+          start         = start,
+          window_size   = window_size,
+          trytes_cache  = trytes_cache,
+      ):
         my_addresses.append(addy)
         my_hashes.extend(hashes)
     else:
@@ -72,6 +83,7 @@ class GetAccountDataCommand(FilterCommand):
           adapter             = self.adapter,
           transaction_hashes  = my_hashes,
           inclusion_states    = inclusion_states,
+          trytes_cache        = trytes_cache,
         ),
     }
 
@@ -98,12 +110,15 @@ class GetAccountDataRequestFilter(RequestFilter):
         'start':  f.Type(int) | f.Min(0) | f.Optional(0),
 
         'inclusionStates': f.Type(bool) | f.Optional(False),
+
+        'windowSize': f.Type(int) | f.Min(1) | f.Optional(SCAN_WINDOW_SIZE),
       },
 
       allow_missing_keys = {
         'stop',
         'inclusionStates',
         'start',
+        'windowSize',
       },
     )
 
@@ -2,16 +2,17 @@
 from __future__ import absolute_import, division, print_function, \
   unicode_literals
 
-from typing import List, Optional
+from typing import List, Mapping
 
 import filters as f
-from iota import BadApiResponse, Bundle, BundleHash, Transaction, \
-  TransactionHash, TryteString
+from six import iteritems
+from iota import BadApiResponse, TransactionHash
 from iota.commands import FilterCommand, RequestFilter
-from iota.commands.core.get_trytes import GetTrytesCommand
+from iota.commands.core.find_transactions import FindTransactionsCommand
+from iota.commands.extended.utils import get_transaction_objects, \
+  traverse_bundles
 from iota.exceptions import with_context
 from iota.filters import Trytes
-from iota.transaction.validator import BundleValidator
 
 __all__ = [
   'GetBundlesCommand',
@@ -33,89 +34,119 @@ class GetBundlesCommand(FilterCommand):
     pass
 
   def _execute(self, request):
-    transaction_hash = request['transaction'] # type: TransactionHash
-
-    bundle    = Bundle(self._traverse_bundle(transaction_hash))
-    validator = BundleValidator(bundle)
-
-    if not validator.is_valid():
-      raise with_context(
-        exc = BadApiResponse(
-          'Bundle failed validation (``exc.context`` has more info).',
-        ),
-
-        context = {
-          'bundle': bundle,
-          'errors': validator.errors,
-        },
-      )
+    tail_hashes = list(request.get('transactions') or []) # type: List[TransactionHash]
+
+    if request.get('transaction'):
+      tail_hashes.insert(0, request['transaction'])
+
+    # Fetch all of the tails at once.
+    transactions = get_transaction_objects(self.adapter, tail_hashes)
+
+    for txn_hash in tail_hashes:
+      transaction = transactions.get(txn_hash)
+
+      if transaction is None:
+        raise with_context(
+          exc = BadApiResponse(
+            'Bundle transactions not visible (``exc.context`` has more info).',
+          ),
+
+          context = {
+            'transaction_hash': txn_hash,
+          },
+        )
+
+      if transaction.current_index:
+        raise with_context(
+          exc = BadApiResponse(
+            '``getBundles`` started with a non-tail transaction '
+            '(``exc.context`` has more info).',
+          ),
+
+          context = {
+            'transaction_object': transaction,
+          },
+        )
+
+    tails = [transactions[txn_hash] for txn_hash in tail_hashes]
+
+    # Then fetch every transaction that belongs to those bundles, so
+    # that they can be assembled locally.
+    bundle_hashes = {txn.bundle_hash for txn in tails if txn.last_index}
+
+    if bundle_hashes:
+      try:
+        ft_response = FindTransactionsCommand(self.adapter)(
+          bundles = list(bundle_hashes),
+        )
+      except BadApiResponse:
+        # E.g., the node refused to return that many results.
+        # ``traverse_bundles`` will fetch the transactions hop by hop
+        # instead.
+        pass
+      else:
+        transactions.update(get_transaction_objects(
+          self.adapter,
+
+          [
+            txn_hash
+              for txn_hash in ft_response['hashes']
+              if txn_hash not in transactions
+          ],
+        ))
 
     return {
-      # Always return a list, so that we have the necessary structure
-      # to return multiple bundles in a future iteration.
-      'bundles': [bundle],
+      # One bundle per tail transaction, in the same order.
+      'bundles': traverse_bundles(self.adapter, tails, transactions),
     }
 
-  def _traverse_bundle(self, txn_hash, target_bundle_hash=None):
-    # type: (TransactionHash, Optional[BundleHash]) -> List[Transaction]
-    """
-    Recursively traverse the Tangle, collecting transactions until we
-    hit a new bundle.
-
-    This method is (usually) faster than ``findTransactions``, and it
-    ensures we don't collect transactions from replayed bundles.
-    """
-    trytes = GetTrytesCommand(self.adapter)(hashes=[txn_hash])['trytes'] # type: List[TryteString]
-
-    if not trytes:
-      raise with_context(
-        exc = BadApiResponse(
-          'Bundle transactions not visible (``exc.context`` has more info).',
-        ),
 
-        context = {
-          'transaction_hash':   txn_hash,
-          'target_bundle_hash': target_bundle_hash,
-        },
-      )
+class GetBundlesRequestFilter(RequestFilter):
+  CODE_NO_TRANSACTIONS = 'no_transactions'
 
-    transaction = Transaction.from_tryte_string(trytes[0])
+  templates = {
+    CODE_NO_TRANSACTIONS: 'Request must include at least one transaction.',
+  }
 
-    if (not target_bundle_hash) and transaction.current_index:
-      raise with_context(
-        exc = BadApiResponse(
-          '``_traverse_bundle`` started with a non-tail transaction '
-          '(``exc.context`` has more info).',
+  def __init__(self):
+    super(GetBundlesRequestFilter, self).__init__(
+      {
+        'transaction': Trytes(result_type=TransactionHash),
+
+        'transactions': (
+            f.Array
+          | f.FilterRepeater(
+                f.Required
+              | Trytes(result_type=TransactionHash)
+            )
         ),
+      },
 
-        context = {
-          'transaction_object': transaction,
-          'target_bundle_hash': target_bundle_hash,
-        },
-      )
-
-    if target_bundle_hash:
-      if target_bundle_hash != transaction.bundle_hash:
-        # We've hit a different bundle; we can stop now.
-        return []
-    else:
-      target_bundle_hash = transaction.bundle_hash
-
-    if transaction.current_index == transaction.last_index == 0:
-      # Bundle only has one transaction.
-      return [transaction]
-
-    # Recursively follow the trunk transaction, to fetch the next
-    # transaction in the bundle.
-    return [transaction] + self._traverse_bundle(
-      txn_hash            = transaction.trunk_transaction_hash,
-      target_bundle_hash  = target_bundle_hash
+      allow_missing_keys = {'transactions'},
     )
 
+  def _apply(self, value):
+    # ``transactions`` can be used instead of ``transaction``, to fetch
+    # many bundles at once.
+    if isinstance(value, Mapping) and ('transactions' in value):
+      value = dict(value)
+      value.setdefault('transaction', None)
 
+    value = super(GetBundlesRequestFilter, self)._apply(value) # type: dict
 
-class GetBundlesRequestFilter(RequestFilter):
-  def __init__(self):
-    super(GetBundlesRequestFilter, self).__init__({
-      'transaction': f.Required | Trytes(result_type=TransactionHash),
-    })
+    if self._has_errors:
+      return value
+
+    # Remove null values, so that the command sees the same request
+    # regardless of which parameter was used.
+    request = {
+      key: param
+        for key, param in iteritems(value)
+        if param is not None
+    }
+
+    if not request:
+      # Include unfiltered ``value`` in filter error context.
+      return self._invalid_value(value, self.CODE_NO_TRANSACTIONS)
+
+    return request
@@ -8,7 +8,8 @@ import filters as f
 from iota import BadApiResponse
 from iota.commands import FilterCommand, RequestFilter
 from iota.commands.core.get_balances import GetBalancesCommand
-from iota.commands.extended.utils import iter_used_addresses
+from iota.commands.extended.utils import SCAN_WINDOW_SIZE, \
+  iter_used_addresses
 from iota.crypto.addresses import AddressGenerator
 from iota.crypto.types import Seed
 from iota.exceptions import with_context
@@ -34,15 +35,23 @@ class GetInputsCommand(FilterCommand):
     pass
 
   def _execute(self, request):
-    stop      = request['stop'] # type: Optional[int]
-    seed      = request['seed'] # type: Seed
-    start     = request['start'] # type: int
-    threshold = request['threshold'] # type: Optional[int]
+    stop        = request['stop'] # type: Optional[int]
+    seed        = request['seed'] # type: Seed
+    start       = request['start'] # type: int
+    threshold   = request['threshold'] # type: Optional[int]
+    window_size = request['windowSize'] # type: int
 
     # Determine the addresses we will be scanning.
     if stop is None:
-      addresses =\
-        [addy for addy, _ in iter_used_addresses(self.adapter, seed, start)]
+      addresses = [
+        addy
+          for addy, _ in iter_used_addresses(
+            adapter     = self.adapter,
+            seed        = seed,
+            start       = start,
+            window_size = window_size,
+          )
+      ]
     else:
       addresses = AddressGenerator(seed).get_addresses(start, stop)
 
@@ -111,6 +120,7 @@ class GetInputsRequestFilter(RequestFilter):
         'stop':       f.Type(int) | f.Min(0),
         'start':      f.Type(int) | f.Min(0) | f.Optional(0),
         'threshold':  f.Type(int) | f.Min(0),
+        'windowSize': f.Type(int) | f.Min(1) | f.Optional(SCAN_WINDOW_SIZE),
 
         # These arguments are required.
         'seed': f.Required | Trytes(result_type=Seed),
@@ -120,6 +130,7 @@ class GetInputsRequestFilter(RequestFilter):
         'stop',
         'start',
         'threshold',
+        'windowSize',
       }
     )
 
@@ -2,13 +2,14 @@
 from __future__ import absolute_import, division, print_function, \
   unicode_literals
 
-from typing import List, Optional
+from typing import Dict, List, Optional
 
 import filters as f
 
 from iota import Address, AddressChecksum
 from iota.commands import FilterCommand, RequestFilter
 from iota.commands.core.find_transactions import FindTransactionsCommand
+from iota.commands.extended.utils import SCAN_WINDOW_SIZE, scan_addresses
 from iota.crypto.addresses import AddressGenerator
 from iota.crypto.types import Seed
 from iota.filters import Trytes
@@ -35,37 +36,111 @@ class GetNewAddressesCommand(FilterCommand):
   def _execute(self, request):
     checksum        = request['checksum'] # type: bool
     count           = request['count'] # type: Optional[int]
+    gallop          = request['gallop'] # type: bool
     index           = request['index'] # type: int
     security_level  = request['securityLevel'] # type: int
     seed            = request['seed'] # type: Seed
+    window_size     = request['windowSize'] # type: int
 
     return {
-      'addresses': 
-         self._find_addresses(seed, index, count, security_level, checksum),
+      'addresses':
+        self._find_addresses(
+          seed,
+          index,
+          count,
+          security_level,
+          checksum,
+          gallop,
+          window_size,
+        ),
     }
 
-  def _find_addresses(self, seed, index, count, security_level, checksum):
-    # type: (Seed, int, Optional[int], int, bool) -> List[Address]
+  def _find_addresses(
+      self,
+      seed,
+      index,
+      count,
+      security_level,
+      checksum,
+      gallop      = False,
+      window_size = SCAN_WINDOW_SIZE,
+  ):
+    # type: (Seed, int, Optional[int], int, bool, bool, int) -> List[Address]
     """
     Find addresses matching the command parameters.
     """
     generator = AddressGenerator(seed, security_level, checksum)
 
     if count is None:
+      if gallop:
+        return [self._gallop(generator, index)]
+
       # Connect to Tangle and find the first address without any
       # transactions.
-      for addy in generator.create_iterator(start=index):
-        # We use addy.address here because FindTransactions does
-        # not work on an address with a checksum
-        response = FindTransactionsCommand(self.adapter)(
-           addresses=[addy.address]
-        )
-
-        if not response.get('hashes'):
+      for addy, hashes in scan_addresses(
+          adapter         = self.adapter,
+          seed            = seed,
+          start           = index,
+          window_size     = window_size,
+          security_level  = security_level,
+          checksum        = checksum,
+      ):
+        if not hashes:
           return [addy]
 
     return generator.get_addresses(start=index, count=count)
 
+  def _gallop(self, generator, index):
+    # type: (AddressGenerator, int) -> Address
+    """
+    Finds the first address without any transactions, assuming that
+    the seed's addresses have been used in order (i.e., every address
+    before the first unused address has transactions, and none after
+    it do).
+
+    Probes addresses at exponentially-increasing offsets from
+    ``index`` until it finds an unused one, then uses a binary search
+    to find the first unused address.  This needs ``O(log n)``
+    requests instead of ``n``.
+    """
+    probed = {} # type: Dict[int, Address]
+
+    def is_used(key_index):
+      # type: (int) -> bool
+      addy = generator.get_addresses(start=key_index, count=1)[0]
+      probed[key_index] = addy
+
+      # We use addy.address here because FindTransactions does
+      # not work on an address with a checksum
+      response = FindTransactionsCommand(self.adapter)(
+        addresses = [addy.address],
+      )
+
+      return bool(response.get('hashes'))
+
+    # Every address before ``low`` is used; ``high`` is the next
+    # address to check.
+    low   = index
+    high  = index
+    step  = 1
+
+    while is_used(high):
+      low   = high + 1
+      high += step
+      step *= 2
+
+    # ``high`` is unused; find the first unused address in
+    # ``[low, high]``.
+    while low < high:
+      middle = (low + high) // 2
+
+      if is_used(middle):
+        low = middle + 1
+      else:
+        high = middle
+
+    return probed[high]
+
 
 class GetNewAddressesRequestFilter(RequestFilter):
   MAX_SECURITY_LEVEL = 3
@@ -83,6 +158,7 @@ class GetNewAddressesRequestFilter(RequestFilter):
 
         'checksum':  f.Type(bool) | f.Optional(default=False),
         'count':     f.Type(int) | f.Min(1),
+        'gallop':    f.Type(bool) | f.Optional(default=False),
         'index':     f.Type(int) | f.Min(0) | f.Optional(default=0),
 
         'securityLevel':
@@ -92,12 +168,19 @@ class GetNewAddressesRequestFilter(RequestFilter):
             | f.Optional(default=AddressGenerator.DEFAULT_SECURITY_LEVEL),
 
         'seed': f.Required | Trytes(result_type=Seed),
+
+        'windowSize':
+              f.Type(int)
+            | f.Min(1)
+            | f.Optional(default=SCAN_WINDOW_SIZE),
       },
 
       allow_missing_keys = {
         'checksum',
         'count',
+        'gallop',
         'index',
         'securityLevel',
+        'windowSize',
       },
     )
@@ -3,13 +3,14 @@ from __future__ import absolute_import, division, print_function, \
   unicode_literals
 
 from itertools import chain
-from typing import Optional
+from typing import Dict, Optional
 
 import filters as f
+from iota import TransactionHash, TransactionTrytes
 from iota.commands import FilterCommand, RequestFilter
 from iota.commands.core.find_transactions import FindTransactionsCommand
-from iota.commands.extended.utils import get_bundles_from_transaction_hashes, \
-  iter_used_addresses
+from iota.commands.extended.utils import SCAN_WINDOW_SIZE, \
+  get_bundles_from_transaction_hashes, iter_used_addresses
 from iota.crypto.addresses import AddressGenerator
 from iota.crypto.types import Seed
 from iota.filters import Trytes
@@ -38,13 +39,24 @@ class GetTransfersCommand(FilterCommand):
     seed              = request['seed'] # type: Seed
     start             = request['start'] # type: int
     stop              = request['stop'] # type: Optional[int]
+    window_size       = request['windowSize'] # type: int
+
+    # Transactions fetched while scanning don't need to be fetched
+    # again.
+    trytes_cache = {} # type: Dict[TransactionHash, TransactionTrytes]
 
     # Determine the addresses we will be scanning, and pull their
     # transaction hashes.
     if stop is None:
       my_hashes = list(chain(*(
         hashes
-          for _, hashes in iter_used_addresses(self.adapter, seed, start)
+          for _, hashes in iter_used_addresses(
+            adapter       = self.adapter,
+            seed          = seed,
+            start         = start,
+            window_size   = window_size,
+            trytes_cache  = trytes_cache,
+          )
       )))
     else:
       ft_response =\
@@ -61,6 +73,7 @@ class GetTransfersCommand(FilterCommand):
           adapter             = self.adapter,
           transaction_hashes  = my_hashes,
           inclusion_states    = inclusion_states,
+          trytes_cache        = trytes_cache,
         ),
     }
 
@@ -87,12 +100,15 @@ class GetTransfersRequestFilter(RequestFilter):
         'start':  f.Type(int) | f.Min(0) | f.Optional(0),
 
         'inclusionStates': f.Type(bool) | f.Optional(False),
+
+        'windowSize': f.Type(int) | f.Min(1) | f.Optional(SCAN_WINDOW_SIZE),
       },
 
       allow_missing_keys = {
         'stop',
         'inclusionStates',
         'start',
+        'windowSize',
       },
     )
 
@@ -2,18 +2,47 @@
 from __future__ import absolute_import, division, print_function, \
   unicode_literals
 
-from typing import Generator, Iterable, List, Tuple
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from threading import Event
+from typing import Dict, Generator, Iterable, List, Optional, Set, Tuple
 
-from iota import Address, Bundle, Transaction, \
-  TransactionHash
+from six import binary_type, text_type
+
+from iota import Address, BadApiResponse, Bundle, LazyTransaction, \
+  Transaction, TransactionHash, TransactionTrytes, TrytesCompatible
 from iota.adapter import BaseAdapter
 from iota.commands.core.find_transactions import FindTransactionsCommand
 from iota.commands.core.get_trytes import GetTrytesCommand
-from iota.commands.extended.get_bundles import GetBundlesCommand
 from iota.commands.extended.get_latest_inclusion import \
   GetLatestInclusionCommand
 from iota.crypto.addresses import AddressGenerator
 from iota.crypto.types import Seed
+from iota.exceptions import with_context
+from iota.transaction.validator import BundleValidator
+
+SCAN_WINDOW_SIZE = 10
+"""
+Default number of addresses that :py:func:`iter_used_addresses` checks
+per request.
+"""
+
+
+def is_null_trytes(trytes):
+  # type: (Optional[TrytesCompatible]) -> bool
+  """
+  Returns whether ``getTrytes`` returned null trytes for a transaction
+  (i.e., the node doesn't have it).
+
+  IRI returns all-9s trytes for unknown hashes, rather than ``null``.
+  """
+  if trytes is None:
+    return True
+
+  if isinstance(trytes, text_type):
+    trytes = trytes.encode('ascii')
+
+  return not binary_type(trytes).strip(b'9')
 
 
 def find_transaction_objects(adapter, **kwargs):
@@ -29,87 +58,377 @@ def find_transaction_objects(adapter, **kwargs):
     if hashes:
       gt_response = GetTrytesCommand(adapter)(hashes=hashes)
 
-      return list(map(
-        Transaction.from_tryte_string,
-        gt_response.get('trytes') or [],
-      )) # type: List[Transaction]
+      found = [
+        (txn_hash, trytes)
+          for txn_hash, trytes in zip(hashes, gt_response.get('trytes') or [])
+          if not is_null_trytes(trytes)
+      ]
+
+      # The node returns the transactions we asked for, so we don't
+      # need to compute their hashes.
+      return Transaction.from_tryte_strings(
+        [trytes for _, trytes in found],
+        [txn_hash for txn_hash, _ in found],
+      ) # type: List[Transaction]
 
     return []
 
 
-def iter_used_addresses(adapter, seed, start):
-  # type: (BaseAdapter, Seed, int) -> Generator[Tuple[Address, List[TransactionHash]]]
+def iter_used_addresses(
+    adapter,
+    seed,
+    start,
+    window_size   = SCAN_WINDOW_SIZE,
+    trytes_cache  = None,
+):
+  # type: (BaseAdapter, Seed, int, int, Optional[Dict[TransactionHash, TransactionTrytes]]) -> Generator[Tuple[Address, List[TransactionHash]]]
   """
   Scans the Tangle for used addresses.
 
   This is basically the opposite of invoking ``getNewAddresses`` with
   ``stop=None``.
+
+  See :py:func:`scan_addresses` for more info.
+  """
+  scan = scan_addresses(
+    adapter       = adapter,
+    seed          = seed,
+    start         = start,
+    window_size   = window_size,
+    trytes_cache  = trytes_cache,
+  )
+
+  try:
+    for addy, hashes in scan:
+      if not hashes:
+        return
+
+      yield addy, hashes
+  finally:
+    scan.close()
+
+
+def scan_addresses(
+    adapter,
+    seed,
+    start,
+    window_size     = SCAN_WINDOW_SIZE,
+    security_level  = AddressGenerator.DEFAULT_SECURITY_LEVEL,
+    checksum        = False,
+    trytes_cache    = None,
+):
+  # type: (BaseAdapter, Seed, int, int, int, bool, Optional[Dict[TransactionHash, TransactionTrytes]]) -> Generator[Tuple[Address, List[TransactionHash]]]
+  """
+  Scans the Tangle for used addresses, yielding each address along with
+  its transaction hashes.
+
+  Stops after the first unused address, which is yielded with an empty
+  list of hashes.
+
+  :param window_size:
+    Max number of addresses to check per ``findTransactions`` request.
+
+    The first window contains a single address, and each window after
+    that is twice as large, up to ``window_size``, so that seeds with
+    few used addresses don't generate addresses that they won't need.
+
+    Addresses are generated one window at a time; the next window is
+    generated while waiting for the node to respond.
+
+  :param security_level:
+    Security level of the addresses (see :py:class:`AddressGenerator`).
+
+  :param checksum:
+    Whether to generate addresses with checksums.
+
+  :param trytes_cache:
+    Provide this if the caller is going to fetch the transactions
+    anyway (see :py:func:`get_bundles_from_transaction_hashes`).
+
+    Windows with multiple used addresses then fetch the transactions'
+    trytes to see which address each transaction belongs to, and store
+    them in this dict.  Otherwise, those windows are split up into
+    smaller ``findTransactions`` requests instead (see
+    :py:func:`_find_hashes_by_address`).
   """
-  ft_command = FindTransactionsCommand(adapter)
+  addresses = AddressGenerator(seed, security_level, checksum)\
+    .create_iterator(start)
+
+  stopped = Event()
+
+  def generate_window(size):
+    # type: (int) -> List[Address]
+    window = [] # type: List[Address]
+
+    # Don't waste time generating addresses that we won't need.
+    while (len(window) < size) and not stopped.is_set():
+      try:
+        window.append(next(addresses))
+      except StopIteration:
+        break
+
+    return window
+
+  executor = ThreadPoolExecutor(max_workers=1)
+
+  try:
+    size = 1
+    next_window = executor.submit(generate_window, size)
+
+    while True:
+      window = next_window.result()
 
-  for addy in AddressGenerator(seed).create_iterator(start):
-    ft_response = ft_command(addresses=[addy])
+      if not window:
+        return
+
+      size = min(size * 2, window_size)
+      next_window = executor.submit(generate_window, size)
+
+      hashes = _find_hashes_by_address(adapter, window, trytes_cache)
+
+      for addy in window:
+        # ``findTransactions`` ignores checksums.
+        addy_hashes = hashes.get(addy.address) or []
+
+        yield addy, addy_hashes
+
+        if not addy_hashes:
+          return
+  finally:
+    # Don't wait for the next window to finish generating.
+    stopped.set()
+    executor.shutdown(wait=False)
+
+
+def _find_hashes_by_address(adapter, addresses, trytes_cache=None):
+  # type: (BaseAdapter, List[Address], Optional[Dict[TransactionHash, TransactionTrytes]]) -> Dict[Address, List[TransactionHash]]
+  """
+  Finds the transactions for a batch of addresses, starting with a
+  single ``findTransactions`` request for the whole batch.
+
+  ``findTransactions`` doesn't say which address each transaction
+  belongs to, so if there are multiple addresses:
+
+  - If ``trytes_cache`` is provided, the trytes are fetched (and stored
+    in the cache), to read the transactions' addresses.
+  - Otherwise, the addresses are split in half, and each half that has
+    transactions is checked separately, until each transaction has been
+    matched with its address.
+  """
+  ft_response = FindTransactionsCommand(adapter)(addresses=addresses)
+
+  hashes = ft_response['hashes'] # type: List[TransactionHash]
+
+  if not hashes:
+    return {}
+
+  if (len(addresses) > 1) and (trytes_cache is not None):
+    try:
+      return _match_hashes_by_trytes(adapter, hashes, trytes_cache)
+    except BadApiResponse:
+      # E.g., the node won't return that many transactions at once.
+      pass
+
+  return _match_hashes_by_bisection(adapter, addresses, hashes)
+
+
+def _match_hashes_by_trytes(adapter, hashes, trytes_cache):
+  # type: (BaseAdapter, List[TransactionHash], Dict[TransactionHash, TransactionTrytes]) -> Dict[Address, List[TransactionHash]]
+  """
+  Matches transactions with their addresses, by fetching their trytes.
+
+  :raise:
+    - :py:class:`BadApiResponse` if the node rejects the ``getTrytes``
+      request, or doesn't have the trytes for some of the transactions
+      (so we can't tell which addresses they belong to).
+  """
+  gt_response = GetTrytesCommand(adapter)(hashes=hashes)
+
+  found = [
+    (txn_hash, trytes)
+      for txn_hash, trytes in zip(hashes, gt_response['trytes'])
+      if not is_null_trytes(trytes)
+  ]
+
+  trytes_cache.update(found)
+
+  if len(found) < len(hashes):
+    raise with_context(
+      exc = BadApiResponse(
+        'Node returned null trytes for {count} transaction(s).'.format(
+          count = len(hashes) - len(found),
+        ),
+      ),
+
+      context = {
+        'hashes': hashes,
+      },
+    )
+
+  result = {} # type: Dict[Address, List[TransactionHash]]
+
+  # Only the ``address`` field is decoded.
+  for txn in LazyTransaction.from_tryte_strings(
+      [trytes for _, trytes in found],
+      [txn_hash for txn_hash, _ in found],
+  ):
+    result.setdefault(txn.address, []).append(txn.hash)
+
+  return result
+
+
+def _match_hashes_by_bisection(adapter, addresses, hashes):
+  # type: (BaseAdapter, List[Address], List[TransactionHash]) -> Dict[Address, List[TransactionHash]]
+  """
+  Matches transactions with their addresses, by sending
+  ``findTransactions`` requests for smaller and smaller groups of
+  addresses.
+
+  Only groups that have transactions are split further, so unused
+  addresses at the end of the batch cost a single request.
+
+  :param hashes:
+    Hashes of the transactions that belong to ``addresses``.
+  """
+  if len(addresses) == 1:
+    # Key by ``address`` for consistency with the addresses read from
+    # the trytes in :py:func:`_match_hashes_by_trytes` (which don't
+    # have checksums).
+    return {addresses[0].address: hashes}
 
-    if ft_response['hashes']:
-      yield addy, ft_response['hashes']
-    else:
-      break
+  middle  = len(addresses) // 2
+  left    = addresses[:middle]
+  right   = addresses[middle:]
 
-    # Reset the command so that we can call it again.
-    ft_command.reset()
+  result = {} # type: Dict[Address, List[TransactionHash]]
+
+  left_hashes = FindTransactionsCommand(adapter)(addresses=left)['hashes']
+
+  if left_hashes:
+    result.update(_match_hashes_by_bisection(adapter, left, left_hashes))
+
+  # Each transaction belongs to a single address, so the rest of the
+  # transactions must belong to the other half.
+  left_hashes   = set(left_hashes)
+  right_hashes  = [
+    txn_hash
+      for txn_hash in hashes
+      if txn_hash not in left_hashes
+  ]
+
+  if right_hashes:
+    result.update(_match_hashes_by_bisection(adapter, right, right_hashes))
+
+  return result
 
 
 def get_bundles_from_transaction_hashes(
     adapter,
     transaction_hashes,
     inclusion_states,
+    trytes_cache = None,
 ):
-  # type: (BaseAdapter, Iterable[TransactionHash], bool) -> List[Bundle]
+  # type: (BaseAdapter, Iterable[TransactionHash], bool, Optional[Dict[TransactionHash, TransactionTrytes]]) -> List[Bundle]
   """
   Given a set of transaction hashes, returns the corresponding bundles,
   sorted by tail transaction timestamp.
+
+  Transactions in ``trytes_cache`` (e.g., filled in by
+  :py:func:`scan_addresses`) are not fetched again.
+
+  The number of requests sent to the node does not depend on the
+  number of transactions:
+
+  1. ``getTrytes`` for the transactions.
+  2. ``findTransactions`` for their bundles.
+  3. ``getTrytes`` for the rest of the bundles' transactions.
+  4. ``getLatestInclusion`` for the tails (if ``inclusion_states`` is
+     set).
+
+  The bundles are then assembled and validated locally.
+
+  If the node rejects the ``findTransactions`` request (e.g., because
+  there are too many results), the bundles are looked up one at a time
+  instead (see :py:func:`traverse_bundles`), same as
+  :py:class:`iota.commands.extended.get_bundles.GetBundlesCommand`.
   """
   transaction_hashes = list(transaction_hashes)
   if not transaction_hashes:
     return []
 
-  my_bundles = [] # type: List[Bundle]
+  transactions = get_transaction_objects(
+    adapter,
+    transaction_hashes,
+    trytes_cache,
+  )
 
   # Sort transactions into tail and non-tail.
-  tail_transaction_hashes = set()
-  non_tail_bundle_hashes  = set()
+  tail_transactions = [
+    transactions[txn_hash]
+      for txn_hash in transaction_hashes
+      if txn_hash in transactions and transactions[txn_hash].is_tail
+  ]
 
-  gt_response = GetTrytesCommand(adapter)(hashes=transaction_hashes)
-  all_transactions = list(map(
-    Transaction.from_tryte_string,
-    gt_response['trytes'],
-  )) # type: List[Transaction]
+  # Capture the bundle ID instead of the transaction hash so that we
+  # can query the node to find the tail transaction for that bundle.
+  non_tail_bundle_hashes = {
+    txn.bundle_hash
+      for txn in transactions.values()
+      if not txn.is_tail
+  }
 
-  for txn in all_transactions:
-    if txn.is_tail:
-      tail_transaction_hashes.add(txn.hash)
-    else:
-      # Capture the bundle ID instead of the transaction hash so that
-      # we can query the node to find the tail transaction for that
-      # bundle.
-      non_tail_bundle_hashes.add(txn.bundle_hash)
-
-  if non_tail_bundle_hashes:
-    for txn in find_transaction_objects(
-        adapter = adapter,
-        bundles = list(non_tail_bundle_hashes)
+  # Fetch the rest of the transactions in each bundle, so that the
+  # bundles can be assembled locally.
+  bundle_hashes = non_tail_bundle_hashes | {
+    txn.bundle_hash
+      for txn in tail_transactions
+      if txn.last_index
+  }
+
+  tail_transaction_hashes = {txn.hash for txn in tail_transactions}
+
+  if bundle_hashes:
+    try:
+      bundle_txn_hashes = FindTransactionsCommand(adapter)(
+        bundles = list(bundle_hashes),
+      )['hashes'] # type: List[TransactionHash]
+    except BadApiResponse:
+      # E.g., the node refused to return that many results.
+      # ``traverse_bundles`` will fetch the transactions for the tails
+      # that we already have hop by hop instead; we only need to look
+      # up the bundles that we don't have a tail for, one at a time.
+      bundle_txn_hashes = []
+
+      for bundle_hash in non_tail_bundle_hashes - {
+        txn.bundle_hash
+          for txn in tail_transactions
+      }:
+        bundle_txn_hashes.extend(
+          FindTransactionsCommand(adapter)(bundles=[bundle_hash])['hashes'],
+        )
+
+    transactions.update(get_transaction_objects(
+      adapter,
+
+      [
+        txn_hash
+          for txn_hash in bundle_txn_hashes
+          if txn_hash not in transactions
+      ],
+    ))
+
+
+  for txn in list(transactions.values()):
+    if (
+          txn.is_tail
+      and txn.bundle_hash in non_tail_bundle_hashes
+      and txn.hash not in tail_transaction_hashes
     ):
-      if txn.is_tail:
-        if txn.hash not in tail_transaction_hashes:
-          all_transactions.append(txn)
-          tail_transaction_hashes.add(txn.hash)
+      tail_transactions.append(txn)
+      tail_transaction_hashes.add(txn.hash)
 
-  # Filter out all non-tail transactions.
-  tail_transactions = [
-    txn
-      for txn in all_transactions
-      if txn.hash in tail_transaction_hashes
-  ]
+  if not tail_transactions:
+    return []
 
   # Attach inclusion states, if requested.
   if inclusion_states:
@@ -120,18 +439,155 @@ def get_bundles_from_transaction_hashes(
     for txn in tail_transactions:
       txn.is_confirmed = gli_response['states'].get(txn.hash)
 
-  # Find the bundles for each transaction.
-  for txn in tail_transactions:
-    gb_response = GetBundlesCommand(adapter)(transaction=txn.hash)
-    txn_bundles = gb_response['bundles'] # type: List[Bundle]
-
-    if inclusion_states:
-      for bundle in txn_bundles:
-        bundle.is_confirmed = txn.is_confirmed
+  my_bundles = traverse_bundles(
+    adapter,
+    tail_transactions,
+    transactions,
+  ) # type: List[Bundle]
 
-    my_bundles.extend(txn_bundles)
+  if inclusion_states:
+    for txn, bundle in zip(tail_transactions, my_bundles):
+      bundle.is_confirmed = txn.is_confirmed
 
   return list(sorted(
     my_bundles,
       key = lambda bundle_: bundle_.tail_transaction.timestamp,
   ))
+
+
+def get_transaction_objects(adapter, hashes, trytes_cache=None):
+  # type: (BaseAdapter, Iterable[TransactionHash], Optional[Dict[TransactionHash, TransactionTrytes]]) -> Dict[TransactionHash, Transaction]
+  """
+  Fetches transactions from the node, in a single ``getTrytes``
+  request.
+
+  Transactions in ``trytes_cache`` are not fetched again.
+
+  Transactions that the node doesn't have (i.e., it returns null
+  trytes) are omitted from the result.
+  """
+  hashes = list(hashes)
+  if not hashes:
+    return {}
+
+  cached = trytes_cache or {} # type: Dict[TransactionHash, TransactionTrytes]
+  fetched = {} # type: Dict[TransactionHash, TransactionTrytes]
+
+  missing = [txn_hash for txn_hash in hashes if txn_hash not in cached]
+
+  if missing:
+    gt_response = GetTrytesCommand(adapter)(hashes=missing)
+
+    # The node returns the transactions in the order that we asked for
+    # them, so we can attach the hashes without recomputing them.
+    fetched = dict(zip(missing, gt_response['trytes']))
+
+  found = [
+    (txn_hash, trytes)
+      for txn_hash, trytes in (
+        (txn_hash, cached.get(txn_hash) or fetched.get(txn_hash))
+          for txn_hash in hashes
+      )
+      if not is_null_trytes(trytes)
+  ]
+
+  transactions = Transaction.from_tryte_strings(
+    [trytes for _, trytes in found],
+    [txn_hash for txn_hash, _ in found],
+  )
+
+  return OrderedDict((txn.hash, txn) for txn in transactions)
+
+
+def traverse_bundles(adapter, tail_transactions, transactions):
+  # type: (BaseAdapter, List[Transaction], Dict[TransactionHash, Transaction]) -> List[Bundle]
+  """
+  Assembles and validates the bundle for each tail transaction, by
+  following the trunk transactions until we hit the head (or a new
+  bundle).
+
+  Following the trunk transactions ensures that we don't collect
+  transactions from replayed bundles.
+
+  :param tail_transactions:
+    Tail transactions of the bundles to assemble.
+
+  :param transactions:
+    Transactions that have already been fetched, indexed by hash
+    (e.g., the results of ``findTransactions`` for the bundle hashes).
+
+    If a transaction in a trunk chain is missing, it is fetched from
+    the node, together with the missing transactions from all of the
+    other chains.
+
+  :return:
+    One bundle per tail transaction, in the same order.
+
+  :raise:
+    - :py:class:`BadApiResponse` if a transaction isn't visible, or a
+      bundle fails validation.
+  """
+  transactions = dict(transactions)
+
+  chains  = [[txn] for txn in tail_transactions]
+  pending = chains
+
+  while pending:
+    missing     = set() # type: Set[TransactionHash]
+    incomplete  = [] # type: List[List[Transaction]]
+
+    for chain in pending:
+      # A bundle has ``last_index + 1`` transactions; stopping there
+      # also protects us from cycles in the trunk chain.
+      while len(chain) <= chain[0].last_index:
+        transaction = transactions.get(chain[-1].trunk_transaction_hash)
+
+        if transaction is None:
+          missing.add(chain[-1].trunk_transaction_hash)
+          incomplete.append(chain)
+          break
+
+        if transaction.bundle_hash != chain[0].bundle_hash:
+          # We've hit a different bundle; we can stop now.
+          break
+
+        chain.append(transaction)
+
+    if missing:
+      fetched = get_transaction_objects(adapter, missing)
+
+      for txn_hash in missing:
+        if txn_hash not in fetched:
+          raise with_context(
+            exc = BadApiResponse(
+              'Bundle transactions not visible '
+              '(``exc.context`` has more info).',
+            ),
+
+            context = {
+              'transaction_hash': txn_hash,
+            },
+          )
+
+      transactions.update(fetched)
+
+    pending = incomplete
+
+  bundles = [Bundle(chain) for chain in chains]
+
+  for bundle in bundles:
+    validator = BundleValidator(bundle)
+
+    if not validator.is_valid():
+      raise with_context(
+        exc = BadApiResponse(
+          'Bundle failed validation (``exc.context`` has more info).',
+        ),
+
+        context = {
+          'bundle': bundle,
+          'errors': validator.errors,
+        },
+      )
+
+  return bundles
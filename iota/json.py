@@ -3,16 +3,27 @@ from __future__ import absolute_import, division, print_function, \
   unicode_literals
 
 from abc import ABCMeta, abstractmethod as abstract_method
+from codecs import getincrementaldecoder
+from json.decoder import JSONDecoder
 from json.encoder import JSONEncoder as BaseJsonEncoder
-from typing import Iterable, Mapping, Text
+from typing import Any, Dict, Generator, Iterable, List, Mapping, \
+  Optional, Text, Union
 
-from six import with_metaclass
+from six import binary_type, get_unbound_function, iteritems, string_types, \
+  text_type, with_metaclass
+
+try:
+  import orjson
+except ImportError:
+  orjson = None
 
 
 class JsonSerializable(with_metaclass(ABCMeta)):
   """
   Interface for classes that can be safely converted to JSON.
   """
+  __slots__ = ()
+
   @abstract_method
   def as_json_compatible(self):
     """
@@ -59,9 +70,388 @@ class JsonSerializable(with_metaclass(ABCMeta)):
 class JsonEncoder(BaseJsonEncoder):
   """
   JSON encoder with support for :py:class:`JsonSerializable`.
+
+  Request payloads that contain lists of tryte sequences (e.g.,
+  transaction trytes for ``storeTransactions``), either as
+  :py:class:`iota.types.TryteString` objects or as the strings that
+  the request filters convert them to, are encoded by copying the
+  trytes' ASCII representation directly into the output, instead of
+  encoding each item individually.  The result is identical either way.
   """
   def default(self, o):
     if isinstance(o, JsonSerializable):
       return o.as_json_compatible()
 
     return super(JsonEncoder, self).default(o)
+
+  def encode(self, o):
+    if isinstance(o, dict) and (self.indent is None):
+      encoded = self._encode_trytes_payload(o)
+      if encoded is not None:
+        return encoded
+
+    return super(JsonEncoder, self).encode(o)
+
+  def _encode_trytes_payload(self, payload):
+    # type: (dict) -> Optional[Text]
+    """
+    Encodes a request payload, writing lists of tryte sequences
+    directly into the output.
+
+    Returns ``None`` if the payload doesn't contain any tryte sequences
+    (or contains values that the fast path can't handle), in which case
+    the regular encoder should be used instead.
+    """
+    items = [
+      (key, value, _encode_trytes_list(value))
+        for key, value in iteritems(payload)
+    ]
+
+    if all(trytes_list is None for _, _, trytes_list in items):
+      return None
+
+    if not all(isinstance(key, string_types) for key, _, _ in items):
+      return None
+
+    if self.sort_keys:
+      items.sort(key=lambda item: item[0])
+
+    item_separator  = self.item_separator.encode('utf-8')
+    tryte_separator = b'"' + item_separator + b'"'
+
+    # Collect all the pieces and join them at the end, so that the
+    # (potentially very large) output only gets copied once.
+    parts = [b'{']
+
+    for index, (key, value, trytes_list) in enumerate(items):
+      if index:
+        parts.append(item_separator)
+
+      parts.append(
+        (super(JsonEncoder, self).encode(key) + self.key_separator)
+          .encode('utf-8'),
+      )
+
+      if trytes_list is not None:
+        # Tryte sequences only contain ``A-Z`` and ``9``, so there's
+        # nothing to escape.
+        parts.append(b'["')
+        parts.append(tryte_separator.join(trytes_list))
+        parts.append(b'"]')
+      else:
+        parts.append(super(JsonEncoder, self).encode(value).encode('utf-8'))
+
+    parts.append(b'}')
+
+    return b''.join(parts).decode('utf-8')
+
+
+_TRYTE_CHARS = b'9ABCDEFGHIJKLMNOPQRSTUVWXYZ'
+"""
+Characters that can appear in a tryte sequence.
+
+Same as :py:data:`iota.types.TRYTE_ALPHABET` (which can't be imported
+at module level; ``iota.types`` depends on this module).
+"""
+
+
+def _encode_trytes_list(value):
+  # type: (Any) -> Optional[List[Union[binary_type, bytearray]]]
+  """
+  If ``value`` is a non-empty list of tryte sequences, returns their
+  ASCII representations.
+
+  Each item may be a :py:class:`iota.types.TryteString` (see
+  :py:func:`_is_plain_trytes`), or a string that only contains tryte
+  characters (request filters convert tryte sequences to strings).
+
+  Returns ``None`` if ``value`` is anything else.
+  """
+  if not (isinstance(value, (list, tuple)) and value):
+    return None
+
+  encoded = []
+
+  for item in value:
+    if isinstance(item, text_type):
+      try:
+        ascii_item = item.encode('ascii')
+      except UnicodeEncodeError:
+        return None
+
+      # ``translate`` removes all the tryte characters; if anything is
+      # left over, the string needs to go through the regular encoder.
+      if ascii_item.translate(None, _TRYTE_CHARS):
+        return None
+
+      encoded.append(ascii_item)
+    elif _is_plain_trytes(item):
+      encoded.append(item._trytes)
+    else:
+      return None
+
+  return encoded
+
+
+_plain_trytes_types = {} # type: Dict[type, bool]
+"""
+Caches whether instances of a type can be encoded as plain tryte
+sequences.
+"""
+
+
+def _is_plain_trytes(value):
+  # type: (Any) -> bool
+  """
+  Returns whether ``value`` is a :py:class:`iota.types.TryteString`
+  that is represented in JSON by its trytes (some subclasses provide a
+  different representation; e.g., :py:class:`iota.types.Address`).
+  """
+  value_type = type(value)
+
+  try:
+    return _plain_trytes_types[value_type]
+  except KeyError:
+    # Can't import at module level; ``iota.types`` depends on this
+    # module.
+    from iota.types import TryteString
+
+    is_plain = (
+          issubclass(value_type, TryteString)
+      and (
+          get_unbound_function(value_type.as_json_compatible)
+        is get_unbound_function(TryteString.as_json_compatible)
+      )
+    )
+
+    _plain_trytes_types[value_type] = is_plain
+    return is_plain
+
+
+class OrjsonEncoder(JsonEncoder):
+  """
+  JSON encoder that uses the ``orjson`` library (if it is installed)
+  for faster encoding of large request payloads.
+
+  ``orjson`` produces compact output (no whitespace between items),
+  which nodes accept just the same.  If ``orjson`` is not installed,
+  this encoder behaves exactly like :py:class:`JsonEncoder`.
+
+  To use it with :py:class:`iota.adapter.HttpAdapter`::
+
+     adapter = HttpAdapter('http://localhost:14265')
+     adapter.json_encoder = OrjsonEncoder()
+
+  References:
+    - https://github.com/ijl/orjson
+  """
+  def encode(self, o):
+    if orjson is None:
+      return super(OrjsonEncoder, self).encode(o)
+
+    return orjson.dumps(o, default=self.default).decode('utf-8')
+
+
+def iter_json_array(chunks, key):
+  # type: (Iterable[Union[binary_type, Text]], Text) -> Generator[Any]
+  """
+  Incrementally parses a JSON object, yielding the items in one of its
+  array values as soon as each item has been received.
+
+  Only the item currently being parsed is held in memory, so this is
+  suitable for very large responses from the node (e.g., a
+  ``getTrytes`` response containing thousands of transactions).
+
+  :param chunks:
+    Iterable of JSON-encoded chunks (e.g., from
+    :py:meth:`requests.Response.iter_content`).
+    Byte strings are decoded as UTF-8.
+
+  :param key:
+    Key of the array to extract from the top-level object.
+    If the object does not contain this key, nothing is yielded.
+
+  :raise:
+    - :py:class:`ValueError` if the JSON is malformed, if the
+      top-level value is not an object, or if ``key`` is not an array.
+  """
+  return _JsonStreamParser(chunks).iter_array(key)
+
+
+class _JsonStreamParser(object):
+  """
+  Parses a JSON document one value at a time, reading more chunks from
+  the source as needed.
+
+  References:
+    - :py:func:`iter_json_array`
+  """
+  NUMBER_CHARS  = '+-.0123456789Ee'
+  WHITESPACE    = ' \t\n\r'
+
+  def __init__(self, chunks):
+    # type: (Iterable[Union[binary_type, Text]]) -> None
+    super(_JsonStreamParser, self).__init__()
+
+    self._chunks    = iter(chunks)
+    self._decoder   = JSONDecoder()
+    self._utf8      = getincrementaldecoder('utf-8')()
+
+    self._buffer    = ''
+    self._pos       = 0
+    self._exhausted = False
+
+  def iter_array(self, key):
+    # type: (Text) -> Generator[Any]
+    """
+    Yields the items in the array at ``key`` in the top-level object.
+    """
+    self._expect('{')
+
+    if self._peek() == '}':
+      return
+
+    while True:
+      name = self._decode_value()
+      if not isinstance(name, string_types):
+        raise ValueError('Expected object key at position {pos}.'.format(
+          pos = self._pos,
+        ))
+
+      self._expect(':')
+
+      if name == key:
+        for item in self._iter_items():
+          yield item
+      else:
+        # Not the value we're looking for; parse it and throw it away.
+        self._decode_value()
+
+      separator = self._next()
+      if separator == '}':
+        return
+      elif separator != ',':
+        raise ValueError(
+          'Expected "," or "}}" at position {pos}.'.format(pos=self._pos),
+        )
+
+  def _iter_items(self):
+    # type: () -> Generator[Any]
+    """
+    Yields the items in the array at the current position.
+    """
+    self._expect('[')
+
+    if self._peek() == ']':
+      self._pos += 1
+      return
+
+    while True:
+      yield self._decode_value()
+
+      separator = self._next()
+      if separator == ']':
+        return
+      elif separator != ',':
+        raise ValueError(
+          'Expected "," or "]" at position {pos}.'.format(pos=self._pos),
+        )
+
+  def _decode_value(self):
+    # type: () -> Any
+    """
+    Decodes the JSON value at the current position.
+    """
+    self._peek()
+
+    while True:
+      try:
+        value, end = self._decoder.raw_decode(self._buffer, self._pos)
+      except ValueError:
+        # Most likely, we don't have the entire value yet.
+        if not self._fill():
+          raise
+      else:
+        # A value that ends at the end of the buffer might continue in
+        # the next chunk (e.g., ``12`` followed by ``34``), and a number
+        # might have been cut short (e.g., ``1.`` followed by ``5``).
+        if (
+              (end < len(self._buffer))
+          and not (
+                isinstance(value, (int, float))
+            and self._buffer[end] in self.NUMBER_CHARS
+          )
+        ):
+          self._pos = end
+          return value
+
+        if not self._fill():
+          self._pos = end
+          return value
+
+  def _expect(self, char):
+    # type: (Text) -> None
+    """
+    Consumes the next non-whitespace character, which must match
+    ``char``.
+    """
+    actual = self._next()
+    if actual != char:
+      raise ValueError(
+        'Expected {expected!r} at position {pos}, found {actual!r}.'.format(
+          actual    = actual,
+          expected  = char,
+          pos       = self._pos,
+        ),
+      )
+
+  def _next(self):
+    # type: () -> Text
+    """
+    Consumes and returns the next non-whitespace character.
+    """
+    char = self._peek()
+    self._pos += 1
+    return char
+
+  def _peek(self):
+    # type: () -> Text
+    """
+    Skips whitespace and returns the next character, without consuming
+    it.
+    """
+    while True:
+      while self._pos < len(self._buffer):
+        char = self._buffer[self._pos]
+        if char not in self.WHITESPACE:
+          return char
+        self._pos += 1
+
+      if not self._fill():
+        raise ValueError('Unexpected end of JSON input.')
+
+  def _fill(self):
+    # type: () -> bool
+    """
+    Reads the next chunk into the buffer.
+
+    Returns ``False`` if there are no more chunks.
+    """
+    while not self._exhausted:
+      try:
+        chunk = next(self._chunks)
+      except StopIteration:
+        self._exhausted = True
+        chunk = self._utf8.decode(b'', final=True)
+      else:
+        if isinstance(chunk, binary_type):
+          chunk = self._utf8.decode(chunk)
+
+      if chunk:
+        # Discard everything we've already parsed, so that the buffer
+        # doesn't grow with the size of the document.
+        self._buffer  = self._buffer[self._pos:] + chunk
+        self._pos     = 0
+        return True
+
+    return False
@@ -6,6 +6,7 @@ from __future__ import absolute_import, division, print_function, \
 # PyOTA 1.1.x.
 from .base import *
 from .creation import *
+from .table import *
 from .types import *
 from .utils import *
 from .validator import *
@@ -3,27 +3,83 @@ from __future__ import absolute_import, division, print_function, \
   unicode_literals
 
 from operator import attrgetter
-from typing import Iterable, Iterator, List, MutableSequence, \
-  Optional, Sequence, Text
+from random import sample
+from typing import Any, Callable, Iterable, Iterator, List, \
+  MutableSequence, Optional, Sequence, Text, Union
 
 from iota.codecs import TrytesDecodeError
 from iota.crypto import Curl, HASH_LENGTH
+from iota.exceptions import with_context
 from iota.json import JsonSerializable
 from iota.transaction.types import BundleHash, Fragment, Nonce, \
   TransactionHash, TransactionTrytes
-from iota.trits import int_from_trits, trits_from_int
+from iota.trits import int_from_trytes, trytes_from_int
 from iota.types import Address, Tag, TryteString, TrytesCompatible
 
 __all__ = [
   'Bundle',
+  'LazyTransaction',
   'Transaction',
 ]
 
 
+VERIFY_SAMPLE_SIZE = 10
+"""
+Number of hashes to check when parsing transactions with
+``verify='sample'``.
+"""
+
+
+def _hash_trytes(tryte_string, sponge=None):
+  # type: (TryteString, Optional[Curl]) -> TransactionHash
+  """
+  Computes the hash of a transaction from its trytes.
+
+  :param sponge:
+    Curl instance to reuse (e.g., when hashing many transactions).
+  """
+  hash_trits = [0] * HASH_LENGTH # type: MutableSequence[int]
+
+  if sponge is None:
+    sponge = Curl()
+  else:
+    sponge.reset()
+
+  sponge.absorb(tryte_string.as_trits())
+  sponge.squeeze(hash_trits)
+
+  return TransactionHash.from_trits(hash_trits)
+
+
+def _int_from_trytes(tryte_string):
+  # type: (TryteString) -> int
+  return int_from_trytes(tryte_string._trytes)
+
+
 class Transaction(JsonSerializable):
   """
   A transaction that has been attached to the Tangle.
   """
+  __slots__ = (
+    'hash',
+    'bundle_hash',
+    'address',
+    'value',
+    '_legacy_tag',
+    'nonce',
+    'timestamp',
+    'current_index',
+    'last_index',
+    'trunk_transaction_hash',
+    'branch_transaction_hash',
+    'tag',
+    'attachment_timestamp',
+    'attachment_timestamp_lower_bound',
+    'attachment_timestamp_upper_bound',
+    'signature_message_fragment',
+    'is_confirmed',
+  )
+
   @classmethod
   def from_tryte_string(cls, trytes, hash_=None):
     # type: (TrytesCompatible, Optional[TransactionHash]) -> Transaction
@@ -40,33 +96,109 @@ class Transaction(JsonSerializable):
     tryte_string = TransactionTrytes(trytes)
 
     if not hash_:
-      hash_trits = [0] * HASH_LENGTH # type: MutableSequence[int]
-
-      sponge = Curl()
-      sponge.absorb(tryte_string.as_trits())
-      sponge.squeeze(hash_trits)
-
-      hash_ = TransactionHash.from_trits(hash_trits)
+      hash_ = _hash_trytes(tryte_string)
 
     return cls(
       hash_ = hash_,
       signature_message_fragment = Fragment(tryte_string[0:2187]),
       address = Address(tryte_string[2187:2268]),
-      value = int_from_trits(tryte_string[2268:2295].as_trits()),
+      value = int_from_trytes(tryte_string._trytes[2268:2295]),
       legacy_tag = Tag(tryte_string[2295:2322]),
-      timestamp = int_from_trits(tryte_string[2322:2331].as_trits()),
-      current_index = int_from_trits(tryte_string[2331:2340].as_trits()),
-      last_index = int_from_trits(tryte_string[2340:2349].as_trits()),
+      timestamp = int_from_trytes(tryte_string._trytes[2322:2331]),
+      current_index = int_from_trytes(tryte_string._trytes[2331:2340]),
+      last_index = int_from_trytes(tryte_string._trytes[2340:2349]),
       bundle_hash = BundleHash(tryte_string[2349:2430]),
       trunk_transaction_hash = TransactionHash(tryte_string[2430:2511]),
       branch_transaction_hash = TransactionHash(tryte_string[2511:2592]),
       tag = Tag(tryte_string[2592:2619]),
-      attachment_timestamp = int_from_trits(tryte_string[2619:2628].as_trits()),
-      attachment_timestamp_lower_bound = int_from_trits(tryte_string[2628:2637].as_trits()),
-      attachment_timestamp_upper_bound = int_from_trits(tryte_string[2637:2646].as_trits()),
+      attachment_timestamp = int_from_trytes(tryte_string._trytes[2619:2628]),
+      attachment_timestamp_lower_bound = int_from_trytes(tryte_string._trytes[2628:2637]),
+      attachment_timestamp_upper_bound = int_from_trytes(tryte_string._trytes[2637:2646]),
       nonce = Nonce(tryte_string[2646:2673]),
     )
 
+  @classmethod
+  def from_tryte_strings(cls, trytes, hashes=None, verify=False):
+    # type: (Iterable[TrytesCompatible], Optional[Iterable[TrytesCompatible]], Union[bool, Text]) -> List[Transaction]
+    """
+    Creates Transaction objects from many sequences of trytes (e.g.,
+    the result of a ``getTrytes`` request).
+
+    :param trytes:
+      Raw trytes for each transaction.
+
+    :param hashes:
+      The corresponding transaction hashes, in the same order (e.g.,
+      the hashes that were passed to ``getTrytes``).
+
+      If not provided, hashes are computed from the transaction trytes.
+
+    :param verify:
+      Whether to check ``hashes`` against the transaction trytes:
+
+      - ``False``: hashes are trusted, and not computed at all.
+      - ``True``: every hash is checked.
+      - ``'sample'``: a random sample of hashes is checked (see
+        :py:data:`VERIFY_SAMPLE_SIZE`), to catch a node that returns
+        the wrong transactions, without paying for every hash.
+
+    :raise:
+      - :py:class:`ValueError` if a hash doesn't match its transaction.
+    """
+    trytes = [TransactionTrytes(t) for t in trytes]
+
+    if hashes is None:
+      return [cls.from_tryte_string(t) for t in trytes]
+
+    hashes = [TransactionHash(h) for h in hashes]
+
+    if len(hashes) != len(trytes):
+      raise with_context(
+        exc = ValueError(
+          'Expected {expected} hashes, got {actual} '
+          '(``exc.context`` has more info).'.format(
+            actual    = len(hashes),
+            expected  = len(trytes),
+          ),
+        ),
+
+        context = {
+          'hashes': hashes,
+        },
+      )
+
+    if verify == 'sample':
+      to_verify = sample(
+        range(len(trytes)),
+        min(VERIFY_SAMPLE_SIZE, len(trytes)),
+      )
+    elif verify:
+      to_verify = range(len(trytes))
+    else:
+      to_verify = []
+
+    # Reuse the same sponge for every transaction.
+    sponge = Curl()
+
+    for i in to_verify:
+      actual = _hash_trytes(trytes[i], sponge)
+
+      if actual != hashes[i]:
+        raise with_context(
+          exc = ValueError(
+            'Transaction hash does not match trytes '
+            '(``exc.context`` has more info).',
+          ),
+
+          context = {
+            'actual':   actual,
+            'expected': hashes[i],
+            'trytes':   trytes[i],
+          },
+        )
+
+    return [cls.from_tryte_string(t, h) for t, h in zip(trytes, hashes)]
+
   def __init__(
       self,
       hash_,                            # type: Optional[TransactionHash]
@@ -213,8 +345,8 @@ class Transaction(JsonSerializable):
     """
     Returns a TryteString representation of the transaction's value.
     """
-    # Note that we are padding to 81 _trits_.
-    return TryteString.from_trits(trits_from_int(self.value, pad=81))
+    # Note that we are padding to 27 _trytes_ (81 trits).
+    return TryteString.from_trusted(trytes_from_int(self.value, pad=27))
 
   @property
   def timestamp_as_trytes(self):
@@ -223,8 +355,8 @@ class Transaction(JsonSerializable):
     Returns a TryteString representation of the transaction's
     timestamp.
     """
-    # Note that we are padding to 27 _trits_.
-    return TryteString.from_trits(trits_from_int(self.timestamp, pad=27))
+    # Note that we are padding to 9 _trytes_ (27 trits).
+    return TryteString.from_trusted(trytes_from_int(self.timestamp, pad=9))
 
   @property
   def current_index_as_trytes(self):
@@ -233,8 +365,8 @@ class Transaction(JsonSerializable):
     Returns a TryteString representation of the transaction's
     ``current_index`` value.
     """
-    # Note that we are padding to 27 _trits_.
-    return TryteString.from_trits(trits_from_int(self.current_index, pad=27))
+    # Note that we are padding to 9 _trytes_ (27 trits).
+    return TryteString.from_trusted(trytes_from_int(self.current_index, pad=9))
 
   @property
   def last_index_as_trytes(self):
@@ -243,8 +375,8 @@ class Transaction(JsonSerializable):
     Returns a TryteString representation of the transaction's
     ``last_index`` value.
     """
-    # Note that we are padding to 27 _trits_.
-    return TryteString.from_trits(trits_from_int(self.last_index, pad=27))
+    # Note that we are padding to 9 _trytes_ (27 trits).
+    return TryteString.from_trusted(trytes_from_int(self.last_index, pad=9))
 
   @property
   def attachment_timestamp_as_trytes(self):
@@ -253,8 +385,8 @@ class Transaction(JsonSerializable):
     Returns a TryteString representation of the transaction's
     attachment timestamp.
     """
-    #Note that we are padding to 27 _trits_.
-    return TryteString.from_trits(trits_from_int(self.attachment_timestamp, pad=27))
+    # Note that we are padding to 9 _trytes_ (27 trits).
+    return TryteString.from_trusted(trytes_from_int(self.attachment_timestamp, pad=9))
 
   @property
   def attachment_timestamp_lower_bound_as_trytes(self):
@@ -263,8 +395,8 @@ class Transaction(JsonSerializable):
     Returns a TryteString representation of the transaction's
     attachment timestamp lower bound.
     """
-    #Note that we are padding to 27 _trits_.
-    return TryteString.from_trits(trits_from_int(self.attachment_timestamp_lower_bound, pad=27))
+    # Note that we are padding to 9 _trytes_ (27 trits).
+    return TryteString.from_trusted(trytes_from_int(self.attachment_timestamp_lower_bound, pad=9))
 
   @property
   def attachment_timestamp_upper_bound_as_trytes(self):
@@ -273,8 +405,8 @@ class Transaction(JsonSerializable):
     Returns a TryteString representation of the transaction's
     attachment timestamp upper bound.
     """
-    #Note that we are padding to 27 _trits_.
-    return TryteString.from_trits(trits_from_int(self.attachment_timestamp_upper_bound, pad=27))
+    # Note that we are padding to 9 _trytes_ (27 trits).
+    return TryteString.from_trusted(trytes_from_int(self.attachment_timestamp_upper_bound, pad=9))
 
   def as_json_compatible(self):
     # type: () -> dict
@@ -351,6 +483,123 @@ class Transaction(JsonSerializable):
     return self._legacy_tag or self.tag
 
 
+class _LazyField(object):
+  """
+  Decodes a :py:class:`LazyTransaction` field from the transaction's
+  trytes the first time it is accessed.
+
+  The decoded value is stored on the instance, where it takes
+  precedence over the descriptor; subsequent lookups don't involve the
+  descriptor at all.
+  """
+  def __init__(self, name, start, stop, decode):
+    # type: (Text, int, int, Callable[[TryteString], Any]) -> None
+    self.name   = name
+    self.start  = start
+    self.stop   = stop
+    self.decode = decode
+
+  def __get__(self, instance, owner):
+    if instance is None:
+      return self
+
+    value = self.decode(instance._trytes[self.start:self.stop])
+    instance.__dict__[self.name] = value
+    return value
+
+
+class LazyTransaction(Transaction):
+  """
+  A :py:class:`Transaction` that keeps the raw transaction trytes, and
+  only decodes each field the first time it is accessed.
+
+  This is much faster than :py:meth:`Transaction.from_tryte_string`
+  when only a few fields are needed (e.g., when scanning transactions
+  for ``address`` and ``value``).  In particular, the transaction hash
+  (which is expensive to compute) is only computed if it wasn't
+  provided and ``hash`` is accessed.
+
+  Once every field has been decoded, though, a LazyTransaction takes
+  up considerably more memory than a :py:class:`Transaction` (about
+  7,000 vs 4,000 bytes, according to
+  ``benchmarks/transaction_memory.py``): it keeps the raw trytes in
+  addition to the decoded values, and it stores the decoded values in
+  an instance ``__dict__`` (that's how each field replaces its
+  decoder), so it can't use ``__slots__``.  To keep many fully-decoded
+  transactions around, use :py:meth:`Transaction.from_tryte_string`
+  instead.
+  """
+  hash                              = _LazyField('hash', 0, 2673, _hash_trytes)
+  signature_message_fragment        = _LazyField('signature_message_fragment', 0, 2187, Fragment)
+  address                           = _LazyField('address', 2187, 2268, Address)
+  value                             = _LazyField('value', 2268, 2295, _int_from_trytes)
+  _legacy_tag                       = _LazyField('_legacy_tag', 2295, 2322, Tag)
+  timestamp                         = _LazyField('timestamp', 2322, 2331, _int_from_trytes)
+  current_index                     = _LazyField('current_index', 2331, 2340, _int_from_trytes)
+  last_index                        = _LazyField('last_index', 2340, 2349, _int_from_trytes)
+  bundle_hash                       = _LazyField('bundle_hash', 2349, 2430, BundleHash)
+  trunk_transaction_hash            = _LazyField('trunk_transaction_hash', 2430, 2511, TransactionHash)
+  branch_transaction_hash           = _LazyField('branch_transaction_hash', 2511, 2592, TransactionHash)
+  tag                               = _LazyField('tag', 2592, 2619, Tag)
+  attachment_timestamp              = _LazyField('attachment_timestamp', 2619, 2628, _int_from_trytes)
+  attachment_timestamp_lower_bound  = _LazyField('attachment_timestamp_lower_bound', 2628, 2637, _int_from_trytes)
+  attachment_timestamp_upper_bound  = _LazyField('attachment_timestamp_upper_bound', 2637, 2646, _int_from_trytes)
+  nonce                             = _LazyField('nonce', 2646, 2673, Nonce)
+
+  @classmethod
+  def from_tryte_string(cls, trytes, hash_=None):
+    # type: (TrytesCompatible, Optional[TransactionHash]) -> LazyTransaction
+    """
+    Creates a LazyTransaction from a sequence of trytes.
+
+    :param trytes:
+      Raw trytes.  Should be exactly 2673 trytes long.
+
+    :param hash_:
+      The transaction hash, if available.
+      If not provided, it will be computed from the transaction trytes
+      when it is first accessed.
+    """
+    return cls(trytes, hash_)
+
+  # noinspection PyMissingConstructor
+  def __init__(self, trytes, hash_=None):
+    # type: (TrytesCompatible, Optional[TransactionHash]) -> None
+    """
+    :param trytes:
+      Raw trytes.  Should be exactly 2673 trytes long.
+
+    :param hash_:
+      The transaction hash, if available.
+    """
+    # Fields are decoded from the trytes on demand, so we don't call
+    # ``Transaction.__init__``.
+    self.__dict__['_trytes'] = TransactionTrytes(trytes)
+    self.__dict__['_modified'] = False
+
+    if hash_:
+      self.__dict__['hash'] = hash_
+
+    self.is_confirmed = None # type: Optional[bool]
+
+  def __setattr__(self, name, value):
+    # Once a field is changed, the trytes are out of date.
+    if isinstance(getattr(type(self), name, None), _LazyField):
+      self.__dict__['_modified'] = True
+
+    super(LazyTransaction, self).__setattr__(name, value)
+
+  def as_tryte_string(self):
+    # type: () -> TransactionTrytes
+    """
+    Returns a TryteString representation of the transaction.
+    """
+    if self._modified:
+      return super(LazyTransaction, self).as_tryte_string()
+
+    return TransactionTrytes(self._trytes)
+
+
 class Bundle(JsonSerializable, Sequence[Transaction]):
   """
   A collection of transactions, treated as an atomic unit when
@@ -371,7 +620,7 @@ class Bundle(JsonSerializable, Sequence[Transaction]):
     """
     Creates a Bundle object from a list of tryte values.
     """
-    return cls(map(Transaction.from_tryte_string, trytes))
+    return cls(Transaction.from_tryte_strings(trytes))
 
   def __init__(self, transactions=None):
     # type: (Optional[Iterable[Transaction]]) -> None
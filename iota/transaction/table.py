@@ -0,0 +1,394 @@
+# coding=utf-8
+from __future__ import absolute_import, division, print_function, \
+  unicode_literals
+
+from array import array
+from collections import OrderedDict
+from typing import Dict, Iterable, Iterator, List, Optional, Sized, Text, \
+  Union
+
+from six import PY2, binary_type
+
+from iota.exceptions import with_context
+from iota.transaction.base import Bundle, Transaction, _hash_trytes
+from iota.transaction.types import BundleHash, TransactionHash, \
+  TransactionTrytes
+from iota.trits import int_from_trytes
+from iota.types import Address, Hash, Tag, TryteString, TrytesCompatible
+
+__all__ = [
+  'TransactionTable',
+]
+
+# ``array`` doesn't support ``q`` (signed 64-bit) in Python 2, but
+# ``l`` is 64 bits wide on the platforms that matter there.
+INT_TYPECODE = 'l' if PY2 else 'q'
+
+FIELDS = {
+  'address':                  (2187, 2268, Address),
+  'legacy_tag':               (2295, 2322, Tag),
+  'bundle_hash':              (2349, 2430, BundleHash),
+  'trunk_transaction_hash':   (2430, 2511, TransactionHash),
+  'branch_transaction_hash':  (2511, 2592, TransactionHash),
+  'tag':                      (2592, 2619, Tag),
+}
+"""
+Fixed-width columns, as slices of the transaction trytes.
+"""
+
+NUMERIC_FIELDS = (
+  ('value',                 2268, 2295),
+  ('timestamp',             2322, 2331),
+  ('current_index',         2331, 2340),
+  ('last_index',            2340, 2349),
+  ('attachment_timestamp',  2619, 2628),
+)
+"""
+Columns that are decoded into integers when the table is built.
+"""
+
+
+def _as_key(value, length):
+  # type: (TrytesCompatible, int) -> binary_type
+  """
+  Converts a value into the form used to compare it against a
+  fixed-width column (e.g., removes the checksum from an address).
+  """
+  return binary_type(TryteString(value)._trytes[:length])
+
+
+class TransactionTable(Sized):
+  """
+  Stores many transactions in a compact, column-oriented form, for
+  bulk analysis (e.g., reconciling balances) without creating a
+  :py:class:`Transaction` object for each one.
+
+  Numeric columns (``value``, ``timestamp``, ``current_index``,
+  ``last_index`` and ``attachment_timestamp``) are decoded once, into
+  :py:class:`array.array` objects.  The raw transaction trytes are kept
+  in a single buffer; other columns are sliced from it as needed.
+
+  Example::
+
+     response = api.get_trytes(hashes)
+     table = TransactionTable.from_tryte_strings(response['trytes'], hashes)
+
+     incoming  = table.filter(addresses=my_addresses, min_value=1)
+     balances  = incoming.get_balances()
+     bundles   = incoming.as_bundles()
+  """
+  def __init__(self, trytes=None, hashes=None):
+    # type: (Optional[Iterable[TrytesCompatible]], Optional[Iterable[TrytesCompatible]]) -> None
+    """
+    :param trytes:
+      Raw transaction trytes (e.g., the result of ``getTrytes``).
+
+    :param hashes:
+      The corresponding transaction hashes, in the same order.
+
+      If not provided, hashes are computed from the trytes, which is
+      slow; transactions returned by ``getTrytes`` should be paired
+      with the hashes that were requested instead.
+    """
+    super(TransactionTable, self).__init__()
+
+    self._trytes = bytearray()
+    self._hashes = bytearray()
+
+    self.values                 = array(INT_TYPECODE) # type: array
+    self.timestamps             = array(INT_TYPECODE) # type: array
+    self.current_indexes        = array(INT_TYPECODE) # type: array
+    self.last_indexes           = array(INT_TYPECODE) # type: array
+    self.attachment_timestamps  = array(INT_TYPECODE) # type: array
+
+    if trytes is not None:
+      self._extend(trytes, hashes)
+
+  @classmethod
+  def from_tryte_strings(cls, trytes, hashes=None):
+    # type: (Iterable[TrytesCompatible], Optional[Iterable[TrytesCompatible]]) -> TransactionTable
+    """
+    Creates a TransactionTable from raw transaction trytes.
+
+    See :py:meth:`__init__` for parameters.
+    """
+    return cls(trytes, hashes)
+
+  @classmethod
+  def from_transactions(cls, transactions):
+    # type: (Iterable[Transaction]) -> TransactionTable
+    """
+    Creates a TransactionTable from :py:class:`Transaction` objects.
+    """
+    transactions = list(transactions)
+
+    return cls(
+      [txn.as_tryte_string() for txn in transactions],
+      [txn.hash for txn in transactions],
+    )
+
+  def __len__(self):
+    # type: () -> int
+    return len(self.values)
+
+  def __getitem__(self, index):
+    # type: (int) -> Transaction
+    """
+    Returns the transaction at the specified index, as a
+    :py:class:`Transaction` object.
+    """
+    if index < 0:
+      index += len(self)
+
+    if not (0 <= index < len(self)):
+      raise IndexError('TransactionTable index out of range.')
+
+    offset = index * TransactionTrytes.LEN
+    hash_offset = index * Hash.LEN
+
+    return Transaction.from_tryte_string(
+      self._trytes[offset:offset + TransactionTrytes.LEN],
+
+      TransactionHash.from_trusted(
+        self._hashes[hash_offset:hash_offset + Hash.LEN],
+      ),
+    )
+
+  def __iter__(self):
+    # type: () -> Iterator[Transaction]
+    return (self[i] for i in range(len(self)))
+
+  def get_column(self, name):
+    # type: (Text) -> Union[array, List[TryteString]]
+    """
+    Returns the values in a column.
+
+    :param name:
+      Name of a :py:class:`Transaction` attribute, e.g. ``address``,
+      ``bundle_hash``, ``hash``, ``value``.
+
+    :return:
+      An :py:class:`array.array` for numeric columns, otherwise a list
+      of TryteStrings (e.g., :py:class:`Address` objects for the
+      ``address`` column).
+    """
+    for field, _, _ in NUMERIC_FIELDS:
+      if name == field:
+        return self._numeric_columns()[field]
+
+    if name == 'hash':
+      return [TransactionHash.from_trusted(key) for key in self._keys(name)]
+
+    try:
+      type_ = FIELDS[name][2]
+    except KeyError:
+      raise ValueError('Unknown column {name!r}.'.format(name=name))
+
+    return [type_.from_trusted(key) for key in self._keys(name)]
+
+  def take(self, indices):
+    # type: (Iterable[int]) -> TransactionTable
+    """
+    Returns a new table containing only the specified rows, in the
+    specified order.
+    """
+    indices = list(indices)
+    table   = TransactionTable()
+
+    for i in indices:
+      offset = i * TransactionTrytes.LEN
+      table._trytes += self._trytes[offset:offset + TransactionTrytes.LEN]
+
+      hash_offset = i * Hash.LEN
+      table._hashes += self._hashes[hash_offset:hash_offset + Hash.LEN]
+
+    columns = table._numeric_columns()
+    for field, column in self._numeric_columns().items():
+      columns[field].extend(column[i] for i in indices)
+
+    return table
+
+  def filter(
+      self,
+      addresses     = None,
+      bundle_hashes = None,
+      tags          = None,
+      min_value     = None,
+      max_value     = None,
+      tails_only    = False,
+  ):
+    # type: (Optional[Iterable[TrytesCompatible]], Optional[Iterable[TrytesCompatible]], Optional[Iterable[TrytesCompatible]], Optional[int], Optional[int], bool) -> TransactionTable
+    """
+    Returns a new table containing only the transactions that match
+    all of the specified criteria.
+
+    :param addresses:
+      Only include transactions for these addresses.
+
+    :param bundle_hashes:
+      Only include transactions from these bundles.
+
+    :param tags:
+      Only include transactions with these tags.
+
+    :param min_value:
+      Only include transactions with at least this value.
+
+    :param max_value:
+      Only include transactions with at most this value.
+
+    :param tails_only:
+      Only include tail transactions.
+    """
+    selected = range(len(self)) # type: Iterable[int]
+
+    for field, values in (
+        ('address',     addresses),
+        ('bundle_hash', bundle_hashes),
+        ('tag',         tags),
+    ):
+      if values is not None:
+        start, stop, _ = FIELDS[field]
+        wanted = {_as_key(value, stop - start) for value in values}
+
+        keys = self._keys(field)
+        selected = [i for i in selected if keys[i] in wanted]
+
+    if min_value is not None:
+      selected = [i for i in selected if self.values[i] >= min_value]
+
+    if max_value is not None:
+      selected = [i for i in selected if self.values[i] <= max_value]
+
+    if tails_only:
+      selected = [i for i in selected if self.current_indexes[i] == 0]
+
+    return self.take(selected)
+
+  def group_by_bundle(self):
+    # type: () -> Dict[BundleHash, TransactionTable]
+    """
+    Groups transactions by bundle hash.
+
+    :return:
+      Dict mapping bundle hash to a table containing the bundle's
+      transactions, sorted by ``current_index``.  Bundles appear in the
+      order they are first encountered.
+    """
+    groups = OrderedDict() # type: Dict[binary_type, List[int]]
+
+    for i, key in enumerate(self._keys('bundle_hash')):
+      groups.setdefault(key, []).append(i)
+
+    return OrderedDict(
+      (
+        BundleHash.from_trusted(key),
+        self.take(sorted(indices, key=self.current_indexes.__getitem__)),
+      )
+        for key, indices in groups.items()
+    )
+
+  def get_balances(self):
+    # type: () -> Dict[Address, int]
+    """
+    Adds up the values of the transactions for each address.
+
+    Note that this doesn't check whether the transactions are
+    confirmed, or whether their bundles are valid; use :py:meth:`filter`
+    or :py:meth:`take` to select the transactions to include first.
+
+    :return:
+      Dict mapping address to the sum of its transaction values.
+      Addresses appear in the order they are first encountered.
+    """
+    totals = OrderedDict() # type: Dict[binary_type, int]
+
+    for key, value in zip(self._keys('address'), self.values):
+      totals[key] = totals.get(key, 0) + value
+
+    return OrderedDict(
+      (Address.from_trusted(key), total)
+        for key, total in totals.items()
+    )
+
+  def as_transactions(self):
+    # type: () -> List[Transaction]
+    """
+    Converts the table into :py:class:`Transaction` objects.
+    """
+    return list(self)
+
+  def as_bundles(self):
+    # type: () -> List[Bundle]
+    """
+    Converts the table into :py:class:`Bundle` objects, one per bundle
+    hash.
+
+    Note that bundles are not validated, and may be incomplete if the
+    table doesn't contain all of their transactions.
+    """
+    return [
+      Bundle(table.as_transactions())
+        for table in self.group_by_bundle().values()
+    ]
+
+  def _extend(self, trytes, hashes):
+    # type: (Iterable[TrytesCompatible], Optional[Iterable[TrytesCompatible]]) -> None
+    columns = self._numeric_columns()
+
+    if hashes is not None:
+      hashes = iter(hashes)
+
+    for value in trytes:
+      raw = TransactionTrytes(value)._trytes
+
+      if hashes is None:
+        hash_ = _hash_trytes(TryteString.from_trusted(raw))
+      else:
+        hash_ = TransactionHash(next(hashes))
+
+      self._trytes += raw
+      self._hashes += hash_._trytes
+
+      for field, start, stop in NUMERIC_FIELDS:
+        try:
+          columns[field].append(int_from_trytes(raw[start:stop]))
+        except OverflowError:
+          raise with_context(
+            exc = ValueError(
+              'Transaction {field} is out of range '
+              '(``exc.context`` has more info).'.format(field=field),
+            ),
+
+            context = {
+              'hash':   hash_,
+              'trytes': raw,
+            },
+          )
+
+  def _keys(self, field):
+    # type: (Text) -> List[binary_type]
+    """
+    Returns the values in a fixed-width column, as byte strings (e.g.,
+    for use as dict keys).
+    """
+    if field == 'hash':
+      buffer, start, stop, stride = self._hashes, 0, Hash.LEN, Hash.LEN
+    else:
+      buffer, stride = self._trytes, TransactionTrytes.LEN
+      start, stop, _ = FIELDS[field]
+
+    return [
+      binary_type(buffer[offset + start:offset + stop])
+        for offset in range(0, len(buffer), stride)
+    ]
+
+  def _numeric_columns(self):
+    # type: () -> Dict[Text, array]
+    return {
+      'value':                  self.values,
+      'timestamp':              self.timestamps,
+      'current_index':          self.current_indexes,
+      'last_index':             self.last_indexes,
+      'attachment_timestamp':   self.attachment_timestamps,
+    }
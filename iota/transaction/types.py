@@ -19,20 +19,22 @@ class BundleHash(Hash):
   """
   A TryteString that acts as a bundle hash.
   """
-  pass
+  __slots__ = ()
 
 
 class TransactionHash(Hash):
   """
   A TryteString that acts as a transaction hash.
   """
-  pass
+  __slots__ = ()
 
 
 class Fragment(TryteString):
   """
   A signature/message fragment in a transaction.
   """
+  __slots__ = ()
+
   LEN = FRAGMENT_LENGTH
 
   def __init__(self, trytes):
@@ -56,6 +58,8 @@ class TransactionTrytes(TryteString):
   """
   A TryteString representation of a Transaction.
   """
+  __slots__ = ()
+
   LEN = 2673
 
   def __init__(self, trytes):
@@ -78,6 +82,8 @@ class Nonce(TryteString):
   """
   A TryteString that acts as a transaction nonce.
   """
+  __slots__ = ()
+
   LEN = 27
 
   def __init__(self, trytes):
@@ -1,6 +1,7 @@
 # coding=utf-8
 """
-Provides functions for manipulating sequences of trits.
+Provides functions for manipulating sequences of trits, and for
+converting integers to and from trytes.
 
 Based on:
 https://github.com/iotaledger/iota.lib.js/blob/v0.4.2/lib/crypto/helpers/adder.js
@@ -9,15 +10,29 @@ https://github.com/iotaledger/iota.lib.js/blob/v0.4.2/lib/crypto/helpers/adder.j
 from __future__ import absolute_import, division, print_function, \
   unicode_literals
 
-from typing import Iterable, List, Optional, Sequence, Tuple
+from typing import Iterable, List, Optional, Sequence, Tuple, Union
+
+from six import binary_type
 
 __all__ = [
   'add_trits',
   'int_from_trits',
+  'int_from_trytes',
   'trits_from_int',
+  'trytes_from_int',
 ]
 
 
+# Tryte characters, indexed by value (negative values wrap around, so
+# ``_TRYTE_CHARS[-1]`` is ``Z``).
+_TRYTE_CHARS = bytearray(b'9ABCDEFGHIJKLMNOPQRSTUVWXYZ')
+
+# Tryte values, indexed by ASCII code.
+_TRYTE_VALUES = [None] * 256 # type: List[Optional[int]]
+for _value, _char in enumerate(_TRYTE_CHARS):
+  _TRYTE_VALUES[_char] = _value if _value <= 13 else _value - 27
+
+
 def add_trits(left, right):
   # type: (Sequence[int], Sequence[int]) -> List[int]
   """
@@ -52,6 +67,60 @@ def int_from_trits(trits):
   return sum(base * (3 ** power) for power, base in enumerate(trits))
 
 
+def int_from_trytes(trytes):
+  # type: (Union[binary_type, bytearray]) -> int
+  """
+  Converts a sequence of trytes (in ASCII representation, e.g. the
+  ``value`` field of a transaction) into an integer value.
+
+  Equivalent to ``int_from_trits(TryteString(trytes).as_trits())``, but
+  much faster, as it doesn't convert the trytes to trits first.
+
+  Note:  The trytes are not validated; use :py:class:`TryteString` to
+  check untrusted input.
+  """
+  if not isinstance(trytes, bytearray):
+    trytes = bytearray(trytes)
+
+  # Horner's method, in base 27; the least significant tryte is first.
+  n = 0
+  for ordinal in reversed(trytes):
+    n = n * 27 + _TRYTE_VALUES[ordinal]
+
+  return n
+
+
+def trytes_from_int(n, pad=1):
+  # type: (int, Optional[int]) -> bytearray
+  """
+  Returns a tryte representation (in ASCII) of an integer value.
+
+  Equivalent to ``TryteString.from_trits(trits_from_int(n, pad * 3))``,
+  but much faster.
+
+  :param n:
+    Integer value to convert.
+
+  :param pad:
+    Ensure the result has at least this many trytes.
+  """
+  trytes = bytearray()
+
+  while n:
+    n, remainder = divmod(n, 27)
+
+    if remainder > 13:
+      # Lend 1 to the next place so we can make this tryte negative.
+      n += 1
+
+    trytes.append(_TRYTE_CHARS[remainder])
+
+  if pad:
+    trytes += b'9' * max(0, pad - len(trytes))
+
+  return trytes
+
+
 def trits_from_int(n, pad=1):
   # type: (int, Optional[int]) -> List[int]
   """
@@ -36,6 +36,11 @@ TrytesCompatible = Union[AnyStr, bytearray, 'TryteString']
 
 T = TypeVar('T', bound='TryteString')
 
+TRYTE_ALPHABET = binary_type(bytearray(itervalues(AsciiTrytesCodec.alphabet)))
+"""
+ASCII characters that are valid trytes.
+"""
+
 @python_2_unicode_compatible
 class TryteString(JsonSerializable):
   """
@@ -48,6 +53,10 @@ class TryteString(JsonSerializable):
 
   IMPORTANT: A TryteString does not represent a numeric value!
   """
+  # Applications can hold a lot of these in memory (e.g., a few per
+  # cached transaction), so they don't get a ``__dict__``.
+  __slots__ = ('_trytes',)
+
   @classmethod
   def random(cls, length):
     # type: (int) -> TryteString
@@ -193,6 +202,75 @@ class TryteString(JsonSerializable):
       **kwargs
     )
 
+  @classmethod
+  def from_trusted(cls, trytes):
+    # type: (Type[T], Union[binary_type, bytearray, memoryview]) -> T
+    """
+    Creates a TryteString from trytes that are already known to be
+    valid (e.g., a slice of a TryteString), without checking them.
+
+    If ``trytes`` is a bytearray, the TryteString wraps it without
+    copying it, so it must not be modified afterwards.  Other buffers
+    (e.g., bytes or memoryview slices) are copied once.
+
+    Subclasses still check the length of the trytes (see
+    :py:meth:`_init_trusted`).
+
+    Warning:  Invalid characters are not detected!  Use the initializer
+    for untrusted input (e.g., values provided by the user).
+
+    :param trytes:
+      Trytes, in ASCII representation.
+    """
+    if not isinstance(trytes, bytearray):
+      trytes = bytearray(trytes)
+
+    instance = cls.__new__(cls)
+    instance._trytes = trytes
+
+    if cls is not TryteString:
+      instance._init_trusted()
+
+    return instance
+
+  def _init_trusted(self):
+    # type: () -> None
+    """
+    Finishes initializing an instance created by :py:meth:`from_trusted`
+    (e.g., checks length, sets attributes).
+
+    By default, this runs the initializer, which copies the trytes (but
+    still skips character validation).  Subclasses can override this
+    method to avoid the copy.
+    """
+    wrapper = TryteString.__new__(TryteString)
+    wrapper._trytes = self._trytes
+
+    # noinspection PyArgumentList
+    self.__init__(wrapper)
+
+  def _pad_trusted(self, length, check_length=True):
+    # type: (int, bool) -> None
+    """
+    Pads trytes that were provided to :py:meth:`from_trusted`, and
+    checks that they aren't too long.
+    """
+    if len(self._trytes) < length:
+      # Don't modify the caller's buffer.
+      self._trytes = self._trytes + (b'9' * (length - len(self._trytes)))
+
+    if check_length and (len(self._trytes) > length):
+      raise with_context(
+        exc = ValueError('{cls} values must be {len} trytes long.'.format(
+          cls = type(self).__name__,
+          len = length,
+        )),
+
+        context = {
+          'trytes': self._trytes,
+        },
+      )
+
   def __init__(self, trytes, pad=None):
     # type: (TrytesCompatible, Optional[int]) -> None
     """
@@ -254,21 +332,24 @@ class TryteString(JsonSerializable):
       if not isinstance(trytes, bytearray):
         trytes = bytearray(trytes)
 
-      for i, ordinal in enumerate(trytes):
-        if ordinal not in AsciiTrytesCodec.index:
-          raise with_context(
-            exc = ValueError(
-              'Invalid character {char!r} at position {i} '
-              '(expected A-Z or 9).'.format(
-                char  = chr(ordinal),
-                i     = i,
-              ),
+      # Deleting every valid character leaves only the invalid ones.
+      # This is much faster than checking each character in Python.
+      invalid = trytes.translate(None, TRYTE_ALPHABET)
+
+      if invalid:
+        raise with_context(
+          exc = ValueError(
+            'Invalid character {char!r} at position {i} '
+            '(expected A-Z or 9).'.format(
+              char  = chr(invalid[0]),
+              i     = trytes.index(invalid[0:1]),
             ),
+          ),
 
-            context = {
-              'trytes': trytes,
-            },
-          )
+          context = {
+            'trytes': trytes,
+          },
+        )
 
     if pad:
       trytes += b'9' * max(0, pad - len(trytes))
@@ -351,16 +432,13 @@ class TryteString(JsonSerializable):
 
   def __getitem__(self, item):
     # type: (Union[int, slice]) -> TryteString
-    new_trytes = bytearray()
-
     sliced = self._trytes[item]
 
     if isinstance(sliced, int):
-      new_trytes.append(sliced)
-    else:
-      new_trytes.extend(sliced)
+      sliced = bytearray((sliced,))
 
-    return TryteString(new_trytes)
+    # Slicing a bytearray creates a copy, so it can be wrapped as-is.
+    return TryteString.from_trusted(sliced)
 
   def __setitem__(self, item, trytes):
     # type: (Union[int, slice], TrytesCompatible) -> None
@@ -387,7 +465,7 @@ class TryteString(JsonSerializable):
   def __add__(self, other):
     # type: (TrytesCompatible) -> TryteString
     if isinstance(other, TryteString):
-      return TryteString(self._trytes + other._trytes)
+      return TryteString.from_trusted(self._trytes + other._trytes)
     elif isinstance(other, text_type):
       return TryteString(self._trytes + other.encode('ascii'))
     elif isinstance(other, (binary_type, bytearray)):
@@ -690,6 +768,8 @@ class Hash(TryteString):
   """
   A TryteString that is exactly one hash long.
   """
+  __slots__ = ()
+
   # Divide by 3 to convert trits to trytes.
   LEN = HASH_LENGTH // TRITS_PER_TRYTE
 
@@ -709,12 +789,18 @@ class Hash(TryteString):
         },
       )
 
+  def _init_trusted(self):
+    # type: () -> None
+    self._pad_trusted(self.LEN)
+
 
 class Address(TryteString):
   """
   A TryteString that acts as an address, with support for generating
   and validating checksums.
   """
+  __slots__ = ('address', 'balance', 'checksum', 'key_index', 'security_level')
+
   LEN = Hash.LEN
 
   def __init__(self, trytes, balance=None, key_index=None, security_level=None):
@@ -768,6 +854,34 @@ class Address(TryteString):
     address.
     """
 
+  def _init_trusted(self):
+    # type: () -> None
+    self._pad_trusted(self.LEN, check_length=False)
+
+    self.checksum = None
+    if len(self._trytes) == (self.LEN + AddressChecksum.LEN):
+      self.checksum = AddressChecksum.from_trusted(self._trytes[self.LEN:])
+
+    elif len(self._trytes) > self.LEN:
+      raise with_context(
+        exc = ValueError(
+          'Address values must be {len_no_checksum} trytes (no checksum), '
+          'or {len_with_checksum} trytes (with checksum).'.format(
+            len_no_checksum   = self.LEN,
+            len_with_checksum = self.LEN + AddressChecksum.LEN,
+          ),
+        ),
+
+        context = {
+          'trytes': self._trytes,
+        },
+      )
+
+    self.address        = self[:self.LEN]
+    self.balance        = None
+    self.key_index      = None
+    self.security_level = None
+
   def as_json_compatible(self):
     # type: () -> dict
     return {
@@ -821,6 +935,8 @@ class AddressChecksum(TryteString):
   """
   A TryteString that acts as an address checksum.
   """
+  __slots__ = ()
+
   LEN = 9
 
   def __init__(self, trytes):
@@ -846,6 +962,8 @@ class Tag(TryteString):
   """
   A TryteString that acts as a transaction tag.
   """
+  __slots__ = ()
+
   LEN = 27
 
   def __init__(self, trytes):
@@ -863,3 +981,7 @@ class Tag(TryteString):
           'trytes': trytes,
         },
       )
+
+  def _init_trusted(self):
+    # type: () -> None
+    self._pad_trusted(self.LEN)
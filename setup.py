@@ -64,6 +64,11 @@ setup(
 
   install_requires = [
     'filters',
+
+    # ``concurrent.futures`` is only included in the stdlib for
+    # Python 3.
+    'futures; python_version < "3.0"',
+
     'pysha3',
 
     # ``security`` extra wasn't introduced until 2.4.1
@@ -77,6 +82,7 @@ setup(
   extras_require = {
     'ccurl': ['pyota-ccurl'],
     'docs-builder': ['sphinx', 'sphinx_rtd_theme'],
+    'orjson': ['orjson'],
     'test-runner': ['detox'] + tests_require,
   },
 
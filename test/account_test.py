@@ -0,0 +1,351 @@
+# coding=utf-8
+from __future__ import absolute_import, division, print_function, \
+  unicode_literals
+
+import json
+from unittest import TestCase
+
+from iota import Address, AccountTracker, Bundle, Iota, Transaction, \
+  TransactionHash
+from iota.adapter import MockAdapter
+from test import mock
+from test.helpers import create_transaction
+
+
+class AccountTrackerTestCase(TestCase):
+  def setUp(self):
+    super(AccountTrackerTestCase, self).setUp()
+
+    self.adapter  = MockAdapter()
+    self.api      = Iota(self.adapter)
+
+    self.addresses = [
+      Address(b'ADDYZERO', key_index=0),
+      Address(b'ADDYONE', key_index=1),
+      Address(b'ADDYTWO', key_index=2),
+      Address(b'ADDYTHREE', key_index=3),
+    ]
+
+    self.hash_0 = TransactionHash(b'HASHZERO')
+    self.hash_1 = TransactionHash(b'HASHONE')
+    self.hash_2 = TransactionHash(b'HASHTWO')
+
+    self.bundle_0 = self.create_bundle(self.hash_0, self.addresses[0])
+    self.bundle_1 = self.create_bundle(self.hash_1, self.addresses[1])
+
+    # To keep the tests fast, we will mock the address generator.
+    # noinspection PyUnusedLocal
+    def create_generator(ag, start, step=1):
+      for addy in self.addresses[start::step]:
+        yield addy
+
+    self.generator_patch = mock.patch(
+      'iota.crypto.addresses.AddressGenerator.create_iterator',
+      create_generator,
+    )
+
+  @staticmethod
+  def create_bundle(hash_, address):
+    return Bundle([
+      Transaction.from_tryte_string(
+        *reversed(create_transaction(hash_, address=address))
+      ),
+    ])
+
+  def test_refresh(self):
+    """
+    Refreshing an account only scans new addresses, and only fetches
+    bundles for new transactions.
+    """
+    tracker = AccountTracker(self.api)
+
+    # First refresh: ``ADDYZERO`` is used, ``ADDYONE`` is not.
+    self.adapter.seed_response('findTransactions', {
+      'hashes': [self.hash_0],
+    })
+
+    self.adapter.seed_response('findTransactions', {
+      'hashes': [],
+    })
+
+    self.adapter.seed_response('getBalances', {
+      'balances': [42],
+      'milestone': None,
+      'milestoneIndex': None,
+    })
+
+    mock_get_bundles = mock.Mock(return_value=[self.bundle_0])
+
+    with self.generator_patch:
+      with mock.patch(
+          'iota.account.get_bundles_from_transaction_hashes',
+          mock_get_bundles,
+      ):
+        response = tracker.get_account_data()
+
+    self.assertDictEqual(
+      response,
+
+      {
+        'addresses':  [self.addresses[0]],
+        'balance':    42,
+        'bundles':    [self.bundle_0],
+      },
+    )
+
+    self.assertListEqual(
+      mock_get_bundles.call_args[1]['transaction_hashes'],
+      [self.hash_0],
+    )
+
+    self.assertEqual(tracker.next_index, 1)
+    del self.adapter.requests[:]
+
+    # Second refresh: ``ADDYZERO`` has a new transaction (which belongs
+    # to a bundle that we already have), and ``ADDYONE`` is now used.
+    self.adapter.seed_response('findTransactions', {
+      'hashes': [self.hash_0, self.hash_2],
+    })
+
+    self.adapter.seed_response('findTransactions', {
+      'hashes': [self.hash_1],
+    })
+
+    self.adapter.seed_response('findTransactions', {
+      'hashes': [],
+    })
+
+    self.adapter.seed_response('getBalances', {
+      'balances': [0, 40],
+      'milestone': None,
+      'milestoneIndex': None,
+    })
+
+    mock_get_bundles = mock.Mock(
+      return_value = [
+        self.create_bundle(self.hash_0, self.addresses[0]),
+        self.bundle_1,
+      ],
+    )
+
+    with self.generator_patch:
+      with mock.patch(
+          'iota.account.get_bundles_from_transaction_hashes',
+          mock_get_bundles,
+      ):
+        response = tracker.get_account_data()
+
+    self.assertListEqual(response['addresses'], self.addresses[:2])
+    self.assertEqual(response['balance'], 40)
+    self.assertListEqual(response['bundles'], [self.bundle_0, self.bundle_1])
+
+    # Bundles are only fetched for the new transactions.
+    self.assertListEqual(
+      mock_get_bundles.call_args[1]['transaction_hashes'],
+      [self.hash_2, self.hash_1],
+    )
+
+    # Known addresses are checked with a single request, and scanning
+    # resumes after the last used address.
+    self.assertListEqual(
+      [
+        (request['command'], request.get('addresses'))
+          for request in self.adapter.requests
+      ],
+
+      [
+        ('findTransactions',  self.addresses[:1]),
+        ('findTransactions',  self.addresses[1:2]),
+        ('findTransactions',  self.addresses[2:4]),
+        ('getBalances',       self.addresses[:2]),
+      ],
+    )
+
+    self.assertEqual(tracker.next_index, 2)
+
+  def test_unused_account(self):
+    """
+    None of the addresses are used.
+    """
+    self.adapter.seed_response('findTransactions', {
+      'hashes': [],
+    })
+
+    with self.generator_patch:
+      response = AccountTracker(self.api).get_account_data()
+
+    self.assertDictEqual(
+      response,
+
+      {
+        'addresses':  [],
+        'balance':    0,
+        'bundles':    [],
+      },
+    )
+
+    # No need to check balances if there are no transactions.
+    self.assertListEqual(
+      [request['command'] for request in self.adapter.requests],
+      ['findTransactions'],
+    )
+
+  def test_inclusion_states(self):
+    """
+    Inclusion states are refreshed for bundles that weren't confirmed.
+    """
+    tracker = AccountTracker(self.api, start=1, inclusion_states=True)
+
+    tracker.addresses = [self.addresses[1]]
+    tracker.hashes    = {self.hash_1}
+    tracker.bundles   = {
+      self.hash_0: self.bundle_0,
+      self.hash_1: self.bundle_1,
+    }
+
+    self.bundle_0.is_confirmed = True
+    self.bundle_1.is_confirmed = False
+
+    self.adapter.seed_response('findTransactions', {
+      'hashes': [self.hash_1],
+    })
+
+    self.adapter.seed_response('findTransactions', {
+      'hashes': [],
+    })
+
+    self.adapter.seed_response('getNodeInfo', {
+      'latestSolidSubtangleMilestone': TransactionHash(b'MILESTONE'),
+    })
+
+    self.adapter.seed_response('getInclusionStates', {
+      'states': [True],
+    })
+
+    self.adapter.seed_response('getBalances', {
+      'balances': [40],
+      'milestone': None,
+      'milestoneIndex': None,
+    })
+
+    with self.generator_patch:
+      tracker.get_account_data()
+
+    self.assertTrue(self.bundle_1.is_confirmed)
+    self.assertTrue(self.bundle_1.tail_transaction.is_confirmed)
+
+    # Only the unconfirmed bundle is checked.
+    self.assertListEqual(
+      self.adapter.requests[3]['transactions'],
+      [self.hash_1],
+    )
+
+  def test_save_and_restore(self):
+    """
+    Restoring a tracker's state in a new instance, so that it doesn't
+    have to scan the account from the start.
+    """
+    tracker = AccountTracker(self.api, inclusion_states=True, window_size=1)
+
+    tracker.addresses = [self.addresses[0]]
+    tracker.hashes    = {self.hash_0}
+    tracker.bundles   = {self.hash_0: self.bundle_0}
+
+    self.addresses[0].balance = 42
+    self.bundle_0.is_confirmed = True
+
+    # The state survives a round trip through JSON.
+    state = json.loads(json.dumps(tracker.to_dict()))
+
+    restored = AccountTracker.from_dict(self.api, state)
+
+    self.assertEqual(restored.start, 0)
+    self.assertTrue(restored.inclusion_states)
+    self.assertEqual(restored.window_size, 1)
+    self.assertEqual(restored.next_index, 1)
+    self.assertEqual(restored.balance, 42)
+
+    self.assertListEqual(restored.addresses, [self.addresses[0]])
+    self.assertEqual(restored.addresses[0].key_index, 0)
+    self.assertSetEqual(restored.hashes, {self.hash_0})
+
+    self.assertListEqual(list(restored.bundles), [self.hash_0])
+    self.assertTrue(restored.bundles[self.hash_0].is_confirmed)
+
+    self.assertEqual(
+      restored.bundles[self.hash_0].tail_transaction.as_tryte_string(),
+      self.bundle_0.tail_transaction.as_tryte_string(),
+    )
+
+    # Refreshing the restored tracker picks up where the original one
+    # left off.
+    self.adapter.seed_response('findTransactions', {
+      'hashes': [self.hash_0],
+    })
+
+    self.adapter.seed_response('findTransactions', {
+      'hashes': [],
+    })
+
+    self.adapter.seed_response('getBalances', {
+      'balances': [42],
+      'milestone': None,
+      'milestoneIndex': None,
+    })
+
+    with self.generator_patch:
+      response = restored.get_account_data()
+
+    self.assertListEqual(response['addresses'], self.addresses[:1])
+
+    self.assertListEqual(
+      [
+        (request['command'], request.get('addresses'))
+          for request in self.adapter.requests
+      ],
+
+      [
+        ('findTransactions',  self.addresses[:1]),
+        ('findTransactions',  self.addresses[1:2]),
+        ('getBalances',       self.addresses[:1]),
+      ],
+    )
+
+  def test_window_size(self):
+    """
+    Scanning for new addresses, with a custom window size.
+    """
+    tracker = AccountTracker(self.api, window_size=1)
+
+    self.adapter.seed_response('findTransactions', {
+      'hashes': [self.hash_0],
+    })
+
+    self.adapter.seed_response('findTransactions', {
+      'hashes': [self.hash_1],
+    })
+
+    self.adapter.seed_response('findTransactions', {
+      'hashes': [],
+    })
+
+    self.adapter.seed_response('getBalances', {
+      'balances': [42, 40],
+      'milestone': None,
+      'milestoneIndex': None,
+    })
+
+    mock_get_bundles = mock.Mock(return_value=[self.bundle_0, self.bundle_1])
+
+    with self.generator_patch:
+      with mock.patch(
+          'iota.account.get_bundles_from_transaction_hashes',
+          mock_get_bundles,
+      ):
+        tracker.get_account_data()
+
+    # Each window contains a single address.
+    self.assertListEqual(
+      [request.get('addresses') for request in self.adapter.requests][:3],
+      [self.addresses[0:1], self.addresses[1:2], self.addresses[2:3]],
+    )
@@ -0,0 +1,259 @@
+# coding=utf-8
+from __future__ import absolute_import, division, print_function, \
+  unicode_literals
+
+from unittest import TestCase
+
+from six import text_type
+
+from iota import Address, BadApiResponse, BundleHash, Iota, \
+  ProposedTransaction, Tag, Transaction, TransactionHash, TransactionTrytes
+from iota.adapter import resolve_adapter
+from iota.adapter.local import LocalTangleAdapter
+from test.helpers import create_transaction
+
+
+class LocalTangleAdapterTestCase(TestCase):
+  def setUp(self):
+    super(LocalTangleAdapterTestCase, self).setUp()
+
+    self.adapter = LocalTangleAdapter(seed=42)
+
+    self.txn_a = create_transaction(b'A', address=b'ADDY', bundle=b'BONE', tag=b'FOO')
+    self.txn_b = create_transaction(b'B', address=b'ADDY', bundle=b'BTWO', trunk=b'A')
+    self.txn_c = create_transaction(b'C', address=b'OTHER', bundle=b'BTWO', branch=b'A')
+
+    self.adapter.add_transactions([self.txn_a, self.txn_b, self.txn_c])
+
+  def test_find_transactions(self):
+    """
+    Finding transactions using the indexes.
+    """
+    def find(**kwargs):
+      kwargs['command'] = 'findTransactions'
+      return self.adapter.send_request(kwargs)['hashes']
+
+    hash_a, hash_b, hash_c = (
+      text_type(txn[0]) for txn in (self.txn_a, self.txn_b, self.txn_c)
+    )
+
+    self.assertListEqual(find(addresses=[Address(b'ADDY')]), [hash_a, hash_b])
+    self.assertListEqual(find(bundles=[BundleHash(b'BTWO')]), [hash_b, hash_c])
+    self.assertListEqual(find(tags=[Tag(b'FOO')]), [hash_a])
+    self.assertListEqual(find(approvees=[TransactionHash(b'A')]), [hash_b, hash_c])
+
+    # Multiple values for the same field are combined using "OR".
+    self.assertListEqual(
+      find(addresses=[Address(b'ADDY'), Address(b'OTHER')]),
+      [hash_a, hash_b, hash_c],
+    )
+
+    # Multiple fields are combined using "AND".
+    self.assertListEqual(
+      find(addresses=[Address(b'ADDY')], bundles=[BundleHash(b'BTWO')]),
+      [hash_b],
+    )
+
+    self.assertListEqual(find(addresses=[Address(b'UNUSED')]), [])
+
+  def test_get_trytes(self):
+    """
+    Fetching transaction trytes.
+    """
+    response = self.adapter.send_request({
+      'command':  'getTrytes',
+      'hashes':   [self.txn_b[0], TransactionHash(b'UNKNOWN')],
+    })
+
+    self.assertListEqual(
+      response['trytes'],
+      [text_type(self.txn_b[1]), '9' * TransactionTrytes.LEN],
+    )
+
+  def test_compress(self):
+    """
+    Storing transactions compressed.
+    """
+    adapter = LocalTangleAdapter(compress=True).add_transactions([self.txn_a])
+
+    self.assertLess(len(adapter._trytes[text_type(self.txn_a[0])]), 500)
+
+    self.assertListEqual(
+      adapter.send_request({
+        'command':  'getTrytes',
+        'hashes':   [self.txn_a[0]],
+      })['trytes'],
+
+      [text_type(self.txn_a[1])],
+    )
+
+  def test_tips(self):
+    """
+    Selecting tips to approve.
+    """
+    hash_b, hash_c = text_type(self.txn_b[0]), text_type(self.txn_c[0])
+
+    self.assertListEqual(
+      sorted(self.adapter.send_request({'command': 'getTips'})['hashes']),
+      [hash_b, hash_c],
+    )
+
+    response = self.adapter.send_request({
+      'command':  'getTransactionsToApprove',
+      'depth':    3,
+    })
+
+    self.assertIn(response['trunkTransaction'], [hash_b, hash_c])
+    self.assertIn(response['branchTransaction'], [hash_b, hash_c])
+
+    # A transaction that approves a tip replaces it.
+    self.adapter.add_transactions([
+      create_transaction(b'D', trunk=self.txn_b[0], branch=self.txn_b[0]),
+    ])
+
+    self.assertListEqual(
+      sorted(self.adapter.send_request({'command': 'getTips'})['hashes']),
+      [hash_c, text_type(TransactionHash(b'D'))],
+    )
+
+  def test_balances(self):
+    """
+    Balances follow the value transactions that are stored.
+    """
+    self.adapter.set_balance(Address(b'RICH'), 100)
+
+    # Spending 40 from ``RICH``; the bundle is attached twice, but it
+    # only counts once.
+    for hash_prefix in (b'S', b'T'):
+      self.adapter.add_transactions([
+        create_transaction(
+          hash_prefix + b'A',
+          address       = b'RICH',
+          value         = -40,
+          bundle        = b'SPEND',
+          last_index    = 1,
+        ),
+
+        create_transaction(
+          hash_prefix + b'B',
+          address       = b'POOR',
+          value         = 40,
+          bundle        = b'SPEND',
+          current_index = 1,
+          last_index    = 1,
+        ),
+      ])
+
+    response = self.adapter.send_request({
+      'command':    'getBalances',
+      'addresses':  [Address(b'RICH'), Address(b'POOR'), Address(b'ADDY')],
+      'threshold':  100,
+    })
+
+    self.assertListEqual(response['balances'], ['60', '40', '0'])
+
+    response = self.adapter.send_request({
+      'command':    'wereAddressesSpentFrom',
+      'addresses':  [Address(b'RICH'), Address(b'POOR')],
+    })
+
+    self.assertListEqual(response['states'], [True, False])
+
+  def test_inclusion_states(self):
+    """
+    Stored transactions are considered confirmed.
+    """
+    response = self.adapter.send_request({
+      'command':      'getInclusionStates',
+      'transactions': [self.txn_a[0], TransactionHash(b'UNKNOWN')],
+      'tips':         [],
+    })
+
+    self.assertListEqual(response['states'], [True, False])
+
+  def test_attach_to_tangle(self):
+    """
+    Attaching transactions to the Tangle, with proof of work.
+    """
+    adapter = LocalTangleAdapter(proof_of_work=True)
+
+    txn_0 = create_transaction(b'', address=b'RECIPIENT', last_index=1)[1]
+    txn_1 = create_transaction(b'', address=b'RECIPIENT', current_index=1, last_index=1)[1]
+
+    response = adapter.send_request({
+      'command':            'attachToTangle',
+      'trunkTransaction':   TransactionHash(b'TRUNK'),
+      'branchTransaction':  TransactionHash(b'BRANCH'),
+      'minWeightMagnitude': 3,
+
+      # Like the API, send the last transaction first.
+      'trytes': [txn_1, txn_0],
+    })
+
+    head, tail = (
+      Transaction.from_tryte_string(trytes.encode('ascii'))
+        for trytes in reversed(response['trytes'])
+    )
+
+    self.assertEqual(head.current_index, 1)
+    self.assertEqual(head.trunk_transaction_hash, TransactionHash(b'TRUNK'))
+    self.assertEqual(head.branch_transaction_hash, TransactionHash(b'BRANCH'))
+
+    self.assertEqual(tail.current_index, 0)
+    self.assertEqual(tail.trunk_transaction_hash, head.hash)
+    self.assertEqual(tail.branch_transaction_hash, TransactionHash(b'TRUNK'))
+
+    # The hashes end with (at least) 3 zero trits.
+    for txn in (head, tail):
+      self.assertEqual(txn.hash.as_trits()[-3:], [0, 0, 0])
+      self.assertGreater(txn.attachment_timestamp, 0)
+
+  def test_api(self):
+    """
+    Sending and finding a transfer using the API.
+    """
+    api = Iota('local://')
+    self.assertIsInstance(api.adapter, LocalTangleAdapter)
+
+    bundle = api.send_transfer(
+      depth     = 3,
+
+      transfers = [
+        ProposedTransaction(address=Address(b'RECIPIENT'), value=0),
+      ],
+    )['bundle']
+
+    self.assertListEqual(
+      api.find_transactions(addresses=[Address(b'RECIPIENT')])['hashes'],
+      [bundle.tail_transaction.hash],
+    )
+
+    self.assertEqual(
+      api.get_bundles(bundle.tail_transaction.hash)['bundles'][0].hash,
+      bundle.hash,
+    )
+
+  def test_error_unknown_command(self):
+    """
+    Sending a command that the adapter doesn't support.
+    """
+    with self.assertRaises(BadApiResponse) as context:
+      self.adapter.send_request({'command': 'helloWorld'})
+
+    self.assertEqual(context.exception.context['status'], 400)
+
+  def test_error_invalid_trytes(self):
+    """
+    Storing transactions with the wrong length.
+    """
+    with self.assertRaises(BadApiResponse):
+      self.adapter.send_request({
+        'command':  'storeTransactions',
+        'trytes':   ['ABC'],
+      })
+
+  def test_resolve_adapter(self):
+    """
+    Creating the adapter using the ``local://`` protocol.
+    """
+    self.assertIsInstance(resolve_adapter('local://'), LocalTangleAdapter)
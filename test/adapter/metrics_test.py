@@ -0,0 +1,238 @@
+# coding=utf-8
+from __future__ import absolute_import, division, print_function, \
+  unicode_literals
+
+import json
+import socket
+from logging import WARNING
+from unittest import TestCase
+
+from iota import BadApiResponse, TransactionHash, TryteString
+from iota.adapter import MockAdapter
+from iota.adapter.metrics import InMemorySink, MetricsWrapper, \
+  PrometheusSink, StatsdSink, estimate_json_size
+from six import text_type
+from test import mock
+
+
+class EstimateJsonSizeTestCase(TestCase):
+  def test_typical_payload(self):
+    """
+    Estimating the size of a typical request payload.
+    """
+    payload = {
+      'command':    'getBalances',
+      'addresses':  [TryteString(b'A' * 81), TransactionHash(b'B')],
+      'threshold':  100,
+      'extra':      {'flag': True, 'missing': None, 'ratio': 0.5},
+    }
+
+    self.assertEqual(
+      estimate_json_size(payload),
+      len(json.dumps({
+        'command':    'getBalances',
+        'addresses':  ['A' * 81, text_type(TransactionHash(b'B'))],
+        'threshold':  100,
+        'extra':      {'flag': True, 'missing': None, 'ratio': 0.5},
+      })),
+    )
+
+  def test_empty(self):
+    """
+    Estimating the size of empty containers.
+    """
+    self.assertEqual(estimate_json_size({}), 2)
+    self.assertEqual(
+      estimate_json_size({'hashes': []}),
+      len('{"hashes": []}'),
+    )
+
+
+class MetricsWrapperTestCase(TestCase):
+  def setUp(self):
+    super(MetricsWrapperTestCase, self).setUp()
+
+    self.adapter = MockAdapter()
+    self.adapter.seed_response('getTrytes', {
+      'trytes':   ['ABC'],
+      'duration': 1,
+    })
+
+    # Each request "takes" 20 milliseconds.
+    timer = mock.Mock(side_effect=[100.0, 100.02, 200.0, 200.02])
+
+    patcher = mock.patch('iota.adapter.metrics.default_timer', timer)
+    patcher.start()
+    self.addCleanup(patcher.stop)
+
+  def send_requests(self, wrapper):
+    wrapper.send_request({'command': 'getTrytes', 'hashes': ['ABC']})
+
+    # No seeded response left, so this request will fail.
+    with self.assertRaises(BadApiResponse):
+      wrapper.send_request({'command': 'getTrytes', 'hashes': ['DEF']})
+
+  def test_in_memory(self):
+    """
+    Recording metrics in memory.
+    """
+    sink = InMemorySink(buckets=[0.01, 0.05, 0.1])
+    self.send_requests(MetricsWrapper(self.adapter, [sink]))
+
+    snapshot = sink.snapshot()
+    stats = snapshot['getTrytes']
+
+    self.assertEqual(stats['calls'], 2)
+    self.assertDictEqual(stats['errors'], {'BadApiResponse': 1})
+    self.assertListEqual(stats['histogram'], [(0.01, 0), (0.05, 2), (0.1, 2)])
+    self.assertAlmostEqual(stats['duration_sum'], 0.04)
+    self.assertAlmostEqual(stats['duration_max'], 0.02)
+
+    self.assertEqual(
+      stats['request_bytes'],
+      2 * len(json.dumps({'command': 'getTrytes', 'hashes': ['ABC']})),
+    )
+
+    # Failed requests don't have a response.
+    self.assertEqual(
+      stats['response_bytes'],
+      len(json.dumps({'trytes': ['ABC'], 'duration': 1})),
+    )
+
+    sink.reset()
+    self.assertDictEqual(sink.snapshot(), {})
+
+  def test_default_sink(self):
+    """
+    An in-memory sink is used if no sinks are specified.
+    """
+    wrapper = MetricsWrapper(self.adapter)
+    self.send_requests(wrapper)
+
+    self.assertEqual(len(wrapper.sinks), 1)
+    self.assertEqual(wrapper.sinks[0].snapshot()['getTrytes']['calls'], 2)
+
+  def test_prometheus(self):
+    """
+    Rendering metrics in the Prometheus text format.
+    """
+    sink = PrometheusSink(namespace='test', buckets=[0.01, 0.05])
+    self.send_requests(MetricsWrapper(self.adapter, [sink]))
+
+    lines = sink.render().splitlines()
+
+    self.assertIn('# TYPE test_requests_total counter', lines)
+    self.assertIn('test_requests_total{command="getTrytes"} 2', lines)
+
+    self.assertIn(
+      'test_errors_total{command="getTrytes",error="BadApiResponse"} 1',
+      lines,
+    )
+
+    self.assertIn('# TYPE test_request_duration_seconds histogram', lines)
+
+    for line in (
+      'test_request_duration_seconds_bucket{command="getTrytes",le="0.01"} 0',
+      'test_request_duration_seconds_bucket{command="getTrytes",le="0.05"} 2',
+      'test_request_duration_seconds_bucket{command="getTrytes",le="+Inf"} 2',
+      'test_request_duration_seconds_count{command="getTrytes"} 2',
+    ):
+      self.assertIn(line, lines)
+
+  def test_statsd(self):
+    """
+    Sending metrics to a StatsD server.
+    """
+    server = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+    self.addCleanup(server.close)
+
+    server.bind(('127.0.0.1', 0))
+    server.settimeout(5)
+
+    sink = StatsdSink(port=server.getsockname()[1], prefix='test')
+    self.addCleanup(sink.close)
+
+    self.send_requests(MetricsWrapper(self.adapter, [sink]))
+
+    request_size  = len(json.dumps({'command': 'getTrytes', 'hashes': ['ABC']}))
+    response_size = len(json.dumps({'trytes': ['ABC'], 'duration': 1}))
+
+    success = server.recv(4096).decode('utf-8').splitlines()
+    self.assertListEqual(
+      success,
+
+      [
+        'test.getTrytes.calls:1|c',
+        'test.getTrytes.latency:20|ms',
+        'test.getTrytes.request_bytes:{size}|h'.format(size=request_size),
+        'test.getTrytes.response_bytes:{size}|h'.format(size=response_size),
+      ],
+    )
+
+    failure = server.recv(4096).decode('utf-8').splitlines()
+    self.assertIn('test.getTrytes.errors.BadApiResponse:1|c', failure)
+    self.assertIn('test.getTrytes.response_bytes:0|h', failure)
+
+  def test_multiple_sinks(self):
+    """
+    Sending measurements to multiple sinks.
+    """
+    first   = InMemorySink()
+    second  = InMemorySink()
+
+    self.send_requests(MetricsWrapper(self.adapter, [first]).add_sink(second))
+
+    self.assertDictEqual(first.snapshot(), second.snapshot())
+
+  def test_interrupted(self):
+    """
+    A request is interrupted by an exception that doesn't inherit from
+    :py:class:`Exception`.
+    """
+    sink    = InMemorySink()
+    wrapper = MetricsWrapper(self.adapter, [sink])
+
+    # noinspection PyUnresolvedReferences
+    with mock.patch.object(
+        self.adapter,
+        'send_request',
+        mock.Mock(side_effect=KeyboardInterrupt),
+    ):
+      with self.assertRaises(KeyboardInterrupt):
+        wrapper.send_request({'command': 'getTrytes', 'hashes': ['ABC']})
+
+    self.assertDictEqual(
+      sink.snapshot()['getTrytes']['errors'],
+      {'KeyboardInterrupt': 1},
+    )
+
+  def test_sink_error(self):
+    """
+    A sink fails to record the measurements.
+    """
+    broken_sink = mock.Mock(spec=InMemorySink)
+    broken_sink.record.side_effect = ValueError('broken sink')
+
+    sink    = InMemorySink()
+    logger  = mock.Mock()
+
+    wrapper = MetricsWrapper(self.adapter, [broken_sink, sink])
+    wrapper.set_logger(logger)
+
+    # The response and the original exception are unaffected.
+    self.assertDictEqual(
+      wrapper.send_request({'command': 'getTrytes', 'hashes': ['ABC']}),
+      {'trytes': ['ABC'], 'duration': 1},
+    )
+
+    with self.assertRaises(BadApiResponse):
+      wrapper.send_request({'command': 'getTrytes', 'hashes': ['DEF']})
+
+    # The other sinks still receive the measurements.
+    self.assertEqual(sink.snapshot()['getTrytes']['calls'], 2)
+
+    # The errors are logged instead.
+    self.assertListEqual(
+      [call[0][0] for call in logger.log.call_args_list],
+      [WARNING, WARNING],
+    )
@@ -0,0 +1,207 @@
+# coding=utf-8
+from __future__ import absolute_import, division, print_function, \
+  unicode_literals
+
+import os
+import shutil
+from tempfile import mkdtemp
+from unittest import TestCase
+
+from iota import BadApiResponse, Iota, TryteString
+from iota.adapter import MockAdapter, resolve_adapter
+from iota.adapter.replay import RecordingWrapper, ReplayAdapter
+from iota.exceptions import with_context
+from six import text_type
+from test import mock
+
+
+class RecordingWrapperTestCase(TestCase):
+  def setUp(self):
+    super(RecordingWrapperTestCase, self).setUp()
+
+    self.adapter = MockAdapter()
+    self.adapter.seed_response('getBalances', {'balances': ['42']})
+    self.adapter.seed_response('getBalances', {'balances': ['0']})
+
+    self.recorder = RecordingWrapper(self.adapter)
+
+    self.request = {
+      'command':    'getBalances',
+      'addresses':  [TryteString(b'A' * 81)],
+      'threshold':  100,
+    }
+
+  def record(self):
+    self.recorder.send_request(dict(self.request))
+    self.recorder.send_request(dict(self.request))
+
+    # No seeded response left, so this request will fail.
+    with self.assertRaises(BadApiResponse):
+      self.recorder.send_request({'command': 'getNodeInfo'})
+
+  def test_replay(self):
+    """
+    Replaying recorded requests.
+    """
+    self.record()
+    self.assertEqual(len(self.recorder.entries), 3)
+
+    adapter = ReplayAdapter(self.recorder.entries)
+
+    # Identical requests get responses in the order they were recorded;
+    # the last one is repeated.  Key order doesn't matter.
+    request = {
+      'threshold':  100,
+      'addresses':  ['A' * 81],
+      'command':    'getBalances',
+    }
+
+    self.assertDictEqual(adapter.send_request(request), {'balances': ['42']})
+    self.assertDictEqual(adapter.send_request(request), {'balances': ['0']})
+    self.assertDictEqual(adapter.send_request(request), {'balances': ['0']})
+
+    with self.assertRaises(BadApiResponse) as context:
+      adapter.send_request({'command': 'getNodeInfo'})
+
+    # The original error is raised again.
+    self.assertTrue(
+      text_type(context.exception).startswith(
+        "No seeded response for 'getNodeInfo'",
+      ),
+    )
+
+  def test_replay_error_context(self):
+    """
+    Replayed errors have the same status and response as the original
+    errors.
+    """
+    error = with_context(
+      exc     = BadApiResponse('500 response from node: boom'),
+      context = {
+        'request':  {'command': 'getNodeInfo'},
+        'response': {'exception': 'boom'},
+        'status':   500,
+      },
+    )
+
+    # noinspection PyUnresolvedReferences
+    with mock.patch.object(
+        self.adapter,
+        'send_request',
+        mock.Mock(side_effect=error),
+    ):
+      with self.assertRaises(BadApiResponse):
+        self.recorder.send_request({'command': 'getNodeInfo'})
+
+    adapter = ReplayAdapter(self.recorder.entries)
+
+    with self.assertRaises(BadApiResponse) as context:
+      adapter.send_request({'command': 'getNodeInfo'})
+
+    self.assertEqual(
+      text_type(context.exception),
+      '500 response from node: boom',
+    )
+
+    self.assertDictEqual(
+      context.exception.context,
+
+      {
+        'request':  {'command': 'getNodeInfo'},
+        'response': {'exception': 'boom'},
+        'status':   500,
+      },
+    )
+
+  def test_response_not_shared(self):
+    """
+    Modifying a replayed response does not affect subsequent responses.
+    """
+    self.record()
+
+    adapter = ReplayAdapter(self.recorder.entries[1:2])
+
+    adapter.send_request(self.request)['balances'].append('1')
+    self.assertDictEqual(
+      adapter.send_request(self.request),
+      {'balances': ['0']},
+    )
+
+  def test_unknown_request(self):
+    """
+    Replaying a request that was not recorded.
+    """
+    self.record()
+
+    adapter = ReplayAdapter(self.recorder.entries)
+
+    with self.assertRaises(BadApiResponse):
+      adapter.send_request(dict(self.request, threshold=50))
+
+  def test_loose_commands(self):
+    """
+    Requests for some commands are matched by command name only.
+    """
+    self.adapter.seed_response('attachToTangle', {'trytes': ['ABC']})
+    self.recorder.send_request({'command': 'attachToTangle', 'trytes': ['A']})
+
+    adapter = ReplayAdapter(self.recorder.entries)
+
+    self.assertDictEqual(
+      adapter.send_request({'command': 'attachToTangle', 'trytes': ['B']}),
+      {'trytes': ['ABC']},
+    )
+
+  def test_reproduce_latency(self):
+    """
+    Waiting as long as the original requests took.
+    """
+    timer = mock.Mock(side_effect=[100.0, 100.25, 200.0, 200.5])
+
+    with mock.patch('iota.adapter.replay.default_timer', timer):
+      self.recorder.send_request(self.request)
+      self.recorder.send_request(self.request)
+
+    adapter = ReplayAdapter(self.recorder.entries, reproduce_latency=True)
+
+    with mock.patch.object(adapter, '_wait') as mocked_waiter:
+      adapter.send_request(self.request)
+      adapter.send_request(self.request)
+
+    self.assertListEqual(
+      mocked_waiter.call_args_list,
+      [mock.call(0.25), mock.call(0.5)],
+    )
+
+  def test_save(self):
+    """
+    Saving recorded traffic to a file, and replaying it using the
+    ``replay://`` protocol.
+    """
+    self.record()
+
+    tempdir = mkdtemp()
+    self.addCleanup(shutil.rmtree, tempdir)
+
+    for filename in ('traffic.jsonl', 'traffic.jsonl.gz'):
+      path = os.path.join(tempdir, filename)
+      self.recorder.save(path)
+
+      adapter = resolve_adapter('replay://' + path)
+
+      self.assertIsInstance(adapter, ReplayAdapter)
+      self.assertEqual(adapter.get_uri(), 'replay://' + path)
+      self.assertDictEqual(
+        adapter.send_request(self.request),
+        {'balances': ['42']},
+      )
+
+  def test_api(self):
+    """
+    Replaying traffic recorded from API commands.
+    """
+    self.adapter.seed_response('getNodeInfo', {'appName': 'IRI'})
+    Iota(self.recorder).get_node_info()
+
+    api = Iota(ReplayAdapter(self.recorder.entries))
+    self.assertEqual(api.get_node_info()['appName'], 'IRI')
@@ -4,6 +4,7 @@ from __future__ import absolute_import, division, print_function, \
 
 import json
 from collections import deque
+from threading import Event
 from unittest import TestCase
 
 from six import text_type
@@ -412,3 +413,289 @@ class SandboxAdapterTestCase(TestCase):
     with self.assertRaises(ValueError):
       # noinspection PyTypeChecker
       SandboxAdapter('https://localhost', 'token', max_polls=0)
+
+  def test_error_min_poll_interval_too_small(self):
+    """
+    ``min_poll_interval`` is <= 0.
+    """
+    with self.assertRaises(ValueError):
+      SandboxAdapter('https://localhost', 'token', min_poll_interval=0)
+
+  def test_error_min_poll_interval_too_large(self):
+    """
+    ``min_poll_interval`` is > ``poll_interval``.
+    """
+    with self.assertRaises(ValueError):
+      SandboxAdapter(
+        uri               = 'https://localhost',
+        auth_token        = 'token',
+        poll_interval     = 1,
+        min_poll_interval = 2,
+      )
+
+
+def create_job_response(job_id, status, result=None, http_status=200):
+  """
+  Creates a response from the sandbox job API.
+  """
+  job = {
+    'id':         job_id,
+    'status':     status,
+    'createdAt':  1483574581,
+    'startedAt':  None,
+    'finishedAt': None,
+    'command':    'helloWorld',
+
+    'helloWorldRequest': {
+      'command': 'helloWorld',
+    },
+  }
+
+  if status == 'FINISHED':
+    job['helloWorldResponse'] = result
+  elif status == 'FAILED':
+    job['error'] = {'message': result}
+
+  return create_http_response(status=http_status, content=json.dumps(job))
+
+
+class SandboxAdapterAsyncTestCase(TestCase):
+  def setUp(self):
+    super(SandboxAdapterAsyncTestCase, self).setUp()
+
+    self.adapter =\
+      SandboxAdapter(
+        uri               = 'https://localhost',
+        auth_token        = 'ACCESS-TOKEN',
+        poll_interval     = 1,
+        max_polls         = 8,
+        min_poll_interval = 0.01,
+      )
+
+    # Responses to polling requests, keyed by job ID.
+    self.job_responses = {}
+    self.submissions = deque()
+
+    # noinspection PyUnusedLocal
+    def _send_http_request(url, payload, method='post', **kwargs):
+      if method == 'post':
+        return self.submissions.popleft()
+
+      response = self.job_responses[url.rsplit('/', 1)[-1]].popleft()
+
+      # Allow tests to do something while a job is being polled.
+      return response() if callable(response) else response
+
+    self.mocked_sender = mock.Mock(wraps=_send_http_request)
+
+    patcher = mock.patch.object(
+      self.adapter,
+      '_send_http_request',
+      self.mocked_sender,
+    )
+    patcher.start()
+    self.addCleanup(patcher.stop)
+
+  def test_many_jobs(self):
+    """
+    Submitting several jobs at once; they are all polled from the same
+    background thread.
+    """
+    for i in range(5):
+      job_id = 'job-{i}'.format(i=i)
+
+      self.submissions.append(
+        create_job_response(job_id, 'QUEUED', http_status=202),
+      )
+
+      # Each job needs a different number of polls to finish.
+      self.job_responses[job_id] = deque(
+          [create_job_response(job_id, 'RUNNING')] * i
+        + [create_job_response(job_id, 'FINISHED', {'job': i})]
+      )
+
+    futures = [
+      self.adapter.send_request_async({'command': 'helloWorld'})
+        for _ in range(5)
+    ]
+
+    self.assertListEqual(
+      [future.result(timeout=5) for future in futures],
+      [{'job': i} for i in range(5)],
+    )
+
+    # 5 submissions, plus 15 polls (0 + 1 + 2 + 3 + 4 extra polls, plus
+    # one final poll per job).
+    self.assertEqual(self.mocked_sender.call_count, 20)
+
+    for call in self.mocked_sender.call_args_list[5:]:
+      self.assertEqual(
+        call[1]['headers'],
+        {'Authorization': 'token ACCESS-TOKEN'},
+      )
+
+  def test_backoff(self):
+    """
+    The interval between polls doubles each time, up to
+    ``poll_interval``.
+    """
+    self.submissions.append(
+      create_job_response('job', 'QUEUED', http_status=202),
+    )
+
+    self.job_responses['job'] = deque(
+        [create_job_response('job', 'RUNNING')] * 3
+      + [create_job_response('job', 'FINISHED', {})]
+    )
+
+    scheduled = []
+
+    original_poll_job = self.adapter._poll_job
+
+    def _poll_job(job):
+      done = original_poll_job(job)
+      scheduled.append(job.interval)
+      return done
+
+    with mock.patch.object(self.adapter, '_poll_job', _poll_job):
+      future = self.adapter.send_request_async({'command': 'helloWorld'})
+      self.assertDictEqual(future.result(timeout=5), {})
+
+    # Last interval isn't updated, because the job finished.
+    self.assertListEqual(scheduled, [0.02, 0.04, 0.08, 0.08])
+
+  def test_regular_command(self):
+    """
+    Sending a command that doesn't create a job; the future resolves
+    immediately.
+    """
+    self.submissions.append(
+      create_http_response(json.dumps({'message': 'Hello, IOTA!'})),
+    )
+
+    future = self.adapter.send_request_async({'command': 'helloWorld'})
+
+    self.assertTrue(future.done())
+    self.assertDictEqual(future.result(), {'message': 'Hello, IOTA!'})
+
+  def test_job_fails(self):
+    """
+    A job fails; the exception is raised by the future.
+    """
+    self.submissions.append(
+      create_job_response('job', 'QUEUED', http_status=202),
+    )
+
+    self.job_responses['job'] = deque([
+      create_job_response('job', 'FAILED', 'Command failed.'),
+    ])
+
+    future = self.adapter.send_request_async({'command': 'helloWorld'})
+
+    with self.assertRaises(BadApiResponse) as context:
+      future.result(timeout=5)
+
+    self.assertEqual(text_type(context.exception), 'Command failed.')
+
+  def test_error_job_takes_too_long(self):
+    """
+    A job doesn't finish before the deadline.
+    """
+    self.submissions.append(
+      create_job_response('job', 'QUEUED', http_status=202),
+    )
+
+    self.job_responses['job'] = deque(
+      [create_job_response('job', 'RUNNING')] * 2,
+    )
+
+    # The second poll happens after the deadline.
+    clock = mock.Mock(side_effect=[0.0, 0.0, 1.0, 9.0, 9.0])
+
+    with mock.patch.object(self.adapter, '_now', clock):
+      future = self.adapter.send_request_async({'command': 'helloWorld'})
+
+      with self.assertRaises(BadApiResponse) as context:
+        future.result(timeout=5)
+
+    self.assertEqual(
+      text_type(context.exception),
+
+      '``helloWorld`` job timed out after 8 seconds '
+      '(``exc.context`` has more info).',
+    )
+
+  def test_error_submission_rejected(self):
+    """
+    The node rejects the request outright.
+    """
+    self.submissions.append(
+      create_http_response(
+        status  = 429,
+        content = json.dumps({'error': 'Too many requests.'}),
+      ),
+    )
+
+    with self.assertRaises(BadApiResponse):
+      self.adapter.send_request_async({'command': 'helloWorld'})
+
+  def test_cancel_while_polling(self):
+    """
+    The caller cancels a job's future while the job is being polled.
+    """
+    futures = []
+    polled  = Event()
+
+    def cancel_job():
+      futures[0].cancel()
+      polled.set()
+      return create_job_response('job-1', 'FINISHED', {'job': 1})
+
+    self.submissions.extend([
+      create_job_response('job-1', 'QUEUED', http_status=202),
+      create_job_response('job-2', 'QUEUED', http_status=202),
+    ])
+
+    self.job_responses['job-1'] = deque([cancel_job])
+    self.job_responses['job-2'] = deque([
+      create_job_response('job-2', 'FINISHED', {'job': 2}),
+    ])
+
+    futures.append(self.adapter.send_request_async({'command': 'helloWorld'}))
+    self.assertTrue(polled.wait(timeout=5))
+
+    self.assertTrue(futures[0].cancelled())
+
+    # The poller can still handle other jobs.
+    future = self.adapter.send_request_async({'command': 'helloWorld'})
+    self.assertDictEqual(future.result(timeout=5), {'job': 2})
+
+  def test_poller_error(self):
+    """
+    An unexpected error occurs in the poller thread.
+    """
+    self.submissions.extend([
+      create_job_response('job-1', 'QUEUED', http_status=202),
+      create_job_response('job-2', 'QUEUED', http_status=202),
+    ])
+
+    self.job_responses['job-2'] = deque([
+      create_job_response('job-2', 'FINISHED', {'job': 2}),
+    ])
+
+    error = RuntimeError('Frog blast the vent core!')
+
+    with mock.patch.object(
+        self.adapter,
+        '_poll_job',
+        mock.Mock(side_effect=error),
+    ):
+      future = self.adapter.send_request_async({'command': 'helloWorld'})
+
+      # The remaining jobs fail, instead of waiting forever.
+      with self.assertRaises(RuntimeError):
+        future.result(timeout=5)
+
+    # A new thread is started for the next job.
+    future = self.adapter.send_request_async({'command': 'helloWorld'})
+    self.assertDictEqual(future.result(timeout=5), {'job': 2})
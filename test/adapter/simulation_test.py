@@ -0,0 +1,184 @@
+# coding=utf-8
+from __future__ import absolute_import, division, print_function, \
+  unicode_literals
+
+import json
+from concurrent.futures import ThreadPoolExecutor
+from unittest import TestCase
+
+from iota import BadApiResponse
+from iota.adapter.simulation import SimulatedNodeAdapter
+from iota.adapter.wrappers import RetryWrapper
+from test import mock
+
+
+class SimulatedNodeAdapterTestCase(TestCase):
+  def setUp(self):
+    super(SimulatedNodeAdapterTestCase, self).setUp()
+
+    self.waits = []
+
+  def create_adapter(self, **kwargs):
+    adapter = SimulatedNodeAdapter(seed=42, **kwargs)
+    adapter._wait = self.waits.append
+    return adapter
+
+  def test_latency(self):
+    """
+    Configuring latency per command.
+    """
+    adapter =\
+      self.create_adapter(latency=0.1)\
+        .set_latency('getTips', (0.2, 0.3))\
+        .set_latency('attachToTangle', lambda rng: 2.0)\
+        .set_default_response('getNodeInfo', {})\
+        .set_default_response('getTips', {})\
+        .set_default_response('attachToTangle', {})
+
+    for command in ('getNodeInfo', 'getTips', 'attachToTangle'):
+      adapter.send_request({'command': command})
+
+    self.assertEqual(self.waits[0], 0.1)
+    self.assertTrue(0.2 <= self.waits[1] <= 0.3)
+    self.assertEqual(self.waits[2], 2.0)
+
+  def test_bandwidth(self):
+    """
+    Large payloads take longer to transfer.
+    """
+    adapter =\
+      self.create_adapter(latency=0.1, bandwidth=100)\
+        .seed_response('getTrytes', {'trytes': ['A' * 500]})
+
+    payload = {'command': 'getTrytes', 'hashes': ['B' * 81]}
+    adapter.send_request(payload)
+
+    size = (
+        len(json.dumps(payload))
+      + len(json.dumps({'trytes': ['A' * 500]}))
+    )
+
+    self.assertEqual(len(self.waits), 1)
+    self.assertAlmostEqual(self.waits[0], 0.1 + size / 100)
+
+  def test_errors(self):
+    """
+    Requests fail at random.
+    """
+    adapter =\
+      self.create_adapter(error_rate=1)\
+        .set_error_rate('getNodeInfo', 0)\
+        .set_default_response('getNodeInfo', {'appName': 'IRI'})\
+        .set_default_response('getTips', {'hashes': []})
+
+    self.assertDictEqual(
+      adapter.send_request({'command': 'getNodeInfo'}),
+      {'appName': 'IRI'},
+    )
+
+    with self.assertRaises(BadApiResponse) as context:
+      adapter.send_request({'command': 'getTips'})
+
+    self.assertEqual(context.exception.context['status'], 503)
+
+  def test_errors_reproducible(self):
+    """
+    Using the same seed produces the same errors.
+    """
+    def failures():
+      adapter =\
+        self.create_adapter(error_rate=0.5)\
+          .set_default_response('getTips', {'hashes': []})
+
+      result = []
+      for _ in range(20):
+        try:
+          adapter.send_request({'command': 'getTips'})
+        except BadApiResponse:
+          result.append(True)
+        else:
+          result.append(False)
+
+      return result
+
+    first = failures()
+
+    self.assertIn(True, first)
+    self.assertIn(False, first)
+    self.assertListEqual(first, failures())
+
+  def test_retry(self):
+    """
+    Simulated errors are retried by :py:class:`RetryWrapper`.
+    """
+    adapter =\
+      self.create_adapter(error_rate=0.5)\
+        .set_default_response('getTips', {'hashes': []})
+
+    wrapper = RetryWrapper(adapter, max_retries=20)
+
+    with mock.patch.object(wrapper, '_wait_for_retry'):
+      for _ in range(10):
+        wrapper.send_request({'command': 'getTips'})
+
+    self.assertGreater(wrapper.get_metrics()['retries'], 0)
+
+  def test_default_response(self):
+    """
+    Seeded responses are used before the default response, and each
+    request gets its own copy of the default response.
+    """
+    adapter =\
+      self.create_adapter()\
+        .set_default_response('getTips', {'hashes': ['A']})\
+        .seed_response('getTips', {'hashes': ['B']})
+
+    self.assertDictEqual(
+      adapter.send_request({'command': 'getTips'}),
+      {'hashes': ['B']},
+    )
+
+    adapter.send_request({'command': 'getTips'})['hashes'].append('C')
+    self.assertDictEqual(
+      adapter.send_request({'command': 'getTips'}),
+      {'hashes': ['A']},
+    )
+
+    # Commands without a default response still need seeded responses.
+    with self.assertRaises(BadApiResponse):
+      adapter.send_request({'command': 'getNodeInfo'})
+
+  def test_concurrent_requests(self):
+    """
+    Sending requests from multiple threads.
+    """
+    adapter = self.create_adapter()
+
+    for i in range(200):
+      adapter.seed_response('getTips', {'hashes': [i]})
+
+    with ThreadPoolExecutor(max_workers=8) as executor:
+      responses = list(executor.map(
+        lambda _: adapter.send_request({'command': 'getTips'}),
+        range(200),
+      ))
+
+    self.assertListEqual(
+      sorted(response['hashes'][0] for response in responses),
+      list(range(200)),
+    )
+
+    self.assertEqual(len(adapter.requests), 200)
+
+  def test_error_invalid_settings(self):
+    """
+    Invalid error rates or bandwidth.
+    """
+    with self.assertRaises(ValueError):
+      SimulatedNodeAdapter(error_rate=1.5)
+
+    with self.assertRaises(ValueError):
+      SimulatedNodeAdapter(bandwidth=0)
+
+    with self.assertRaises(ValueError):
+      SimulatedNodeAdapter().set_error_rate('getTips', -0.1)
@@ -0,0 +1,207 @@
+# coding=utf-8
+from __future__ import absolute_import, division, print_function, \
+  unicode_literals
+
+import os
+import shutil
+from tempfile import mkdtemp
+from unittest import TestCase
+
+from six import text_type
+
+from iota import Address, BundleHash, Iota, Tag, Transaction, \
+  TransactionHash
+from iota.adapter import MockAdapter
+from iota.adapter.store import TransactionStore, TransactionStoreWrapper
+from test.helpers import create_transaction
+
+
+class TransactionStoreTestCase(TestCase):
+  def setUp(self):
+    super(TransactionStoreTestCase, self).setUp()
+
+    self.store = TransactionStore()
+    self.addCleanup(self.store.close)
+
+    self.txn_a = create_transaction(
+      b'A',
+      address = b'ADDY',
+      bundle  = b'BONE',
+      tag     = b'FOO',
+      value   = 42,
+    )
+
+    self.txn_b = create_transaction(b'B', address=b'ADDY', bundle=b'BTWO', trunk=b'A')
+    self.txn_c = create_transaction(b'C', address=b'OTHER', bundle=b'BTWO', branch=b'A')
+
+    self.store.add_trytes(*zip(self.txn_a, self.txn_b, self.txn_c))
+
+  def test_find_transactions(self):
+    """
+    Finding transactions using the indexes.
+    """
+    hash_a, hash_b, hash_c = (
+      txn[0] for txn in (self.txn_a, self.txn_b, self.txn_c)
+    )
+
+    find = self.store.find_transactions
+
+    self.assertListEqual(find(addresses=[Address(b'ADDY')]), [hash_a, hash_b])
+    self.assertListEqual(find(bundles=[BundleHash(b'BTWO')]), [hash_b, hash_c])
+    self.assertListEqual(find(tags=[Tag(b'FOO')]), [hash_a])
+    self.assertListEqual(find(approvees=[TransactionHash(b'A')]), [hash_b, hash_c])
+
+    # Multiple values for the same parameter are combined using "OR".
+    self.assertListEqual(
+      find(addresses=[Address(b'ADDY'), Address(b'OTHER')]),
+      [hash_a, hash_b, hash_c],
+    )
+
+    # Multiple parameters are combined using "AND".
+    self.assertListEqual(
+      find(addresses=[Address(b'ADDY')], bundles=[BundleHash(b'BTWO')]),
+      [hash_b],
+    )
+
+    self.assertListEqual(find(addresses=[Address(b'UNUSED')]), [])
+    self.assertListEqual(find(), [])
+
+  def test_get_trytes(self):
+    """
+    Fetching trytes from the store.
+    """
+    self.assertDictEqual(
+      self.store.get_trytes([self.txn_a[0], TransactionHash(b'UNKNOWN')]),
+      {text_type(self.txn_a[0]): text_type(self.txn_a[1])},
+    )
+
+  def test_add_trytes(self):
+    """
+    Transactions that are already stored, or that the node doesn't have,
+    are skipped.
+    """
+    added = self.store.add_trytes(
+      [self.txn_a[0], TransactionHash(b'UNKNOWN')],
+      [self.txn_a[1], '9' * 2673],
+    )
+
+    self.assertEqual(added, 0)
+    self.assertEqual(len(self.store), 3)
+
+  def test_add_transactions(self):
+    """
+    Adding :py:class:`Transaction` objects.
+    """
+    hash_, trytes = create_transaction(b'D', address=b'ADDY', value=-5)
+
+    self.assertEqual(
+      self.store.add_transactions([
+        Transaction.from_tryte_string(trytes, hash_),
+      ]),
+
+      1,
+    )
+
+    self.assertIn(hash_, self.store.find_transactions(addresses=[Address(b'ADDY')]))
+    self.assertEqual(self.store.get_trytes([hash_])[text_type(hash_)], text_type(trytes))
+
+  def test_persistent(self):
+    """
+    Transactions are persisted to disk.
+    """
+    tempdir = mkdtemp()
+    self.addCleanup(shutil.rmtree, tempdir)
+
+    path = os.path.join(tempdir, 'transactions.db')
+
+    store = TransactionStore(path)
+    store.add_trytes(*zip(self.txn_a))
+    store.close()
+
+    store = TransactionStore(path)
+    self.addCleanup(store.close)
+
+    self.assertListEqual(
+      store.find_transactions(tags=[Tag(b'FOO')]),
+      [self.txn_a[0]],
+    )
+
+
+class TransactionStoreWrapperTestCase(TestCase):
+  def setUp(self):
+    super(TransactionStoreWrapperTestCase, self).setUp()
+
+    self.txn_a = create_transaction(b'A', address=b'ADDY')
+    self.txn_b = create_transaction(b'B', address=b'ADDY')
+
+    self.store = TransactionStore()
+    self.addCleanup(self.store.close)
+
+    self.store.add_trytes(*zip(self.txn_a))
+
+    self.adapter = MockAdapter()
+    self.wrapper = TransactionStoreWrapper(self.adapter, self.store)
+
+  def test_read_through(self):
+    """
+    Only transactions that are not in the store are requested from the
+    node.
+    """
+    self.adapter.seed_response('getTrytes', {
+      'trytes': [text_type(self.txn_b[1]), '9' * 2673],
+    })
+
+    response = self.wrapper.send_request({
+      'command': 'getTrytes',
+      'hashes': [self.txn_a[0], self.txn_b[0], TransactionHash(b'UNKNOWN')],
+    })
+
+    self.assertListEqual(
+      response['trytes'],
+      [text_type(self.txn_a[1]), text_type(self.txn_b[1]), '9' * 2673],
+    )
+
+    self.assertListEqual(
+      self.adapter.requests[0]['hashes'],
+      [text_type(self.txn_b[0]), text_type(TransactionHash(b'UNKNOWN'))],
+    )
+
+    # The transaction fetched from the node is stored, so it doesn't
+    # have to be fetched again.
+    response = self.wrapper.send_request({
+      'command':  'getTrytes',
+      'hashes':   [self.txn_b[0]],
+    })
+
+    self.assertListEqual(response['trytes'], [text_type(self.txn_b[1])])
+    self.assertEqual(len(self.adapter.requests), 1)
+
+    self.assertDictEqual(self.wrapper.get_metrics(), {'hits': 2, 'misses': 2})
+
+  def test_api(self):
+    """
+    Using the wrapper with the API.
+    """
+    api = Iota(self.wrapper)
+
+    self.assertListEqual(
+      api.get_trytes([self.txn_a[0]])['trytes'],
+      [self.txn_a[1]],
+    )
+
+    self.assertListEqual(self.adapter.requests, [])
+
+  def test_pass_through(self):
+    """
+    Other commands are sent to the node.
+    """
+    self.adapter.seed_response('findTransactions', {'hashes': []})
+
+    self.assertDictEqual(
+      self.wrapper.send_request({
+        'command':    'findTransactions',
+        'addresses':  ['ADDY'],
+      }),
+
+      {'hashes': []},
+    )
@@ -2,10 +2,76 @@
 from __future__ import absolute_import, division, print_function, \
   unicode_literals
 
+import json
+from threading import Lock, Thread
+from time import sleep
 from unittest import TestCase
 
-from iota.adapter import HttpAdapter, MockAdapter
-from iota.adapter.wrappers import RoutingWrapper
+from requests.exceptions import ConnectionError as RequestsConnectionError
+
+from iota import BadApiResponse, TransactionHash
+from iota.adapter import BaseAdapter, HttpAdapter, MockAdapter
+from iota.adapter.wrappers import ChunkingWrapper, CircuitBreakerOpen, \
+  CoalescingWrapper, RateLimitWrapper, RetryWrapper, RoutingWrapper
+from iota.exceptions import with_context
+from six import moves as compat, text_type
+from test import mock
+
+
+class EchoAdapter(BaseAdapter):
+  """
+  Stand-in node that generates responses from the request contents, so
+  that results don't depend on the order in which concurrent requests
+  arrive.
+  """
+  def __init__(self):
+    super(EchoAdapter, self).__init__()
+
+    self.requests = []
+    self._lock    = Lock()
+
+  def get_uri(self):
+    return 'echo://'
+
+  def send_request(self, payload, **kwargs):
+    with self._lock:
+      self.requests.append(dict(payload))
+
+    command = payload['command']
+
+    if command == 'getTrytes':
+      return {
+        'trytes':   ['TRYTES' + h for h in payload['hashes']],
+        'duration': 1,
+      }
+
+    if command == 'getBalances':
+      return {
+        'balances':       [len(a) for a in payload['addresses']],
+        'milestone':      'MILESTONE' + payload['addresses'][0],
+        'milestoneIndex': len(payload['addresses']),
+        'duration':       2,
+      }
+
+    if command == 'findTransactions':
+      # Simulate intersection of search terms by only returning hashes
+      # for bundles that match a tag.
+      return {
+        'hashes': [
+          b + t
+            for b in payload['bundles']
+            for t in payload['tags']
+            if b[-1] == t[-1]
+        ] + ['SHARED'],
+      }
+
+    if command == 'wereAddressesSpentFrom':
+      if 'BOOM' in payload['addresses']:
+        raise BadApiResponse('Kaboom!')
+
+      return {'states': [a.startswith('S') for a in payload['addresses']]}
+
+    return {'command': command}
 
 
 class RoutingWrapperTestCase(TestCase):
@@ -90,3 +156,859 @@ class RoutingWrapperTestCase(TestCase):
       wrapper2.get_adapter('echo'),
       wrapper1.get_adapter('alpha'),
     )
+
+
+class ChunkingWrapperTestCase(TestCase):
+  def setUp(self):
+    super(ChunkingWrapperTestCase, self).setUp()
+
+    self.adapter = EchoAdapter()
+    self.wrapper = ChunkingWrapper(self.adapter, chunk_size=3)
+
+  def test_small_request(self):
+    """
+    The request is small enough to be sent in one piece.
+    """
+    response = self.wrapper.send_request({
+      'command':  'getTrytes',
+      'hashes':   ['A', 'B', 'C'],
+    })
+
+    self.assertDictEqual(
+      response,
+
+      {
+        'trytes':   ['TRYTESA', 'TRYTESB', 'TRYTESC'],
+        'duration': 1,
+      },
+    )
+
+    self.assertEqual(len(self.adapter.requests), 1)
+
+  def test_unsupported_command(self):
+    """
+    The wrapper does not know how to split the command, so it passes
+    the request through unmodified.
+    """
+    payload = {
+      'command':  'storeTransactions',
+      'trytes':   ['A', 'B', 'C', 'D', 'E'],
+    }
+
+    self.assertDictEqual(
+      self.wrapper.send_request(payload),
+      {'command': 'storeTransactions'},
+    )
+
+    self.assertListEqual(self.adapter.requests, [payload])
+
+  def test_concat_preserves_order(self):
+    """
+    Splitting a request whose response values correspond to the
+    request items, in order.
+    """
+    hashes = [chr(ord('A') + i) for i in range(10)]
+
+    response = self.wrapper.send_request({
+      'command':  'getTrytes',
+      'hashes':   hashes,
+    })
+
+    self.assertListEqual(response['trytes'], ['TRYTES' + h for h in hashes])
+
+    # Durations from each chunk are added together.
+    self.assertEqual(response['duration'], 4)
+
+    self.assertListEqual(
+      sorted(len(r['hashes']) for r in self.adapter.requests),
+      [1, 3, 3, 3],
+    )
+
+  def test_per_command_chunk_size(self):
+    """
+    Configuring a different chunk size for a specific command.
+    """
+    self.wrapper.set_chunk_size('getTrytes', 5)
+
+    self.wrapper.send_request({
+      'command':  'getTrytes',
+      'hashes':   ['A'] * 10,
+    })
+
+    self.assertListEqual(
+      [len(r['hashes']) for r in self.adapter.requests],
+      [5, 5],
+    )
+
+  def test_chunk_size_from_capabilities(self):
+    """
+    If no chunk size is specified, the wrapper uses the request limits
+    that the node reported when the adapter was warmed up.
+    """
+    adapter = MockAdapter()
+    adapter.seed_response('getNodeInfo', {
+      'maxGetTrytes':     20,
+      'maxRequestsList':  50,
+    })
+
+    wrapper = ChunkingWrapper(adapter)
+
+    # Not warmed up yet.
+    self.assertEqual(
+      wrapper.get_chunk_size('getTrytes'),
+      ChunkingWrapper.DEFAULT_CHUNK_SIZE,
+    )
+
+    wrapper.warmup()
+
+    self.assertEqual(wrapper.get_chunk_size('getTrytes'), 20)
+    self.assertEqual(wrapper.get_chunk_size('getBalances'), 50)
+
+    # Explicit chunk sizes take precedence.
+    wrapper.set_chunk_size('getTrytes', 5)
+    self.assertEqual(wrapper.get_chunk_size('getTrytes'), 5)
+
+    self.assertEqual(
+      ChunkingWrapper(adapter, chunk_size=3).get_chunk_size('getBalances'),
+      3,
+    )
+
+  def test_milestone_from_oldest_chunk(self):
+    """
+    When merging ``getBalances`` responses, the wrapper reports the
+    oldest milestone that any chunk was evaluated against.
+    """
+    response = self.wrapper.send_request({
+      'command':    'getBalances',
+      'addresses':  ['A', 'BB', 'CCC', 'DDDD'],
+      'threshold':  100,
+    })
+
+    self.assertDictEqual(
+      response,
+
+      {
+        'balances':       [1, 2, 3, 4],
+        'milestone':      'MILESTONEDDDD',
+        'milestoneIndex': 1,
+        'duration':       4,
+      },
+    )
+
+    # Non-chunked parameters are copied to every request.
+    for request in self.adapter.requests:
+      self.assertEqual(request['threshold'], 100)
+
+  def test_union_multiple_parameters(self):
+    """
+    Splitting a ``findTransactions`` request where multiple search
+    terms are too large.
+    """
+    response = self.wrapper.send_request({
+      'command':  'findTransactions',
+      'bundles':  ['B1', 'B2', 'B3', 'B4'],
+      'tags':     ['T1', 'T2', 'T3', 'T4', 'T5'],
+    })
+
+    # Every combination of chunks is sent, so that the intersection of
+    # search terms is preserved.
+    self.assertEqual(len(self.adapter.requests), 4)
+
+    # Results are de-duplicated.
+    self.assertListEqual(
+      sorted(response['hashes']),
+      ['B1T1', 'B2T2', 'B3T3', 'B4T4', 'SHARED'],
+    )
+
+  def test_sequential(self):
+    """
+    Sending chunks one at a time.
+    """
+    wrapper = ChunkingWrapper(self.adapter, chunk_size=2, max_workers=1)
+
+    response = wrapper.send_request({
+      'command':    'wereAddressesSpentFrom',
+      'addresses':  ['SA', 'B', 'SC', 'D', 'E'],
+    })
+
+    self.assertListEqual(
+      response['states'],
+      [True, False, True, False, False],
+    )
+
+    self.assertListEqual(
+      [r['addresses'] for r in self.adapter.requests],
+      [['SA', 'B'], ['SC', 'D'], ['E']],
+    )
+
+  def test_chunk_fails(self):
+    """
+    One of the chunks fails.
+    """
+    with self.assertRaises(BadApiResponse):
+      self.wrapper.send_request({
+        'command':    'wereAddressesSpentFrom',
+        'addresses':  ['A', 'B', 'C', 'BOOM'],
+      })
+
+
+class CoalescingWrapperTestCase(TestCase):
+  def setUp(self):
+    super(CoalescingWrapperTestCase, self).setUp()
+
+    self.adapter = EchoAdapter()
+    self.wrapper = CoalescingWrapper(self.adapter)
+
+  def _send_concurrently(self, payloads):
+    """
+    Sends requests from separate threads, ensuring that they all join
+    the same batch.
+    """
+    results = [None] * len(payloads)
+
+    def wait_for_batch(batch):
+      # Instead of waiting a fixed interval, wait until every thread
+      # has joined the batch.
+      for _ in range(500):
+        if batch.size >= len(payloads):
+          break
+        sleep(0.01)
+
+    def send(i):
+      try:
+        results[i] = self.wrapper.send_request(payloads[i])
+      except BaseException as e:
+        results[i] = e
+
+    # noinspection PyUnresolvedReferences
+    with mock.patch.object(self.wrapper, '_wait_for_batch', wait_for_batch):
+      threads = [Thread(target=send, args=(i,)) for i in range(len(payloads))]
+
+      for t in threads:
+        t.start()
+
+      for t in threads:
+        t.join()
+
+    return results
+
+  def test_single_request(self):
+    """
+    Only one request is sent during the window.
+    """
+    wrapper = CoalescingWrapper(self.adapter, window=0)
+
+    self.assertDictEqual(
+      wrapper.send_request({'command': 'getTrytes', 'hashes': ['A', 'B']}),
+      {'trytes': ['TRYTESA', 'TRYTESB'], 'duration': 1},
+    )
+
+    self.assertEqual(len(self.adapter.requests), 1)
+
+  def test_unsupported_command(self):
+    """
+    Commands that can't be merged are passed through immediately.
+    """
+    self.assertDictEqual(
+      self.wrapper.send_request({'command': 'getNodeInfo'}),
+      {'command': 'getNodeInfo'},
+    )
+
+  def test_merge_concurrent_requests(self):
+    """
+    Concurrent requests are merged, and duplicate items are only
+    requested once.
+    """
+    results = self._send_concurrently([
+      {'command': 'getTrytes', 'hashes': ['A', 'B']},
+      {'command': 'getTrytes', 'hashes': [TransactionHash(b'B'), 'C']},
+      {'command': 'getTrytes', 'hashes': ['C', 'A', 'D']},
+    ])
+
+    self.assertEqual(len(self.adapter.requests), 1)
+
+    hash_b = text_type(TransactionHash(b'B'))
+
+    self.assertListEqual(
+      sorted(self.adapter.requests[0]['hashes']),
+      sorted(['A', 'B', hash_b, 'C', 'D']),
+    )
+
+    self.assertListEqual(results[0]['trytes'], ['TRYTESA', 'TRYTESB'])
+    self.assertListEqual(results[1]['trytes'], ['TRYTES' + hash_b, 'TRYTESC'])
+    self.assertListEqual(
+      results[2]['trytes'],
+      ['TRYTESC', 'TRYTESA', 'TRYTESD'],
+    )
+
+  def test_different_parameters(self):
+    """
+    Requests are only merged if their other parameters match.
+    """
+    # noinspection PyProtectedMember
+    get_batch_key = CoalescingWrapper._get_batch_key
+
+    self.assertEqual(
+      get_batch_key(
+        {'command': 'getBalances', 'addresses': ['A'], 'threshold': 100},
+        'addresses',
+      ),
+
+      get_batch_key(
+        {'command': 'getBalances', 'addresses': ['B', 'C'], 'threshold': 100},
+        'addresses',
+      ),
+    )
+
+    self.assertNotEqual(
+      get_batch_key(
+        {'command': 'getBalances', 'addresses': ['A'], 'threshold': 100},
+        'addresses',
+      ),
+
+      get_batch_key(
+        {'command': 'getBalances', 'addresses': ['A'], 'threshold': 50},
+        'addresses',
+      ),
+    )
+
+  def test_max_batch_size(self):
+    """
+    Once a batch is full, new requests start a new batch.
+    """
+    wrapper = CoalescingWrapper(self.adapter, window=0, max_batch_size=2)
+
+    wrapper.send_request({'command': 'getTrytes', 'hashes': ['A', 'B']})
+    wrapper.send_request({'command': 'getTrytes', 'hashes': ['C']})
+
+    self.assertEqual(len(self.adapter.requests), 2)
+
+  def test_error(self):
+    """
+    The merged request fails.
+    """
+    results = self._send_concurrently([
+      {'command': 'wereAddressesSpentFrom', 'addresses': ['A']},
+      {'command': 'wereAddressesSpentFrom', 'addresses': ['BOOM']},
+    ])
+
+    self.assertEqual(len(self.adapter.requests), 1)
+
+    # Every request in the batch receives the exception.
+    self.assertIsInstance(results[0], BadApiResponse)
+    self.assertIsInstance(results[1], BadApiResponse)
+
+  def test_error_not_exception(self):
+    """
+    The merged request is interrupted by an exception that doesn't
+    inherit from :py:class:`Exception`.
+    """
+    # noinspection PyUnresolvedReferences
+    with mock.patch.object(
+        self.adapter,
+        'send_request',
+        mock.Mock(side_effect=KeyboardInterrupt),
+    ):
+      results = self._send_concurrently([
+        {'command': 'getTrytes', 'hashes': ['A']},
+        {'command': 'getTrytes', 'hashes': ['B']},
+      ])
+
+    # Every request in the batch receives the exception.
+    self.assertIsInstance(results[0], KeyboardInterrupt)
+    self.assertIsInstance(results[1], KeyboardInterrupt)
+
+
+def node_error(status):
+  # type: (int) -> BadApiResponse
+  """
+  Creates an exception like the one HttpAdapter raises for a non-success
+  response.
+  """
+  return with_context(
+    exc = BadApiResponse('{status} response from node'.format(
+      status = status,
+    )),
+
+    context = {'status': status},
+  )
+
+
+class FlakyAdapter(BaseAdapter):
+  """
+  Stand-in node that raises a sequence of errors before it starts
+  responding normally.
+  """
+  def __init__(self, *errors):
+    super(FlakyAdapter, self).__init__()
+
+    self.errors   = list(errors)
+    self.requests = []
+
+  def get_uri(self):
+    return 'flaky://'
+
+  def send_request(self, payload, **kwargs):
+    self.requests.append(dict(payload))
+
+    if self.errors:
+      raise self.errors.pop(0)
+
+    return {'duration': 1}
+
+
+class FlakyNode(compat.BaseHTTPServer.HTTPServer, object):
+  """
+  Local HTTP server that responds with ``503 Service Unavailable`` (and
+  a non-JSON body, like a reverse proxy would) a number of times before
+  it starts responding normally.
+  """
+  class Handler(compat.BaseHTTPServer.BaseHTTPRequestHandler):
+    def do_POST(self):
+      self.rfile.read(int(self.headers['Content-Length']))
+
+      with self.server.lock:
+        self.server.request_count += 1
+        fail = self.server.failures > 0
+        self.server.failures -= fail
+
+      if fail:
+        status, body = 503, b'Service Unavailable'
+      else:
+        status, body = 200, json.dumps({'appName': 'IRI'}).encode('utf-8')
+
+      self.send_response(status)
+      self.send_header('Content-Length', text_type(len(body)))
+      self.end_headers()
+      self.wfile.write(body)
+
+    def log_message(self, *args):
+      pass
+
+  def __init__(self, failures):
+    super(FlakyNode, self).__init__(('127.0.0.1', 0), self.Handler)
+
+    self.failures       = failures
+    self.lock           = Lock()
+    self.request_count  = 0
+
+  @property
+  def uri(self):
+    return 'http://127.0.0.1:{port}'.format(port=self.server_address[1])
+
+  def __enter__(self):
+    Thread(target=self.serve_forever).start()
+    return self
+
+  def __exit__(self, exc_type, exc_val, exc_tb):
+    self.shutdown()
+    self.server_close()
+
+
+class RetryWrapperTestCase(TestCase):
+  def setUp(self):
+    super(RetryWrapperTestCase, self).setUp()
+
+    self.delays = []
+
+  def create_wrapper(self, adapter, **kwargs):
+    wrapper = RetryWrapper(adapter, **kwargs)
+
+    # Record delays instead of actually waiting.
+    # noinspection PyUnresolvedReferences
+    patcher = mock.patch.object(wrapper, '_wait_for_retry', self.delays.append)
+    patcher.start()
+    self.addCleanup(patcher.stop)
+
+    return wrapper
+
+  def test_success(self):
+    """
+    The request succeeds on the first attempt.
+    """
+    adapter = FlakyAdapter()
+    wrapper = self.create_wrapper(adapter)
+
+    self.assertDictEqual(
+      wrapper.send_request({'command': 'getNodeInfo'}),
+      {'duration': 1},
+    )
+
+    self.assertEqual(len(adapter.requests), 1)
+    self.assertListEqual(self.delays, [])
+
+  def test_retry_transient_errors(self):
+    """
+    The request fails with transient errors, then succeeds.
+    """
+    adapter = FlakyAdapter(
+      node_error(503),
+      RequestsConnectionError('Connection refused'),
+    )
+
+    wrapper = self.create_wrapper(adapter, base_delay=1.0)
+
+    self.assertDictEqual(
+      wrapper.send_request({'command': 'getTrytes', 'hashes': []}),
+      {'duration': 1},
+    )
+
+    self.assertEqual(len(adapter.requests), 3)
+
+    # Delays are randomized, but they stay within the exponential
+    # backoff limits.
+    self.assertEqual(len(self.delays), 2)
+    self.assertTrue(0 <= self.delays[0] <= 1.0)
+    self.assertTrue(0 <= self.delays[1] <= 2.0)
+
+    metrics = wrapper.get_metrics()
+    self.assertEqual(metrics['attempts'], 3)
+    self.assertEqual(metrics['retries'], 2)
+    self.assertEqual(metrics['successes'], 1)
+    self.assertEqual(metrics['failures'], 0)
+    self.assertDictEqual(metrics['retries_by_command'], {'getTrytes': 2})
+
+  def test_max_delay(self):
+    """
+    Backoff delays never exceed ``max_delay``.
+    """
+    wrapper = RetryWrapper(FlakyAdapter(), base_delay=1.0, max_delay=3.0)
+
+    for attempt in range(10):
+      self.assertLessEqual(wrapper._get_delay(attempt), 3.0)
+
+  def test_retries_exhausted(self):
+    """
+    The request keeps failing until the wrapper runs out of retries.
+    """
+    adapter = FlakyAdapter(*(node_error(500) for _ in range(5)))
+    wrapper = self.create_wrapper(adapter, max_retries=2)
+
+    with self.assertRaises(BadApiResponse):
+      wrapper.send_request({'command': 'getNodeInfo'})
+
+    self.assertEqual(len(adapter.requests), 3)
+    self.assertEqual(wrapper.get_metrics()['failures'], 1)
+
+  def test_non_transient_error(self):
+    """
+    Errors caused by the request itself are not retried.
+    """
+    adapter = FlakyAdapter(node_error(400))
+    wrapper = self.create_wrapper(adapter)
+
+    with self.assertRaises(BadApiResponse):
+      wrapper.send_request({'command': 'getNodeInfo'})
+
+    self.assertEqual(len(adapter.requests), 1)
+
+  def test_non_idempotent_command(self):
+    """
+    Commands that aren't safe to repeat are not retried.
+    """
+    adapter = FlakyAdapter(node_error(503))
+    wrapper = self.create_wrapper(adapter)
+
+    with self.assertRaises(BadApiResponse):
+      wrapper.send_request({'command': 'attachToTangle'})
+
+    self.assertEqual(len(adapter.requests), 1)
+
+  def test_per_command_policy(self):
+    """
+    Configuring the number of retries for specific commands.
+    """
+    adapter = FlakyAdapter(node_error(503), node_error(503))
+
+    wrapper = (
+      self.create_wrapper(adapter)
+        .set_max_retries('attachToTangle', 1)
+        .set_max_retries('getNodeInfo', 0)
+    )
+
+    self.assertEqual(wrapper.get_max_retries('getTrytes'), 3)
+
+    with self.assertRaises(BadApiResponse):
+      wrapper.send_request({'command': 'getNodeInfo'})
+
+    self.assertDictEqual(
+      wrapper.send_request({'command': 'attachToTangle'}),
+      {'duration': 1},
+    )
+
+    self.assertEqual(len(adapter.requests), 3)
+
+  def test_circuit_breaker(self):
+    """
+    The circuit breaker opens after too many consecutive failures, then
+    closes again once the node recovers.
+    """
+    adapter = FlakyAdapter(node_error(503), node_error(503))
+
+    wrapper = self.create_wrapper(
+      adapter,
+      max_retries       = 0,
+      failure_threshold = 2,
+      reset_timeout     = 30,
+    )
+
+    # noinspection PyUnresolvedReferences
+    with mock.patch.object(wrapper, '_now', mock.Mock(return_value=1000)):
+      for _ in range(2):
+        with self.assertRaises(BadApiResponse):
+          wrapper.send_request({'command': 'getNodeInfo'})
+
+      self.assertEqual(wrapper.state, RetryWrapper.STATE_OPEN)
+
+      # The node is not contacted while the breaker is open.
+      with self.assertRaises(CircuitBreakerOpen):
+        wrapper.send_request({'command': 'getNodeInfo'})
+
+      self.assertEqual(len(adapter.requests), 2)
+
+    # noinspection PyUnresolvedReferences
+    with mock.patch.object(wrapper, '_now', mock.Mock(return_value=1030)):
+      self.assertEqual(wrapper.state, RetryWrapper.STATE_HALF_OPEN)
+
+      # Trial request succeeds; breaker closes.
+      wrapper.send_request({'command': 'getNodeInfo'})
+
+    self.assertEqual(wrapper.state, RetryWrapper.STATE_CLOSED)
+
+    metrics = wrapper.get_metrics()
+    self.assertEqual(metrics['breaker_opened'], 1)
+    self.assertEqual(metrics['rejected'], 1)
+
+  def test_circuit_breaker_trial_fails(self):
+    """
+    The trial request fails, so the circuit breaker opens again.
+    """
+    adapter = FlakyAdapter(node_error(503), node_error(503))
+
+    wrapper = self.create_wrapper(
+      adapter,
+      max_retries       = 0,
+      failure_threshold = 1,
+      reset_timeout     = 30,
+    )
+
+    # noinspection PyUnresolvedReferences
+    with mock.patch.object(wrapper, '_now', mock.Mock(return_value=1000)):
+      with self.assertRaises(BadApiResponse):
+        wrapper.send_request({'command': 'getNodeInfo'})
+
+    # noinspection PyUnresolvedReferences
+    with mock.patch.object(wrapper, '_now', mock.Mock(return_value=1030)):
+      with self.assertRaises(BadApiResponse):
+        wrapper.send_request({'command': 'getNodeInfo'})
+
+      self.assertEqual(wrapper.state, RetryWrapper.STATE_OPEN)
+
+      with self.assertRaises(CircuitBreakerOpen):
+        wrapper.send_request({'command': 'getNodeInfo'})
+
+    self.assertEqual(len(adapter.requests), 2)
+    self.assertEqual(wrapper.get_metrics()['breaker_opened'], 2)
+
+  def test_flaky_node(self):
+    """
+    Retrying requests sent to a local node that is temporarily
+    unavailable.
+    """
+    with FlakyNode(failures=2) as node:
+      wrapper = self.create_wrapper(HttpAdapter(node.uri))
+
+      self.assertDictEqual(
+        wrapper.send_request({'command': 'getNodeInfo'}),
+        {'appName': 'IRI'},
+      )
+
+      self.assertEqual(node.request_count, 3)
+
+  def test_node_down(self):
+    """
+    Nothing is listening at the node's address.
+    """
+    with FlakyNode(failures=0) as node:
+      uri = node.uri
+
+    wrapper = self.create_wrapper(HttpAdapter(uri), max_retries=1)
+
+    with self.assertRaises(RequestsConnectionError):
+      wrapper.send_request({'command': 'getNodeInfo'})
+
+    self.assertEqual(wrapper.get_metrics()['retries'], 1)
+
+
+class RateLimitWrapperTestCase(TestCase):
+  def setUp(self):
+    super(RateLimitWrapperTestCase, self).setUp()
+
+    self.adapter  = EchoAdapter()
+    self.clock    = 1000.0
+    self.delays   = []
+
+  def create_wrapper(self, **kwargs):
+    wrapper = RateLimitWrapper(self.adapter, **kwargs)
+
+    # Use a fake clock, so that the test doesn't have to wait.
+    def fake_wait(delay):
+      self.delays.append(delay)
+      self.clock += delay
+
+    for patcher in (
+        mock.patch.object(wrapper, '_now', lambda: self.clock),
+        mock.patch.object(wrapper, '_wait', fake_wait),
+    ):
+      patcher.start()
+      self.addCleanup(patcher.stop)
+
+    return wrapper
+
+  @staticmethod
+  def send(wrapper, command='getNodeInfo'):
+    return wrapper.send_request({'command': command})
+
+  def test_no_limits(self):
+    """
+    Requests are sent immediately if no limits are configured.
+    """
+    wrapper = self.create_wrapper()
+
+    for _ in range(10):
+      self.send(wrapper)
+
+    self.assertEqual(len(self.adapter.requests), 10)
+    self.assertListEqual(self.delays, [])
+
+  def test_global_rate(self):
+    """
+    Requests wait in line once the burst allowance is used up.
+    """
+    wrapper = self.create_wrapper(rate=2)
+
+    for _ in range(4):
+      self.send(wrapper)
+
+    self.assertEqual(len(self.adapter.requests), 4)
+    self.assertListEqual(self.delays, [0.5, 0.5])
+
+    # After a pause, the bucket refills.
+    self.clock += 10
+    self.delays = []
+
+    self.send(wrapper)
+    self.send(wrapper)
+    self.assertListEqual(self.delays, [])
+
+    metrics = wrapper.get_metrics()
+    self.assertEqual(metrics['requests'], 6)
+    self.assertEqual(metrics['queued'], 2)
+    self.assertEqual(metrics['total_wait'], 1.0)
+    self.assertEqual(metrics['max_wait'], 0.5)
+    self.assertDictEqual(metrics['wait_by_command'], {'getNodeInfo': 1.0})
+
+  def test_burst(self):
+    """
+    Configuring the burst allowance separately from the rate.
+    """
+    wrapper = self.create_wrapper(rate=1, burst=3)
+
+    for _ in range(4):
+      self.send(wrapper)
+
+    self.assertListEqual(self.delays, [1.0])
+
+  def test_per_command_rate(self):
+    """
+    Commands can have their own rate limits.
+    """
+    wrapper = self.create_wrapper().set_rate_limit('getTips', rate=1)
+
+    self.send(wrapper, 'getTips')
+    self.send(wrapper, 'getNodeInfo')
+    self.send(wrapper, 'getNodeInfo')
+    self.assertListEqual(self.delays, [])
+
+    self.send(wrapper, 'getTips')
+    self.assertListEqual(self.delays, [1.0])
+
+  def test_invalid_rate(self):
+    """
+    Rate limits must be positive.
+    """
+    with self.assertRaises(ValueError):
+      RateLimitWrapper(self.adapter, rate=0)
+
+  def test_max_in_flight(self):
+    """
+    Limiting the number of requests in progress at the same time.
+    """
+    lock          = Lock()
+    in_flight     = [0]
+    max_in_flight = [0]
+
+    def slow_send(payload, **kwargs):
+      with lock:
+        in_flight[0] += 1
+        max_in_flight[0] = max(max_in_flight[0], in_flight[0])
+
+      sleep(0.02)
+
+      with lock:
+        in_flight[0] -= 1
+
+      return {}
+
+    wrapper = RateLimitWrapper(self.adapter, max_in_flight=2)
+
+    # noinspection PyUnresolvedReferences
+    with mock.patch.object(self.adapter, 'send_request', slow_send):
+      threads = [
+        Thread(target=self.send, args=(wrapper,))
+          for _ in range(6)
+      ]
+
+      for t in threads:
+        t.start()
+
+      for t in threads:
+        t.join()
+
+    self.assertEqual(max_in_flight[0], 2)
+
+    metrics = wrapper.get_metrics()
+    self.assertEqual(metrics['requests'], 6)
+    self.assertEqual(metrics['in_flight'], 0)
+    self.assertGreater(metrics['max_wait'], 0)
+    self.assertGreater(metrics['queued'], 0)
+
+  def test_not_throttled(self):
+    """
+    Requests that don't have to wait aren't counted as queued, even
+    though checking the limits takes a little time.
+    """
+    # Use the real clock.
+    wrapper = RateLimitWrapper(self.adapter, rate=1000, max_in_flight=2)
+
+    for _ in range(5):
+      self.send(wrapper)
+
+    metrics = wrapper.get_metrics()
+    self.assertEqual(metrics['requests'], 5)
+    self.assertEqual(metrics['queued'], 0)
+
+  def test_error(self):
+    """
+    A failed request still releases its slot.
+    """
+    wrapper = RateLimitWrapper(self.adapter, max_in_flight=1)
+
+    with self.assertRaises(BadApiResponse):
+      wrapper.send_request({
+        'command':    'wereAddressesSpentFrom',
+        'addresses':  ['BOOM'],
+      })
+
+    self.send(wrapper)
+    self.assertEqual(wrapper.get_metrics()['in_flight'], 0)
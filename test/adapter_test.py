@@ -4,13 +4,18 @@ from __future__ import absolute_import, division, print_function, \
 
 import json
 import socket
+from logging import DEBUG, Handler, Logger, getLogger
+from threading import Lock, Thread
+from time import sleep
 from typing import Text
 from unittest import TestCase
 
 import requests
-from iota import BadApiResponse, InvalidUri, TryteString
-from iota.adapter import API_VERSION, HttpAdapter, MockAdapter, resolve_adapter
-from six import BytesIO, text_type
+from iota import BadApiResponse, InvalidUri, TransactionTrytes, TryteString
+from iota.adapter import API_VERSION, DEFAULT_NODE_LIMITS, HttpAdapter, \
+  MockAdapter, get_node_capabilities, resolve_adapter
+from iota.commands.core.store_transactions import StoreTransactionsCommand
+from six import BytesIO, moves as compat, text_type
 from test import mock
 
 
@@ -71,6 +76,76 @@ def create_http_response(content, status=200):
   return response
 
 
+class RecordingHandler(Handler):
+  """
+  Log handler that keeps records in memory, so that tests can inspect
+  them.
+  """
+  def __init__(self):
+    super(RecordingHandler, self).__init__()
+
+    self.records = []
+
+  def emit(self, record):
+    self.records.append(record)
+
+
+class KeepAliveNode(compat.socketserver.ThreadingMixIn,
+    compat.BaseHTTPServer.HTTPServer, object):
+  """
+  Local HTTP server that keeps connections open, and keeps track of
+  how many connections clients have opened.
+  """
+  daemon_threads = True
+
+  class Handler(compat.BaseHTTPServer.BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'
+
+    def do_POST(self):
+      self.rfile.read(int(self.headers['Content-Length']))
+
+      with self.server.lock:
+        self.server.clients.add(self.client_address)
+        self.server.request_count += 1
+
+      # Give concurrent requests a chance to overlap.
+      sleep(0.05)
+
+      body = json.dumps({
+        'appName':      'IRI',
+        'appVersion':   '1.5.5',
+        'features':     ['RemotePOW'],
+      }).encode('utf-8')
+
+      self.send_response(200)
+      self.send_header('Content-Type', 'application/json')
+      self.send_header('Content-Length', text_type(len(body)))
+      self.end_headers()
+      self.wfile.write(body)
+
+    def log_message(self, *args):
+      pass
+
+  def __init__(self):
+    super(KeepAliveNode, self).__init__(('127.0.0.1', 0), self.Handler)
+
+    self.clients        = set()
+    self.lock           = Lock()
+    self.request_count  = 0
+
+  @property
+  def uri(self):
+    return 'http://127.0.0.1:{port}'.format(port=self.server_address[1])
+
+  def __enter__(self):
+    Thread(target=self.serve_forever).start()
+    return self
+
+  def __exit__(self, exc_type, exc_val, exc_tb):
+    self.shutdown()
+    self.server_close()
+
+
 class HttpAdapterTestCase(TestCase):
   def test_http(self):
     """
@@ -417,3 +492,280 @@ class HttpAdapterTestCase(TestCase):
         'X-IOTA-API-Version': API_VERSION,
       },
     )
+
+  def test_filtered_trytes_in_request(self):
+    """
+    Sending a request whose trytes have been converted to strings by
+    the command's request filter.
+    """
+    adapter = HttpAdapter('http://localhost:14265')
+
+    mocked_sender = mock.Mock(return_value=create_http_response('{}'))
+
+    # Keep track of whether the tryte sequences were copied directly
+    # into the output.
+    encode_trytes_payload = adapter.json_encoder._encode_trytes_payload
+    fast_path_results     = []
+
+    def mock_encode_trytes_payload(payload):
+      result = encode_trytes_payload(payload)
+      fast_path_results.append(result)
+      return result
+
+    trytes = [
+      TransactionTrytes(b'RBTC9D9DCDQAEASBYBCCKBFA'),
+      TransactionTrytes(b'CCPCBDVC9DTCEAKDXC9D9DEARCWCPCBDVCTCEAHDWCTC'),
+    ]
+
+    # noinspection PyUnresolvedReferences
+    with mock.patch.object(adapter, '_send_http_request', mocked_sender):
+      with mock.patch.object(
+          adapter.json_encoder,
+          '_encode_trytes_payload',
+          mock_encode_trytes_payload,
+      ):
+        StoreTransactionsCommand(adapter)(trytes=trytes)
+
+    self.assertEqual(len(fast_path_results), 1)
+    self.assertIsNotNone(fast_path_results[0])
+
+    _, kwargs = mocked_sender.call_args
+
+    self.assertDictEqual(
+      json.loads(kwargs['payload']),
+
+      {
+        'command':  'storeTransactions',
+        'trytes':   [text_type(t) for t in trytes],
+      },
+    )
+
+  def test_streaming_response(self):
+    """
+    Iterating over values in a response as they are received.
+    """
+    adapter = HttpAdapter('http://localhost:14265')
+
+    # Force the response to be decoded in multiple chunks.
+    adapter.STREAM_CHUNK_SIZE = 7
+
+    mocked_response = create_http_response(json.dumps({
+      'hashes':   ['ABCDEFGHI', 'JKLMNOPQR', 'STUVWXYZ9'],
+      'duration': 42,
+    }))
+
+    mocked_sender = mock.Mock(return_value=mocked_response)
+
+    # noinspection PyUnresolvedReferences
+    with mock.patch.object(adapter, '_send_http_request', mocked_sender):
+      result = adapter.iter_response_values(
+        {'command': 'findTransactions'},
+        'hashes',
+      )
+
+      self.assertListEqual(
+        list(result),
+        ['ABCDEFGHI', 'JKLMNOPQR', 'STUVWXYZ9'],
+      )
+
+    mocked_sender.assert_called_once_with(
+      headers = {
+        'Content-type':       'application/json',
+        'X-IOTA-API-Version': API_VERSION,
+      },
+
+      payload = json.dumps({'command': 'findTransactions'}),
+      stream  = True,
+      url     = adapter.node_url,
+    )
+
+  def test_streaming_error_response(self):
+    """
+    Attempting to stream a response, but the node returns an error.
+    """
+    adapter = HttpAdapter('http://localhost:14265')
+
+    mocked_response = create_http_response(
+      status = 400,
+
+      content = json.dumps({
+        'error':    'Command \u0027helloWorld\u0027 is unknown',
+        'duration': 42,
+      }),
+    )
+
+    mocked_sender = mock.Mock(return_value=mocked_response)
+
+    # noinspection PyUnresolvedReferences
+    with mock.patch.object(adapter, '_send_http_request', mocked_sender):
+      with self.assertRaises(BadApiResponse) as context:
+        adapter.iter_response_values({'command': 'helloWorld'}, 'hashes')
+
+    self.assertEqual(
+      text_type(context.exception),
+      '400 response from node: Command \u0027helloWorld\u0027 is unknown',
+    )
+
+  def test_streaming_malformed_response(self):
+    """
+    The node's response is cut off partway through the stream.
+    """
+    adapter = HttpAdapter('http://localhost:14265')
+
+    mocked_response = create_http_response('{"hashes": ["ABC", "DE')
+    mocked_sender   = mock.Mock(return_value=mocked_response)
+
+    # noinspection PyUnresolvedReferences
+    with mock.patch.object(adapter, '_send_http_request', mocked_sender):
+      result = adapter.iter_response_values(
+        {'command': 'findTransactions'},
+        'hashes',
+      )
+
+      # Values that arrived before the problem are still yielded.
+      self.assertEqual(next(result), 'ABC')
+
+      with self.assertRaises(BadApiResponse):
+        next(result)
+
+  @mock.patch('iota.adapter.request')
+  def test_logging_enabled(self, request_mock):
+    """
+    Requests and responses are logged if the logger is enabled for
+    DEBUG messages.
+    """
+    request_mock.return_value = create_http_response('{"dummy": "payload"}')
+
+    handler = RecordingHandler()
+    logger  = getLogger('test.adapter.logging_enabled')
+    logger.addHandler(handler)
+    logger.setLevel(DEBUG)
+    logger.propagate = False
+
+    adapter = HttpAdapter('http://localhost:14265').set_logger(logger)
+    adapter.send_request({'command': 'helloWorld'})
+
+    self.assertEqual(len(handler.records), 2)
+
+    self.assertEqual(
+      handler.records[0].getMessage(),
+
+      'Sending post to http://localhost:14265: {payload!r}'.format(
+        payload = json.dumps({'command': 'helloWorld'}),
+      ),
+    )
+
+    self.assertEqual(
+      handler.records[1].context['response_content'],
+      b'{"dummy": "payload"}',
+    )
+
+  @mock.patch('iota.adapter.request')
+  def test_logging_disabled(self, request_mock):
+    """
+    Log messages are not prepared at all if the logger would ignore
+    them.
+    """
+    request_mock.return_value = create_http_response('{"dummy": "payload"}')
+
+    logger = mock.Mock(spec=Logger)
+    logger.isEnabledFor.return_value = False
+
+    adapter = HttpAdapter('http://localhost:14265').set_logger(logger)
+
+    adapter.send_request({'command': 'helloWorld'})
+
+    logger.isEnabledFor.assert_called_with(DEBUG)
+    self.assertFalse(logger.log.called)
+
+
+  def test_warmup(self):
+    """
+    Warming up the adapter opens a pool of connections, which are
+    reused for subsequent requests.
+    """
+    with KeepAliveNode() as node:
+      adapter = HttpAdapter(node.uri)
+
+      capabilities = adapter.warmup(connections=3)
+
+      self.assertEqual(node.request_count, 3)
+      self.assertEqual(len(node.clients), 3)
+
+      self.assertEqual(capabilities['appName'], 'IRI')
+      self.assertListEqual(capabilities['features'], ['RemotePOW'])
+      self.assertIs(adapter.get_capabilities(), capabilities)
+
+      for _ in range(3):
+        adapter.send_request({'command': 'getNodeInfo'})
+
+      self.assertEqual(node.request_count, 6)
+      self.assertEqual(len(node.clients), 3)
+
+      adapter.session.close()
+
+  @mock.patch('iota.adapter.request')
+  def test_no_warmup(self, request_mock):
+    """
+    Until the adapter is warmed up, it doesn't keep connections open.
+    """
+    request_mock.return_value = create_http_response('{"dummy": "payload"}')
+
+    adapter = HttpAdapter('http://localhost:14265')
+    adapter.send_request({'command': 'helloWorld'})
+
+    self.assertIsNone(adapter.session)
+    self.assertIsNone(adapter.get_capabilities())
+    self.assertEqual(request_mock.call_count, 1)
+
+
+class GetNodeCapabilitiesTestCase(TestCase):
+  def test_defaults(self):
+    """
+    The node doesn't report its request limits.
+    """
+    capabilities = get_node_capabilities({'appName': 'IRI'})
+
+    self.assertEqual(capabilities['appName'], 'IRI')
+    self.assertIsNone(capabilities['appVersion'])
+    self.assertListEqual(capabilities['features'], [])
+
+    for key, value in DEFAULT_NODE_LIMITS.items():
+      self.assertEqual(capabilities[key], value)
+
+  def test_node_limits(self):
+    """
+    The node reports its own request limits.
+    """
+    capabilities = get_node_capabilities({
+      'appName':          'IRI',
+      'appVersion':       '1.5.5',
+      'features':         ['RemotePOW', 'zeroMessageQueue'],
+      'maxGetTrytes':     500,
+    })
+
+    self.assertEqual(capabilities['maxGetTrytes'], 500)
+    self.assertListEqual(
+      capabilities['features'],
+      ['RemotePOW', 'zeroMessageQueue'],
+    )
+
+    self.assertEqual(
+      capabilities['maxRequestsList'],
+      DEFAULT_NODE_LIMITS['maxRequestsList'],
+    )
+
+
+class MockAdapterTestCase(TestCase):
+  def test_iter_response_values(self):
+    """
+    Adapters that can't stream responses decode the whole response,
+    then iterate over it.
+    """
+    adapter = MockAdapter()
+    adapter.seed_response('getTrytes', {'trytes': ['ABC', 'DEF']})
+
+    self.assertListEqual(
+      list(adapter.iter_response_values({'command': 'getTrytes'}, 'trytes')),
+      ['ABC', 'DEF'],
+    )
@@ -135,3 +135,19 @@ class IotaApiTestCase(TestCase):
 
     self.assertIsInstance(custom_command, CustomCommand)
     self.assertEqual(custom_command.command, 'helloWorld')
+
+  def test_warmup(self):
+    """
+    Warming up the adapter when creating the API instance.
+    """
+    adapter = MockAdapter()
+    adapter.seed_response('getNodeInfo', {
+      'appName':        'IRI',
+      'appVersion':     '1.5.5',
+      'maxGetTrytes':   500,
+    })
+
+    api = Iota(adapter, warmup=True)
+
+    self.assertListEqual(adapter.requests, [{'command': 'getNodeInfo'}])
+    self.assertEqual(api.adapter.get_capabilities()['maxGetTrytes'], 500)
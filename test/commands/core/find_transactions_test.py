@@ -566,3 +566,36 @@ class FindTransactionsCommandTestCase(TestCase):
       Iota(self.adapter).findTransactions,
       FindTransactionsCommand,
     )
+
+  def test_iterate(self):
+    """
+    Iterating over transaction hashes as they are received from the
+    node.
+    """
+    self.adapter.seed_response('findTransactions', {
+      'hashes': ['RBTC9D9DCDQAEASBYBCCKBFA', 'CCPCBDVC9DTCEAKDXC9D9DEA'],
+    })
+
+    result = Iota(self.adapter).iter_find_transactions(
+      tags = [Tag(b'TAG')],
+    )
+
+    self.assertListEqual(
+      list(result),
+
+      [
+        TransactionHash(b'RBTC9D9DCDQAEASBYBCCKBFA'),
+        TransactionHash(b'CCPCBDVC9DTCEAKDXC9D9DEA'),
+      ],
+    )
+
+    self.assertListEqual(
+      self.adapter.requests,
+
+      [
+        {
+          'command':  'findTransactions',
+          'tags':     [text_type(Tag(b'TAG'))],
+        },
+      ],
+    )
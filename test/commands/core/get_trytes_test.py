@@ -6,6 +6,7 @@ from unittest import TestCase
 
 import filters as f
 from filters.test import BaseFilterTestCase
+from six import text_type
 
 from iota import Iota, TransactionHash, TryteString
 from iota.adapter import MockAdapter
@@ -247,3 +248,47 @@ class GetTrytesCommandTestCase(TestCase):
       Iota(self.adapter).getTrytes,
       GetTrytesCommand,
     )
+
+  def test_iterate(self):
+    """
+    Iterating over trytes as they are received from the node.
+    """
+    self.adapter.seed_response('getTrytes', {
+      'trytes': ['RBTC9D9DCDQAEASBYBCCKBFA', 'CCPCBDVC9DTCEAKDXC9D9DEA'],
+    })
+
+    result = Iota(self.adapter).iter_get_trytes(
+      hashes = [TransactionHash(b'A'), TransactionHash(b'B')],
+    )
+
+    self.assertListEqual(
+      list(result),
+
+      [
+        TryteString(b'RBTC9D9DCDQAEASBYBCCKBFA'),
+        TryteString(b'CCPCBDVC9DTCEAKDXC9D9DEA'),
+      ],
+    )
+
+    self.assertListEqual(
+      self.adapter.requests,
+
+      [
+        {
+          'command': 'getTrytes',
+          'hashes': [
+            text_type(TransactionHash(b'A')),
+            text_type(TransactionHash(b'B')),
+          ],
+        },
+      ],
+    )
+
+  def test_iterate_invalid_request(self):
+    """
+    The request is validated before anything is sent to the node.
+    """
+    with self.assertRaises(ValueError):
+      Iota(self.adapter).iter_get_trytes(hashes=[])
+
+    self.assertListEqual(self.adapter.requests, [])
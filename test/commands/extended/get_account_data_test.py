@@ -12,6 +12,7 @@ from iota import Address, Bundle, Iota, TransactionHash
 from iota.adapter import MockAdapter
 from iota.commands.extended.get_account_data import GetAccountDataCommand, \
   GetAccountDataRequestFilter
+from iota.commands.extended.utils import SCAN_WINDOW_SIZE
 from iota.crypto.types import Seed
 from iota.filters import Trytes
 from test import mock
@@ -37,6 +38,7 @@ class GetAccountDataRequestFilterTestCase(BaseFilterTestCase):
       'start':            0,
       'stop':             10,
       'inclusionStates':  True,
+      'windowSize':       20,
     }
 
     filter_ = self._filter(request)
@@ -69,6 +71,7 @@ class GetAccountDataRequestFilterTestCase(BaseFilterTestCase):
         'start':            42,
         'stop':             86,
         'inclusionStates':  True,
+        'windowSize':       SCAN_WINDOW_SIZE,
       },
     )
 
@@ -89,6 +92,7 @@ class GetAccountDataRequestFilterTestCase(BaseFilterTestCase):
         'start':            0,
         'stop':             None,
         'inclusionStates':  False,
+        'windowSize':       SCAN_WINDOW_SIZE,
       }
     )
 
@@ -369,7 +373,13 @@ class GetAccountDataCommandTestCase(TestCase):
     Loading account data for an account.
     """
     # noinspection PyUnusedLocal
-    def mock_iter_used_addresses(adapter, seed, start):
+    def mock_iter_used_addresses(
+        adapter,
+        seed,
+        start,
+        window_size   = None,
+        trytes_cache  = None,
+    ):
       """
       Mocks the ``iter_used_addresses`` function, so that we can
       simulate its functionality without actually connecting to the
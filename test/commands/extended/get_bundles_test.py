@@ -8,12 +8,44 @@ import filters as f
 from filters.test import BaseFilterTestCase
 
 from iota import Address, BadApiResponse, Bundle, BundleHash, Fragment, Hash, \
-  Iota, Tag, Transaction, TransactionHash, TransactionTrytes, Nonce
+  Iota, Tag, Transaction, TransactionHash, TransactionTrytes, Nonce, \
+  ProposedBundle, ProposedTransaction, TryteString
 from iota.adapter import MockAdapter
-from iota.commands.extended.get_bundles import GetBundlesCommand
+from iota.commands.extended.get_bundles import GetBundlesCommand, \
+  GetBundlesRequestFilter
 from iota.filters import Trytes
 
 
+def create_bundle(tag):
+  # type: (bytes) -> Bundle
+  """
+  Creates a valid 2-transaction bundle, with each transaction's trunk
+  pointing at the next transaction.
+  """
+  proposed = ProposedBundle([
+    ProposedTransaction(
+      # noinspection SpellCheckingInspection
+      address = Address(b'TESTVALUE9DONTUSEINPRODUCTION99999'),
+      value   = 0,
+      tag     = Tag(tag),
+      # Long enough to need two transactions.
+      message = TryteString(b'MESSAGE' * 400),
+    ),
+  ])
+  proposed.finalize()
+
+  transactions = []
+  trunk = TransactionHash(b'')
+  for txn in reversed(list(proposed)):
+    txn.trunk_transaction_hash = trunk
+
+    transaction = Transaction.from_tryte_string(txn.as_tryte_string())
+    transactions.insert(0, transaction)
+    trunk = transaction.hash
+
+  return Bundle(transactions)
+
+
 class GetBundlesRequestFilterTestCase(BaseFilterTestCase):
   filter_type = GetBundlesCommand(MockAdapter()).get_request_filter
   skip_value_check = True
@@ -60,6 +92,23 @@ class GetBundlesRequestFilterTestCase(BaseFilterTestCase):
       },
     )
 
+  def test_pass_many_transactions(self):
+    """
+    Request contains many transactions, to fetch many bundles at once.
+    """
+    filter_ = self._filter({
+      'transactions': [TransactionHash(self.transaction), self.transaction],
+    })
+
+    self.assertFilterPasses(filter_)
+    self.assertDictEqual(
+      filter_.cleaned_data,
+
+      {
+        'transactions': [self.transaction, self.transaction],
+      },
+    )
+
   def test_fail_empty(self):
     """
     Request is empty.
@@ -72,6 +121,40 @@ class GetBundlesRequestFilterTestCase(BaseFilterTestCase):
       },
     )
 
+  def test_fail_transactions_null(self):
+    """
+    ``transactions`` is null, and ``transaction`` is missing.
+    """
+    self.assertFilterErrors(
+      {
+        'transactions': None,
+      },
+
+      {
+        '': [GetBundlesRequestFilter.CODE_NO_TRANSACTIONS],
+      },
+    )
+
+  def test_fail_transactions_contents_invalid(self):
+    """
+    ``transactions`` contains invalid values.
+    """
+    self.assertFilterErrors(
+      {
+        'transactions': [
+          b'',
+          42,
+          b'not valid; must contain only uppercase and "9"',
+        ],
+      },
+
+      {
+        'transactions.0': [f.Required.CODE_EMPTY],
+        'transactions.1': [f.Type.CODE_WRONG_TYPE],
+        'transactions.2': [Trytes.CODE_NOT_TRYTES],
+      },
+    )
+
   def test_fail_unexpected_parameters(self):
     """
     Request contains unexpected parameters.
@@ -298,70 +381,104 @@ class GetBundlesCommandTestCase(TestCase):
       ),
     ])
 
-    for txn in bundle:
-      self.adapter.seed_response('getTrytes', {
-        'trytes': [txn.as_tryte_string()],
-      })
+    # The fixture predates the current hash function, so link the
+    # transactions using their actual hashes.
+    bundle[0].trunk_transaction_hash = bundle[1].hash
+    bundle = Bundle([
+      Transaction.from_tryte_string(bundle[0].as_tryte_string()),
+      bundle[1],
+    ])
 
+    # The tail transaction is fetched first.
     self.adapter.seed_response('getTrytes', {
-      'trytes': [
-        'SPAMSPAMSPAM999999999999999999999999999999999999999999999999999999'
-        '999999999999999999999999999999999999999999999999999999999999999999'
-        '999999999999999999999999999999999999999999999999999999999999999999'
-        '999999999999999999999999999999999999999999999999999999999999999999'
-        '999999999999999999999999999999999999999999999999999999999999999999'
-        '999999999999999999999999999999999999999999999999999999999999999999'
-        '999999999999999999999999999999999999999999999999999999999999999999'
-        '999999999999999999999999999999999999999999999999999999999999999999'
-        '999999999999999999999999999999999999999999999999999999999999999999'
-        '999999999999999999999999999999999999999999999999999999999999999999'
-        '999999999999999999999999999999999999999999999999999999999999999999'
-        '999999999999999999999999999999999999999999999999999999999999999999'
-        '999999999999999999999999999999999999999999999999999999999999999999'
-        '999999999999999999999999999999999999999999999999999999999999999999'
-        '999999999999999999999999999999999999999999999999999999999999999999'
-        '999999999999999999999999999999999999999999999999999999999999999999'
-        '999999999999999999999999999999999999999999999999999999999999999999'
-        '999999999999999999999999999999999999999999999999999999999999999999'
-        '999999999999999999999999999999999999999999999999999999999999999999'
-        '999999999999999999999999999999999999999999999999999999999999999999'
-        '999999999999999999999999999999999999999999999999999999999999999999'
-        '999999999999999999999999999999999999999999999999999999999999999999'
-        '999999999999999999999999999999999999999999999999999999999999999999'
-        '999999999999999999999999999999999999999999999999999999999999999999'
-        '999999999999999999999999999999999999999999999999999999999999999999'
-        '999999999999999999999999999999999999999999999999999999999999999999'
-        '999999999999999999999999999999999999999999999999999999999999999999'
-        '999999999999999999999999999999999999999999999999999999999999999999'
-        '999999999999999999999999999999999999999999999999999999999999999999'
-        '999999999999999999999999999999999999999999999999999999999999999999'
-        '999999999999999999999999999999999999999999999999999999999999999999'
-        '999999999999999999999999999999999999999999999999999999999999999999'
-        '999999999999999999999999999999999999999999999999999999999999999999'
-        '999999999999999999999999999999999999999999999999999999999999999999'
-        '999999999999999999999999999999999999999999999999999JECDITWO9999999'
-        '999999999999ONLFMVD99999999999999999999VVCHSQSRVFKSBONDWB9EAQEMQOY'
-        'YRBIZHTBJLYNAVDHZPUZAZ9LYHXWKBEJ9IPR9FAMFLT9EEOHVYWUPRHHSRCILCLWFD'
-        'GBYBFFOKMCSAPVD9VGZZRRGBLGMZMXD9RMZQDBLMGN9BATWZGULRBCYQEIKIRBPHC9'
-        '999KTLTRSYOWBD9HVNP9GCUABARNGMYXUZKXWRPGOPETZLKYYC9Z9EYXIWVARUBMBM'
-        'BPXGORN9WPBLY99999ZRBVQWULRFXDNDYZKRKIXPZQT9JJJH9FZU9PVWZJWLXBPODP'
-        'EHMKTTAGEPLPHUQCZNLDSHERONOMHJCOI'
-      ],
+      'trytes': [bundle[0].as_tryte_string()],
+    })
+
+    # Then the rest of the bundle is fetched in a single request.
+    self.adapter.seed_response('findTransactions', {
+      'hashes': [bundle[0].hash, bundle[1].hash],
+    })
+
+    self.adapter.seed_response('getTrytes', {
+      'trytes': [bundle[1].as_tryte_string()],
+    })
+
+    response = self.command(transaction=bundle.tail_transaction.hash)
+
+    self.maxDiff = None
+    self.assertListEqual(
+      response['bundles'][0].as_json_compatible(),
+      bundle.as_json_compatible(),
+    )
+
+  def test_multiple_bundles(self):
+    """
+    Getting many bundles at once.
+    """
+    bundle_1 = create_bundle(b'ONE')
+    bundle_2 = create_bundle(b'TWO')
+
+    self.adapter.seed_response('getTrytes', {
+      'trytes': [bundle_1[0].as_tryte_string(), bundle_2[0].as_tryte_string()],
+    })
+
+    self.adapter.seed_response('findTransactions', {
+      'hashes': [txn.hash for txn in bundle_1] + [txn.hash for txn in bundle_2],
+    })
+
+    self.adapter.seed_response('getTrytes', {
+      'trytes': [bundle_1[1].as_tryte_string(), bundle_2[1].as_tryte_string()],
     })
 
     response = self.command(
-      transaction =
-        TransactionHash(
-          b'TOYJPHKMLQNDVLDHDILARUJCCIUMQBLUSWPCTIVA'
-          b'DRXICGYDGSVPXFTILFFGAPICYHGGJ9OHXINFX9999'
-        ),
+      transactions = [bundle_1.tail_transaction.hash, bundle_2.tail_transaction.hash],
     )
-    self.maxDiff = None
+
+    self.assertListEqual(
+      [bundle.as_json_compatible() for bundle in response['bundles']],
+      [bundle_1.as_json_compatible(), bundle_2.as_json_compatible()],
+    )
+
+    # Both bundles were fetched using a single ``findTransactions``
+    # request.
+    self.assertListEqual(
+      [request['command'] for request in self.adapter.requests],
+      ['getTrytes', 'findTransactions', 'getTrytes'],
+    )
+
+    self.assertListEqual(
+      self.adapter.requests[2]['hashes'],
+      [bundle_1[1].hash, bundle_2[1].hash],
+    )
+
+  def test_missing_candidates(self):
+    """
+    ``findTransactions`` doesn't return all of the transactions in the
+    bundle, so they have to be fetched hop by hop.
+    """
+    bundle = create_bundle(b'ONE')
+
+    self.adapter.seed_response('getTrytes', {
+      'trytes': [bundle[0].as_tryte_string()],
+    })
+
+    self.adapter.seed_response('findTransactions', {
+      'hashes': [bundle[0].hash],
+    })
+
+    self.adapter.seed_response('getTrytes', {
+      'trytes': [bundle[1].as_tryte_string()],
+    })
+
+    response = self.command(transaction=bundle.tail_transaction.hash)
+
     self.assertListEqual(
       response['bundles'][0].as_json_compatible(),
       bundle.as_json_compatible(),
     )
 
+    self.assertListEqual(self.adapter.requests[2]['hashes'], [bundle[1].hash])
+
   def test_non_tail_transaction(self):
     """
     Trying to get a bundle for a non-tail transaction.
@@ -437,3 +554,43 @@ class GetBundlesCommandTestCase(TestCase):
             b'ORYCRDX9TOMJPFCRB9R9KPUUGFPVOWYXFIWEW9999'
           ),
       )
+
+  def test_missing_transaction_null_trytes(self):
+    """
+    The node returns null trytes for the requested transaction.
+    """
+    # IRI returns all-9s trytes for transactions that it doesn't have.
+    self.adapter.seed_response('getTrytes', {'trytes': ['9' * 2673]})
+
+    with self.assertRaises(BadApiResponse):
+      self.command(
+        transaction =
+          TransactionHash(
+            b'FSEWUNJOEGNUI9QOCRFMYSIFAZLJHKZBPQZZYFG9'
+            b'ORYCRDX9TOMJPFCRB9R9KPUUGFPVOWYXFIWEW9999'
+          ),
+      )
+
+  def test_missing_trunk_null_trytes(self):
+    """
+    The node returns null trytes for a transaction in the bundle.
+    """
+    bundle = create_bundle(b'ONE')
+
+    self.adapter.seed_response('getTrytes', {
+      'trytes': [bundle[0].as_tryte_string()],
+    })
+
+    self.adapter.seed_response('findTransactions', {
+      'hashes': [bundle[0].hash],
+    })
+
+    self.adapter.seed_response('getTrytes', {'trytes': ['9' * 2673]})
+
+    with self.assertRaises(BadApiResponse) as context:
+      self.command(transaction=bundle.tail_transaction.hash)
+
+    self.assertEqual(
+      context.exception.context['transaction_hash'],
+      bundle[1].hash,
+    )
@@ -11,6 +11,7 @@ from iota import Address, BadApiResponse, Iota, TransactionHash
 from iota.adapter import MockAdapter
 from iota.commands.extended.get_inputs import GetInputsCommand, \
   GetInputsRequestFilter
+from iota.commands.extended.utils import SCAN_WINDOW_SIZE
 from iota.crypto.types import Seed
 from iota.filters import Trytes
 from test import mock
@@ -38,6 +39,7 @@ class GetInputsRequestFilterTestCase(BaseFilterTestCase):
       'start':      0,
       'stop':       10,
       'threshold':  100,
+      'windowSize': 20,
     }
 
     filter_ = self._filter(request)
@@ -70,6 +72,7 @@ class GetInputsRequestFilterTestCase(BaseFilterTestCase):
         'start':      42,
         'stop':       86,
         'threshold':  99,
+        'windowSize': SCAN_WINDOW_SIZE,
       },
     )
 
@@ -90,6 +93,7 @@ class GetInputsRequestFilterTestCase(BaseFilterTestCase):
         'start':      0,
         'stop':       None,
         'threshold':  None,
+        'windowSize': SCAN_WINDOW_SIZE,
       }
     )
 
@@ -567,8 +571,17 @@ class GetInputsCommandTestCase(TestCase):
       ],
     })
 
+    # The second and third addresses are checked together, so the
+    # command also checks the second address on its own, to see which
+    # address the transaction belongs to.
+    # noinspection SpellCheckingInspection
     self.adapter.seed_response('findTransactions', {
-      'hashes': [],
+      'hashes': [
+        TransactionHash(
+          b'TESTVALUE9DONTUSEINPRODUCTION99999YFXGOD'
+          b'GISBJAX9PDJIRDMDV9DCRDCAEG9FN9KECCBDDFZ9H'
+        ),
+      ],
     })
 
     # To keep the unit test nice and speedy, we will mock the address
@@ -664,8 +677,17 @@ class GetInputsCommandTestCase(TestCase):
       ],
     })
 
+    # The second and third addresses are checked together, so the
+    # command also checks the second address on its own, to see which
+    # address the transaction belongs to.
+    # noinspection SpellCheckingInspection
     self.adapter.seed_response('findTransactions', {
-      'hashes': [],
+      'hashes': [
+        TransactionHash(
+          b'TESTVALUE9DONTUSEINPRODUCTION99999YFXGOD'
+          b'GISBJAX9PDJIRDMDV9DCRDCAEG9FN9KECCBDDFZ9H'
+        ),
+      ],
     })
 
     # To keep the unit test nice and speedy, we will mock the address
@@ -727,8 +749,17 @@ class GetInputsCommandTestCase(TestCase):
       ],
     })
 
+    # The second and third addresses are checked together, so the
+    # command also checks the second address on its own, to see which
+    # address the transaction belongs to.
+    # noinspection SpellCheckingInspection
     self.adapter.seed_response('findTransactions', {
-      'hashes': [],
+      'hashes': [
+        TransactionHash(
+          b'TESTVALUE9DONTUSEINPRODUCTION99999YFXGOD'
+          b'GISBJAX9PDJIRDMDV9DCRDCAEG9FN9KECCBDDFZ9H'
+        ),
+      ],
     })
 
     # To keep the unit test nice and speedy, we will mock the address
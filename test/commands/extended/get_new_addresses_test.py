@@ -10,6 +10,7 @@ from filters.test import BaseFilterTestCase
 from iota import Address, Iota
 from iota.adapter import MockAdapter
 from iota.commands.extended.get_new_addresses import GetNewAddressesCommand
+from iota.commands.extended.utils import SCAN_WINDOW_SIZE
 from iota.crypto.addresses import AddressGenerator
 from iota.crypto.types import Seed
 from iota.filters import Trytes
@@ -36,6 +37,8 @@ class GetNewAddressesRequestFilterTestCase(BaseFilterTestCase):
       'count':          1,
       'securityLevel':  2,
       'checksum':       False,
+      'gallop':         False,
+      'windowSize':     20,
     }
 
     filter_ = self._filter(request)
@@ -61,6 +64,8 @@ class GetNewAddressesRequestFilterTestCase(BaseFilterTestCase):
         'count':          None,
         'securityLevel':  AddressGenerator.DEFAULT_SECURITY_LEVEL,
         'checksum':       False,
+        'gallop':         False,
+        'windowSize':     SCAN_WINDOW_SIZE,
       },
     )
 
@@ -78,8 +83,9 @@ class GetNewAddressesRequestFilterTestCase(BaseFilterTestCase):
       'count':          8,
       'securityLevel':  2,
 
-      # ``checksum`` must be boolean.
+      # ``checksum`` and ``gallop`` must be boolean.
       'checksum':       False,
+      'gallop':         True,
     })
 
     self.assertFilterPasses(filter_)
@@ -92,6 +98,8 @@ class GetNewAddressesRequestFilterTestCase(BaseFilterTestCase):
         'count':          8,
         'securityLevel':  2,
         'checksum':       False,
+        'gallop':         True,
+        'windowSize':     SCAN_WINDOW_SIZE,
       },
     )
 
@@ -328,6 +336,21 @@ class GetNewAddressesRequestFilterTestCase(BaseFilterTestCase):
       },
     )
 
+  def test_fail_gallop_wrong_type(self):
+    """
+    ``gallop`` is not a boolean.
+    """
+    self.assertFilterErrors(
+      {
+        'gallop':         1,
+        'seed':           Seed(self.seed),
+      },
+
+      {
+        'gallop': [f.Type.CODE_WRONG_TYPE],
+      },
+    )
+
 
 class GetNewAddressesCommandTestCase(TestCase):
   # noinspection SpellCheckingInspection
@@ -355,6 +378,18 @@ class GetNewAddressesCommandTestCase(TestCase):
         b'IWYTLQUUHDWSOVXLIKVJTYZBFKLABWRBFYVSMD9NB',
       )
 
+    self.addy_3 =\
+      Address(
+        b'GLYQTDQSTRZIAMACILIJ9BHMLEIBNFJNSFINUEQZ'
+        b'AUEUCGILXRGOGRK9FXZOYMWTXVVDHRSOGMKIYPHQB',
+      )
+
+    self.addy_4 =\
+      Address(
+        b'HZRYSLAYTFVFERLXPNEB9FDPOBZDSPJFNLOX9XOS'
+        b'HFMGZONWRU9IAVUEDGLEXNXJOSRMUPNCYYNOYHJYW',
+      )
+
     self.addy_1_checksum =\
       Address(
         b'NYMWLBUJEISSACZZBRENC9HEHYQXHCGQHSNHVCEA'
@@ -461,8 +496,9 @@ class GetNewAddressesCommandTestCase(TestCase):
     self.assertListEqual(
       self.adapter.requests,
 
-      # The command issued two `findTransactions` API requests: one for
-      # each address generated, until it found an unused address.
+      # The command issued two `findTransactions` API requests, until
+      # it found an unused address.  Each request checks twice as many
+      # addresses as the one before it.
       [
         {
           'command':    'findTransactions',
@@ -471,11 +507,79 @@ class GetNewAddressesCommandTestCase(TestCase):
 
         {
           'command':    'findTransactions',
-          'addresses':  [self.addy_2],
+          'addresses':  [self.addy_2, self.addy_3],
         },
       ],
     )
 
+  def test_get_addresses_online_gallop(self):
+    """
+    Generate address in online mode, using a galloping search.
+    """
+    # Pretend that ``self.addy1`` and ``self.addy2`` have already been
+    # used.
+    # noinspection SpellCheckingInspection
+    for _ in range(2):
+      self.adapter.seed_response('findTransactions', {
+        'hashes': [
+          'TESTVALUE9DONTUSEINPRODUCTION99999ITQLQN'
+          'LPPG9YNAARMKNKYQO9GSCSBIOTGMLJUFLZWSY9999',
+        ],
+      })
+
+    for _ in range(2):
+      self.adapter.seed_response('findTransactions', {
+        'hashes': [],
+      })
+
+    response =\
+      self.command(
+        gallop  = True,
+        index   = 0,
+        seed    = self.seed,
+      )
+
+    self.assertDictEqual(response, {'addresses': [self.addy_3]})
+
+    # The command skipped ahead to ``self.addy_4``, then searched
+    # backwards to find the first unused address.
+    self.assertListEqual(
+      [request['addresses'] for request in self.adapter.requests],
+      [[self.addy_1], [self.addy_2], [self.addy_4], [self.addy_3]],
+    )
+
+  def test_get_addresses_online_checksum(self):
+    """
+    Generate address with a checksum in online mode.
+    """
+    # Pretend that ``self.addy1`` has already been used, but not
+    # ``self.addy2``.
+    # noinspection SpellCheckingInspection
+    self.adapter.seed_response('findTransactions', {
+      'hashes': [
+        'TESTVALUE9DONTUSEINPRODUCTION99999ITQLQN'
+        'LPPG9YNAARMKNKYQO9GSCSBIOTGMLJUFLZWSY9999',
+      ],
+    })
+
+    self.adapter.seed_response('findTransactions', {
+      'hashes': [],
+    })
+
+    response =\
+      self.command(
+        checksum  = True,
+        index     = 0,
+        seed      = self.seed,
+      )
+
+    # The checksum doesn't prevent the command from recognizing that
+    # ``self.addy_1`` was already used.
+    self.assertDictEqual(
+      response,
+      {'addresses': [self.addy_2.with_valid_checksum()]},
+    )
+
   def test_new_address_checksum(self):
     """
     Generate address with a checksum.
@@ -12,9 +12,11 @@ from iota import Address, Bundle, Iota, Tag, Transaction, TryteString
 from iota.adapter import MockAdapter
 from iota.commands.extended.get_transfers import GetTransfersCommand, \
   GetTransfersRequestFilter
+from iota.commands.extended.utils import SCAN_WINDOW_SIZE
 from iota.crypto.types import Seed
 from iota.filters import Trytes
 from test import mock
+from test.commands.extended.get_bundles_test import create_bundle
 
 
 class GetTransfersRequestFilterTestCase(BaseFilterTestCase):
@@ -37,6 +39,7 @@ class GetTransfersRequestFilterTestCase(BaseFilterTestCase):
       'start':            0,
       'stop':             10,
       'inclusionStates':  True,
+      'windowSize':       20,
     }
 
     filter_ = self._filter(request)
@@ -68,6 +71,7 @@ class GetTransfersRequestFilterTestCase(BaseFilterTestCase):
         'start':            42,
         'stop':             86,
         'inclusionStates':  True,
+        'windowSize':       SCAN_WINDOW_SIZE,
       },
     )
 
@@ -88,6 +92,7 @@ class GetTransfersRequestFilterTestCase(BaseFilterTestCase):
         'start':            0,
         'stop':             None,
         'inclusionStates':  False,
+        'windowSize':       SCAN_WINDOW_SIZE,
       }
     )
 
@@ -315,6 +320,22 @@ class GetTransfersRequestFilterTestCase(BaseFilterTestCase):
     )
 
 
+  def test_fail_window_size_too_small(self):
+    """
+    ``windowSize`` is less than 1.
+    """
+    self.assertFilterErrors(
+      {
+        'windowSize': 0,
+
+        'seed': Seed(self.seed),
+      },
+
+      {
+        'windowSize': [f.Min.CODE_TOO_SMALL],
+      },
+    )
+
 # noinspection SpellCheckingInspection
 class GetTransfersCommandTestCase(TestCase):
   def setUp(self):
@@ -389,9 +410,10 @@ class GetTransfersCommandTestCase(TestCase):
         'duration': 99,
 
         # Thankfully, we do not have to seed a realistic response for
-        # ``getTrytes``, as we will be mocking the ``getBundles``
-        # command that uses on it.
-        'trytes': [''],
+        # ``getTrytes``, as we will be mocking the function that
+        # assembles the bundles.  It just can't be all 9s, since that
+        # means that the node doesn't have the transaction.
+        'trytes': ['TESTVALUE'],
       },
     )
 
@@ -417,17 +439,14 @@ class GetTransfersCommandTestCase(TestCase):
       )
     ])
 
-    mock_get_bundles =\
-      mock.Mock(return_value={
-        'bundles': [bundle],
-      })
+    mock_get_bundles = mock.Mock(return_value=[bundle])
 
     with mock.patch(
         'iota.crypto.addresses.AddressGenerator.create_iterator',
         create_generator,
     ):
       with mock.patch(
-          'iota.commands.extended.get_bundles.GetBundlesCommand._execute',
+          'iota.commands.extended.utils.traverse_bundles',
           mock_get_bundles,
       ):
         response = self.command(seed=Seed.random())
@@ -440,6 +459,199 @@ class GetTransfersCommandTestCase(TestCase):
       },
     )
 
+  def test_fetch_bundles_in_stages(self):
+    """
+    The bundles are fetched using a fixed number of requests,
+    regardless of how many transactions they contain.
+    """
+    # noinspection PyUnusedLocal
+    def create_generator(ag, start, step=1):
+      for addy in [self.addy1, self.addy2][start::step]:
+        yield addy
+
+    bundle_1 = create_bundle(b'ONE')
+    bundle_2 = create_bundle(b'TWO')
+
+    # The first address has the tail of one bundle and the head of
+    # another.
+    self.adapter.seed_response('findTransactions', {
+      'hashes': [bundle_1[0].hash, bundle_2[1].hash],
+    })
+
+    # The second address is unused.
+    self.adapter.seed_response('findTransactions', {
+      'hashes': [],
+    })
+
+    self.adapter.seed_response('getTrytes', {
+      'trytes': [bundle_1[0].as_tryte_string(), bundle_2[1].as_tryte_string()],
+    })
+
+    self.adapter.seed_response('findTransactions', {
+      'hashes': [txn.hash for txn in bundle_1] + [txn.hash for txn in bundle_2],
+    })
+
+    self.adapter.seed_response('getTrytes', {
+      'trytes': [bundle_1[1].as_tryte_string(), bundle_2[0].as_tryte_string()],
+    })
+
+    with mock.patch(
+        'iota.crypto.addresses.AddressGenerator.create_iterator',
+        create_generator,
+    ):
+      response = self.command(seed=Seed.random())
+
+    self.assertListEqual(
+      [bundle.as_json_compatible() for bundle in response['bundles']],
+      [bundle_1.as_json_compatible(), bundle_2.as_json_compatible()],
+    )
+
+    self.assertListEqual(
+      [request['command'] for request in self.adapter.requests],
+
+      [
+        'findTransactions',
+        'findTransactions',
+        'getTrytes',
+        'findTransactions',
+        'getTrytes',
+      ],
+    )
+
+  def test_fetch_bundles_rejected(self):
+    """
+    The node rejects the request for the transactions in every bundle
+    at once, so the bundles are fetched one at a time instead.
+    """
+    # noinspection PyUnusedLocal
+    def create_generator(ag, start, step=1):
+      for addy in [self.addy1, self.addy2][start::step]:
+        yield addy
+
+    bundle_1 = create_bundle(b'ONE')
+    bundle_2 = create_bundle(b'TWO')
+
+    # The first address has the tail of one bundle and the head of
+    # another.
+    self.adapter.seed_response('findTransactions', {
+      'hashes': [bundle_1[0].hash, bundle_2[1].hash],
+    })
+
+    # The second address is unused.
+    self.adapter.seed_response('findTransactions', {
+      'hashes': [],
+    })
+
+    self.adapter.seed_response('getTrytes', {
+      'trytes': [bundle_1[0].as_tryte_string(), bundle_2[1].as_tryte_string()],
+    })
+
+    self.adapter.seed_response('findTransactions', {
+      'error': 'Could not complete request: Too many transactions.',
+    })
+
+    # We need to find the tail for the second bundle.
+    self.adapter.seed_response('findTransactions', {
+      'hashes': [txn.hash for txn in bundle_2],
+    })
+
+    self.adapter.seed_response('getTrytes', {
+      'trytes': [bundle_2[0].as_tryte_string()],
+    })
+
+    # The rest of the first bundle is fetched by following the trunk.
+    self.adapter.seed_response('getTrytes', {
+      'trytes': [bundle_1[1].as_tryte_string()],
+    })
+
+    with mock.patch(
+        'iota.crypto.addresses.AddressGenerator.create_iterator',
+        create_generator,
+    ):
+      response = self.command(seed=Seed.random())
+
+    self.assertSetEqual(
+      {bundle.hash for bundle in response['bundles']},
+      {bundle_1.hash, bundle_2.hash},
+    )
+
+    self.assertListEqual(
+      [
+        request.get('bundles')
+          for request in self.adapter.requests
+          if request['command'] == 'findTransactions'
+      ][-1],
+
+      [bundle_2.hash],
+    )
+
+  def test_reuse_scanned_transactions(self):
+    """
+    Transactions that were fetched while scanning addresses are not
+    fetched again.
+    """
+    bundle_1 = create_bundle(b'ONE')
+    bundle_2 = create_bundle(b'TWO')
+
+    # The second window has the address that ``create_bundle`` uses.
+    addresses = [self.addy1, bundle_2[0].address, self.addy2]
+
+    # noinspection PyUnusedLocal
+    def create_generator(ag, start, step=1):
+      for addy in addresses[start::step]:
+        yield addy
+
+    self.adapter.seed_response('findTransactions', {
+      'hashes': [bundle_1[0].hash],
+    })
+
+    self.adapter.seed_response('findTransactions', {
+      'hashes': [txn.hash for txn in bundle_2],
+    })
+
+    # The second window has multiple addresses, so we need the trytes
+    # to find out which of them are used.
+    self.adapter.seed_response('getTrytes', {
+      'trytes': [txn.as_tryte_string() for txn in bundle_2],
+    })
+
+    self.adapter.seed_response('getTrytes', {
+      'trytes': [bundle_1[0].as_tryte_string()],
+    })
+
+    self.adapter.seed_response('findTransactions', {
+      'hashes': [txn.hash for txn in bundle_1] + [txn.hash for txn in bundle_2],
+    })
+
+    self.adapter.seed_response('getTrytes', {
+      'trytes': [bundle_1[1].as_tryte_string()],
+    })
+
+    with mock.patch(
+        'iota.crypto.addresses.AddressGenerator.create_iterator',
+        create_generator,
+    ):
+      response = self.command(seed=Seed.random(), windowSize=2)
+
+    self.assertSetEqual(
+      {bundle.hash for bundle in response['bundles']},
+      {bundle_1.hash, bundle_2.hash},
+    )
+
+    self.assertListEqual(
+      [
+        (request['command'], request.get('hashes'))
+          for request in self.adapter.requests
+          if request['command'] == 'getTrytes'
+      ],
+
+      [
+        ('getTrytes', [txn.hash for txn in bundle_2]),
+        ('getTrytes', [bundle_1[0].hash]),
+        ('getTrytes', [bundle_1[1].hash]),
+      ],
+    )
+
   def test_no_transactions(self):
     """
     There are no transactions for the specified seed.
@@ -510,7 +722,7 @@ class GetTransfersCommandTestCase(TestCase):
 
       {
         'duration': 99,
-        'trytes':   [''],
+        'trytes':   ['TESTVALUE'],
       },
     )
 
@@ -536,16 +748,14 @@ class GetTransfersCommandTestCase(TestCase):
       )
     ])
 
-    mock_get_bundles = mock.Mock(return_value={
-      'bundles': [bundle],
-    })
+    mock_get_bundles = mock.Mock(return_value=[bundle])
 
     with mock.patch(
         'iota.crypto.addresses.AddressGenerator.create_iterator',
         create_generator,
     ):
       with mock.patch(
-          'iota.commands.extended.get_bundles.GetBundlesCommand._execute',
+          'iota.commands.extended.utils.traverse_bundles',
           mock_get_bundles,
       ):
         response = self.command(seed=Seed.random(), start=1)
@@ -588,7 +798,7 @@ class GetTransfersCommandTestCase(TestCase):
 
       {
         'duration': 99,
-        'trytes':   [''],
+        'trytes':   ['TESTVALUE'],
       },
     )
 
@@ -614,16 +824,14 @@ class GetTransfersCommandTestCase(TestCase):
       )
     ])
 
-    mock_get_bundles = mock.Mock(return_value={
-      'bundles': [bundle],
-    })
+    mock_get_bundles = mock.Mock(return_value=[bundle])
 
     with mock.patch(
         'iota.crypto.addresses.AddressGenerator.create_iterator',
         create_generator,
     ):
       with mock.patch(
-          'iota.commands.extended.get_bundles.GetBundlesCommand._execute',
+          'iota.commands.extended.utils.traverse_bundles',
           mock_get_bundles,
       ):
         response = self.command(seed=Seed.random(), stop=1)
@@ -646,6 +854,8 @@ class GetTransfersCommandTestCase(TestCase):
         yield addy
 
     # The first address received IOTA.
+    # The hash has to match the transaction trytes below, since the
+    # transaction is identified by the hash that was requested.
     self.adapter.seed_response(
       'findTransactions',
 
@@ -653,8 +863,8 @@ class GetTransfersCommandTestCase(TestCase):
         'duration': 42,
 
         'hashes': [
-          'TESTVALUEFIVE9DONTUSEINPRODUCTION99999VH'
-          'YHRHJETGYCAFZGABTEUBWCWAS9WF99UHBHRHLIOFJ',
+          'NHSYHLIJYACWYRXQSEMRHZGBWXMFOAKYNH9U9ERIO'
+          'DWBMLATGSKWYVAUGLEJNVXABCIEFUVW9ZBUMLHGV',
         ],
       },
     )
@@ -714,11 +924,24 @@ class GetTransfersCommandTestCase(TestCase):
       },
     )
 
+    # The transaction is part of a larger bundle, so its bundle gets
+    # fetched, too.
+    self.adapter.seed_response(
+      'findTransactions',
+
+      {
+        'duration': 42,
+
+        'hashes': [
+          'NHSYHLIJYACWYRXQSEMRHZGBWXMFOAKYNH9U9ERIO'
+          'DWBMLATGSKWYVAUGLEJNVXABCIEFUVW9ZBUMLHGV',
+        ],
+      },
+    )
+
     transaction = Transaction.from_tryte_string(transaction_trytes)
 
-    mock_get_bundles = mock.Mock(return_value={
-      'bundles': [Bundle([transaction])],
-    })
+    mock_get_bundles = mock.Mock(return_value=[Bundle([transaction])])
 
     mock_get_latest_inclusion = mock.Mock(return_value={
       'states': {
@@ -731,7 +954,7 @@ class GetTransfersCommandTestCase(TestCase):
         create_generator,
     ):
       with mock.patch(
-          'iota.commands.extended.get_bundles.GetBundlesCommand._execute',
+          'iota.commands.extended.utils.traverse_bundles',
           mock_get_bundles,
       ):
         with mock.patch(
@@ -0,0 +1,405 @@
+# coding=utf-8
+from __future__ import absolute_import, division, print_function, \
+  unicode_literals
+
+from unittest import TestCase
+
+from iota import Address, TransactionHash
+from iota.adapter import MockAdapter
+from iota.commands.extended.utils import find_transaction_objects, \
+  iter_used_addresses
+from iota.crypto.types import Seed
+from test import mock
+from test.helpers import create_transaction
+
+
+class FindTransactionObjectsTestCase(TestCase):
+  def test_null_trytes(self):
+    """
+    The node returns null trytes for a transaction that it doesn't
+    have.
+    """
+    adapter = MockAdapter()
+
+    txn_hash, trytes = create_transaction(b'HASHA', address=b'ADDYA')
+
+    adapter.seed_response('findTransactions', {
+      'hashes': [txn_hash, TransactionHash(b'HASHB')],
+    })
+
+    adapter.seed_response('getTrytes', {
+      # IRI returns all-9s trytes instead of ``null``.
+      'trytes': [trytes, '9' * 2673],
+    })
+
+    transactions = find_transaction_objects(adapter, addresses=[b'ADDYA'])
+
+    self.assertListEqual(
+      [txn.hash for txn in transactions],
+      [txn_hash],
+    )
+
+
+class IterUsedAddressesTestCase(TestCase):
+  def setUp(self):
+    super(IterUsedAddressesTestCase, self).setUp()
+
+    self.adapter = MockAdapter()
+
+    self.addresses = [
+      Address(b'ADDYZERO', key_index=0),
+      Address(b'ADDYONE', key_index=1),
+      Address(b'ADDYTWO', key_index=2),
+      Address(b'ADDYTHREE', key_index=3),
+      Address(b'ADDYFOUR', key_index=4),
+    ]
+
+    # To keep the tests fast, we will mock the address generator.
+    # noinspection PyUnusedLocal
+    def create_generator(ag, start, step=1):
+      for addy in self.addresses[start::step]:
+        yield addy
+
+    self.generator_patch = mock.patch(
+      'iota.crypto.addresses.AddressGenerator.create_iterator',
+      create_generator,
+    )
+
+  @staticmethod
+  def hash_for(index):
+    # type: (int) -> TransactionHash
+    """
+    Returns the hash of the transaction for the address at ``index``.
+    """
+    return TransactionHash(b'HASH' + (b'A' * (index + 1)))
+
+  def seed_window(self, window, used, cached=False):
+    """
+    Seeds the responses for a window of addresses.
+
+    :param window:
+      Indexes of the addresses in the window.
+
+    :param used:
+      Indexes of the addresses in the window that have transactions.
+
+    :param cached:
+      Whether the scan fetches trytes into a cache (instead of
+      bisecting the window).
+    """
+    self.adapter.seed_response('findTransactions', {
+      'hashes': [self.hash_for(i) for i in used],
+    })
+
+    if not used:
+      return
+
+    if cached and (len(window) > 1):
+      self.adapter.seed_response('getTrytes', {
+        'trytes': [
+          create_transaction(self.hash_for(i), address=self.addresses[i])[1]
+            for i in used
+        ],
+      })
+    else:
+      self.seed_bisection(window, used)
+
+  def seed_bisection(self, window, used):
+    """
+    Seeds the responses for matching the transactions in a window with
+    their addresses, by splitting the window in half.
+    """
+    if len(window) < 2:
+      return
+
+    middle  = len(window) // 2
+    left    = window[:middle]
+    right   = window[middle:]
+
+    left_used   = [i for i in used if i in left]
+    right_used  = [i for i in used if i in right]
+
+    self.adapter.seed_response('findTransactions', {
+      'hashes': [self.hash_for(i) for i in left_used],
+    })
+
+    if left_used:
+      self.seed_bisection(left, left_used)
+
+    if right_used:
+      self.seed_bisection(right, right_used)
+
+  def test_windows(self):
+    """
+    Scanning addresses in windows, stopping at the first unused
+    address.
+    """
+    # The windows start with a single address, and grow up to
+    # ``window_size``.
+    self.seed_window([0], used=[0])
+    self.seed_window([1, 2], used=[1, 2])
+    self.seed_window([3, 4], used=[])
+
+    with self.generator_patch:
+      result = list(iter_used_addresses(
+        self.adapter,
+        Seed.random(),
+        start       = 0,
+        window_size = 2,
+      ))
+
+    self.assertListEqual(
+      [addy for addy, _ in result],
+      self.addresses[:3],
+    )
+
+    self.assertListEqual(
+      result[2][1],
+      [TransactionHash(b'HASHAAA')],
+    )
+
+    # Each window of addresses needs one ``findTransactions`` request,
+    # plus one more for each half of a window that has transactions.
+    self.assertListEqual(
+      [request['addresses'] for request in self.adapter.requests],
+
+      [
+        self.addresses[0:1],
+        self.addresses[1:3],
+        self.addresses[1:2],
+        self.addresses[3:5],
+      ],
+    )
+
+  def test_bisect_window(self):
+    """
+    Only the halves of a window that have transactions are split
+    further.
+    """
+    self.addresses.extend(
+      Address(b'ADDY' + (b'X' * i), key_index=i) for i in range(5, 8)
+    )
+
+    self.seed_window([0], used=[0])
+    self.seed_window([1, 2], used=[1, 2])
+    self.seed_window([3, 4, 5, 6], used=[3])
+
+    with self.generator_patch:
+      result = list(iter_used_addresses(
+        self.adapter,
+        Seed.random(),
+        start       = 0,
+        window_size = 4,
+      ))
+
+    self.assertListEqual(
+      [(addy, hashes) for addy, hashes in result],
+
+      [
+        (self.addresses[i], [self.hash_for(i)])
+          for i in range(4)
+      ],
+    )
+
+    self.assertListEqual(
+      [request['addresses'] for request in self.adapter.requests],
+
+      [
+        self.addresses[0:1],
+        self.addresses[1:3],
+        self.addresses[1:2],
+        self.addresses[3:7],
+        self.addresses[3:5],
+        self.addresses[3:4],
+      ],
+    )
+
+  def test_trytes_cache(self):
+    """
+    The caller provides a cache for the trytes, so they are fetched to
+    match the transactions with their addresses.
+    """
+    self.seed_window([0], used=[0], cached=True)
+    self.seed_window([1, 2], used=[1, 2], cached=True)
+    self.seed_window([3, 4], used=[], cached=True)
+
+    trytes_cache = {}
+
+    with self.generator_patch:
+      result = list(iter_used_addresses(
+        self.adapter,
+        Seed.random(),
+        start         = 0,
+        window_size   = 2,
+        trytes_cache  = trytes_cache,
+      ))
+
+    self.assertListEqual(
+      [addy for addy, _ in result],
+      self.addresses[:3],
+    )
+
+    self.assertListEqual(
+      [request['command'] for request in self.adapter.requests],
+
+      [
+        'findTransactions',
+        'findTransactions',
+        'getTrytes',
+        'findTransactions',
+      ],
+    )
+
+    self.assertSetEqual(
+      set(trytes_cache),
+      {self.hash_for(1), self.hash_for(2)},
+    )
+
+  def test_trytes_cache_rejected(self):
+    """
+    The node rejects the request for the trytes (e.g., there are too
+    many transactions), so the window is bisected instead.
+    """
+    self.seed_window([0], used=[0], cached=True)
+
+    self.adapter.seed_response('findTransactions', {
+      'hashes': [self.hash_for(1), self.hash_for(2)],
+    })
+
+    self.adapter.seed_response('getTrytes', {
+      'error': 'Could not complete request: Too many transactions.',
+    })
+
+    self.seed_bisection([1, 2], used=[1, 2])
+    self.seed_window([3, 4], used=[])
+
+    with self.generator_patch:
+      result = list(iter_used_addresses(
+        self.adapter,
+        Seed.random(),
+        start         = 0,
+        window_size   = 2,
+        trytes_cache  = {},
+      ))
+
+    self.assertListEqual(
+      [(addy, hashes) for addy, hashes in result],
+
+      [
+        (self.addresses[i], [self.hash_for(i)])
+          for i in range(3)
+      ],
+    )
+
+  def test_gap_in_window(self):
+    """
+    An unused address is followed by a used one; scanning stops at the
+    unused address.
+    """
+    self.seed_window([0], used=[0])
+    self.seed_window([1, 2], used=[2])
+
+    with self.generator_patch:
+      result = list(iter_used_addresses(
+        self.adapter,
+        Seed.random(),
+        start       = 0,
+        window_size = 4,
+      ))
+
+    self.assertListEqual(
+      [addy for addy, _ in result],
+      self.addresses[:1],
+    )
+
+  def test_single_address_window(self):
+    """
+    Windows containing a single address don't need to fetch the
+    transactions.
+    """
+    self.seed_window([3], used=[3])
+    self.seed_window([4], used=[])
+
+    with self.generator_patch:
+      result = list(iter_used_addresses(
+        self.adapter,
+        Seed.random(),
+        start       = 3,
+        window_size = 1,
+      ))
+
+    self.assertListEqual(
+      result,
+      [(self.addresses[3], [TransactionHash(b'HASHAAAA')])],
+    )
+
+    self.assertListEqual(
+      [request['command'] for request in self.adapter.requests],
+      ['findTransactions', 'findTransactions'],
+    )
+
+  def test_end_of_addresses(self):
+    """
+    The generator runs out of addresses before an unused one is found.
+    """
+    self.seed_window([0], used=[0])
+    self.seed_window([1, 2], used=[1, 2])
+    self.seed_window([3, 4], used=[3, 4])
+
+    with self.generator_patch:
+      result = list(iter_used_addresses(
+        self.adapter,
+        Seed.random(),
+        start       = 0,
+        window_size = 3,
+      ))
+
+    self.assertEqual(len(result), 5)
+
+  def test_null_trytes(self):
+    """
+    The node doesn't have the trytes for one of the transactions, so
+    the window is bisected instead.
+    """
+    self.seed_window([0], used=[0], cached=True)
+
+    self.adapter.seed_response('findTransactions', {
+      'hashes': [TransactionHash(b'HASHAA'), TransactionHash(b'HASHAAA')],
+    })
+
+    self.adapter.seed_response('getTrytes', {
+      'trytes': [
+        create_transaction(b'HASHAA', address=self.addresses[1])[1],
+        '9' * 2673,
+      ],
+    })
+
+    self.adapter.seed_response('findTransactions', {
+      'hashes': [TransactionHash(b'HASHAA')],
+    })
+
+    self.seed_window([3, 4], used=[])
+
+    trytes_cache = {}
+
+    with self.generator_patch:
+      result = list(iter_used_addresses(
+        self.adapter,
+        Seed.random(),
+        start         = 0,
+        window_size   = 2,
+        trytes_cache  = trytes_cache,
+      ))
+
+    self.assertListEqual(
+      [addy for addy, _ in result],
+      self.addresses[:3],
+    )
+
+    self.assertListEqual(
+      result[2][1],
+      [TransactionHash(b'HASHAAA')],
+    )
+
+    # The trytes that the node did return are still cached.
+    self.assertListEqual(list(trytes_cache), [TransactionHash(b'HASHAA')])
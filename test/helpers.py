@@ -0,0 +1,47 @@
+# coding=utf-8
+"""
+Helpers shared by multiple test modules.
+"""
+from __future__ import absolute_import, division, print_function, \
+  unicode_literals
+
+from iota import Address, BundleHash, Fragment, Nonce, Tag, Transaction, \
+  TransactionHash
+
+
+def create_transaction(
+    hash_,
+    address         = b'',
+    value           = 0,
+    bundle          = b'',
+    trunk           = b'',
+    branch          = b'',
+    tag             = b'',
+    current_index   = 0,
+    last_index      = 0,
+):
+  """
+  Creates a ``(hash, trytes)`` tuple for a transaction, e.g., for
+  :py:meth:`iota.adapter.local.LocalTangleAdapter.add_transactions` or
+  a seeded ``getTrytes`` response.
+  """
+  txn = Transaction(
+    hash_                             = TransactionHash(hash_),
+    signature_message_fragment        = Fragment(b''),
+    address                           = Address(address),
+    value                             = value,
+    legacy_tag                        = Tag(b''),
+    timestamp                         = 0,
+    current_index                     = current_index,
+    last_index                        = last_index,
+    bundle_hash                       = BundleHash(bundle),
+    trunk_transaction_hash            = TransactionHash(trunk),
+    branch_transaction_hash           = TransactionHash(branch),
+    tag                               = Tag(tag),
+    attachment_timestamp              = 0,
+    attachment_timestamp_lower_bound  = 0,
+    attachment_timestamp_upper_bound  = 0,
+    nonce                             = Nonce(b''),
+  )
+
+  return txn.hash, txn.as_tryte_string()
@@ -0,0 +1,164 @@
+# coding=utf-8
+from __future__ import absolute_import, division, print_function, \
+  unicode_literals
+
+import json
+from unittest import TestCase, skipIf
+
+from iota import Address, TransactionHash, TryteString
+from iota.json import JsonEncoder, OrjsonEncoder, iter_json_array, orjson
+
+
+class JsonEncoderTestCase(TestCase):
+  def setUp(self):
+    super(JsonEncoderTestCase, self).setUp()
+
+    self.payload = {
+      'command':  'storeTransactions',
+      'trytes':   [
+        TryteString(b'RBTC9D9DCDQAEASBYBCCKBFA'),
+        TransactionHash(b'A'),
+      ],
+      'extra':    {'foo': ['bar', 42]},
+      'unicode':  '\u00e9',
+    }
+
+    self.expected = {
+      'command':  'storeTransactions',
+      'trytes':   ['RBTC9D9DCDQAEASBYBCCKBFA', 'A' + ('9' * 80)],
+      'extra':    {'foo': ['bar', 42]},
+      'unicode':  '\u00e9',
+    }
+
+  def test_tryte_lists(self):
+    """
+    Encoding a payload containing lists of tryte sequences.
+    """
+    self.assertEqual(
+      JsonEncoder().encode(self.payload),
+      json.dumps(self.expected),
+    )
+
+  def test_tryte_lists_with_options(self):
+    """
+    Encoder options are respected when encoding lists of tryte
+    sequences.
+    """
+    options = {
+      'ensure_ascii': False,
+      'separators':   (',', ':'),
+      'sort_keys':    True,
+    }
+
+    self.assertEqual(
+      JsonEncoder(**options).encode(self.payload),
+      json.dumps(self.expected, **options),
+    )
+
+  def test_custom_representation(self):
+    """
+    Subclasses of TryteString that have their own JSON representation
+    are encoded using that representation.
+    """
+    address = Address(b'A', balance=42)
+
+    self.assertEqual(
+      JsonEncoder().encode({'addresses': [address]}),
+      json.dumps({'addresses': [address.as_json_compatible()]}),
+    )
+
+  @skipIf(orjson is None, 'orjson is not installed.')
+  def test_orjson(self):
+    """
+    Encoding a payload using orjson.
+    """
+    self.assertDictEqual(
+      json.loads(OrjsonEncoder().encode(self.payload)),
+      self.expected,
+    )
+
+
+class IterJsonArrayTestCase(TestCase):
+  def test_single_chunk(self):
+    """
+    The entire document is available in a single chunk.
+    """
+    self.assertListEqual(
+      list(iter_json_array(
+        ['{"duration": 42, "trytes": ["ABC", "DEF"], "extra": null}'],
+        'trytes',
+      )),
+
+      ['ABC', 'DEF'],
+    )
+
+  def test_chunk_boundaries(self):
+    """
+    Values are split across chunks at every possible position.
+    """
+    document = json.dumps({
+      'duration': 12345,
+      'nested':   {'hashes': ['decoy', '}]']},
+      'hashes':   ['ABC', 'é', -1.25e3, 42, True, None, {'a': [1]}],
+      'last':     1.5,
+    }).encode('utf-8')
+
+    for size in range(1, len(document) + 1):
+      chunks = [
+        document[i:i + size]
+          for i in range(0, len(document), size)
+      ]
+
+      self.assertListEqual(
+        list(iter_json_array(chunks, 'hashes')),
+        ['ABC', 'é', -1250.0, 42, True, None, {'a': [1]}],
+        'chunk size {size}'.format(size=size),
+      )
+
+  def test_empty_array(self):
+    """
+    The array is empty.
+    """
+    self.assertListEqual(
+      list(iter_json_array([b'{"hashes": [ ]}'], 'hashes')),
+      [],
+    )
+
+  def test_missing_key(self):
+    """
+    The object does not contain the requested key.
+    """
+    self.assertListEqual(
+      list(iter_json_array([b'{"duration": 42}'], 'hashes')),
+      [],
+    )
+
+    self.assertListEqual(list(iter_json_array([b'{}'], 'hashes')), [])
+
+  def test_fail_not_object(self):
+    """
+    The top-level value is not an object.
+    """
+    with self.assertRaises(ValueError):
+      list(iter_json_array([b'["ABC"]'], 'hashes'))
+
+  def test_fail_not_array(self):
+    """
+    The requested key does not contain an array.
+    """
+    with self.assertRaises(ValueError):
+      list(iter_json_array([b'{"hashes": "ABC"}'], 'hashes'))
+
+  def test_fail_malformed(self):
+    """
+    The array is missing a separator.
+    """
+    with self.assertRaises(ValueError):
+      list(iter_json_array([b'{"hashes": ["ABC" "DEF"]}'], 'hashes'))
+
+  def test_fail_truncated(self):
+    """
+    The document ends prematurely.
+    """
+    with self.assertRaises(ValueError):
+      list(iter_json_array([b'{"hashes": ["ABC", '], 'hashes'))
@@ -4,8 +4,10 @@ from __future__ import absolute_import, division, print_function, \
 
 from unittest import TestCase
 
-from iota import Address, Bundle, BundleHash, Fragment, Hash, Nonce, Tag, \
-  Transaction, TransactionHash, TransactionTrytes
+from iota import Address, Bundle, BundleHash, Fragment, Hash, \
+  LazyTransaction, Nonce, Tag, Transaction, TransactionHash, \
+  TransactionTrytes
+from test.helpers import create_transaction
 
 
 class BundleTestCase(TestCase):
@@ -564,6 +566,19 @@ class TransactionTestCase(TestCase):
 
     self.assertEqual(txn.hash, txn_hash)
 
+  def test_slots(self):
+    """
+    Transactions don't have a ``__dict__``, to keep their memory
+    footprint small.
+    """
+    txn = Transaction.from_tryte_string(b'', hash_=TransactionHash(b''))
+
+    self.assertFalse(hasattr(txn, '__dict__'))
+    self.assertFalse(hasattr(txn.hash, '__dict__'))
+
+    txn.is_confirmed = True
+    self.assertTrue(txn.is_confirmed)
+
   # noinspection SpellCheckingInspection
   def test_as_tryte_string(self):
     """
@@ -702,3 +717,162 @@ class TransactionTestCase(TestCase):
         b'EEVD99999999999999999999999999999'
       ),
     )
+
+
+class TransactionFromTryteStringsTestCase(TestCase):
+  def setUp(self):
+    super(TransactionFromTryteStringsTestCase, self).setUp()
+
+    self.trytes = [
+      create_transaction(b'', address=b'ADDY', value=i)[1]
+        for i in range(3)
+    ]
+
+    # ``create_transaction`` uses a placeholder hash, so compute the
+    # real ones.
+    self.hashes = [
+      Transaction.from_tryte_string(trytes).hash
+        for trytes in self.trytes
+    ]
+
+  def test_compute_hashes(self):
+    """
+    Parsing transactions without hashes; they are computed from the
+    trytes.
+    """
+    transactions = Transaction.from_tryte_strings(self.trytes)
+
+    self.assertListEqual([txn.hash for txn in transactions], self.hashes)
+    self.assertListEqual([txn.value for txn in transactions], [0, 1, 2])
+
+  def test_trusted_hashes(self):
+    """
+    Hashes provided by the caller are used as-is.
+    """
+    # noinspection SpellCheckingInspection
+    fake_hash = TransactionHash(b'TESTVALUE9DONTUSEINPRODUCTION99999FAKE')
+
+    transactions = Transaction.from_tryte_strings(self.trytes[:1], [fake_hash])
+
+    self.assertEqual(transactions[0].hash, fake_hash)
+
+  def test_verify(self):
+    """
+    Checking the provided hashes against the trytes.
+    """
+    for verify in (True, 'sample'):
+      transactions = Transaction.from_tryte_strings(
+        self.trytes,
+        self.hashes,
+        verify = verify,
+      )
+
+      self.assertListEqual([txn.hash for txn in transactions], self.hashes)
+
+      with self.assertRaises(ValueError):
+        Transaction.from_tryte_strings(
+          self.trytes,
+          list(reversed(self.hashes)),
+          verify = verify,
+        )
+
+  def test_lazy(self):
+    """
+    Parsing LazyTransactions in bulk.
+    """
+    transactions = LazyTransaction.from_tryte_strings(self.trytes, self.hashes)
+
+    self.assertIsInstance(transactions[0], LazyTransaction)
+    self.assertEqual(transactions[2].value, 2)
+
+  def test_error_wrong_number_of_hashes(self):
+    """
+    The number of hashes doesn't match the number of transactions.
+    """
+    with self.assertRaises(ValueError):
+      Transaction.from_tryte_strings(self.trytes, self.hashes[:2])
+
+
+class LazyTransactionTestCase(TestCase):
+  def setUp(self):
+    super(LazyTransactionTestCase, self).setUp()
+
+    # noinspection SpellCheckingInspection
+    self.transaction = Transaction(
+      hash_                             = None,
+      signature_message_fragment        = Fragment(b'HELLOIOTA'),
+      address                           = Address(b'TESTVALUE9DONTUSEINPRODUCTION99999ADDRESS'),
+      value                             = -42,
+      legacy_tag                        = Tag(b'LEGACY'),
+      timestamp                         = 1480690413,
+      current_index                     = 1,
+      last_index                        = 3,
+      bundle_hash                       = BundleHash(b'TESTVALUE9DONTUSEINPRODUCTION99999BUNDLE'),
+      trunk_transaction_hash            = TransactionHash(b'TRUNK'),
+      branch_transaction_hash           = TransactionHash(b'BRANCH'),
+      tag                               = Tag(b'TAG'),
+      attachment_timestamp              = 1480690414,
+      attachment_timestamp_lower_bound  = 1,
+      attachment_timestamp_upper_bound  = 2,
+      nonce                             = Nonce(b'NONCE'),
+    )
+
+    self.trytes = self.transaction.as_tryte_string()
+
+  def test_fields(self):
+    """
+    Fields are decoded the same way as
+    :py:meth:`Transaction.from_tryte_string`.
+    """
+    lazy  = LazyTransaction.from_tryte_string(self.trytes)
+    eager = Transaction.from_tryte_string(self.trytes)
+
+    self.assertIsInstance(lazy, Transaction)
+    self.assertDictEqual(lazy.as_json_compatible(), eager.as_json_compatible())
+
+    self.assertIsInstance(lazy.address, Address)
+    self.assertEqual(lazy.value, -42)
+    self.assertEqual(lazy.legacy_tag, Tag(b'LEGACY'))
+    self.assertFalse(lazy.is_tail)
+    self.assertIsNone(lazy.is_confirmed)
+
+  def test_decoded_on_first_access(self):
+    """
+    Each field is decoded the first time it is accessed, then cached.
+    """
+    txn = LazyTransaction.from_tryte_string(self.trytes)
+
+    self.assertNotIn('address', vars(txn))
+    self.assertNotIn('hash', vars(txn))
+
+    address = txn.address
+
+    self.assertIs(txn.address, address)
+    self.assertNotIn('hash', vars(txn))
+
+  def test_with_hash(self):
+    """
+    If the hash is provided, it is not computed.
+    """
+    # noinspection SpellCheckingInspection
+    txn_hash = TransactionHash(b'TESTVALUE9DONTUSEINPRODUCTION99999HASH')
+
+    txn = LazyTransaction.from_tryte_string(self.trytes, txn_hash)
+
+    self.assertIs(txn.hash, txn_hash)
+
+  def test_as_tryte_string(self):
+    """
+    Converting a LazyTransaction back into a TryteString.
+    """
+    txn = LazyTransaction.from_tryte_string(self.trytes)
+
+    self.assertEqual(txn.as_tryte_string(), self.trytes)
+
+    # Changes to fields are reflected.
+    txn.value = 42
+
+    self.assertEqual(
+      Transaction.from_tryte_string(txn.as_tryte_string()).value,
+      42,
+    )
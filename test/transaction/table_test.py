@@ -0,0 +1,181 @@
+# coding=utf-8
+from __future__ import absolute_import, division, print_function, \
+  unicode_literals
+
+from unittest import TestCase
+
+from iota import Address, Bundle, BundleHash, Tag, Transaction, \
+  TransactionHash, TransactionTable
+from test.helpers import create_transaction
+
+
+class TransactionTableTestCase(TestCase):
+  def setUp(self):
+    super(TransactionTableTestCase, self).setUp()
+
+    # Rows are deliberately out of order.
+    self.rows = [
+      create_transaction(
+        b'SPENDB',
+        address       = b'POOR',
+        value         = 40,
+        bundle        = b'SPEND',
+        current_index = 1,
+        last_index    = 1,
+      ),
+
+      create_transaction(b'GIFT', address=b'POOR', value=5, bundle=b'GIFT', tag=b'THX'),
+
+      create_transaction(
+        b'SPENDA',
+        address       = b'RICH',
+        value         = -40,
+        bundle        = b'SPEND',
+        last_index    = 1,
+      ),
+    ]
+
+    self.table = TransactionTable.from_tryte_strings(
+      [trytes for _, trytes in self.rows],
+      [hash_ for hash_, _ in self.rows],
+    )
+
+  def test_columns(self):
+    """
+    Accessing the values in a column.
+    """
+    self.assertEqual(len(self.table), 3)
+
+    self.assertListEqual(list(self.table.values), [40, 5, -40])
+    self.assertListEqual(list(self.table.current_indexes), [1, 0, 0])
+    self.assertListEqual(list(self.table.get_column('last_index')), [1, 0, 1])
+
+    self.assertListEqual(
+      self.table.get_column('address'),
+      [Address(b'POOR'), Address(b'POOR'), Address(b'RICH')],
+    )
+
+    self.assertIsInstance(self.table.get_column('bundle_hash')[0], BundleHash)
+
+    self.assertListEqual(
+      self.table.get_column('hash'),
+      [hash_ for hash_, _ in self.rows],
+    )
+
+    with self.assertRaises(ValueError):
+      self.table.get_column('foo')
+
+  def test_filter(self):
+    """
+    Selecting transactions that match criteria.
+    """
+    def hashes(table):
+      return [txn.hash for txn in table]
+
+    self.assertListEqual(
+      hashes(self.table.filter(addresses=[Address(b'POOR')])),
+      [self.rows[0][0], self.rows[1][0]],
+    )
+
+    # Criteria are combined using "AND".
+    self.assertListEqual(
+      hashes(self.table.filter(addresses=[Address(b'POOR')], tails_only=True)),
+      [self.rows[1][0]],
+    )
+
+    self.assertListEqual(
+      hashes(self.table.filter(bundle_hashes=[BundleHash(b'SPEND')], max_value=0)),
+      [self.rows[2][0]],
+    )
+
+    self.assertListEqual(
+      hashes(self.table.filter(tags=[Tag(b'THX')], min_value=1)),
+      [self.rows[1][0]],
+    )
+
+    self.assertEqual(len(self.table.filter(addresses=[])), 0)
+
+  def test_group_by_bundle(self):
+    """
+    Grouping transactions by bundle, sorted by index.
+    """
+    groups = self.table.group_by_bundle()
+
+    self.assertListEqual(list(groups), [BundleHash(b'SPEND'), BundleHash(b'GIFT')])
+
+    spend = groups[BundleHash(b'SPEND')]
+    self.assertListEqual(list(spend.current_indexes), [0, 1])
+    self.assertListEqual(list(spend.values), [-40, 40])
+
+  def test_get_balances(self):
+    """
+    Adding up transaction values per address.
+    """
+    self.assertDictEqual(
+      dict(self.table.get_balances()),
+
+      {
+        Address(b'POOR'): 45,
+        Address(b'RICH'): -40,
+      },
+    )
+
+  def test_as_bundles(self):
+    """
+    Converting the table into Bundle objects.
+    """
+    bundles = self.table.as_bundles()
+
+    self.assertEqual(len(bundles), 2)
+    self.assertIsInstance(bundles[0], Bundle)
+
+    self.assertListEqual(
+      [txn.hash for txn in bundles[0]],
+      [self.rows[2][0], self.rows[0][0]],
+    )
+
+  def test_round_trip(self):
+    """
+    Converting transactions into a table and back.
+    """
+    transactions = [
+      Transaction.from_tryte_string(trytes, hash_)
+        for hash_, trytes in self.rows
+    ]
+
+    table = TransactionTable.from_transactions(transactions)
+
+    self.assertListEqual(
+      [txn.as_json_compatible() for txn in table.as_transactions()],
+      [txn.as_json_compatible() for txn in transactions],
+    )
+
+    self.assertEqual(table[-1].hash, self.rows[2][0])
+
+    with self.assertRaises(IndexError):
+      # noinspection PyStatementEffect
+      table[3]
+
+  def test_compute_hashes(self):
+    """
+    If hashes aren't provided, they are computed from the trytes.
+    """
+    table = TransactionTable.from_tryte_strings([self.rows[0][1]])
+
+    self.assertEqual(
+      table[0].hash,
+      Transaction.from_tryte_string(self.rows[0][1]).hash,
+    )
+
+    self.assertIsInstance(table[0].hash, TransactionHash)
+
+  def test_error_value_out_of_range(self):
+    """
+    The trytes contain a value that is too large for a valid
+    transaction.
+    """
+    trytes = bytearray(self.rows[0][1]._trytes)
+    trytes[2268:2295] = b'M' * 27
+
+    with self.assertRaises(ValueError):
+      TransactionTable.from_tryte_strings([trytes], [self.rows[0][0]])
@@ -4,7 +4,8 @@ from __future__ import absolute_import, division, print_function, \
 
 from unittest import TestCase
 
-from iota import trits_from_int
+from iota import TryteString, int_from_trits, int_from_trytes, \
+  trits_from_int, trytes_from_int
 
 
 class TritsFromIntTestCase(TestCase):
@@ -30,3 +31,44 @@ class TritsFromIntTestCase(TestCase):
     self.assertEqual(trits_from_int(0, pad=None), [])
 
 
+
+
+class TryteIntCodecTestCase(TestCase):
+  """
+  Unit tests for :py:func:`int_from_trytes` and
+  :py:func:`trytes_from_int`.
+  """
+  def test_round_trip(self):
+    """
+    Converting integers into trytes and back.
+    """
+    for n in (0, 1, -1, 13, 14, -13, -14, 42, -42, 1480690413, -2779530283277761):
+      trytes = trytes_from_int(n, pad=27)
+
+      self.assertEqual(len(trytes), 27)
+      self.assertEqual(int_from_trytes(trytes), n)
+
+  def test_same_as_trits(self):
+    """
+    The results match converting via trits.
+    """
+    for n in (-2779530283277761, -42, 0, 42, 1480690413):
+      self.assertEqual(
+        bytes(trytes_from_int(n, pad=9)),
+        bytes(TryteString.from_trits(trits_from_int(n, pad=27))),
+      )
+
+    trytes = b'NFDPEEZCWVYLKZG'
+
+    self.assertEqual(
+      int_from_trytes(trytes),
+      int_from_trits(TryteString(trytes).as_trits()),
+    )
+
+  def test_pad(self):
+    """
+    Padding is only applied if the result is too short.
+    """
+    self.assertEqual(trytes_from_int(0), bytearray(b'9'))
+    self.assertEqual(trytes_from_int(0, pad=None), bytearray())
+    self.assertEqual(trytes_from_int(-40, pad=None), bytearray(b'NZ'))
@@ -8,7 +8,7 @@ from warnings import catch_warnings, simplefilter as simple_filter
 from six import binary_type, text_type
 
 from iota import Address, AddressChecksum, AsciiTrytesCodec, Hash, Tag, \
-  TryteString, TrytesDecodeError
+  TransactionHash, TryteString, TrytesDecodeError
 
 
 # noinspection SpellCheckingInspection
@@ -377,6 +377,77 @@ class TryteStringTestCase(TestCase):
     with self.assertRaises(ValueError):
       TryteString(b'not valid')
 
+  def test_init_error_invalid_character_position(self):
+    """
+    The error message identifies the first invalid character.
+    """
+    with self.assertRaises(ValueError) as context:
+      TryteString(b'ABC9DEFgHIj')
+
+    self.assertEqual(
+      text_type(context.exception),
+      "Invalid character 'g' at position 7 (expected A-Z or 9).",
+    )
+
+  def test_from_trusted(self):
+    """
+    Creating a TryteString from trytes that are known to be valid.
+    """
+    buffer = bytearray(b'RBTC9D9DCDQAEASBYBCCKBFA')
+
+    trytes = TryteString.from_trusted(buffer)
+
+    self.assertEqual(trytes, TryteString(b'RBTC9D9DCDQAEASBYBCCKBFA'))
+
+    # The bytearray is wrapped, not copied.
+    self.assertIs(trytes._trytes, buffer)
+
+    # Other buffers are copied.
+    self.assertEqual(
+      TryteString.from_trusted(memoryview(b'ABCDEF')[2:4]),
+      TryteString(b'CD'),
+    )
+
+  def test_from_trusted_subclass(self):
+    """
+    Creating a subclass of TryteString from trusted trytes still
+    applies the subclass' checks.
+    """
+    tag = Tag.from_trusted(b'FOO')
+
+    self.assertIsInstance(tag, Tag)
+    self.assertEqual(binary_type(tag), b'FOO' + b'9' * 24)
+
+    with self.assertRaises(ValueError):
+      Tag.from_trusted(b'A' * 28)
+
+    # Padding doesn't modify the caller's buffer.
+    buffer = bytearray(b'FOO')
+    Tag.from_trusted(buffer)
+    self.assertEqual(buffer, bytearray(b'FOO'))
+
+  def test_from_trusted_subclass_no_copy(self):
+    """
+    Subclasses wrap the buffer without copying it, if it is already the
+    correct length.
+    """
+    buffer = bytearray(b'A' * 81)
+    txn_hash = TransactionHash.from_trusted(buffer)
+
+    self.assertIsInstance(txn_hash, TransactionHash)
+    self.assertIs(txn_hash._trytes, buffer)
+
+    buffer  = bytearray(b'A' * 81 + b'B' * 9)
+    addy    = Address.from_trusted(buffer)
+
+    self.assertIs(addy._trytes, buffer)
+    self.assertEqual(addy.address, TryteString(b'A' * 81))
+    self.assertEqual(addy.checksum, AddressChecksum(b'B' * 9))
+    self.assertIsNone(addy.key_index)
+
+    with self.assertRaises(ValueError):
+      Address.from_trusted(b'A' * 82)
+
   # noinspection PyTypeChecker
   def test_init_error_int(self):
     """
@@ -886,6 +957,21 @@ class TryteStringTestCase(TestCase):
 
 # noinspection SpellCheckingInspection
 class AddressTestCase(TestCase):
+  def test_slots(self):
+    """
+    Addresses don't have a ``__dict__``, but their ancillary attributes
+    can still be changed.
+    """
+    address = Address(b'TESTVALUE9DONTUSEINPRODUCTION99999')
+
+    self.assertFalse(hasattr(address, '__dict__'))
+
+    address.balance = 42
+    self.assertEqual(address.balance, 42)
+
+    with self.assertRaises(AttributeError):
+      address.foo = 'bar'
+
   def test_init_automatic_pad(self):
     """
     Addresses are automatically padded to 81 trytes.